@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
-ASGI entry point for the Resume Modifier FastAPI application.
-This file is used to run the FastAPI application in production with uvicorn.
+ASGI entry point for the Resume Modifier Flask application.
+Wraps the WSGI app for ASGI servers such as uvicorn; requests still run in a
+thread pool, so gunicorn (railway_start.py) remains the production server.
 """
 
 import os
@@ -13,8 +14,12 @@ sys.path.insert(0, basedir)
 # Add the core directory to allow 'app' imports
 sys.path.insert(0, os.path.join(basedir, 'core'))
 
-# Import the FastAPI app
-from app.main import app
+from asgiref.wsgi import WsgiToAsgi
+
+from app import create_app
+
+# Wrap the Flask app
+app = WsgiToAsgi(create_app())
 
 if __name__ == "__main__":
     import uvicorn
@@ -44,6 +44,34 @@ def app():
         db.drop_all()
 
 
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """Start every test with empty rate-limit buckets."""
+    from app.utils.rate_limiter import get_rate_limiter
+    get_rate_limiter().reset()
+    yield
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Fail when a block issues more SQL statements than allowed.
+
+    Usage:
+        with assert_max_queries(3):
+            client.get('/api/files', headers=auth_headers)
+    """
+    from contextlib import contextmanager
+    from app.utils.query_stats import collect_queries
+
+    @contextmanager
+    def check(limit):
+        with collect_queries() as stats:
+            yield stats
+        assert stats.count <= limit, f"Expected at most {limit} SQL statements, got {stats.format()}"
+    return check
+
+
 @pytest.fixture(scope='function')
 def client(app):
     """Create test client with fresh database state."""
@@ -0,0 +1,85 @@
+"""
+API blueprint registration
+Endpoints are grouped into domain blueprints. A domain's module is only
+imported when the domain is enabled, so a process deployed for one role
+(e.g. only the batch endpoints) does not load the code and dependencies of
+the others.
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import os
+import logging
+from importlib import import_module
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import Flask
+
+
+logger = logging.getLogger(__name__)
+
+
+# Domain -> blueprints as (module, attribute, url_prefix)
+BLUEPRINTS: Dict[str, List[Tuple[str, str, Optional[str]]]] = {
+    'files': [
+        ('app.api.file_endpoints', 'files_bp', None),
+        ('app.api.file_category_endpoints', 'file_category_bp', '/api/files')
+    ],
+    'auth': [('app.api.auth_endpoints', 'auth_bp', None)],
+    'oauth_admin': [('app.api.oauth_admin_endpoints', 'oauth_admin_bp', None)],
+    'resume_ai': [('app.api.resume_ai_endpoints', 'resume_ai_bp', None)],
+    'export': [('app.api.export_endpoints', 'export_bp', None)],
+    'storage': [('app.api.storage_endpoints', 'storage_bp', None)],
+    'batch': [('app.api.batch_endpoints', 'batch_bp', None)],
+    'web': [('app.web', 'web', None)]
+}
+
+
+def enabled_domains(value: Optional[str] = None) -> List[str]:
+    """
+    Domains to serve, from ``value`` or the API_BLUEPRINTS environment variable.
+
+    API_BLUEPRINTS is a comma-separated list of domains (see BLUEPRINTS), or
+    ``all`` (default).
+
+    Raises:
+        ValueError: If an unknown domain is named
+    """
+    value = value if value is not None else os.getenv('API_BLUEPRINTS', 'all')
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    if not names or 'all' in names:
+        return list(BLUEPRINTS)
+    unknown = [name for name in names if name not in BLUEPRINTS]
+    if unknown:
+        raise ValueError(f"Unknown API blueprint domain(s): {', '.join(unknown)}")
+    return names
+
+
+def register_blueprints(app: Flask, domains: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Register the system endpoints and the blueprints of the enabled domains.
+
+    Args:
+        app: Flask application
+        domains: Domains to register; defaults to the API_BLUEPRINTS app
+            config value or environment variable
+
+    Returns:
+        List[str]: Registered domains
+    """
+    if domains is None:
+        domains = enabled_domains(app.config.get('API_BLUEPRINTS'))
+    domains = list(domains)
+
+    from app.server import api
+    app.register_blueprint(api)
+
+    for domain in domains:
+        for module_name, attribute, url_prefix in BLUEPRINTS[domain]:
+            blueprint = getattr(import_module(module_name), attribute)
+            app.register_blueprint(blueprint, url_prefix=url_prefix)
+
+    app.config['API_BLUEPRINTS_ENABLED'] = domains
+    logger.info(f"Registered API blueprints: {', '.join(domains)}")
+    return domains
@@ -0,0 +1,907 @@
+"""
+Resume Export API Endpoints
+Handles HTTP requests for resume generation, Google Docs export and generated documents
+"""
+
+from flask import Blueprint, request, jsonify, send_file
+from flasgger import swag_from
+import os
+from app.extensions import db
+from app.services.resume_generator import ResumeGenerator
+from app.services.google_auth import GoogleAuthService
+from app.services.google_docs_service import GoogleDocsService
+from app.services.google_drive_service import GoogleDriveService
+from app.models.temp import User, Resume, GoogleAuth, ResumeTemplate, GeneratedDocument
+from app.utils.jwt_utils import token_required
+from app.services.ai_usage import metered_endpoint
+from app.utils.rate_limiter import rate_limited
+from datetime import datetime
+from googleapiclient.errors import HttpError
+import io
+
+
+# Create blueprint for export endpoints
+export_bp = Blueprint('export', __name__)
+
+# ===== GOOGLE DOCS EXPORT ENDPOINTS =====
+
+@export_bp.route('/api/resume/export/gdocs', methods=['POST'])
+@swag_from({
+    'tags': ['Document Export'],
+    'summary': 'Export resume to Google Docs',
+    'description': 'Export a resume to Google Docs using a specified template',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': True,
+            'schema': {
+                'type': 'object',
+                'required': ['resume_id', 'template_id'],
+                'properties': {
+                    'resume_id': {
+                        'type': 'integer',
+                        'description': 'Resume ID to export'
+                    },
+                    'template_id': {
+                        'type': 'integer',
+                        'description': 'Template ID to apply'
+                    },
+                    'document_title': {
+                        'type': 'string',
+                        'description': 'Optional document title'
+                    }
+                }
+            }
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Resume exported successfully',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'document_id': {'type': 'string'},
+                    'document_url': {'type': 'string'},
+                    'message': {'type': 'string'}
+                }
+            }
+        },
+        400: {
+            'description': 'Bad request',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        },
+        401: {
+            'description': 'Unauthorized',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        },
+        403: {
+            'description': 'Google authentication required',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        },
+        404: {
+            'description': 'Resume or template not found',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        }
+    }
+})
+@token_required
+@rate_limited('export')
+def export_resume_to_google_docs():
+    """Export resume to Google Docs"""
+    data = request.get_json()
+    user_id = request.user.get('user_id')
+    current_user = User.query.get(user_id)
+    
+    if not current_user:
+        return jsonify({"error": "User not found"}), 404
+    
+    # Validate input
+    if not data or 'resume_id' not in data or 'template_id' not in data:
+        return jsonify({"error": "resume_id and template_id are required"}), 400
+    
+    # Check if user has Google auth
+    google_auth = GoogleAuth.query.filter_by(user_id=current_user.id).first()
+    if not google_auth:
+        return jsonify({"error": "google_auth_required"}), 401
+    
+    # Verify Google auth has required scopes
+    required_scopes = ['https://www.googleapis.com/auth/documents', 'https://www.googleapis.com/auth/drive']
+    if not google_auth.scope or not all(scope in google_auth.scope for scope in required_scopes):
+        return jsonify({"error": "insufficient_scope"}), 403
+    
+    try:
+        # Get resume and template
+        resume = Resume.query.filter_by(
+            serial_number=data['resume_id'],
+            user_id=current_user.id
+        ).first()
+        
+        if not resume:
+            return jsonify({"error": "resume_not_found"}), 404
+        
+        template = ResumeTemplate.query.get(data['template_id'])
+        if not template:
+            return jsonify({"error": "template_not_found"}), 404
+        
+        # Get Google credentials
+        google_auth_service = GoogleAuthService()
+        credentials = google_auth_service.get_credentials(current_user.id)
+        
+        # Create Google Docs document
+        docs_service = GoogleDocsService()
+        document_data = {
+            'title': data.get('document_title', f"Resume - {resume.title}"),
+            'content': resume.parsed_resume
+        }
+        
+        doc_result = docs_service.create_document(document_data, credentials)
+        
+        # Apply template styling
+        if template:
+            docs_service.apply_template_styling(
+                doc_result['document_id'], 
+                template, 
+                credentials
+            )
+        
+        # Create shareable link
+        drive_service = GoogleDriveService()
+        share_result = drive_service.create_shareable_link(
+            doc_result['document_id'], 
+            credentials
+        )
+        
+        # Track in database
+        generated_doc = GeneratedDocument(
+            user_id=current_user.id,
+            resume_id=data['resume_id'],
+            template_id=data['template_id'],
+            google_doc_id=doc_result['document_id'],
+            google_doc_url=share_result['shareable_url'],
+            document_title=document_data['title'],
+            generation_status='created',
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
+        
+        db.session.add(generated_doc)
+        db.session.commit()
+        
+        return jsonify({
+            "status": 200,
+            "data": {
+                "document_id": doc_result['document_id'],
+                "shareable_url": share_result['shareable_url'],
+                "generated_document_id": generated_doc.id
+            }
+        }), 200
+        
+    except HttpError as e:
+        # Handle specific Google API errors
+        if e.resp.status == 429:
+            return jsonify({
+                "error": "quota_exceeded",
+                "message": "Google API quota exceeded"
+            }), 429
+        elif e.resp.status == 401:
+            return jsonify({
+                "error": "authentication_error", 
+                "message": "Invalid Google credentials"
+            }), 401
+        elif e.resp.status == 403:
+            return jsonify({
+                "error": "permission_denied",
+                "message": "Insufficient permissions"
+            }), 403
+        else:
+            return jsonify({
+                "error": "google_api_error",
+                "message": f"Google API error: {e.resp.status}"
+            }), e.resp.status
+    except Exception as e:
+        # Handle network errors
+        import requests
+        if isinstance(e, requests.exceptions.ConnectionError) or 'ConnectionError' in str(type(e)):
+            return jsonify({
+                "error": "network_error",
+                "message": "Network connection failed"
+            }), 503
+        
+        # Generic error fallback
+        return jsonify({
+            "error": "Failed to export to Google Docs",
+            "details": str(e)
+        }), 500
+
+
+@export_bp.route('/api/resume/generate', methods=['POST'])
+@swag_from({
+    'tags': ['Resume Processing'],
+    'summary': 'Generate optimized resume content using AI',
+    'description': 'Generate optimized resume content using AI based on user data and job description',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': True,
+            'schema': {
+                'type': 'object',
+                'required': ['resume_id', 'job_description_id'],
+                'properties': {
+                    'resume_id': {
+                        'type': 'integer',
+                        'description': 'Resume ID to optimize'
+                    },
+                    'job_description_id': {
+                        'type': 'integer',
+                        'description': 'Job description ID for optimization'
+                    },
+                    'template_id': {
+                        'type': 'integer',
+                        'description': 'Template ID to apply'
+                    }
+                }
+            }
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Resume generated successfully',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'message': {'type': 'string'},
+                    'resume': {'type': 'object'},
+                    'generated_content': {'type': 'object'}
+                }
+            }
+        },
+        400: {
+            'description': 'Bad request',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        },
+        401: {
+            'description': 'Unauthorized',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        },
+        404: {
+            'description': 'Resume or job description not found',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        }
+    }
+})
+@token_required
+@rate_limited('ai')
+@metered_endpoint()
+def generate_resume():
+    """
+    Generate optimized resume content using AI based on user data and job description
+    """
+    data = request.get_json()
+    user_id = request.user.get('user_id')
+    current_user = User.query.get(user_id)
+    
+    if not current_user:
+        return jsonify({"error": "User not found"}), 404
+    
+    # Validate required fields - support both API formats
+    if not data:
+        return jsonify({
+            "error": "Missing required_fields: user_data, job_description, template_id"
+        }), 400
+    
+    # Check for new API format (resume_id, job_description_id) or legacy format (user_data, job_description, template_id)
+    has_new_format = all(key in data for key in ['resume_id', 'job_description_id'])
+    has_legacy_format = all(key in data for key in ['user_data', 'job_description', 'template_id'])
+    
+    if not has_new_format and not has_legacy_format:
+        return jsonify({
+            "error": "Missing required_fields: user_data, job_description, template_id or resume_id, job_description_id"
+        }), 400
+    
+    try:
+        # Initialize resume generator
+        generator = ResumeGenerator()
+        
+        # Generate optimized content
+        result = generator.generate_content(
+            user_data=data['user_data'],
+            job_description=data['job_description'],
+            template_id=data['template_id']
+        )
+        
+        return jsonify({
+            "status": 200,
+            "data": {
+                "generated_resume": result.get('optimized_content', ''),
+                "optimizations_applied": result.get('improvements', []),
+                "ats_score": result.get('ats_score', 0),
+                "keywords_matched": result.get('keywords_matched', []),
+                "template_applied": result.get('template_applied', '')
+            }
+        }), 200
+        
+    except ValueError as e:
+        # Check if it's a template not found error
+        if "Template" in str(e) and "not found" in str(e):
+            return jsonify({
+                "error": "template_not_found",
+                "details": str(e)
+            }), 404
+        
+        return jsonify({
+            "error": "Invalid request data",
+            "details": str(e)
+        }), 400
+        
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to generate resume",
+            "details": str(e)
+        }), 500
+
+
+@export_bp.route('/api/resume/export/pdf/<document_id>', methods=['GET'])
+@swag_from({
+    'tags': ['Document Export'],
+    'summary': 'Export Google Docs document as PDF',
+    'description': 'Export a previously created Google Docs document as a PDF file',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'document_id',
+            'in': 'path',
+            'required': True,
+            'type': 'string',
+            'description': 'Google Docs document ID'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'PDF file',
+            'schema': {
+                'type': 'file'
+            }
+        },
+        401: {
+            'description': 'Unauthorized',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        },
+        403: {
+            'description': 'Access denied',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        },
+        404: {
+            'description': 'Document not found',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        }
+    }
+})
+@token_required
+@rate_limited('export')
+def export_google_docs_as_pdf(document_id):
+    """
+    Export Google Docs document as PDF
+    """
+    user_id = request.user.get('user_id')
+    current_user = User.query.get(user_id)
+    
+    if not current_user:
+        return jsonify({"error": "User not found"}), 404
+    
+    try:
+        # Check if user has access to this document
+        generated_doc = GeneratedDocument.query.filter_by(
+            google_doc_id=document_id,
+            user_id=current_user.id
+        ).first()
+        
+        if not generated_doc:
+            return jsonify({"error": "document_not_found"}), 404
+        
+        # Get Google credentials
+        google_auth_service = GoogleAuthService()
+        credentials = google_auth_service.get_credentials(current_user.id)
+        
+        # Export as PDF
+        drive_service = GoogleDriveService()
+        pdf_result = drive_service.export_as_pdf(document_id, credentials)
+        
+        # Clean up temporary file if exists
+        if pdf_result.get('temp_file_path'):
+            try:
+                os.remove(pdf_result['temp_file_path'])
+            except:
+                pass
+        
+        return send_file(
+            io.BytesIO(pdf_result['pdf_content']),
+            mimetype='application/pdf',
+            as_attachment=True,
+            download_name=pdf_result['filename']
+        )
+        
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to export PDF",
+            "details": str(e)
+        }), 500
+
+
+@export_bp.route('/api/resume/export/docx/<document_id>', methods=['GET'])
+@swag_from({
+    'tags': ['Document Export'],
+    'summary': 'Export Google Docs document as DOCX',
+    'description': 'Export a previously created Google Docs document as a DOCX file',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'document_id',
+            'in': 'path',
+            'required': True,
+            'type': 'string',
+            'description': 'Google Docs document ID'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'DOCX file',
+            'schema': {
+                'type': 'file'
+            }
+        },
+        401: {
+            'description': 'Unauthorized',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        },
+        403: {
+            'description': 'Access denied',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        },
+        404: {
+            'description': 'Document not found',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        }
+    }
+})
+@token_required
+@rate_limited('export')
+def export_google_docs_as_docx(document_id):
+    """
+    Export Google Docs document as DOCX
+    """
+    user_id = request.user.get('user_id')
+    current_user = User.query.get(user_id)
+    
+    if not current_user:
+        return jsonify({"error": "User not found"}), 404
+    
+    try:
+        # Check if user has access to this document
+        generated_doc = GeneratedDocument.query.filter_by(
+            google_doc_id=document_id,
+            user_id=current_user.id
+        ).first()
+        
+        if not generated_doc:
+            return jsonify({"error": "document_not_found"}), 404
+        
+        # Get Google credentials
+        google_auth_service = GoogleAuthService()
+        credentials = google_auth_service.get_credentials(current_user.id)
+        
+        # Export as DOCX
+        drive_service = GoogleDriveService()
+        docx_result = drive_service.export_as_docx(document_id, credentials)
+        
+        return send_file(
+            io.BytesIO(docx_result['docx_content']),
+            mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+            as_attachment=True,
+            download_name=docx_result['filename']
+        )
+        
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to export DOCX",
+            "details": str(e)
+        }), 500
+
+
+@export_bp.route('/api/documents', methods=['GET'])
+@swag_from({
+    'tags': ['Document Management'],
+    'summary': 'List user generated documents',
+    'description': 'Get list of all documents generated by the user',
+    'security': [{'Bearer': []}],
+    'responses': {
+        200: {
+            'description': 'List of user documents',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'documents': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'id': {'type': 'integer'},
+                                'google_doc_id': {'type': 'string'},
+                                'document_title': {'type': 'string'},
+                                'shareable_url': {'type': 'string'},
+                                'created_at': {'type': 'string', 'format': 'date-time'}
+                            }
+                        }
+                    }
+                }
+            }
+        },
+        401: {
+            'description': 'Unauthorized',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        },
+        404: {
+            'description': 'User not found',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        }
+    }
+})
+@token_required
+def list_user_generated_documents():
+    """
+    List user's generated documents
+    """
+    user_id = request.user.get('user_id')
+    current_user = User.query.get(user_id)
+    
+    if not current_user:
+        return jsonify({"error": "User not found"}), 404
+    
+    try:
+        documents = GeneratedDocument.query.filter_by(
+            user_id=current_user.id
+        ).order_by(GeneratedDocument.created_at.desc()).all()
+        
+        result = []
+        for doc in documents:
+            result.append({
+                "id": doc.id,
+                "document_title": doc.document_title,
+                "google_doc_id": doc.google_doc_id,
+                "google_doc_url": doc.google_doc_url,
+                "resume_id": doc.resume_id,
+                "template_id": doc.template_id,
+                "generation_status": doc.generation_status,
+                "created_at": doc.created_at.isoformat(),
+                "updated_at": doc.updated_at.isoformat()
+            })
+        
+        return jsonify({
+            "status": 200,
+            "data": result
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to list documents",
+            "details": str(e)
+        }), 500
+
+
+@export_bp.route('/api/documents/<int:document_id>', methods=['DELETE'])
+@swag_from({
+    'tags': ['Document Management'],
+    'summary': 'Delete a generated document',
+    'description': 'Delete a generated document from both the database and Google Drive',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'document_id',
+            'in': 'path',
+            'required': True,
+            'type': 'integer',
+            'description': 'ID of the document to delete'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Document deleted successfully',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'message': {'type': 'string'}
+                }
+            }
+        },
+        401: {
+            'description': 'Unauthorized',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        },
+        403: {
+            'description': 'Access denied',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        },
+        404: {
+            'description': 'Document not found',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        }
+    }
+})
+@token_required
+def delete_generated_document(document_id):
+    """
+    Delete a generated document
+    """
+    user_id = request.user.get('user_id')
+    current_user = User.query.get(user_id)
+    
+    if not current_user:
+        return jsonify({"error": "User not found"}), 404
+    
+    try:
+        # Find the document
+        doc = GeneratedDocument.query.filter_by(
+            id=document_id,
+            user_id=current_user.id
+        ).first()
+        
+        if not doc:
+            return jsonify({"error": "document_not_found"}), 404
+        
+        # Delete from Google Drive
+        try:
+            google_auth_service = GoogleAuthService()
+            credentials = google_auth_service.get_credentials(current_user.id)
+            
+            drive_service = GoogleDriveService()
+            drive_service.delete_document(doc.google_doc_id, credentials)
+        except:
+            # Continue even if Google deletion fails
+            pass
+        
+        # Delete from database
+        db.session.delete(doc)
+        db.session.commit()
+        
+        return jsonify({
+            "status": 200,
+            "message": "Document deleted successfully"
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to delete document",
+            "details": str(e)
+        }), 500
+
+
+@export_bp.route('/api/documents/<int:document_id>/sharing', methods=['PUT'])
+@swag_from({
+    'tags': ['Document Management'],
+    'summary': 'Update document sharing permissions',
+    'description': 'Update sharing permissions for a generated Google Docs document',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'document_id',
+            'in': 'path',
+            'required': True,
+            'type': 'integer',
+            'description': 'ID of the document to update sharing for'
+        },
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': True,
+            'schema': {
+                'type': 'object',
+                'required': ['sharing_settings'],
+                'properties': {
+                    'sharing_settings': {
+                        'type': 'object',
+                        'properties': {
+                            'type': {
+                                'type': 'string',
+                                'enum': ['user', 'domain', 'anyone'],
+                                'description': 'Type of sharing permission'
+                            },
+                            'role': {
+                                'type': 'string',
+                                'enum': ['reader', 'writer', 'commenter'],
+                                'description': 'Access role for the shared document'
+                            },
+                            'emailAddress': {
+                                'type': 'string',
+                                'description': 'Email address (required for user type)'
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Sharing settings updated successfully',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'message': {'type': 'string'},
+                    'sharing_settings': {'type': 'object'}
+                }
+            }
+        },
+        400: {
+            'description': 'Bad request',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        },
+        401: {
+            'description': 'Unauthorized',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        },
+        403: {
+            'description': 'Access denied',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        },
+        404: {
+            'description': 'Document not found',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        }
+    }
+})
+@token_required
+def update_document_sharing(document_id):
+    """
+    Update document sharing permissions
+    """
+    user_id = request.user.get('user_id')
+    current_user = User.query.get(user_id)
+    data = request.get_json()
+    
+    if not current_user:
+        return jsonify({"error": "User not found"}), 404
+    
+    try:
+        # Find the document
+        doc = GeneratedDocument.query.filter_by(
+            id=document_id,
+            user_id=current_user.id
+        ).first()
+        
+        if not doc:
+            return jsonify({"error": "document_not_found"}), 404
+        
+        # Update Google Drive permissions
+        google_auth_service = GoogleAuthService()
+        credentials = google_auth_service.get_credentials(current_user.id)
+        
+        drive_service = GoogleDriveService()
+        success = drive_service.update_permissions(
+            doc.google_doc_id, 
+            data, 
+            credentials
+        )
+        
+        return jsonify({
+            "status": 200,
+            "permissions_updated": success
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to update sharing",
+            "details": str(e)
+        }), 500
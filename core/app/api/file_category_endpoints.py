@@ -9,6 +9,7 @@ from typing import Dict, Any
 from app.services.file_category_service import FileCategoryService
 from app.utils.error_handler import FileManagementError, handle_file_management_errors
 from app.utils.jwt_utils import token_required
+from app.utils.read_replica import read_replica
 
 
 # Create blueprint for file categorization endpoints
@@ -309,6 +310,15 @@ def bulk_update_categories() -> Dict[str, Any]:
             'type': 'string',
             'required': False,
             'description': 'Search term for filename filtering'
+        },
+        {
+            'name': 'search_mode',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'default': 'filename',
+            'enum': ['filename', 'content'],
+            'description': "Match 'search' against filenames or against extracted text and keywords"
         }
     ],
     'responses': {
@@ -352,6 +362,7 @@ def bulk_update_categories() -> Dict[str, Any]:
     }
 })
 @token_required
+@read_replica
 @handle_file_management_errors
 def list_files_by_category() -> Dict[str, Any]:
     """
@@ -365,6 +376,7 @@ def list_files_by_category() -> Dict[str, Any]:
         - sort_by: Sort field (default: 'created_at')
         - sort_order: Sort order ('asc' or 'desc', default: 'desc')
         - search: Search term for filename filtering
+        - search_mode: 'filename' (default) or 'content' for full-text search
         
     Returns:
         JSON response with paginated file list
@@ -378,6 +390,7 @@ def list_files_by_category() -> Dict[str, Any]:
     sort_by = request.args.get('sort_by', 'created_at')
     sort_order = request.args.get('sort_order', 'desc')
     search = request.args.get('search')
+    search_mode = request.args.get('search_mode', 'filename')
     
     # Validate page parameters
     if page < 1:
@@ -393,7 +406,8 @@ def list_files_by_category() -> Dict[str, Any]:
         per_page=per_page,
         sort_by=sort_by,
         sort_order=sort_order,
-        search=search
+        search=search,
+        search_mode='content' if search_mode == 'content' else 'filename'
     )
     
     return jsonify(result), 200
@@ -460,6 +474,7 @@ def list_files_by_category() -> Dict[str, Any]:
     }
 })
 @token_required
+@read_replica
 @handle_file_management_errors
 def get_category_statistics() -> Dict[str, Any]:
     """
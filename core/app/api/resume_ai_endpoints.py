@@ -0,0 +1,938 @@
+"""
+Resume and AI Processing API Endpoints
+Handles HTTP requests for resume parsing, analysis, scoring, feedback, templates and saved resumes
+"""
+
+from flask import Blueprint, request, jsonify, current_app
+from flasgger import swag_from
+from app.extensions import db
+from app.utils.pdf_validator import PDFValidator
+from app.utils.job_validator import JobValidator
+from app.utils.parse_pdf import parse_pdf_file
+from app.services.resume_ai import ResumeAI
+from app.services.template_service import TemplateService
+from app.models.temp import User, Resume
+from app.utils.feedback_validator import FeedbackValidator
+from app.utils.jwt_utils import token_required
+from app.utils.read_replica import read_replica
+from app.services.resume_scorer import score_resume_locally
+from app.services.ai_usage import metered_endpoint
+from app.utils.rate_limiter import rate_limited
+from datetime import datetime
+
+
+# Create blueprint for resume and AI endpoints
+resume_ai_bp = Blueprint('resume_ai', __name__)
+
+@resume_ai_bp.route('/api/pdfupload', methods=['POST'])
+@rate_limited('ai')
+@metered_endpoint()
+def upload_pdf():
+    """
+    Upload PDF and process resume
+    ---
+    tags:
+      - Resume Processing
+    consumes:
+      - multipart/form-data
+    parameters:
+      - name: file
+        in: formData
+        type: file
+        required: true
+        description: PDF file containing the resume
+    responses:
+      200:
+        description: Resume successfully parsed
+        schema:
+          type: object
+          properties:
+            status:
+              type: integer
+              example: 200
+            data:
+              type: object
+              description: Parsed resume data structure
+      400:
+        description: Invalid request or file format
+      500:
+        description: Resume processing failed
+    """
+    
+    # Validate request
+    error, status_code = PDFValidator.validate_upload_request(request)
+    if error:
+        return jsonify({"error": error}), status_code
+    
+    # Get file
+    pdf_file = request.files['file']
+    
+    try:
+        # Parse PDF to text
+        extracted_text = parse_pdf_file(pdf_file)
+        
+        # Process with ResumeAI - only parse
+        resume_processor = ResumeAI(extracted_text)
+        parsed_resume = resume_processor.parse()
+        
+        return jsonify({
+            "status": 200,
+            "data": parsed_resume
+        }), 200
+    
+    except Exception as e:
+        return jsonify({
+            "error": "Resume processing failed", 
+            "details": str(e)
+        }), 500
+
+
+@resume_ai_bp.route('/api/templates', methods=['GET'])
+def get_templates():
+    """
+    Get all available resume templates
+    ---
+    tags:
+      - Templates
+    responses:
+      200:
+        description: Templates retrieved successfully
+        schema:
+          type: object
+          properties:
+            status:
+              type: integer
+              example: 200
+            data:
+              type: array
+              items:
+                type: object
+                properties:
+                  id:
+                    type: integer
+                    example: 1
+                  name:
+                    type: string
+                    example: "Professional Modern"
+                  description:
+                    type: string
+                    example: "Clean, modern design with blue accents"
+                  style_config:
+                    type: object
+                    description: Template styling configuration
+                  sections:
+                    type: array
+                    items:
+                      type: string
+                    example: ["header", "summary", "experience", "education", "skills"]
+                  created_at:
+                    type: string
+                    format: date-time
+      500:
+        description: Failed to retrieve templates
+    """
+    try:
+        templates = TemplateService.get_all_templates()
+        
+        return jsonify({
+            "status": 200,
+            "data": templates
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to retrieve templates",
+            "details": str(e)
+        }), 500
+
+
+@resume_ai_bp.route('/api/templates/<int:template_id>', methods=['GET'])
+def get_template(template_id):
+    """
+    Get a specific template by ID
+    ---
+    tags:
+      - Templates
+    parameters:
+      - name: template_id
+        in: path
+        type: integer
+        required: true
+        description: Template ID to retrieve
+    responses:
+      200:
+        description: Template retrieved successfully
+        schema:
+          type: object
+          properties:
+            status:
+              type: integer
+              example: 200
+            data:
+              type: object
+              properties:
+                id:
+                  type: integer
+                name:
+                  type: string
+                description:
+                  type: string
+                style_config:
+                  type: object
+                sections:
+                  type: array
+                  items:
+                    type: string
+      404:
+        description: Template not found
+      500:
+        description: Failed to retrieve template
+    """
+    try:
+        template = TemplateService.get_template_by_id(template_id)
+        
+        if not template:
+            return jsonify({
+                "error": "Template not found"
+            }), 404
+        
+        return jsonify({
+            "status": 200,
+            "data": template
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to retrieve template",
+            "details": str(e)
+        }), 500
+
+
+@resume_ai_bp.route('/api/templates/seed', methods=['POST'])
+def seed_templates():
+    """
+    Seed default templates (development/admin endpoint)
+    ---
+    tags:
+      - Templates
+    responses:
+      200:
+        description: Templates seeded successfully
+        schema:
+          type: object
+          properties:
+            status:
+              type: integer
+              example: 200
+            message:
+              type: string
+              example: "Default templates seeded successfully"
+      500:
+        description: Failed to seed templates
+    """
+    try:
+        TemplateService.seed_default_templates()
+        
+        return jsonify({
+            "status": 200,
+            "message": "Default templates seeded successfully"
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to seed templates",
+            "details": str(e)
+        }), 500
+
+
+@resume_ai_bp.route('/api/job_description_upload', methods=['POST'])
+@rate_limited('ai')
+@metered_endpoint()
+def analyze_with_job():
+    """
+    Analyze resume against job description
+    ---
+    tags:
+      - Resume Analysis
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          required:
+            - updated_resume
+            - job_description
+          properties:
+            updated_resume:
+              type: object
+              description: Parsed resume data structure
+            job_description:
+              type: string
+              description: Job description text to analyze against
+    responses:
+      200:
+        description: Analysis completed successfully
+        schema:
+          type: object
+          properties:
+            status:
+              type: integer
+              example: 200
+            data:
+              type: object
+              description: Detailed analysis with scores and recommendations
+      400:
+        description: Invalid request data
+      500:
+        description: Analysis failed
+    """
+    try:
+        # Validate request
+        error_response, status_code, data = JobValidator.validate_request(request)
+        if error_response:
+            return error_response, status_code
+        
+        # Process with ResumeAI
+        resume_processor = ResumeAI("")  # Empty string as we're using provided resume
+        resume_processor.parsed_resume = data['updated_resume']
+        analysis = resume_processor.analyze(data['job_description'])
+
+        return jsonify({
+            "status": 200,
+            "data": analysis
+        }), 200
+        
+    except Exception as e:
+        current_app.logging.getLogger(__name__).error(f"Job description analysis failed: {str(e)}")
+        return jsonify({
+            "error": "Analysis failed",
+            "details": str(e)
+        }), 500
+
+@resume_ai_bp.route('/api/feedback', methods=['PUT'])
+@swag_from({
+    'tags': ['Resume Processing'],
+    'summary': 'Process feedback and updated resume data',
+    'description': 'Process user feedback on resume sections and update resume content based on feedback',
+    'security': [{'Bearer': []}],
+    'parameters': [
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': True,
+            'schema': {
+                'type': 'object',
+                'required': ['section', 'updated_resume'],
+                'properties': {
+                    'section': {
+                        'type': 'object',
+                        'required': ['section type'],
+                        'properties': {
+                            'section type': {
+                                'type': 'string',
+                                'description': 'Type of section being updated'
+                            }
+                        }
+                    },
+                    'updated_resume': {
+                        'type': 'object',
+                        'description': 'Updated resume content'
+                    }
+                }
+            }
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Feedback processed successfully',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'message': {'type': 'string'},
+                    'updated_resume': {'type': 'object'}
+                }
+            }
+        },
+        400: {
+            'description': 'Bad request',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        },
+        401: {
+            'description': 'Unauthorized',
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'error': {'type': 'string'}
+                }
+            }
+        }
+    }
+})
+@rate_limited('ai')
+@metered_endpoint()
+def process_feedback():
+    """Process feedback and updated resume data."""
+    # Validate request
+    validation_result = FeedbackValidator.validate_request(request)
+    if len(validation_result) == 2:
+        # Error case: (error_response, status_code)
+        return validation_result
+    else:
+        # Success case: (None, None, data)
+        _, _, data = validation_result
+    
+    try:
+        # Extract fields from validated data
+        section = data['section']
+        feedback = data.get('feedback', '')
+        updated_resume = data['updated_resume']
+        
+        # Process with ResumeAI
+        resume_processor = ResumeAI("")  # Empty string as we're using provided resume
+        resume_processor.parsed_resume = updated_resume
+        
+        # Process feedback for the specific section
+        analysis = resume_processor.process_section_feedback(
+            section=section['section type'],
+            subsection_data=section,
+            feedback=feedback
+        )
+        
+        return jsonify({
+            "status": 200,
+            "data": analysis
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to process feedback",
+            "details": str(e)
+        }), 500
+
+@resume_ai_bp.route('/api/admin/ai/model-routes', methods=['GET'])
+@token_required
+def admin_model_routes():
+    """
+    Show AI model routes and rolling per-model latency/error stats (Admin only)
+    ---
+    tags:
+      - Admin
+    parameters:
+      - name: Authorization
+        in: header
+        required: true
+        type: string
+        description: Bearer token for authentication
+    responses:
+      200:
+        description: Routes (with current model order) and per-model stats of this worker
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+              example: true
+            routes:
+              type: object
+              description: Per task - configured models, temperature, SLOs and active_order
+            models:
+              type: object
+              description: Per model - samples, p50_ms, p95_ms and error_rate over the window
+            window_seconds:
+              type: number
+              example: 300
+      403:
+        description: Admin access required
+    """
+    user = User.query.get(request.user.get('user_id'))
+    if not user or not user.is_admin:
+        return jsonify({
+            'success': False,
+            'error': 'Admin access required'
+        }), 403
+    
+    from app.services.model_router import get_model_router
+    return jsonify({'success': True, **get_model_router().snapshot()}), 200
+
+
+@resume_ai_bp.route('/api/admin/ai/usage', methods=['GET'])
+@token_required
+def admin_ai_usage():
+    """
+    Aggregate AI usage from the usage ledger (Admin only)
+    ---
+    tags:
+      - Admin
+    parameters:
+      - name: Authorization
+        in: header
+        required: true
+        type: string
+        description: Bearer token for authentication
+      - name: days
+        in: query
+        type: integer
+        default: 7
+        description: Look-back window in days (1-90)
+      - name: group_by
+        in: query
+        type: string
+        enum: [user, model, endpoint, lane, day]
+        default: user
+      - name: user_id
+        in: query
+        type: integer
+        required: false
+        description: Restrict to one user
+    responses:
+      200:
+        description: Usage totals per group plus budget and lane status
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+              example: true
+            usage:
+              type: array
+              items:
+                type: object
+                properties:
+                  calls:
+                    type: integer
+                  prompt_tokens:
+                    type: integer
+                  completion_tokens:
+                    type: integer
+                  total_tokens:
+                    type: integer
+                  avg_latency_ms:
+                    type: number
+                  errors:
+                    type: integer
+            daily_token_budget:
+              type: integer
+              example: 1000000
+            lanes:
+              type: object
+              description: Active and waiting AI calls per lane in this worker
+      400:
+        description: Invalid group_by
+      403:
+        description: Admin access required
+    """
+    user = User.query.get(request.user.get('user_id'))
+    if not user or not user.is_admin:
+        return jsonify({
+            'success': False,
+            'error': 'Admin access required'
+        }), 403
+    
+    from app.services.ai_usage import get_lane_scheduler, get_usage_ledger
+    days = min(max(request.args.get('days', 7, type=int), 1), 90)
+    ledger = get_usage_ledger()
+    try:
+        usage = ledger.aggregate(
+            days=days,
+            group_by=request.args.get('group_by', 'user'),
+            user_id=request.args.get('user_id', type=int)
+        )
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    return jsonify({
+        'success': True,
+        'days': days,
+        'usage': usage,
+        'daily_token_budget': ledger.daily_token_budget,
+        'lanes': get_lane_scheduler().snapshot()
+    }), 200
+
+
+@resume_ai_bp.route('/api/save_resume', methods=['PUT'])
+@token_required
+def save_resume():
+    """
+    Save or update a resume for the authenticated user
+    ---
+    tags:
+      - Resume Management
+    security:
+      - Bearer: []
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          required:
+            - updated_resume
+            - resume_title
+          properties:
+            updated_resume:
+              type: object
+              description: Complete resume data structure
+            resume_title:
+              type: string
+              description: Title for the resume
+              example: "Software Engineer Resume"
+    responses:
+      200:
+        description: Resume saved successfully
+        schema:
+          type: object
+          properties:
+            message:
+              type: string
+              example: "Resume saved successfully"
+            resume_id:
+              type: integer
+              example: 1
+      400:
+        description: Missing required data
+      401:
+        description: Unauthorized - Invalid or missing token
+      500:
+        description: Server error during save operation
+    """
+    # Get user ID from token
+    user_id = request.user.get('user_id')
+    
+    # Get and validate JSON data
+    data = request.get_json()
+    if not data or 'updated_resume' not in data:
+        return jsonify({"error": "Missing resume data"}), 400
+        
+    # Get resume title from root level
+    resume_title = data.get('resume_title')
+    if not resume_title:
+        return jsonify({"error": "Resume title is required"}), 400
+    
+    # Get template ID (required field)
+    # template = data.get('template')
+    # if template is None:
+    #     return jsonify({"error": "Template ID is required"}), 400
+    
+    resume_data = data['updated_resume']
+    
+    try:
+        # Check if resume with same title exists for this user
+        existing_resume = Resume.query.filter_by(
+            user_id=user_id,
+            title=resume_title
+        ).first()
+        
+        if existing_resume:
+            # Update existing resume
+            existing_resume.parsed_resume = resume_data
+            # existing_resume.template = template
+            existing_resume.template_id = 1
+            db.session.commit()
+        else:
+            # Create new resume entry
+            # Get the next serial number for this user (the count would
+            # reuse a number after a deletion)
+            last_serial = db.session.query(db.func.max(Resume.serial_number)).filter_by(user_id=user_id).scalar()
+            now = datetime.utcnow()  # Using standard utcnow() method
+            
+            resume = Resume(
+                user_id=user_id,
+                serial_number=(last_serial or 0) + 1,
+                title=resume_title,
+                parsed_resume=resume_data,
+                # template=template,
+                template_id=1,
+                updated_at=now,
+                created_at=now
+            )
+            db.session.add(resume)
+            db.session.commit()
+        
+        return jsonify({
+            "status": 200,
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({
+            "error": "Failed to save resume",
+            "details": str(e)
+        }), 500
+
+@resume_ai_bp.route('/api/get_resume_list', methods=['GET'])
+@token_required
+@read_replica
+def get_resume_list():
+    """
+    Get list of all resumes for the authenticated user
+    ---
+    tags:
+      - Resume Management
+    security:
+      - Bearer: []
+    responses:
+      200:
+        description: Resume list retrieved successfully
+        schema:
+          type: object
+          properties:
+            status:
+              type: integer
+              example: 200
+            data:
+              type: array
+              items:
+                type: object
+                properties:
+                  resume_id:
+                    type: integer
+                    description: Unique resume identifier
+                    example: 1
+                  resume_title:
+                    type: string
+                    description: Resume title
+                    example: "Software Engineer Resume"
+                  created_at:
+                    type: string
+                    format: date-time
+                    description: Creation timestamp
+                    example: "2025-10-16T12:00:00"
+      401:
+        description: Unauthorized - Invalid or missing token
+      500:
+        description: Server error during retrieval
+    """
+    user_id = request.user.get('user_id')
+    
+    try:
+        # Query resumes for this user
+        resumes = Resume.query.filter_by(user_id=user_id).all()
+        
+        # Format response
+        resume_list = [{
+            "resume_id": resume.serial_number,
+            "resume_title": resume.title,
+            "created_at": resume.created_at.isoformat()
+        } for resume in resumes]
+        
+        return jsonify({
+            "status": 200,
+            "data": resume_list
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to fetch resume list",
+            "details": str(e)
+        }), 500
+
+@resume_ai_bp.route('/api/get_resume/<int:resume_id>', methods=['GET'])
+@token_required
+def get_resume(resume_id):
+    """
+    Get a specific resume by ID for the authenticated user
+    ---
+    tags:
+      - Resume Management
+    security:
+      - Bearer: []
+    parameters:
+      - name: resume_id
+        in: path
+        type: integer
+        required: true
+        description: Resume ID to retrieve
+        example: 1
+    responses:
+      200:
+        description: Resume retrieved successfully
+        schema:
+          type: object
+          properties:
+            status:
+              type: integer
+              example: 200
+            data:
+              type: object
+              properties:
+                resume_id:
+                  type: integer
+                  example: 1
+                resume_title:
+                  type: string
+                  example: "Software Engineer Resume"
+                parsed_resume:
+                  type: object
+                  description: Complete resume data structure
+                created_at:
+                  type: string
+                  format: date-time
+      404:
+        description: Resume not found
+      401:
+        description: Unauthorized - Invalid or missing token
+      500:
+        description: Server error during retrieval
+    """
+    user_id = request.user.get('user_id')
+    
+    try:
+        # Query resume and verify ownership
+        resume = Resume.query.filter_by(
+            serial_number=resume_id,
+            user_id=user_id
+        ).first()
+        
+        if not resume:
+            return jsonify({
+                "error": "Resume not found or access denied"
+            }), 404
+        
+        return jsonify({
+            "status": 200,
+            "data": {
+                "resume": resume.parsed_resume,
+                "resume_title": resume.title
+            }
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to fetch resume",
+            "details": str(e)
+        }), 500
+
+@resume_ai_bp.route('/api/resume/score', methods=['POST'])
+@rate_limited('ai')
+@metered_endpoint()
+def score_resume():
+    """
+    Score resume with AI-powered analysis
+    ---
+    tags:
+      - Resume Scoring
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          type: object
+          required:
+            - resume
+          properties:
+            resume:
+              type: object
+              description: Parsed resume data structure
+            job_description:
+              type: string
+              description: Optional job description to score against
+            mode:
+              type: string
+              enum: [full, fast]
+              default: full
+              description: >
+                "fast" scores locally without an AI call (language quality is
+                estimated); "full" adds an AI review of language and feedback
+    responses:
+      200:
+        description: Resume scored successfully
+        schema:
+          type: object
+          properties:
+            status:
+              type: integer
+              example: 200
+            data:
+              type: object
+              properties:
+                overall_score:
+                  type: number
+                  example: 85.5
+                scores:
+                  type: object
+                  properties:
+                    keyword_matching:
+                      type: object
+                      properties:
+                        score:
+                          type: number
+                        weight:
+                          type: number
+                        details:
+                          type: object
+                    language_expression:
+                      type: object
+                      properties:
+                        score:
+                          type: number
+                        weight:
+                          type: number
+                        details:
+                          type: object
+                    ats_readability:
+                      type: object
+                      properties:
+                        score:
+                          type: number
+                        weight:
+                          type: number
+                        details:
+                          type: object
+                recommendations:
+                  type: array
+                  items:
+                    type: string
+                strengths:
+                  type: array
+                  items:
+                    type: string
+                weaknesses:
+                  type: array
+                  items:
+                    type: string
+      400:
+        description: Invalid request data
+      500:
+        description: Scoring failed
+    """
+    data = request.get_json()
+    
+    # Validate input
+    if not data or 'resume' not in data:
+        return jsonify({"error": "Resume data is required"}), 400
+    
+    try:
+        # Get optional job description
+        job_description = data.get('job_description', '')
+        mode = data.get('mode', 'full')
+        if mode not in ('full', 'fast'):
+            return jsonify({"error": "mode must be 'full' or 'fast'"}), 400
+        
+        if mode == 'fast':
+            # Deterministic local scoring, no AI client needed
+            scoring_result = score_resume_locally(data['resume'], job_description)
+            scoring_result['scoring_mode'] = 'fast'
+        else:
+            # Create ResumeAI instance with existing parsed resume
+            resume_processor = ResumeAI("")
+            resume_processor.parsed_resume = data['resume']
+            
+            # Score the resume
+            scoring_result = resume_processor.score_resume(job_description)
+        
+        return jsonify({
+            "status": 200,
+            "data": scoring_result
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            "error": "Failed to score resume",
+            "details": str(e)
+        }), 500
@@ -0,0 +1,538 @@
+"""
+Storage Monitoring API Endpoints
+Handles HTTP requests for Google Drive storage monitoring and overview
+"""
+
+from flask import Blueprint, request, jsonify
+from app.models.temp import User
+from app.utils.jwt_utils import token_required
+from app.utils.read_replica import read_replica
+from datetime import datetime
+import logging
+
+
+# Create blueprint for storage monitoring endpoints
+storage_bp = Blueprint('storage', __name__)
+
+# =============================================================================
+# STORAGE MONITORING API ENDPOINTS
+# =============================================================================
+
+@storage_bp.route('/api/storage/monitoring/status', methods=['GET'])
+@token_required
+@read_replica
+def get_storage_monitoring_status():
+    """
+    Get status of the background storage monitoring service
+    ---
+    tags:
+      - Storage Monitoring
+    security:
+      - Bearer: []
+    description: |
+      Get the current status of the background storage monitoring service,
+      including configuration, statistics, and service health.
+      
+      **Admin Access Only**: This endpoint requires admin privileges.
+    responses:
+      200:
+        description: Storage monitoring status retrieved successfully
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+              example: true
+            service_status:
+              type: object
+              properties:
+                enabled:
+                  type: boolean
+                  example: true
+                running:
+                  type: boolean  
+                  example: true
+                check_interval_minutes:
+                  type: integer
+                  example: 60
+                thread_alive:
+                  type: boolean
+                  example: true
+                stats:
+                  type: object
+                  properties:
+                    service_started:
+                      type: string
+                      format: datetime
+                      example: "2024-11-25T10:30:00"
+                    last_check:
+                      type: string
+                      format: datetime
+                      example: "2024-11-25T11:30:00"
+                    total_checks:
+                      type: integer
+                      example: 15
+                    total_alerts_sent:
+                      type: integer
+                      example: 3
+                    uptime_hours:
+                      type: number
+                      example: 2.5
+      401:
+        description: Authentication required
+      403:
+        description: Admin access required
+      500:
+        description: Server error
+    """
+    # Verify admin access
+    try:
+        # Get user from token and check admin status
+        user = User.query.get(request.user.get('user_id'))
+        if not user or not user.is_admin:
+            return jsonify({
+                'success': False,
+                'error': 'Admin access required'
+            }), 403
+        
+        from app.services.background_storage_monitor import background_storage_monitor
+        
+        status = background_storage_monitor.get_status()
+        
+        return jsonify({
+            'success': True,
+            'service_status': status,
+            'timestamp': datetime.utcnow().isoformat()
+        }), 200
+        
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error getting storage monitoring status: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@storage_bp.route('/api/storage/monitoring/start', methods=['POST'])
+@token_required
+def start_storage_monitoring():
+    """
+    Start the background storage monitoring service
+    ---
+    tags:
+      - Storage Monitoring
+    security:
+      - Bearer: []
+    description: |
+      Start the background storage monitoring service. The service will
+      periodically check storage quotas for all active OAuth sessions
+      and generate alerts when thresholds are exceeded.
+      
+      **Admin Access Only**: This endpoint requires admin privileges.
+    responses:
+      200:
+        description: Storage monitoring service started successfully
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+              example: true
+            message:
+              type: string
+              example: "Storage monitoring service started (checking every 60 minutes)"
+            running:
+              type: boolean
+              example: true
+            check_interval_minutes:
+              type: integer
+              example: 60
+      400:
+        description: Service already running or configuration issue
+      401:
+        description: Authentication required
+      403:
+        description: Admin access required
+      500:
+        description: Failed to start service
+    """
+    try:
+        # Get user from token and check admin status
+        user = User.query.get(request.user.get('user_id'))
+        if not user or not user.is_admin:
+            return jsonify({
+                'success': False,
+                'error': 'Admin access required'
+            }), 403
+        
+        from app.services.background_storage_monitor import background_storage_monitor
+        
+        result = background_storage_monitor.start()
+        
+        status_code = 200 if result['success'] else 400
+        return jsonify(result), status_code
+        
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error starting storage monitoring: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@storage_bp.route('/api/storage/monitoring/stop', methods=['POST'])
+@token_required
+def stop_storage_monitoring():
+    """
+    Stop the background storage monitoring service
+    ---
+    tags:
+      - Storage Monitoring
+    security:
+      - Bearer: []
+    description: |
+      Stop the background storage monitoring service. This will halt
+      all periodic storage checks and alert generation.
+      
+      **Admin Access Only**: This endpoint requires admin privileges.
+    responses:
+      200:
+        description: Storage monitoring service stopped successfully
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+              example: true
+            message:
+              type: string
+              example: "Storage monitoring service stopped"
+            running:
+              type: boolean
+              example: false
+            final_stats:
+              type: object
+              description: Final service statistics
+      400:
+        description: Service not running or stop failed
+      401:
+        description: Authentication required
+      403:
+        description: Admin access required
+      500:
+        description: Failed to stop service
+    """
+    try:
+        # Get user from token and check admin status
+        user = User.query.get(request.user.get('user_id'))
+        if not user or not user.is_admin:
+            return jsonify({
+                'success': False,
+                'error': 'Admin access required'
+            }), 403
+        
+        from app.services.background_storage_monitor import background_storage_monitor
+        
+        result = background_storage_monitor.stop()
+        
+        status_code = 200 if result['success'] else 400
+        return jsonify(result), status_code
+        
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error stopping storage monitoring: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@storage_bp.route('/api/storage/monitoring/check-now', methods=['POST'])
+@token_required  
+def force_storage_check():
+    """
+    Force an immediate storage check for all active OAuth sessions
+    ---
+    tags:
+      - Storage Monitoring
+    security:
+      - Bearer: []
+    description: |
+      Trigger an immediate storage quota check for all active OAuth sessions,
+      bypassing the normal scheduled interval. This will generate alerts
+      if any sessions exceed storage thresholds.
+      
+      **Admin Access Only**: This endpoint requires admin privileges.
+    responses:
+      200:
+        description: Storage check completed successfully
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+              example: true
+            message:
+              type: string
+              example: "Checked storage for 3 sessions"
+            sessions_checked:
+              type: integer
+              example: 3
+            alerts_generated:
+              type: integer
+              example: 1
+            results:
+              type: array
+              items:
+                type: object
+                properties:
+                  auth_id:
+                    type: integer
+                    example: 1
+                  user_id:
+                    type: integer
+                    example: 1
+                  success:
+                    type: boolean
+                    example: true
+                  quota:
+                    type: object
+                    properties:
+                      usage_percentage:
+                        type: number
+                        example: 85.2
+                      warning_level:
+                        type: string
+                        example: "medium"
+            forced_check:
+              type: boolean
+              example: true
+      401:
+        description: Authentication required
+      403:
+        description: Admin access required
+      500:
+        description: Check failed
+    """
+    try:
+        # Get user from token and check admin status
+        user = User.query.get(request.user.get('user_id'))
+        if not user or not user.is_admin:
+            return jsonify({
+                'success': False,
+                'error': 'Admin access required'
+            }), 403
+        
+        from app.services.background_storage_monitor import background_storage_monitor
+        
+        result = background_storage_monitor.force_check_now()
+        
+        status_code = 200 if result['success'] else 500
+        return jsonify(result), status_code
+        
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error during forced storage check: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'forced_check': True
+        }), 500
+
+
+@storage_bp.route('/api/storage/overview', methods=['GET'])
+@token_required
+@read_replica
+def get_storage_overview():
+    """
+    Get storage overview for all active OAuth sessions
+    ---
+    tags:
+      - Storage Monitoring
+    security:
+      - Bearer: []
+    description: |
+      Get a comprehensive overview of storage usage across all active
+      OAuth sessions, including summary statistics and individual session details.
+      
+      **Admin Access Only**: This endpoint requires admin privileges.
+    responses:
+      200:
+        description: Storage overview retrieved successfully
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+              example: true
+            summary:
+              type: object
+              properties:
+                total_sessions:
+                  type: integer
+                  example: 5
+                sessions_with_warnings:
+                  type: integer
+                  example: 2
+                critical_sessions:
+                  type: integer
+                  example: 1
+                total_storage_used_gb:
+                  type: number
+                  example: 85.5
+                total_storage_quota_gb:
+                  type: number
+                  example: 375.0
+                overall_usage_percentage:
+                  type: number
+                  example: 22.8
+            sessions:
+              type: array
+              items:
+                type: object
+                properties:
+                  auth_id:
+                    type: integer
+                    example: 1
+                  user_id:
+                    type: integer
+                    example: 1
+                  user_email:
+                    type: string
+                    example: "user@example.com"
+                  usage_percentage:
+                    type: number
+                    example: 85.2
+                  warning_level:
+                    type: string
+                    example: "medium"
+                  last_check:
+                    type: string
+                    format: datetime
+                    example: "2024-11-25T11:30:00"
+      401:
+        description: Authentication required
+      403:
+        description: Admin access required
+      500:
+        description: Failed to retrieve overview
+    """
+    try:
+        # Get user from token and check admin status
+        user = User.query.get(request.user.get('user_id'))
+        if not user or not user.is_admin:
+            return jsonify({
+                'success': False,
+                'error': 'Admin access required'
+            }), 403
+        
+        from app.services.storage_monitoring_service import storage_monitoring_service
+        
+        result = storage_monitoring_service.get_all_storage_status()
+        
+        status_code = 200 if result['success'] else 500
+        return jsonify(result), status_code
+        
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error getting storage overview: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'timestamp': datetime.utcnow().isoformat()
+        }), 500
+
+
+@storage_bp.route('/api/storage/monitoring/config', methods=['PUT'])
+@token_required
+def update_storage_monitoring_config():
+    """
+    Update storage monitoring service configuration
+    ---
+    tags:
+      - Storage Monitoring
+    security:
+      - Bearer: []
+    description: |
+      Update the configuration of the background storage monitoring service,
+      such as check interval and enable/disable status.
+      
+      **Admin Access Only**: This endpoint requires admin privileges.
+    parameters:
+      - in: body
+        name: config
+        required: true
+        schema:
+          type: object
+          properties:
+            check_interval_minutes:
+              type: integer
+              minimum: 5
+              example: 120
+              description: Check interval in minutes (minimum 5)
+            enabled:
+              type: boolean
+              example: true
+              description: Enable or disable the monitoring service
+    responses:
+      200:
+        description: Configuration updated successfully
+        schema:
+          type: object
+          properties:
+            success:
+              type: boolean
+              example: true
+            message:
+              type: string
+              example: "Configuration updated"
+            old_config:
+              type: object
+              description: Previous configuration
+            new_config:
+              type: object
+              description: Updated configuration
+            needs_restart:
+              type: boolean
+              example: true
+            restart_result:
+              type: object
+              description: Result of automatic restart if needed
+      400:
+        description: Invalid configuration
+      401:
+        description: Authentication required
+      403:
+        description: Admin access required
+      500:
+        description: Configuration update failed
+    """
+    try:
+        # Get user from token and check admin status
+        user = User.query.get(request.user.get('user_id'))
+        if not user or not user.is_admin:
+            return jsonify({
+                'success': False,
+                'error': 'Admin access required'
+            }), 403
+        
+        data = request.get_json()
+        if not data:
+            return jsonify({
+                'success': False,
+                'error': 'No configuration data provided'
+            }), 400
+        
+        from app.services.background_storage_monitor import background_storage_monitor
+        
+        result = background_storage_monitor.update_config(
+            check_interval_minutes=data.get('check_interval_minutes'),
+            enabled=data.get('enabled')
+        )
+        
+        status_code = 200 if result['success'] else 400
+        return jsonify(result), status_code
+        
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error updating storage monitoring config: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
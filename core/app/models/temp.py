@@ -641,18 +641,22 @@ class ResumeFile(db.Model):
             cls.is_active == True
         ).all()
         
-        successful_updates = []
-        failed_updates = []
-        
-        for file_id in file_ids:
-            file_obj = next((f for f in files if f.id == file_id), None)
-            if file_obj:
-                if file_obj.update_category(new_category, updated_by_user_id):
-                    successful_updates.append(file_obj)
-                else:
-                    failed_updates.append({'id': file_id, 'error': 'Category update failed'})
-            else:
-                failed_updates.append({'id': file_id, 'error': 'File not found or access denied'})
+        found = {f.id: f for f in files}
+        
+        # One UPDATE for every file whose category changes
+        changing = [f.id for f in files if f.category != new_category]
+        if changing:
+            cls.query.filter(cls.id.in_(changing)).update({
+                cls.category: new_category,
+                cls.category_updated_at: datetime.utcnow(),
+                cls.category_updated_by: updated_by_user_id
+            }, synchronize_session='evaluate')
+        
+        successful_updates = [found[file_id] for file_id in dict.fromkeys(file_ids) if file_id in found]
+        failed_updates = [
+            {'id': file_id, 'error': 'File not found or access denied'}
+            for file_id in dict.fromkeys(file_ids) if file_id not in found
+        ]
         
         return {
             'successful_updates': len(successful_updates),
@@ -856,7 +860,12 @@ class BatchResumeModification(db.Model):
     errors = db.Column(db.JSON, nullable=True)  # Contains any errors that occurred
     
     # Status tracking
-    status = db.Column(db.String(50), default='pending')  # pending, in_progress, completed, failed
+    status = db.Column(db.String(50), default='pending')  # pending, submitted, in_progress, ingesting, completed, failed
+    
+    # Bulk (offline) execution through a batch-completion backend
+    execution_mode = db.Column(db.String(20), nullable=False, default='interactive')  # interactive, bulk
+    external_batch_id = db.Column(db.String(100), nullable=True)  # Backend batch/job ID
+    bulk_manifest = db.Column(db.JSON, nullable=True)  # Inputs needed to ingest bulk results
     
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -875,4 +884,55 @@ class BatchResumeModification(db.Model):
     )
     
     def __repr__(self):
-        return f'<BatchResumeModification {self.id} (User: {self.user_id}, Status: {self.status})>'
\ No newline at end of file
+        return f'<BatchResumeModification {self.id} (User: {self.user_id}, Status: {self.status})>'
+
+class OptimizedSection(db.Model):
+    """
+    Cached AI rewrite of one resume section, keyed by content fingerprint
+    按内容指纹缓存的简历分段优化结果
+    """
+    __tablename__ = 'optimized_sections'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    # SHA-256 of prompt version + section kind + section content + job description hash
+    fingerprint = db.Column(db.String(64), nullable=False, unique=True)
+    section = db.Column(db.String(50), nullable=False)  # summary, workExperience, projects, skills, analysis
+    optimized_value = db.Column(db.JSON, nullable=False)
+    hit_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_used_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('idx_optimized_sections_last_used', 'last_used_at'),
+    )
+    
+    def __repr__(self):
+        return f'<OptimizedSection {self.section} {self.fingerprint[:12]}>'
+
+
+class AIUsageRecord(db.Model):
+    """
+    Ledger entry of one AI provider call: tokens, latency, model and endpoint
+    """
+    __tablename__ = 'ai_usage_records'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='SET NULL'), nullable=True)  # NULL for anonymous/system calls
+    endpoint = db.Column(db.String(100), nullable=True)  # Flask endpoint or job name
+    task = db.Column(db.String(50), nullable=True)  # parse, analyze, score, ...
+    model = db.Column(db.String(50), nullable=False)
+    lane = db.Column(db.String(20), nullable=False, default='interactive')  # interactive, bulk, batch_api
+    prompt_tokens = db.Column(db.Integer, nullable=False, default=0)
+    completion_tokens = db.Column(db.Integer, nullable=False, default=0)
+    total_tokens = db.Column(db.Integer, nullable=False, default=0)
+    latency_ms = db.Column(db.Integer, nullable=False, default=0)
+    success = db.Column(db.Boolean, nullable=False, default=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('idx_ai_usage_user_created', 'user_id', 'created_at'),
+        db.Index('idx_ai_usage_created', 'created_at'),
+    )
+    
+    def __repr__(self):
+        return f'<AIUsageRecord {self.model} {self.total_tokens} tokens (User: {self.user_id})>'
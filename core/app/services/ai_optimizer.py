@@ -7,8 +7,11 @@ import os
 from typing import Dict, List, Any
 from dotenv import load_dotenv
 
-# Import openai for easier mocking in tests
-import openai
+from app.services.structured_output import decode_json
+from app.utils.lazy_import import LazyImport
+
+# Module stand-in (imported on first use); tests mock openai.ChatCompletion.create
+openai = LazyImport('openai')
 
 load_dotenv()
 
@@ -68,7 +71,7 @@ class AIOptimizer:
             else:
                 content = response.choices[0].message.content
                 
-            result = json.loads(content)
+            result = decode_json(content)
             return result
             
         except Exception as e:
@@ -121,7 +124,7 @@ class AIOptimizer:
             else:
                 content = response.choices[0].message.content
                 
-            result = json.loads(content)
+            result = decode_json(content)
             return result
             
         except Exception as e:
@@ -179,7 +182,7 @@ class AIOptimizer:
             else:
                 content = response.choices[0].message.content
                 
-            result = json.loads(content)
+            result = decode_json(content)
             return result
             
         except Exception as e:
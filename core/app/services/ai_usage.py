@@ -0,0 +1,391 @@
+"""
+AI Usage accounting, quotas and priority lanes
+Records tokens and latency of every AI provider call per user, enforces
+per-user token budgets and schedules calls so interactive requests preempt
+bulk work
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import os
+import time
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import wraps
+from typing import Any, Dict, Iterable, List, Optional
+
+from flask import has_app_context, jsonify, request
+from sqlalchemy import func
+
+from app.extensions import db
+from app.models.temp import AIUsageRecord
+from app.utils.metrics import OPENAI_REQUEST_DURATION, OPENAI_TOKENS
+
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+BATCH_API = 'batch_api'
+
+_usage_context: contextvars.ContextVar = contextvars.ContextVar('ai_usage_context', default=None)
+
+
+class QuotaExceededError(Exception):
+    """Raised when a user has spent their AI token budget"""
+
+    def __init__(self, user_id: int, used: int, budget: int, retry_after: int):
+        super().__init__(f"AI token budget exceeded ({used}/{budget} tokens in the last 24 hours)")
+        self.user_id = user_id
+        self.used = used
+        self.budget = budget
+        self.retry_after = retry_after
+
+
+def current_usage_context() -> Dict[str, Any]:
+    """User, endpoint, lane and task attributed to AI calls made in this context"""
+    return _usage_context.get() or {'user_id': None, 'endpoint': None, 'lane': INTERACTIVE, 'task': None}
+
+
+@contextmanager
+def usage_context(user_id: Optional[int] = None, endpoint: Optional[str] = None, lane: Optional[str] = None,
+                  task: Optional[str] = None):
+    """
+    Attribute AI calls made inside the block to a user, endpoint, lane and task.
+
+    Unset arguments are inherited from the enclosing context. Worker threads
+    do not inherit context variables; submit work with
+    ``contextvars.copy_context().run`` to keep the attribution.
+    """
+    outer = current_usage_context()
+    token = _usage_context.set({
+        'user_id': user_id if user_id is not None else outer['user_id'],
+        'endpoint': endpoint or outer['endpoint'],
+        'lane': lane or outer['lane'],
+        'task': task or outer['task']
+    })
+    try:
+        yield
+    finally:
+        _usage_context.reset(token)
+
+
+class LaneScheduler:
+    """
+    Concurrency limiter with an interactive and a bulk lane.
+
+    At most ``max_concurrent`` AI calls run at once per process. Bulk calls
+    are further capped at ``max_bulk`` and only start while no interactive
+    call is waiting, so a large batch can never starve interactive traffic.
+    """
+
+    def __init__(self, max_concurrent: Optional[int] = None, max_bulk: Optional[int] = None):
+        self.max_concurrent = max_concurrent or int(os.getenv('AI_MAX_CONCURRENT_CALLS', '8'))
+        self.max_bulk = max_bulk or int(os.getenv('AI_MAX_BULK_CALLS', str(max(1, self.max_concurrent // 2))))
+        self._condition = threading.Condition()
+        self._active = {INTERACTIVE: 0, BULK: 0}
+        self._waiting = {INTERACTIVE: 0, BULK: 0}
+
+    def _can_start(self, lane: str) -> bool:
+        if sum(self._active.values()) >= self.max_concurrent:
+            return False
+        if lane == BULK:
+            return self._waiting[INTERACTIVE] == 0 and self._active[BULK] < self.max_bulk
+        return True
+
+    @contextmanager
+    def slot(self, lane: str = INTERACTIVE):
+        """Hold one call slot in ``lane`` for the duration of the block"""
+        lane = BULK if lane == BULK else INTERACTIVE
+        with self._condition:
+            self._waiting[lane] += 1
+            try:
+                while not self._can_start(lane):
+                    self._condition.wait()
+            finally:
+                self._waiting[lane] -= 1
+            self._active[lane] += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._active[lane] -= 1
+                self._condition.notify_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Active and waiting calls per lane"""
+        with self._condition:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'max_bulk': self.max_bulk,
+                'active': dict(self._active),
+                'waiting': dict(self._waiting)
+            }
+
+
+def _as_int(value: Any) -> int:
+    return value if isinstance(value, int) and not isinstance(value, bool) else 0
+
+
+class UsageLedger:
+    """
+    Per-call usage ledger backed by the ``ai_usage_records`` table.
+
+    Rows are inserted on their own connection so recording never commits or
+    rolls back the caller's session. Budgets are rolling 24-hour token totals
+    (``AI_USER_DAILY_TOKEN_BUDGET``, 0 disables); totals are cached per user
+    for ``BUDGET_CACHE_SECONDS`` and advanced locally as calls are recorded.
+    """
+
+    BUDGET_CACHE_SECONDS = 30
+
+    def __init__(self, daily_token_budget: Optional[int] = None):
+        self.daily_token_budget = (daily_token_budget if daily_token_budget is not None
+                                   else int(os.getenv('AI_USER_DAILY_TOKEN_BUDGET', '1000000')))
+        self._used: Dict[int, List[float]] = {}  # user_id -> [fetched_at, tokens]
+        self._lock = threading.Lock()
+
+    def record(self, model: str, prompt_tokens: int = 0, completion_tokens: int = 0, latency_ms: float = 0,
+               success: bool = True, task: Optional[str] = None, user_id: Optional[int] = None,
+               endpoint: Optional[str] = None, lane: Optional[str] = None) -> None:
+        """Record one AI call; attribution defaults to the current usage context"""
+        context = current_usage_context()
+        self.record_many([{
+            'user_id': user_id if user_id is not None else context['user_id'],
+            'endpoint': (endpoint or context['endpoint'] or '')[:100] or None,
+            'task': task or context['task'],
+            'model': (model or 'unknown')[:50],
+            'lane': lane or context['lane'],
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens,
+            'latency_ms': int(latency_ms),
+            'success': success,
+            'created_at': datetime.utcnow()
+        }])
+
+    def record_many(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Insert ledger rows (dicts of AIUsageRecord columns)"""
+        rows = list(rows)
+        if not rows or not has_app_context():
+            return
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(AIUsageRecord.__table__.insert(), rows)
+        except Exception as e:
+            # Accounting must never fail the AI call itself
+            logger.warning(f"Could not record AI usage: {str(e)}")
+            return
+        with self._lock:
+            for row in rows:
+                cached = self._used.get(row.get('user_id'))
+                if cached is not None:
+                    cached[1] += row.get('total_tokens', 0)
+
+    def tokens_used(self, user_id: int) -> int:
+        """Tokens the user spent in the last 24 hours"""
+        now = time.time()
+        with self._lock:
+            cached = self._used.get(user_id)
+            if cached is not None and now - cached[0] < self.BUDGET_CACHE_SECONDS:
+                return int(cached[1])
+        used = db.session.query(func.coalesce(func.sum(AIUsageRecord.total_tokens), 0)).filter(
+            AIUsageRecord.user_id == user_id,
+            AIUsageRecord.created_at >= datetime.utcnow() - timedelta(days=1)
+        ).scalar()
+        with self._lock:
+            self._used[user_id] = [now, int(used or 0)]
+        return int(used or 0)
+
+    def check_budget(self, user_id: Optional[int]) -> None:
+        """
+        Raise if the user's rolling 24-hour budget is spent.
+
+        Raises:
+            QuotaExceededError: With a retry_after hint in seconds
+        """
+        if not user_id or self.daily_token_budget <= 0 or not has_app_context():
+            return
+        used = self.tokens_used(user_id)
+        if used < self.daily_token_budget:
+            return
+        oldest = db.session.query(func.min(AIUsageRecord.created_at)).filter(
+            AIUsageRecord.user_id == user_id,
+            AIUsageRecord.created_at >= datetime.utcnow() - timedelta(days=1)
+        ).scalar()
+        retry_after = 3600
+        if oldest is not None:
+            retry_after = max(60, int((oldest + timedelta(days=1) - datetime.utcnow()).total_seconds()))
+        raise QuotaExceededError(user_id, used, self.daily_token_budget, retry_after)
+
+    @staticmethod
+    def aggregate(days: int = 7, group_by: str = 'user', user_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Usage totals over the last ``days`` days.
+
+        Args:
+            days: Look-back window
+            group_by: user, model, endpoint, lane or day
+            user_id: Restrict to one user
+
+        Returns:
+            List[Dict[str, Any]]: One row per group, largest token totals first
+        """
+        columns = {
+            'user': AIUsageRecord.user_id,
+            'model': AIUsageRecord.model,
+            'endpoint': AIUsageRecord.endpoint,
+            'lane': AIUsageRecord.lane,
+            'day': func.date(AIUsageRecord.created_at)
+        }
+        if group_by not in columns:
+            raise ValueError(f"group_by must be one of: {', '.join(columns)}")
+        key = columns[group_by].label('key')
+        query = db.session.query(
+            key,
+            func.count(AIUsageRecord.id).label('calls'),
+            func.coalesce(func.sum(AIUsageRecord.prompt_tokens), 0).label('prompt_tokens'),
+            func.coalesce(func.sum(AIUsageRecord.completion_tokens), 0).label('completion_tokens'),
+            func.coalesce(func.sum(AIUsageRecord.total_tokens), 0).label('total_tokens'),
+            func.avg(AIUsageRecord.latency_ms).label('avg_latency_ms'),
+            func.sum(db.case((AIUsageRecord.success.is_(False), 1), else_=0)).label('errors')
+        ).filter(AIUsageRecord.created_at >= datetime.utcnow() - timedelta(days=days))
+        if user_id is not None:
+            query = query.filter(AIUsageRecord.user_id == user_id)
+        rows = query.group_by(key).order_by(func.sum(AIUsageRecord.total_tokens).desc()).all()
+        return [{
+            group_by: str(row.key) if group_by == 'day' else row.key,
+            'calls': row.calls,
+            'prompt_tokens': int(row.prompt_tokens),
+            'completion_tokens': int(row.completion_tokens),
+            'total_tokens': int(row.total_tokens),
+            'avg_latency_ms': round(float(row.avg_latency_ms or 0), 1),
+            'errors': int(row.errors or 0)
+        } for row in rows]
+
+
+class _MeteredCompletions:
+    def __init__(self, completions, ledger: 'UsageLedger', scheduler: LaneScheduler):
+        self._completions = completions
+        self._ledger = ledger
+        self._scheduler = scheduler
+
+    def create(self, **kwargs):
+        context = current_usage_context()
+        self._ledger.check_budget(context['user_id'])
+        started = time.perf_counter()
+        labels = {'model': str(kwargs.get('model')), 'task': context['task'] or 'unknown'}
+        with self._scheduler.slot(context['lane']):
+            try:
+                with OPENAI_REQUEST_DURATION.time(**labels):
+                    response = self._completions.create(**kwargs)
+            except Exception:
+                self._ledger.record(kwargs.get('model'), latency_ms=(time.perf_counter() - started) * 1000,
+                                    success=False)
+                raise
+        usage = getattr(response, 'usage', None)
+        prompt_tokens = _as_int(getattr(usage, 'prompt_tokens', 0))
+        completion_tokens = _as_int(getattr(usage, 'completion_tokens', 0))
+        OPENAI_TOKENS.inc(prompt_tokens, model=labels['model'], kind='prompt')
+        OPENAI_TOKENS.inc(completion_tokens, model=labels['model'], kind='completion')
+        self._ledger.record(
+            kwargs.get('model'),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency_ms=(time.perf_counter() - started) * 1000
+        )
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._completions, name)
+
+
+class _MeteredChat:
+    def __init__(self, chat, ledger: 'UsageLedger', scheduler: LaneScheduler):
+        self._chat = chat
+        self.completions = _MeteredCompletions(chat.completions, ledger, scheduler)
+
+    def __getattr__(self, name):
+        return getattr(self._chat, name)
+
+
+class MeteredClient:
+    """
+    OpenAI client wrapper that schedules, budgets and records chat completions.
+
+    ``client.chat.completions.create`` checks the caller's budget, waits for a
+    slot in the caller's lane and records tokens and latency in the ledger.
+    Everything else is passed through to the wrapped client.
+    """
+
+    def __init__(self, client, ledger: Optional[UsageLedger] = None, scheduler: Optional[LaneScheduler] = None):
+        self._client = client
+        self.chat = _MeteredChat(client.chat, ledger or get_usage_ledger(), scheduler or get_lane_scheduler())
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def metered(client) -> MeteredClient:
+    """Wrap an OpenAI client with usage accounting (idempotent)"""
+    return client if isinstance(client, MeteredClient) else MeteredClient(client)
+
+
+def metered_endpoint(lane: str = INTERACTIVE):
+    """
+    Endpoint decorator: attribute AI calls to the requester and enforce budgets.
+
+    Apply below ``@token_required`` (``request.user`` is used when present).
+    Requests from users over budget get 429 with a Retry-After header before
+    any AI work starts.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            user = getattr(request, 'user', None) or {}
+            user_id = user.get('user_id') if isinstance(user, dict) else None
+            try:
+                get_usage_ledger().check_budget(user_id)
+            except QuotaExceededError as e:
+                response = jsonify({
+                    'success': False,
+                    'error': str(e),
+                    'tokens_used': e.used,
+                    'token_budget': e.budget,
+                    'retry_after': e.retry_after
+                })
+                response.headers['Retry-After'] = str(e.retry_after)
+                return response, 429
+            with usage_context(user_id=user_id, endpoint=request.endpoint, lane=lane):
+                return f(*args, **kwargs)
+        return decorated
+    return decorator
+
+
+_default_ledger: Optional[UsageLedger] = None
+_default_scheduler: Optional[LaneScheduler] = None
+_default_lock = threading.Lock()
+
+
+def get_usage_ledger() -> UsageLedger:
+    """Return the process-wide UsageLedger instance"""
+    global _default_ledger
+    if _default_ledger is None:
+        with _default_lock:
+            if _default_ledger is None:
+                _default_ledger = UsageLedger()
+    return _default_ledger
+
+
+def get_lane_scheduler() -> LaneScheduler:
+    """Return the process-wide LaneScheduler instance"""
+    global _default_scheduler
+    if _default_scheduler is None:
+        with _default_lock:
+            if _default_scheduler is None:
+                _default_scheduler = LaneScheduler()
+    return _default_scheduler
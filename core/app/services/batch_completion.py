@@ -0,0 +1,275 @@
+"""
+Batch Completion backends for offline bulk AI requests
+Serializes chat-completion requests to a JSONL job file and runs them through
+the OpenAI Batch API, or through a local replay of the normal client for
+development and tests
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import os
+import json
+import uuid
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from flask import current_app
+
+from app.utils.lazy_import import LazyImport
+
+# Only needed when a backend creates its own client
+OpenAI = LazyImport('openai', 'OpenAI')
+
+
+logger = logging.getLogger(__name__)
+
+CHAT_COMPLETIONS_URL = '/v1/chat/completions'
+
+# Normalized job states returned by BatchCompletionBackend.poll
+IN_PROGRESS = 'in_progress'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+
+def job_dir() -> str:
+    """
+    Directory holding bulk job input and output files
+
+    ``BULK_JOB_DIR`` when set, otherwise ``<instance_path>/bulk_jobs``. Jobs
+    outlive the request that submitted them, so the files must not live in a
+    temp directory the host may clean up before they are ingested.
+    """
+    path = os.getenv('BULK_JOB_DIR') or os.path.join(current_app.instance_path, 'bulk_jobs')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def chat_request(custom_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    """One line of a batch job file"""
+    return {'custom_id': custom_id, 'method': 'POST', 'url': CHAT_COMPLETIONS_URL, 'body': body}
+
+
+def write_job_file(requests: Iterable[Dict[str, Any]], name: Optional[str] = None) -> str:
+    """
+    Write batch requests to a JSONL file.
+
+    Args:
+        requests: Lines built with ``chat_request``
+        name: File name stem (random if omitted)
+
+    Returns:
+        str: Path of the written file
+    """
+    path = os.path.join(job_dir(), f"{name or uuid.uuid4().hex}.jsonl")
+    with open(path, 'w', encoding='utf-8') as handle:
+        for line in requests:
+            handle.write(json.dumps(line, ensure_ascii=False, separators=(',', ':')) + '\n')
+    return path
+
+
+def parse_output(text: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse batch output (or error) JSONL.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: {custom_id: {'content', 'model', 'usage'}}
+        for successful requests and {custom_id: {'error': str}} for failed ones
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    for line in (text or '').splitlines():
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            logger.warning("Skipping malformed batch output line")
+            continue
+        custom_id = record.get('custom_id')
+        response = record.get('response') or {}
+        if record.get('error') or response.get('status_code') != 200:
+            error = record.get('error') or (response.get('body') or {}).get('error') or response.get('status_code')
+            results[custom_id] = {'error': json.dumps(error) if isinstance(error, dict) else str(error)}
+            continue
+        try:
+            body = response['body']
+            results[custom_id] = {
+                'content': body['choices'][0]['message']['content'],
+                'model': body.get('model'),
+                'usage': body.get('usage') or {}
+            }
+        except (KeyError, IndexError, TypeError):
+            results[custom_id] = {'error': 'Response has no message content'}
+    return results
+
+
+class BatchCompletionBackend:
+    """
+    Interface of a batch-completion backend.
+
+    A backend accepts a JSONL job file of chat-completion requests, reports
+    the job state as ``in_progress``, ``completed`` or ``failed``, and returns
+    per-request results keyed by ``custom_id`` once completed.
+    """
+
+    name = 'base'
+
+    def submit(self, job_file: str, metadata: Optional[Dict[str, str]] = None) -> str:
+        """Submit a job file and return the backend job ID"""
+        raise NotImplementedError
+
+    def poll(self, job_id: str) -> str:
+        """Return the normalized job state"""
+        raise NotImplementedError
+
+    def results(self, job_id: str) -> Dict[str, Dict[str, Any]]:
+        """Return {custom_id: {'content', 'model', 'usage'} | {'error': ...}} for a completed job"""
+        raise NotImplementedError
+
+
+class OpenAIBatchBackend(BatchCompletionBackend):
+    """
+    OpenAI Batch API backend.
+
+    Jobs are uploaded with ``purpose='batch'`` and complete within the
+    completion window at batch pricing. Expired jobs are treated as completed:
+    requests that did not finish are reported as errors.
+    """
+
+    name = 'openai'
+
+    COMPLETION_WINDOW = '24h'
+
+    _STATES = {
+        'validating': IN_PROGRESS,
+        'in_progress': IN_PROGRESS,
+        'finalizing': IN_PROGRESS,
+        'completed': COMPLETED,
+        'expired': COMPLETED,
+        'failed': FAILED,
+        'cancelling': FAILED,
+        'cancelled': FAILED
+    }
+
+    def __init__(self, client=None):
+        self.client = client or OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+
+    def submit(self, job_file: str, metadata: Optional[Dict[str, str]] = None) -> str:
+        with open(job_file, 'rb') as handle:
+            uploaded = self.client.files.create(file=handle, purpose='batch')
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=CHAT_COMPLETIONS_URL,
+            completion_window=self.COMPLETION_WINDOW,
+            metadata=metadata
+        )
+        logger.info(f"Submitted OpenAI batch {batch.id} from {job_file}")
+        return batch.id
+
+    def poll(self, job_id: str) -> str:
+        return self._STATES.get(self.client.batches.retrieve(job_id).status, IN_PROGRESS)
+
+    def results(self, job_id: str) -> Dict[str, Dict[str, Any]]:
+        batch = self.client.batches.retrieve(job_id)
+        results: Dict[str, Dict[str, Any]] = {}
+        for file_id in (batch.error_file_id, batch.output_file_id):
+            if file_id:
+                results.update(parse_output(self.client.files.content(file_id).text))
+        return results
+
+
+class LocalReplayBackend(BatchCompletionBackend):
+    """
+    Replays a job file through the normal chat-completions client.
+
+    Requests run synchronously on submit and the output is written in the
+    Batch API format next to the job file, so polling and ingestion follow the
+    same path as the OpenAI backend. A job manifest is written before any
+    request runs: a job whose manifest exists but whose output does not is
+    still running (or was interrupted and is waiting for cleanup), not failed.
+    """
+
+    name = 'local'
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        return self._client
+
+    @staticmethod
+    def _output_path(job_id: str) -> str:
+        return os.path.join(job_dir(), f"{job_id}.output.jsonl")
+
+    @staticmethod
+    def _manifest_path(job_id: str) -> str:
+        return os.path.join(job_dir(), f"{job_id}.job.json")
+
+    def submit(self, job_file: str, metadata: Optional[Dict[str, str]] = None) -> str:
+        job_id = f"local-{uuid.uuid4().hex}"
+        with open(self._manifest_path(job_id), 'w', encoding='utf-8') as handle:
+            json.dump({'job_file': job_file, 'metadata': metadata or {}}, handle)
+        lines: List[str] = []
+        with open(job_file, encoding='utf-8') as handle:
+            for raw in handle:
+                if not raw.strip():
+                    continue
+                request = json.loads(raw)
+                record = {'id': uuid.uuid4().hex, 'custom_id': request['custom_id'], 'response': None, 'error': None}
+                try:
+                    completion = self.client.chat.completions.create(**request['body'])
+                    usage = getattr(completion, 'usage', None)
+                    record['response'] = {'status_code': 200, 'body': {
+                        'model': request['body'].get('model'),
+                        'choices': [
+                            {'message': {'role': 'assistant', 'content': completion.choices[0].message.content}}
+                        ],
+                        'usage': {
+                            key: getattr(usage, key) for key in ('prompt_tokens', 'completion_tokens')
+                            if isinstance(getattr(usage, key, None), int)
+                        }
+                    }}
+                except Exception as e:
+                    record['error'] = {'message': str(e)}
+                lines.append(json.dumps(record, ensure_ascii=False))
+
+        temp_path = f"{self._output_path(job_id)}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as handle:
+            handle.write('\n'.join(lines) + '\n')
+        os.replace(temp_path, self._output_path(job_id))
+        return job_id
+
+    def poll(self, job_id: str) -> str:
+        if os.path.exists(self._output_path(job_id)):
+            return COMPLETED
+        return IN_PROGRESS if os.path.exists(self._manifest_path(job_id)) else FAILED
+
+    def results(self, job_id: str) -> Dict[str, Dict[str, Any]]:
+        with open(self._output_path(job_id), encoding='utf-8') as handle:
+            return parse_output(handle.read())
+
+
+BACKENDS = {
+    OpenAIBatchBackend.name: OpenAIBatchBackend,
+    LocalReplayBackend.name: LocalReplayBackend
+}
+
+
+def get_batch_backend(name: Optional[str] = None, client=None) -> BatchCompletionBackend:
+    """
+    Create a batch-completion backend.
+
+    Args:
+        name: Backend name; defaults to BATCH_COMPLETION_BACKEND (``openai``)
+        client: Optional OpenAI client to use
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    name = name or os.getenv('BATCH_COMPLETION_BACKEND', OpenAIBatchBackend.name)
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown batch completion backend: {name}")
+    return BACKENDS[name](client=client)
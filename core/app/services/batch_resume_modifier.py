@@ -6,23 +6,75 @@ Batch Resume Modification Service
 import os
 import json
 from typing import Dict, Any, List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 from flask import current_app
-from app.models.temp import Resume, JobDescription, User
+from app.models.temp import Resume, JobDescription, User, BatchResumeModification
+from app.response_template.analysis_schema import ANALYSIS_TEMPLATE
 from app.services.resume_ai import ResumeAI
+from app.services.model_router import get_model_router
+from app.services.prompt_builder import PromptBuilder, PromptSection, compact_json, minify_schema, prune_empty
+from app.services.section_cache import SectionCache
+from app.services.structured_output import complete_json, decode_json, ensure_json_instruction
+from app.services.batch_completion import (
+    BatchCompletionBackend, IN_PROGRESS, FAILED, chat_request, get_batch_backend, write_job_file
+)
+from app.services.ai_usage import (
+    BATCH_API, BULK, QuotaExceededError, current_usage_context, get_usage_ledger, metered, usage_context
+)
 from app.extensions import db
 import logging
+import inspect
+import contextvars
+from functools import wraps
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 logger = logging.getLogger(__name__)
 
 
+def _bulk_usage(method):
+    """批量操作中的AI调用归属到 user_id 并走 bulk 通道（交互请求优先）"""
+    signature = inspect.signature(method)
+    
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        user_id = signature.bind(self, *args, **kwargs).arguments.get('user_id')
+        with usage_context(user_id=user_id, lane=BULK):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class BatchResumeModifier:
     """批量简历修改服务类"""
     
+    # 个人简介字段（旧数据使用 professionalSummary，解析模板使用 summary）
+    SUMMARY_KEYS = ('professionalSummary', 'summary')
+    
+    # 多目标模式：每次分析请求最多包含的职位数和职位描述总字符数
+    MULTI_JOB_CHUNK_SIZE = 5
+    MULTI_JOB_CHUNK_CHARS = 24000
+    
+    # 多目标模式下并行改写的最大线程数
+    MAX_PARALLEL_REWRITES = int(os.getenv('BATCH_MODIFY_MAX_WORKERS', '4'))
+    
     def __init__(self):
         """初始化批量简历修改服务"""
         self.logger = logger
+        self.section_cache = SectionCache()
+        self.router = get_model_router()
+        self.prompt_builder = PromptBuilder()
+    
+    def _routed(self, task: str, call):
+        """通过模型路由执行 ``call(model, route)``：先检查用户预算，按任务选择模型、温度并在失败时回退"""
+        with usage_context(task=task):
+            get_usage_ledger().check_budget(current_usage_context()['user_id'])
+            return self.router.run(task, call)
+    
+    def _offline_request(self, task: str) -> Dict[str, Any]:
+        """离线批量请求无法回退，使用任务路由当前的首选模型和温度"""
+        route = self.router.route(task)
+        return {'model': self.router.candidates(task)[0], 'temperature': route.temperature}
         
+    @_bulk_usage
     def batch_modify_resumes(
         self, 
         resume_ids: List[int], 
@@ -140,26 +192,82 @@ class BatchResumeModifier:
         resume_ai = ResumeAI("")
         resume_ai.parsed_resume = original_resume
         
-        # 分析简历与职位的匹配度
-        analysis = resume_ai.analyze(job_description)
+        # 分析简历与职位的匹配度（简历和职位均未变化时复用之前的分析）
+        use_cache = (customization_options or {}).get('use_section_cache', True)
+        analysis_key = self._analysis_fingerprint(original_resume, job_description)
+        analysis = self.section_cache.lookup_many([analysis_key]).get(analysis_key) if use_cache else None
+        if analysis is None:
+            analysis = resume_ai.analyze(job_description)
+            if use_cache:
+                self.section_cache.store_many({analysis_key: {'section': 'analysis', 'value': analysis}})
         
-        # 根据职位描述优化简历
-        optimized_resume = self._optimize_resume_for_job(
+        return self._build_modified_result(
+            resume_id=resume_id,
+            original_title=resume.title,
             original_resume=original_resume,
             job_description=job_description,
+            job_title=job_title,
             analysis=analysis,
             customization_options=customization_options
         )
+    
+    def _build_modified_result(
+        self,
+        resume_id: int,
+        original_title: str,
+        original_resume: Dict[str, Any],
+        job_description: str,
+        job_title: str,
+        analysis: Dict[str, Any],
+        customization_options: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        根据分析结果优化简历并生成修改结果（不访问数据库，可在线程池中执行）
         
+        Args:
+            resume_id: 简历ID
+            original_title: 原始简历标题
+            original_resume: 原始简历数据
+            job_description: 职位描述文本
+            job_title: 职位标题
+            analysis: 简历分析结果
+            customization_options: 自定义选项
+            
+        Returns:
+            修改后的简历数据
+        """
+        # 根据职位描述优化简历
+        optimized_resume, stats = self._optimize_resume_for_job(
+            original_resume=original_resume,
+            job_description=job_description,
+            customization_options=customization_options
+        )
+        
+        return self._result_entry(resume_id, original_title, original_resume, optimized_resume,
+                                  job_title, analysis, stats)
+    
+    def _result_entry(
+        self,
+        resume_id: int,
+        original_title: str,
+        original_resume: Dict[str, Any],
+        optimized_resume: Dict[str, Any],
+        job_title: str,
+        analysis: Dict[str, Any],
+        stats: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        组装单份简历的修改结果（交互模式与离线批量模式共用）
+        """
         # 生成修改后的简历标题
         modified_title = self._generate_modified_title(
-            original_title=resume.title,
+            original_title=original_title,
             job_title=job_title
         )
         
         return {
             'original_resume_id': resume_id,
-            'original_title': resume.title,
+            'original_title': original_title,
             'modified_title': modified_title,
             'original_content': original_resume,
             'modified_content': optimized_resume,
@@ -170,6 +278,7 @@ class BatchResumeModifier:
                 optimized_resume,
                 analysis
             ),
+            'optimization_stats': stats,
             'timestamp': datetime.utcnow().isoformat()
         }
     
@@ -177,117 +286,311 @@ class BatchResumeModifier:
         self,
         original_resume: Dict[str, Any],
         job_description: str,
-        analysis: Dict[str, Any],
         customization_options: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
+    ):
         """
         根据职位描述优化简历内容
         
+        默认使用结构化模式：所有可优化的部分在一次请求中发送，返回按路径
+        索引的补丁；只有未通过校验的部分才回退为逐段调用。
+        customization_options['optimization_mode'] = 'per_section' 时使用逐段模式。
+        不修改实例状态，可在多目标模式的并行线程中调用。
+        
         Args:
             original_resume: 原始简历数据
             job_description: 职位描述
-            analysis: 简历分析结果
             customization_options: 自定义选项
             
         Returns:
-            优化后的简历数据
+            (优化后的简历, 调用统计：模式、部分数、请求次数、回退次数、缓存命中数)
         """
         from openai import OpenAI
         
         # 复制原始简历作为基础
         optimized = json.loads(json.dumps(original_resume))
         
-        # 配置优化级别
         options = customization_options or {}
-        optimize_summary = options.get('optimize_summary', True)
-        optimize_experience = options.get('optimize_experience', True)
-        optimize_skills = options.get('optimize_skills', True)
-        optimize_projects = options.get('optimize_projects', True)
+        sections = self._collect_sections(optimized, options)
+        stats = {'mode': options.get('optimization_mode', 'structured'),
+                 'sections': len(sections), 'round_trips': 0, 'fallbacks': 0, 'cached': 0}
+        if not sections:
+            return optimized, stats
+        
+        # 按分段指纹复用之前的优化结果，只对变更的部分调用AI
+        fingerprints: Dict[str, str] = {}
+        if options.get('use_section_cache', True):
+            job_hash = SectionCache.text_hash(job_description)
+            fingerprints = {
+                path: SectionCache.fingerprint(*self._section_content(optimized, path), job_hash)
+                for path in sections
+            }
+            cached = self.section_cache.lookup_many(fingerprints.values())
+            for path in list(sections):
+                value = cached.get(fingerprints[path])
+                if value is not None and self._valid_section_value(sections[path], value):
+                    self._set_path(optimized, path, value)
+                    del sections[path]
+                    stats['cached'] += 1
+            if not sections:
+                return optimized, stats
         
-        client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        client = metered(OpenAI(api_key=os.getenv('OPENAI_API_KEY')))
         
-        # 优化个人简介/目标
-        if optimize_summary and 'professionalSummary' in optimized:
+        produced: Dict[str, Any] = {}
+        pending = dict(sections)
+        if stats['mode'] != 'per_section':
+            patch = self._request_structured_patch(client, sections, job_description, stats)
+            for path, value in patch.items():
+                if path in pending and self._valid_section_value(sections[path], value):
+                    produced[path] = value
+                    del pending[path]
+            stats['fallbacks'] = len(pending)
+        
+        # 逐段优化（或结构化结果校验失败的部分）
+        for path, value in pending.items():
             try:
-                summary_prompt = f"""
-                根据以下职位描述，优化简历的个人简介部分，使其更符合职位要求。
-                
-                原始个人简介:
-                {optimized.get('professionalSummary', '')}
-                
-                职位描述:
-                {job_description}
-                
+                new_value = self._optimize_section(client, optimized, path, value, job_description, stats)
+                if self._valid_section_value(value, new_value):
+                    produced[path] = new_value
+            except QuotaExceededError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"Failed to optimize {path}: {str(e)}")
+        
+        for path, value in produced.items():
+            self._set_path(optimized, path, value)
+        
+        if fingerprints:
+            self.section_cache.store_many({
+                fingerprints[path]: {'section': self._section_content(original_resume, path)[0], 'value': value}
+                for path, value in produced.items()
+            })
+        
+        return optimized, stats
+    
+    def _section_content(self, resume: Dict[str, Any], path: str):
+        """
+        返回 (分段类型, 指纹内容)；列表条目使用整个条目，使职位名称等上下文变化也会失效
+        """
+        section, index, _ = self._parse_path(path)
+        if section in self.SUMMARY_KEYS:
+            return 'summary', resume.get(section)
+        if index is None:
+            return section, resume.get(section)
+        return section, resume[section][index]
+    
+    def _collect_sections(self, resume: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        收集需要优化的部分，按路径索引
+        
+        Args:
+            resume: 简历数据
+            options: 自定义选项
+            
+        Returns:
+            {路径: 原始值}，例如 {'workExperience[0].description': '...', 'skills': [...]}
+        """
+        sections: Dict[str, Any] = {}
+        
+        if options.get('optimize_summary', True):
+            for key in self.SUMMARY_KEYS:
+                if isinstance(resume.get(key), str) and resume[key].strip():
+                    sections[key] = resume[key]
+                    break
+        
+        for option, section in (('optimize_experience', 'workExperience'), ('optimize_projects', 'projects')):
+            if options.get(option, True) and isinstance(resume.get(section), list):
+                for index, entry in enumerate(resume[section]):
+                    if isinstance(entry, dict) and isinstance(entry.get('description'), str) \
+                            and entry['description'].strip():
+                        sections[f'{section}[{index}].description'] = entry['description']
+        
+        if options.get('optimize_skills', True) and isinstance(resume.get('skills'), list) and resume['skills']:
+            sections['skills'] = resume['skills']
+        
+        return sections
+    
+    @staticmethod
+    def _parse_path(path: str):
+        """'workExperience[0].description' -> ('workExperience', 0, 'description')"""
+        if '[' not in path:
+            return path, None, None
+        section, rest = path.split('[', 1)
+        index, field = rest.split('].', 1)
+        return section, int(index), field
+    
+    def _set_path(self, resume: Dict[str, Any], path: str, value: Any) -> None:
+        section, index, field = self._parse_path(path)
+        if index is None:
+            resume[section] = value
+        else:
+            resume[section][index][field] = value
+    
+    @staticmethod
+    def _valid_section_value(original: Any, value: Any) -> bool:
+        """优化结果必须与原值类型一致且非空"""
+        if isinstance(original, list):
+            return isinstance(value, list) and bool(value) and all(isinstance(item, str) for item in value)
+        return isinstance(value, str) and bool(value.strip())
+    
+    def _request_structured_patch(self, client, sections: Dict[str, Any], job_description: str,
+                                  stats: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        一次请求优化所有部分
+        
+        Args:
+            client: OpenAI客户端
+            sections: {路径: 原始值}
+            job_description: 职位描述
+            stats: 调用统计
+            
+        Returns:
+            {路径: 优化后的值}；请求或解析失败时返回空字典
+        """
+        request = self._structured_patch_request(sections, job_description)
+        try:
+            stats['round_trips'] += 1
+            # 本地修复截断/格式问题，修复失败时才重新请求一次
+            return self._routed('optimize', lambda model, route: complete_json(
+                client, request['messages'], model=model, response_format=request['response_format'],
+                temperature=route.temperature, timeout=route.timeout_seconds
+            ))
+        except QuotaExceededError:
+            raise
+        except Exception as e:
+            self.logger.warning(f"Structured optimization failed, falling back to per-section calls: {str(e)}")
+            return {}
+    
+    def _structured_patch_request(self, sections: Dict[str, Any], job_description: str) -> Dict[str, Any]:
+        """
+        构建结构化优化请求（交互模式与离线批量模式共用）
+        
+        Returns:
+            chat.completions 请求参数（model、messages、response_format、temperature）；
+            交互模式下 model 和 temperature 由模型路由按候选模型替换
+        """
+        schema = {
+            'type': 'object',
+            'properties': {
+                path: ({'type': 'array', 'items': {'type': 'string'}} if isinstance(value, list)
+                       else {'type': 'string'})
+                for path, value in sections.items()
+            },
+            'required': list(sections),
+            'additionalProperties': False
+        }
+        
+        prompt = self.prompt_builder.build(
+            'optimize_patch',
+            """
+            根据职位描述优化以下简历各部分，返回以相同路径为键的JSON对象。
+            """,
+            [
+                PromptSection('职位描述', job_description or '', trimmable=True, min_tokens=500),
+                PromptSection('简历各部分（路径: 原始内容）', compact_json(sections))
+            ],
+            """
+            要求:
+            1. 个人简介（summary / professionalSummary）：突出相关技能和经验，使用职位关键词，3-5句话
+            2. 工作经验（workExperience[i].description）：行动动词开头，包含可量化成果，每行一个bullet point
+            3. 项目（projects[i].description）：突出相关技术和项目成果，保持简洁专业
+            4. 技能（skills）：保留所有相关技能，添加候选人可能具备的职位技能，按重要性排序
+            5. 不要编造经历，只改写已有内容
+            """
+        ).text
+        
+        return {
+            **self._offline_request('optimize'),
+            'messages': [
+                {"role": "system", "content": "你是一位专业的简历优化专家。返回纯JSON格式。"},
+                {"role": "user", "content": prompt}
+            ],
+            'response_format': {
+                'type': 'json_schema',
+                'json_schema': {'name': 'resume_patch', 'strict': True, 'schema': schema}
+            }
+        }
+    
+    def _optimize_section(self, client, resume: Dict[str, Any], path: str, value: Any,
+                          job_description: str, stats: Dict[str, Any]) -> Any:
+        """
+        单独优化一个部分（逐段模式及结构化模式的回退）
+        
+        Args:
+            client: OpenAI客户端
+            resume: 简历数据（用于读取职位、项目名称等上下文）
+            path: 部分路径
+            value: 原始值
+            job_description: 职位描述
+            stats: 调用统计
+            
+        Returns:
+            优化后的值
+        """
+        section, index, _ = self._parse_path(path)
+        entry = resume[section][index] if index is not None else {}
+        job_section = PromptSection('职位描述', job_description or '', trimmable=True, min_tokens=500)
+        
+        if section in self.SUMMARY_KEYS:
+            system = "你是一位专业的简历优化专家。"
+            prompt = self.prompt_builder.build(
+                'optimize_summary',
+                "根据以下职位描述，优化简历的个人简介部分，使其更符合职位要求。",
+                [PromptSection('原始个人简介', value or ''), job_section],
+                """
                 要求:
                 1. 突出与职位相关的技能和经验
                 2. 使用职位描述中的关键词
                 3. 保持专业且简洁（3-5句话）
                 4. 只返回优化后的个人简介文本
                 """
-                
-                response = client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": "你是一位专业的简历优化专家。"},
-                        {"role": "user", "content": summary_prompt}
-                    ],
-                    temperature=0.7
-                )
-                
-                optimized['professionalSummary'] = response.choices[0].message.content.strip()
-            except Exception as e:
-                self.logger.warning(f"Failed to optimize summary: {str(e)}")
-        
-        # 优化工作经验描述
-        if optimize_experience and 'workExperience' in optimized:
-            try:
-                for exp in optimized['workExperience']:
-                    if 'description' in exp and exp['description']:
-                        exp_prompt = f"""
-                        优化以下工作经验描述，使其更符合目标职位要求。
-                        
-                        原始描述:
-                        {exp['description']}
-                        
-                        职位名称: {exp.get('position', 'N/A')}
-                        目标职位描述:
-                        {job_description}
-                        
-                        要求:
-                        1. 使用行动导向的动词开头
-                        2. 包含可量化的成果
-                        3. 突出与目标职位相关的技能
-                        4. 使用职位描述中的关键词
-                        5. 保持专业格式（每行一个bullet point）
-                        6. 只返回优化后的描述文本（bullet points）
-                        """
-                        
-                        response = client.chat.completions.create(
-                            model="gpt-4o-mini",
-                            messages=[
-                                {"role": "system", "content": "你是一位专业的简历优化专家。"},
-                                {"role": "user", "content": exp_prompt}
-                            ],
-                            temperature=0.7
-                        )
-                        
-                        exp['description'] = response.choices[0].message.content.strip()
-            except Exception as e:
-                self.logger.warning(f"Failed to optimize work experience: {str(e)}")
-        
-        # 优化技能部分
-        if optimize_skills and 'skills' in optimized:
-            try:
-                # 从职位描述提取关键技能
-                skills_prompt = f"""
-                分析以下职位描述，提取关键技能要求，并将其与候选人的现有技能结合。
-                
-                候选人现有技能:
-                {json.dumps(optimized['skills'], ensure_ascii=False)}
-                
-                职位描述:
-                {job_description}
-                
+            ).text
+        elif section == 'workExperience':
+            system = "你是一位专业的简历优化专家。"
+            prompt = self.prompt_builder.build(
+                'optimize_experience',
+                "优化以下工作经验描述，使其更符合目标职位要求。",
+                [
+                    PromptSection('原始描述', value or ''),
+                    PromptSection('职位名称', entry.get('jobTitle') or entry.get('position', 'N/A')),
+                    job_section
+                ],
+                """
+                要求:
+                1. 使用行动导向的动词开头
+                2. 包含可量化的成果
+                3. 突出与目标职位相关的技能
+                4. 使用职位描述中的关键词
+                5. 保持专业格式（每行一个bullet point）
+                6. 只返回优化后的描述文本（bullet points）
+                """
+            ).text
+        elif section == 'projects':
+            system = "你是一位专业的简历优化专家。"
+            prompt = self.prompt_builder.build(
+                'optimize_project',
+                "优化以下项目描述，使其更符合目标职位要求。",
+                [
+                    PromptSection('原始描述', value or ''),
+                    PromptSection('项目名称', entry.get('title') or entry.get('name', 'N/A')),
+                    job_section
+                ],
+                """
+                要求:
+                1. 突出项目中使用的相关技术
+                2. 强调项目成果和影响
+                3. 使用职位描述中的关键技术词汇
+                4. 保持简洁专业
+                5. 只返回优化后的描述文本
+                """
+            ).text
+        else:
+            system = "你是一位专业的简历优化专家。返回纯JSON格式。"
+            prompt = self.prompt_builder.build(
+                'optimize_skills',
+                "分析以下职位描述，提取关键技能要求，并将其与候选人的现有技能结合。",
+                [PromptSection('候选人现有技能', compact_json(value)), job_section],
+                """
                 要求:
                 1. 保留候选人所有相关技能
                 2. 添加职位描述中提到的候选人可能具备的技能
@@ -297,63 +600,24 @@ class BatchResumeModifier:
                 返回格式示例:
                 ["Skill 1", "Skill 2", "Skill 3"]
                 """
-                
-                response = client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": "你是一位专业的简历优化专家。返回纯JSON格式。"},
-                        {"role": "user", "content": skills_prompt}
-                    ],
-                    temperature=0.7
-                )
-                
-                content = response.choices[0].message.content.strip()
-                # 清理可能的markdown格式
-                content = content.replace("```json", "").replace("```", "").strip()
-                optimized_skills = json.loads(content)
-                
-                if isinstance(optimized_skills, list):
-                    optimized['skills'] = optimized_skills
-            except Exception as e:
-                self.logger.warning(f"Failed to optimize skills: {str(e)}")
+            ).text
         
-        # 优化项目经验
-        if optimize_projects and 'projects' in optimized:
-            try:
-                for project in optimized['projects']:
-                    if 'description' in project and project['description']:
-                        project_prompt = f"""
-                        优化以下项目描述，使其更符合目标职位要求。
-                        
-                        原始描述:
-                        {project['description']}
-                        
-                        项目名称: {project.get('name', 'N/A')}
-                        目标职位描述:
-                        {job_description}
-                        
-                        要求:
-                        1. 突出项目中使用的相关技术
-                        2. 强调项目成果和影响
-                        3. 使用职位描述中的关键技术词汇
-                        4. 保持简洁专业
-                        5. 只返回优化后的描述文本
-                        """
-                        
-                        response = client.chat.completions.create(
-                            model="gpt-4o-mini",
-                            messages=[
-                                {"role": "system", "content": "你是一位专业的简历优化专家。"},
-                                {"role": "user", "content": project_prompt}
-                            ],
-                            temperature=0.7
-                        )
-                        
-                        project['description'] = response.choices[0].message.content.strip()
-            except Exception as e:
-                self.logger.warning(f"Failed to optimize projects: {str(e)}")
+        stats['round_trips'] += 1
+        response = self._routed('optimize', lambda model, route: client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=route.temperature,
+            timeout=route.timeout_seconds
+        ))
+        content = response.choices[0].message.content.strip()
         
-        return optimized
+        if isinstance(value, list):
+            # 容忍markdown格式、多余说明文字和截断
+            return decode_json(content, list)
+        return content
     
     def _generate_modified_title(self, original_title: str, job_title: str) -> str:
         """
@@ -394,7 +658,7 @@ class BatchResumeModifier:
         }
         
         # 检查各部分是否被修改
-        if original_resume.get('professionalSummary') != modified_resume.get('professionalSummary'):
+        if any(original_resume.get(key) != modified_resume.get(key) for key in self.SUMMARY_KEYS):
             summary['sections_modified'].append('Professional Summary')
             summary['key_improvements'].append('优化个人简介以匹配职位要求')
         
@@ -416,6 +680,7 @@ class BatchResumeModifier:
         
         return summary
     
+    @_bulk_usage
     def modify_resume_for_multiple_jobs(
         self, 
         resume_id: int,
@@ -462,6 +727,11 @@ class BatchResumeModifier:
                 'timestamp': datetime.utcnow().isoformat()
             }
             
+            options = customization_options or {}
+            if options.get('multi_target', True) and len(job_description_ids) > 1:
+                self._modify_for_jobs_multi_target(resume, job_description_ids, user_id, options, results)
+                return results
+            
             # 遍历每个职位描述并生成对应的简历版本
             for idx, job_desc_id in enumerate(job_description_ids):
                 try:
@@ -507,11 +777,616 @@ class BatchResumeModifier:
             self.logger.error(f"Multi-job modification error: {str(e)}")
             raise
 
+    def _modify_for_jobs_multi_target(
+        self,
+        resume: Resume,
+        job_description_ids: List[int],
+        user_id: int,
+        options: Dict[str, Any],
+        results: Dict[str, Any]
+    ) -> None:
+        """
+        多目标模式：一次请求分析简历与多个职位的匹配度（按上下文大小分块），
+        然后并行生成各职位版本
+        
+        Args:
+            resume: 简历记录
+            job_description_ids: 职位描述ID列表
+            user_id: 用户ID
+            options: 自定义选项
+            results: 结果字典（原地更新）
+        """
+        # 数据库查询在主线程完成，线程池只做AI调用
+        job_descs = {
+            job.serial_number: job for job in JobDescription.query.filter(
+                JobDescription.user_id == user_id,
+                JobDescription.serial_number.in_(job_description_ids)
+            ).all()
+        }
+        jobs = []
+        errors = {}
+        for job_desc_id in job_description_ids:
+            job_desc = job_descs.get(job_desc_id)
+            if job_desc:
+                jobs.append(job_desc)
+            else:
+                errors[job_desc_id] = f"Failed to modify resume for job {job_desc_id}: Job description {job_desc_id} not found"
+        
+        original_resume = resume.parsed_resume
+        
+        # 已缓存分析的职位不再发送
+        use_cache = options.get('use_section_cache', True)
+        analysis_keys = {
+            job_desc.serial_number: self._analysis_fingerprint(original_resume, job_desc.description)
+            for job_desc in jobs
+        }
+        cached = self.section_cache.lookup_many(analysis_keys.values()) if use_cache else {}
+        analyses = {
+            job_id: cached[key] for job_id, key in analysis_keys.items() if key in cached
+        }
+        fresh = self._analyze_multiple_jobs(
+            original_resume, [job_desc for job_desc in jobs if job_desc.serial_number not in analyses]
+        )
+        analyses.update(fresh)
+        if use_cache:
+            self.section_cache.store_many({
+                analysis_keys[job_id]: {'section': 'analysis', 'value': analysis}
+                for job_id, analysis in fresh.items()
+            })
+        
+        app = current_app._get_current_object()
+        
+        def build_version(job_desc):
+            # 工作线程需要自己的应用上下文（分段缓存访问数据库）
+            with app.app_context():
+                return build_version_in_context(job_desc)
+        
+        def build_version_in_context(job_desc):
+            analysis = analyses.get(job_desc.serial_number)
+            if analysis is None:
+                # 多目标分析未覆盖此职位时回退为单独分析
+                resume_ai = ResumeAI("")
+                resume_ai.parsed_resume = original_resume
+                analysis = resume_ai.analyze(job_desc.description)
+            modified_result = self._build_modified_result(
+                resume_id=resume.serial_number,
+                original_title=resume.title,
+                original_resume=original_resume,
+                job_description=job_desc.description,
+                job_title=job_desc.title,
+                analysis=analysis,
+                customization_options=options
+            )
+            modified_result['job_description_id'] = job_desc.serial_number
+            modified_result['job_title'] = job_desc.title
+            return modified_result
+        
+        versions = {}
+        workers = max(1, min(self.MAX_PARALLEL_REWRITES, len(jobs)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # 复制上下文，使工作线程中的AI调用仍归属到当前用户和 bulk 通道
+            futures = {
+                executor.submit(contextvars.copy_context().run, build_version, job_desc): job_desc.serial_number
+                for job_desc in jobs
+            }
+            for future in as_completed(futures):
+                job_desc_id = futures[future]
+                try:
+                    versions[job_desc_id] = future.result()
+                except Exception as e:
+                    errors[job_desc_id] = f"Failed to modify resume for job {job_desc_id}: {str(e)}"
+        
+        # 按请求顺序输出结果
+        for job_desc_id in job_description_ids:
+            if job_desc_id in versions:
+                results['modified_versions'].append(versions[job_desc_id])
+                results['successful_modifications'] += 1
+            elif job_desc_id in errors:
+                self.logger.error(errors[job_desc_id])
+                results['errors'].append({'job_description_id': job_desc_id, 'error': errors[job_desc_id]})
+                results['failed_modifications'] += 1
+    
+    @staticmethod
+    def _analysis_fingerprint(original_resume: Dict[str, Any], job_description: str) -> str:
+        """整份简历与职位描述的分析缓存键"""
+        return SectionCache.fingerprint('analysis', original_resume, SectionCache.text_hash(job_description))
+    
+    def _chunk_jobs(self, jobs: List[JobDescription]) -> List[List[JobDescription]]:
+        """按数量和字符数将职位描述分块，保证单次请求不超出上下文"""
+        chunks, current, size = [], [], 0
+        for job_desc in jobs:
+            length = len(job_desc.description or '')
+            if current and (len(current) >= self.MULTI_JOB_CHUNK_SIZE or size + length > self.MULTI_JOB_CHUNK_CHARS):
+                chunks.append(current)
+                current, size = [], 0
+            current.append(job_desc)
+            size += length
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    def _analyze_multiple_jobs(self, original_resume: Dict[str, Any],
+                               jobs: List[JobDescription]) -> Dict[int, Dict[str, Any]]:
+        """
+        在一次请求中分析简历与多个职位的匹配度（简历只发送一次）
+        
+        Args:
+            original_resume: 原始简历数据
+            jobs: 职位描述记录列表
+            
+        Returns:
+            {职位ID: 分析结果}；失败的分块不包含在结果中
+        """
+        from openai import OpenAI
+        
+        if not jobs:
+            return {}
+        
+        client = metered(OpenAI(api_key=os.getenv('OPENAI_API_KEY')))
+        resume_json = compact_json(prune_empty(original_resume))
+        template_json = minify_schema(ANALYSIS_TEMPLATE)
+        
+        def analyze_chunk(chunk):
+            job_texts = {f"job_{job_desc.serial_number}": job_desc.description for job_desc in chunk}
+            # 分块已限制职位描述的总长度；JSON 内容不裁剪
+            prompt = self.prompt_builder.build(
+                'analyze_multiple_jobs',
+                """
+                Analyze this resume against each of the job descriptions below.
+                Return a JSON object with one key per job (the keys given below), each value
+                following this analysis structure:
+                """,
+                [
+                    PromptSection('Structure', template_json),
+                    PromptSection('Resume Data', resume_json),
+                    PromptSection('Job Descriptions', compact_json(job_texts))
+                ],
+                """
+                Important instructions:
+                1. Follow the exact analysis schema structure for every job
+                2. Score each section from 0-100
+                3. Provide detailed comments for each section
+                4. Match each work experience, education, and project entry from the resume
+                """
+            ).text
+            messages = [
+                {"role": "system", "content": "You are an expert resume analyst."},
+                {"role": "user", "content": prompt}
+            ]
+            # 与 ResumeAI.analyze 相同的 analyze 路由（温度 0），结果可按指纹缓存
+            parsed = self._routed('analyze', lambda model, route: complete_json(
+                client, messages, model=model, temperature=route.temperature, timeout=route.timeout_seconds
+            ))
+            return {
+                job_desc.serial_number: parsed[f"job_{job_desc.serial_number}"]
+                for job_desc in chunk
+                if isinstance(parsed.get(f"job_{job_desc.serial_number}"), dict)
+            }
+        
+        analyses: Dict[int, Dict[str, Any]] = {}
+        chunks = self._chunk_jobs(jobs)
+        with ThreadPoolExecutor(max_workers=max(1, min(self.MAX_PARALLEL_REWRITES, len(chunks)))) as executor:
+            for future in as_completed([
+                executor.submit(contextvars.copy_context().run, analyze_chunk, chunk) for chunk in chunks
+            ]):
+                try:
+                    analyses.update(future.result())
+                except Exception as e:
+                    self.logger.warning(f"Multi-job analysis chunk failed, falling back to single analysis: {str(e)}")
+        return analyses
+    
+    # ==================== 离线批量模式 ====================
+    
+    # 离线批量模式的记录状态
+    BULK_PENDING_STATUSES = ('submitted', 'in_progress')
+    
+    # ingesting 状态超过该时长视为认领者已退出（进程被杀），记录重新回到待轮询
+    BULK_CLAIM_TIMEOUT_SECONDS = int(os.getenv('BULK_INGEST_CLAIM_TIMEOUT_SECONDS', '1800'))
+    
+    def submit_bulk_modification(
+        self,
+        resume_ids: List[int],
+        job_description_id: int,
+        user_id: int,
+        customization_options: Optional[Dict[str, Any]] = None,
+        save_as_new: bool = True,
+        backend: Optional[BatchCompletionBackend] = None
+    ) -> BatchResumeModification:
+        """
+        离线批量模式 - 提交批量修改任务
+        
+        将每份简历的分析请求和结构化优化请求写入JSONL任务文件，通过批量补全
+        后端（OpenAI Batch API 或本地回放）提交，并创建状态为 submitted 的
+        批量修改记录。分段缓存命中的部分不会进入任务文件。结果由
+        poll_bulk_modification 在任务完成后写回记录。
+        
+        Args:
+            resume_ids: 要修改的简历ID列表
+            job_description_id: 职位描述ID
+            user_id: 用户ID
+            customization_options: 可选的自定义选项
+            save_as_new: 完成后是否将修改后的简历保存为新简历
+            backend: 批量补全后端（默认由 BATCH_COMPLETION_BACKEND 决定）
+            
+        Returns:
+            已提交的批量修改记录
+        """
+        user = User.query.get(user_id)
+        if not user:
+            raise ValueError("User not found")
+        
+        job_desc = JobDescription.query.filter_by(
+            user_id=user_id,
+            serial_number=job_description_id
+        ).first()
+        if not job_desc:
+            raise ValueError(f"Job description {job_description_id} not found for user {user_id}")
+        
+        options = customization_options or {}
+        use_cache = options.get('use_section_cache', True)
+        job_description = job_desc.description
+        job_hash = SectionCache.text_hash(job_description)
+        backend = backend or get_batch_backend()
+        
+        resumes = {
+            resume.serial_number: resume
+            for resume in Resume.query.filter(
+                Resume.user_id == user_id,
+                Resume.serial_number.in_(resume_ids)
+            ).all()
+        }
+        
+        # 收集每份简历的待优化部分和指纹，缓存一次性批量查询
+        entries: Dict[str, Dict[str, Any]] = {}
+        errors = []
+        for resume_id in resume_ids:
+            resume = resumes.get(resume_id)
+            if not resume:
+                errors.append({
+                    'resume_id': resume_id,
+                    'error': f"Failed to modify resume {resume_id}: Resume {resume_id} not found for user {user_id}"
+                })
+                continue
+            original = resume.parsed_resume
+            sections = self._collect_sections(json.loads(json.dumps(original)), options)
+            entries[str(resume_id)] = {
+                'title': resume.title,
+                'original': original,
+                'sections': sections,
+                'cached': {},
+                'analysis': None,
+                'analysis_key': self._analysis_fingerprint(original, job_description),
+                'fingerprints': {
+                    path: SectionCache.fingerprint(*self._section_content(original, path), job_hash)
+                    for path in sections
+                } if use_cache else {}
+            }
+        
+        if use_cache:
+            keys = [entry['analysis_key'] for entry in entries.values()]
+            keys += [key for entry in entries.values() for key in entry['fingerprints'].values()]
+            cached = self.section_cache.lookup_many(keys)
+            for entry in entries.values():
+                entry['analysis'] = cached.get(entry['analysis_key'])
+                for path in list(entry['sections']):
+                    value = cached.get(entry['fingerprints'][path])
+                    if value is not None and self._valid_section_value(entry['sections'][path], value):
+                        entry['cached'][path] = value
+                        del entry['sections'][path]
+        
+        requests = []
+        resume_ai = ResumeAI("") if any(entry['analysis'] is None for entry in entries.values()) else None
+        for resume_id, entry in entries.items():
+            if entry['analysis'] is None:
+                resume_ai.parsed_resume = entry['original']
+                requests.append(chat_request(f"resume-{resume_id}:analysis", {
+                    **self._offline_request('analyze'),
+                    'messages': ensure_json_instruction(resume_ai.analysis_messages(job_description)),
+                    'response_format': {'type': 'json_object'}
+                }))
+            if entry['sections']:
+                requests.append(chat_request(
+                    f"resume-{resume_id}:patch",
+                    self._structured_patch_request(entry['sections'], job_description)
+                ))
+        
+        manifest = {
+            'backend': backend.name,
+            'job_file': None,
+            'job_description': job_description,
+            'customization_options': options,
+            'save_as_new': save_as_new,
+            'resumes': entries
+        }
+        external_batch_id = None
+        if requests:
+            manifest['job_file'] = write_job_file(requests)
+            external_batch_id = backend.submit(manifest['job_file'], metadata={'user_id': str(user_id)})
+        
+        batch_record = BatchResumeModification(
+            user_id=user_id,
+            job_description_id=job_description_id,
+            job_title=job_desc.title,
+            total_resumes=len(resume_ids),
+            successful_modifications=0,
+            failed_modifications=len(errors),
+            modification_results=[],
+            errors=errors,
+            status='submitted',
+            execution_mode='bulk',
+            external_batch_id=external_batch_id,
+            bulk_manifest=manifest
+        )
+        db.session.add(batch_record)
+        db.session.commit()
+        self.logger.info(
+            f"Submitted bulk modification {batch_record.id}: {len(entries)} resumes, "
+            f"{len(requests)} requests via {backend.name}"
+        )
+        
+        if not requests:
+            # 全部命中缓存，无需等待后端
+            self._ingest_bulk_results(batch_record, {})
+        return batch_record
+    
+    def poll_bulk_modification(
+        self,
+        batch_record: BatchResumeModification,
+        backend: Optional[BatchCompletionBackend] = None
+    ) -> BatchResumeModification:
+        """
+        检查离线批量任务状态，完成后写回结果
+        
+        Args:
+            batch_record: 批量修改记录（非 bulk 或已结束的记录原样返回）
+            backend: 批量补全后端（默认使用提交时的后端）
+            
+        Returns:
+            更新后的批量修改记录
+        """
+        if batch_record.execution_mode != 'bulk' or not self._bulk_pollable(batch_record):
+            return batch_record
+        
+        manifest = batch_record.bulk_manifest or {}
+        backend = backend or get_batch_backend(manifest.get('backend'))
+        state = backend.poll(batch_record.external_batch_id)
+        
+        if state == IN_PROGRESS:
+            if batch_record.status != 'in_progress':
+                batch_record.status = 'in_progress'
+                db.session.commit()
+            return batch_record
+        
+        if state == FAILED:
+            batch_record.status = 'failed'
+            batch_record.failed_modifications = batch_record.total_resumes
+            batch_record.errors = list(batch_record.errors or []) + [
+                {'error': f"Bulk job {batch_record.external_batch_id} failed"}
+            ]
+            batch_record.completed_at = datetime.utcnow()
+            db.session.commit()
+            return batch_record
+        
+        # 请求处理与后台轮询可能同时看到任务完成：先原子地认领，只有认领成功的一方写回结果
+        claimed_at = self._claim_bulk_job(batch_record)
+        if claimed_at is None:
+            db.session.refresh(batch_record)
+            return batch_record
+        try:
+            self._ingest_bulk_results(batch_record, backend.results(batch_record.external_batch_id), claimed_at)
+        except Exception:
+            db.session.rollback()
+            # 释放认领，下次轮询重试
+            self._owned_claim(batch_record, claimed_at).update(
+                {BatchResumeModification.status: 'in_progress'}, synchronize_session=False
+            )
+            db.session.commit()
+            raise
+        return batch_record
+    
+    def _stale_claim_cutoff(self) -> datetime:
+        """早于该时间的 ingesting 认领视为已失效"""
+        return datetime.utcnow() - timedelta(seconds=self.BULK_CLAIM_TIMEOUT_SECONDS)
+    
+    def _bulk_pollable_filter(self):
+        """待轮询记录的查询条件：未完成，或认领已失效的 ingesting"""
+        return db.or_(
+            BatchResumeModification.status.in_(self.BULK_PENDING_STATUSES),
+            db.and_(BatchResumeModification.status == 'ingesting',
+                    BatchResumeModification.updated_at < self._stale_claim_cutoff())
+        )
+    
+    def _bulk_pollable(self, batch_record: BatchResumeModification) -> bool:
+        """与 _bulk_pollable_filter 相同的判断（内存中的记录）"""
+        if batch_record.status in self.BULK_PENDING_STATUSES:
+            return True
+        return (batch_record.status == 'ingesting' and batch_record.updated_at is not None
+                and batch_record.updated_at < self._stale_claim_cutoff())
+    
+    @staticmethod
+    def _owned_claim(batch_record: BatchResumeModification, claimed_at: datetime):
+        """仍由本次认领持有的记录（认领失效后被他人重新认领则为空）"""
+        return BatchResumeModification.query.filter_by(
+            id=batch_record.id, status='ingesting', updated_at=claimed_at
+        )
+    
+    def _claim_bulk_job(self, batch_record: BatchResumeModification) -> Optional[datetime]:
+        """
+        将未完成的离线任务标记为 ingesting（条件 UPDATE）
+        
+        认领时间写入 updated_at，既用于判断认领是否失效，也作为认领凭据：
+        写回结果时只有 updated_at 仍等于认领时间的一方能提交。
+        
+        Returns:
+            认领成功时返回认领时间，否则返回 None（仅一个并发轮询能成功）
+        """
+        # 秒级精度：MySQL DATETIME 不保存微秒，凭据比较需要能原样读回
+        claimed_at = datetime.utcnow().replace(microsecond=0)
+        claimed = BatchResumeModification.query.filter(
+            BatchResumeModification.id == batch_record.id,
+            self._bulk_pollable_filter()
+        ).update({BatchResumeModification.status: 'ingesting',
+                  BatchResumeModification.updated_at: claimed_at}, synchronize_session=False)
+        db.session.commit()
+        return claimed_at if claimed == 1 else None
+    
+    def poll_pending_bulk_modifications(self, limit: int = 50) -> int:
+        """
+        轮询所有未完成的离线批量任务（供定时任务调用）
+        
+        Returns:
+            本次完成（成功或失败）的任务数
+        """
+        pending = BatchResumeModification.query.filter(
+            BatchResumeModification.execution_mode == 'bulk',
+            self._bulk_pollable_filter()
+        ).order_by(BatchResumeModification.created_at).limit(limit).all()
+        
+        finished = 0
+        for batch_record in pending:
+            try:
+                if self.poll_bulk_modification(batch_record).status in ('completed', 'failed'):
+                    finished += 1
+            except Exception as e:
+                db.session.rollback()
+                self.logger.warning(f"Polling bulk modification {batch_record.id} failed: {str(e)}")
+        return finished
+    
+    def _ingest_bulk_results(self, batch_record: BatchResumeModification,
+                             results: Dict[str, Dict[str, Any]], claimed_at: datetime) -> None:
+        """
+        将批量任务结果写回批量修改记录
+        
+        分析结果缺失或无法解析的简历计为失败；结构化补丁中缺失或未通过校验的
+        部分保留原内容（离线模式不做逐段交互回退）。新简历与记录在同一事务中
+        提交：任何一步失败都整体回滚，重试时不会重复保存。
+        """
+        manifest = batch_record.bulk_manifest or {}
+        options = manifest.get('customization_options') or {}
+        use_cache = options.get('use_section_cache', True)
+        modified_resumes = []
+        errors = list(batch_record.errors or [])
+        to_cache: Dict[str, Dict[str, Any]] = {}
+        
+        for resume_id, entry in (manifest.get('resumes') or {}).items():
+            try:
+                analysis = entry.get('analysis')
+                if analysis is None:
+                    analysis = self._bulk_result_json(results, f"resume-{resume_id}:analysis")
+                    for key, default in ANALYSIS_TEMPLATE.items():
+                        analysis.setdefault(key, json.loads(json.dumps(default)))
+                    if use_cache:
+                        to_cache[entry['analysis_key']] = {'section': 'analysis', 'value': analysis}
+                
+                optimized = json.loads(json.dumps(entry['original']))
+                for path, value in entry['cached'].items():
+                    self._set_path(optimized, path, value)
+                
+                stats = {'mode': 'bulk', 'sections': len(entry['sections']) + len(entry['cached']),
+                         'round_trips': 1 if entry['sections'] else 0, 'fallbacks': 0,
+                         'cached': len(entry['cached']), 'unoptimized': 0}
+                if entry['sections']:
+                    try:
+                        patch = self._bulk_result_json(results, f"resume-{resume_id}:patch")
+                    except ValueError as e:
+                        self.logger.warning(f"Bulk patch for resume {resume_id} unusable: {str(e)}")
+                        patch = {}
+                    for path, original_value in entry['sections'].items():
+                        value = patch.get(path)
+                        if self._valid_section_value(original_value, value):
+                            self._set_path(optimized, path, value)
+                            if path in entry['fingerprints']:
+                                to_cache[entry['fingerprints'][path]] = {
+                                    'section': self._section_content(entry['original'], path)[0], 'value': value
+                                }
+                        else:
+                            stats['unoptimized'] += 1
+                
+                modified_resumes.append(self._result_entry(
+                    int(resume_id), entry['title'], entry['original'], optimized,
+                    batch_record.job_title, analysis, stats
+                ))
+            except Exception as e:
+                errors.append({
+                    'resume_id': int(resume_id),
+                    'error': f"Failed to modify resume {resume_id}: {str(e)}"
+                })
+        
+        if use_cache:
+            self.section_cache.store_many(to_cache)
+        
+        saved_resumes = []
+        if manifest.get('save_as_new', True):
+            for modified_resume in modified_resumes:
+                save_result = self.save_modified_resume(
+                    user_id=batch_record.user_id,
+                    modified_resume_data=modified_resume,
+                    save_as_new=True,
+                    commit=False
+                )
+                saved_resumes.append({
+                    'original_id': modified_resume['original_resume_id'],
+                    'new_id': save_result['resume_id'],
+                    'title': modified_resume['modified_title']
+                })
+        
+        # 认领失效后已被其他轮询重新认领：放弃本次写回，由新的认领者完成
+        if self._owned_claim(batch_record, claimed_at).update(
+            {BatchResumeModification.status: 'completed'}, synchronize_session=False
+        ) != 1:
+            db.session.rollback()
+            db.session.refresh(batch_record)
+            self.logger.warning(f"Bulk modification {batch_record.id} claim expired during ingest, discarding")
+            return
+        
+        batch_record.modification_results = modified_resumes
+        batch_record.errors = errors
+        batch_record.successful_modifications = len(modified_resumes)
+        batch_record.failed_modifications = len(errors)
+        batch_record.bulk_manifest = dict(manifest, saved_resumes=saved_resumes)
+        batch_record.status = 'completed'
+        batch_record.completed_at = datetime.utcnow()
+        db.session.commit()
+        
+        # 批量任务的用量计入用户账本（批量API通道）
+        get_usage_ledger().record_many([
+            {
+                'user_id': batch_record.user_id,
+                'endpoint': 'batch-modify:bulk',
+                'task': custom_id.rsplit(':', 1)[-1],
+                'model': (result.get('model') or 'unknown')[:50],
+                'lane': BATCH_API,
+                'prompt_tokens': int(result['usage'].get('prompt_tokens') or 0),
+                'completion_tokens': int(result['usage'].get('completion_tokens') or 0),
+                'total_tokens': int(result['usage'].get('prompt_tokens') or 0)
+                                + int(result['usage'].get('completion_tokens') or 0),
+                'latency_ms': 0,
+                'success': True,
+                'created_at': datetime.utcnow()
+            }
+            for custom_id, result in results.items() if 'usage' in result
+        ])
+        self.logger.info(
+            f"Bulk modification {batch_record.id} completed: "
+            f"{len(modified_resumes)} succeeded, {len(errors)} failed"
+        )
+    
+    @staticmethod
+    def _bulk_result_json(results: Dict[str, Dict[str, Any]], custom_id: str) -> Dict[str, Any]:
+        """解析单个批量请求的JSON结果；缺失或出错时抛出 ValueError"""
+        result = results.get(custom_id)
+        if result is None:
+            raise ValueError(f"No result for {custom_id}")
+        if 'error' in result:
+            raise ValueError(f"{custom_id} failed: {result['error']}")
+        return decode_json(result['content'])
+    
     def save_modified_resume(
         self,
         user_id: int,
         modified_resume_data: Dict[str, Any],
-        save_as_new: bool = True
+        save_as_new: bool = True,
+        commit: bool = True
     ) -> Dict[str, Any]:
         """
         保存修改后的简历
@@ -520,6 +1395,7 @@ class BatchResumeModifier:
             user_id: 用户ID
             modified_resume_data: 修改后的简历数据
             save_as_new: 是否保存为新简历（默认为True）
+            commit: 是否立即提交；为False时只flush，由调用方在同一事务中提交或回滚
             
         Returns:
             保存结果
@@ -541,7 +1417,10 @@ class BatchResumeModifier:
                 )
                 
                 db.session.add(new_resume)
-                db.session.commit()
+                if commit:
+                    db.session.commit()
+                else:
+                    db.session.flush()
                 
                 return {
                     'success': True,
@@ -559,7 +1438,10 @@ class BatchResumeModifier:
                     resume.title = modified_resume_data['modified_title']
                     resume.parsed_resume = modified_resume_data['modified_content']
                     resume.updated_at = datetime.utcnow()
-                    db.session.commit()
+                    if commit:
+                        db.session.commit()
+                    else:
+                        db.session.flush()
                     
                     return {
                         'success': True,
@@ -570,6 +1452,7 @@ class BatchResumeModifier:
                     raise ValueError("Resume not found")
                     
         except Exception as e:
-            db.session.rollback()
+            if commit:
+                db.session.rollback()
             self.logger.error(f"Failed to save modified resume: {str(e)}")
             raise
@@ -0,0 +1,150 @@
+"""
+Bulk File Service
+Set-based soft delete, restore and hard delete of many files: one SELECT
+checks ownership of all requested IDs and one UPDATE or DELETE changes the
+rows in a single transaction; stored objects of hard-deleted files are
+removed afterwards by the concurrent storage deleter
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.extensions import db
+from app.models.temp import ResumeFile
+from app.services.resume_search_service import queue_file_changes
+
+
+logger = logging.getLogger(__name__)
+
+NOT_FOUND = 'File not found or access denied'
+
+
+class BulkFileService:
+    """Service for operations on many files at once"""
+
+    @staticmethod
+    def _select(file_ids: List[int], user_id: Optional[int], deleted: Optional[bool]) -> Dict[int, ResumeFile]:
+        """
+        Load the requested files in one query.
+
+        Args:
+            file_ids: Requested file IDs
+            user_id: Owner the files must belong to (None for any user)
+            deleted: True for soft-deleted files only, False for live files
+                only, None for both
+        """
+        query = ResumeFile.query.filter(ResumeFile.id.in_(set(file_ids)))
+        if user_id is not None:
+            query = query.filter(ResumeFile.user_id == user_id)
+        if deleted is True:
+            query = query.filter(ResumeFile.deleted_at.is_not(None))
+        elif deleted is False:
+            query = query.filter(ResumeFile.deleted_at.is_(None))
+        return {resume_file.id: resume_file for resume_file in query}
+
+    @staticmethod
+    def _result(file_ids: List[int], found: Dict[int, ResumeFile], error: str = NOT_FOUND) -> Dict[str, Any]:
+        return {
+            'processed_ids': list(found),
+            'failed': [{'file_id': file_id, 'error': error} for file_id in dict.fromkeys(file_ids) if file_id not in found]
+        }
+
+    @classmethod
+    def soft_delete(cls, file_ids: List[int], user_id: int) -> Dict[str, Any]:
+        """
+        Mark a user's live files as deleted (as ResumeFile.soft_delete does).
+
+        Returns:
+            dict: processed_ids and failed ({'file_id', 'error'}) entries
+        """
+        found = cls._select(file_ids, user_id, deleted=False)
+        if found:
+            now = datetime.utcnow()
+            ResumeFile.query.filter(ResumeFile.id.in_(list(found))).update({
+                ResumeFile.is_active: False,
+                ResumeFile.deleted_at: now,
+                ResumeFile.deleted_by: user_id,
+                ResumeFile.updated_at: now
+            }, synchronize_session='evaluate')
+            queue_file_changes(db.session, files=found.values())
+            db.session.commit()
+            logger.info(f"Soft-deleted {len(found)} file(s) for user {user_id}")
+        return cls._result(file_ids, found)
+
+    @classmethod
+    def restore(cls, file_ids: List[int], user_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Restore soft-deleted files of a user (or of any user when user_id is None).
+
+        Returns:
+            dict: processed_ids, failed entries and the restored ResumeFile objects
+        """
+        found = cls._select(file_ids, user_id, deleted=True)
+        if found:
+            ResumeFile.query.filter(ResumeFile.id.in_(list(found))).update({
+                ResumeFile.is_active: True,
+                ResumeFile.deleted_at: None,
+                ResumeFile.deleted_by: None,
+                ResumeFile.updated_at: datetime.utcnow()
+            }, synchronize_session='evaluate')
+            queue_file_changes(db.session, files=found.values())
+            db.session.commit()
+        result = cls._result(file_ids, found, 'File not found or not deleted')
+        result['files'] = list(found.values())
+        return result
+
+    @classmethod
+    def hard_delete(cls, file_ids: List[int], user_id: Optional[int] = None,
+                    deleted_only: bool = False, wait: bool = False) -> Dict[str, Any]:
+        """
+        Remove files from the database, then from storage.
+
+        The rows (and references to them from duplicates) are removed in one
+        transaction; their stored objects and thumbnails are handed to the
+        storage deleter, in the background unless ``wait`` is set.
+
+        Args:
+            file_ids: Requested file IDs
+            user_id: Owner the files must belong to (None for any user)
+            deleted_only: Only soft-deleted files may be removed
+            wait: Wait for the storage deletion and include its report
+
+        Returns:
+            dict: processed_ids, failed entries, storage_objects queued and,
+            with ``wait``, the storage report
+        """
+        from app.services.storage_deleter import get_storage_deleter
+        from app.services.thumbnail_service import ThumbnailService
+
+        found = cls._select(file_ids, user_id, deleted=True if deleted_only else None)
+        result = cls._result(file_ids, found, 'File not found or not deleted' if deleted_only else NOT_FOUND)
+        if not found:
+            result['storage_objects'] = 0
+            return result
+
+        ids = list(found)
+        objects = [(f.storage_type, f.s3_bucket, f.file_path) for f in found.values() if f.file_path]
+        objects += [('local', None, ThumbnailService.get_thumbnail_path(file_id)) for file_id in ids]
+
+        # Duplicates keep existing when their original goes (as with session.delete)
+        ResumeFile.query.filter(ResumeFile.original_file_id.in_(ids)).update(
+            {ResumeFile.original_file_id: None}, synchronize_session=False
+        )
+        ResumeFile.query.filter(ResumeFile.id.in_(ids)).delete(synchronize_session=False)
+        for resume_file in found.values():
+            db.session.expunge(resume_file)
+        queue_file_changes(db.session, deleted_file_ids=ids)
+        db.session.commit()
+        logger.info(f"Permanently deleted {len(ids)} file(s); removing {len(objects)} stored object(s)")
+
+        deleter = get_storage_deleter()
+        result['storage_objects'] = len(objects)
+        if wait:
+            result['storage'] = deleter.delete(objects).to_dict()
+        else:
+            deleter.submit(objects)
+        return result
@@ -0,0 +1,253 @@
+"""
+Extraction Cache for reusing file processing results
+Reuses extracted text, keywords, language and page counts across ResumeFile
+rows that share the same content hash and extractor version
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import re
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.extensions import db
+from app.models.temp import ResumeFile
+from app.services.file_processing_service import FileProcessingService, ProcessingResult
+
+
+logger = logging.getLogger(__name__)
+
+# Columns copied from a cached source row to the target row
+CACHED_COLUMNS = (
+    'extracted_text', 'page_count', 'paragraph_count', 'language',
+    'keywords', 'processing_time', 'processing_metadata'
+)
+
+# Only real content hashes are cache keys; placeholders such as the upload
+# fallback's 'fallback_hash' are shared by unrelated files
+_SHA256_HEX = re.compile(r'^[0-9a-f]{64}$')
+
+
+class ExtractionCache:
+    """
+    Content-addressed cache of file processing results.
+
+    The cache is the ``resume_files`` table itself: a completed row whose
+    ``file_hash`` matches and whose ``processing_metadata['extractor_version']``
+    equals the current ``FileProcessingService.EXTRACTOR_VERSION`` is a hit,
+    and its columns are copied instead of re-running extraction, keyword
+    extraction and language detection. Lookups use the existing
+    ``idx_file_hash`` index.
+    """
+
+    # Maximum number of same-hash candidates inspected per lookup
+    MAX_CANDIDATES = 10
+
+    def __init__(self, processing_service: Optional[FileProcessingService] = None):
+        self.processing_service = processing_service or FileProcessingService()
+
+    @staticmethod
+    def current_version() -> str:
+        """Return the extractor version results must match to be reused"""
+        return FileProcessingService.EXTRACTOR_VERSION
+
+    @staticmethod
+    def is_content_hash(file_hash: Any) -> bool:
+        """Whether a value is a SHA-256 content hash usable as a cache key"""
+        return isinstance(file_hash, str) and _SHA256_HEX.match(file_hash) is not None
+
+    @staticmethod
+    def record_version(file_record) -> Optional[str]:
+        """Return the extractor version a processed row was produced with"""
+        metadata = file_record.processing_metadata
+        if isinstance(metadata, dict):
+            return metadata.get('extractor_version')
+        return None
+
+    def lookup(self, file_hash: str, exclude_file_id: Optional[int] = None) -> Optional[ResumeFile]:
+        """
+        Find a processed row with the same content and extractor version.
+
+        Args:
+            file_hash: SHA-256 content hash (lowercase hex)
+            exclude_file_id: Row to ignore (usually the one being processed)
+
+        Returns:
+            Optional[ResumeFile]: Source row to copy from, or None on a miss
+            (always for anything but a 64-character hex digest)
+        """
+        if not self.is_content_hash(file_hash):
+            return None
+
+        try:
+            query = ResumeFile.query.filter(
+                ResumeFile.file_hash == file_hash,
+                ResumeFile.processing_status == 'completed',
+                ResumeFile.extracted_text.isnot(None)
+            )
+            if exclude_file_id is not None:
+                query = query.filter(ResumeFile.id != exclude_file_id)
+
+            version = self.current_version()
+            for candidate in query.order_by(ResumeFile.updated_at.desc()).limit(self.MAX_CANDIDATES).all():
+                if self.record_version(candidate) == version:
+                    return candidate
+        except Exception as e:
+            # The cache is an optimization; never fail processing because of it
+            logger.debug(f"Extraction cache lookup failed for {file_hash}: {str(e)}")
+
+        return None
+
+    @staticmethod
+    def result_from_record(source: ResumeFile) -> ProcessingResult:
+        """Build a ProcessingResult from a previously processed row"""
+        metadata = dict(source.processing_metadata or {})
+        metadata['cache_source_file_id'] = source.id
+
+        return ProcessingResult(
+            success=True,
+            text=source.extracted_text,
+            file_type=metadata.get('file_type'),
+            metadata=metadata,
+            processing_time=source.processing_time,
+            page_count=source.page_count,
+            paragraph_count=source.paragraph_count,
+            keywords=list(source.keywords or []),
+            language=source.language
+        )
+
+    @staticmethod
+    def apply_result(file_record, result: ProcessingResult) -> None:
+        """Store a successful processing result on a ResumeFile row"""
+        file_record.processing_status = 'completed'
+        file_record.extracted_text = result.text
+        file_record.is_processed = True
+        file_record.processing_error = None
+        file_record.page_count = result.page_count
+        file_record.paragraph_count = result.paragraph_count
+        file_record.language = result.language
+        file_record.keywords = result.keywords or []
+        file_record.processing_time = result.processing_time
+        file_record.processing_metadata = result.metadata or {}
+
+    def get_or_process(self, file_hash: Optional[str], load_file: Callable[[], Any],
+                       exclude_file_id: Optional[int] = None,
+                       force: bool = False) -> Tuple[ProcessingResult, bool]:
+        """
+        Return a processing result, reusing a cached one when possible.
+
+        Args:
+            file_hash: SHA-256 content hash of the file
+            load_file: Callable returning a file-like object with ``filename`` and
+                ``content_type`` attributes; only called on a cache miss
+            exclude_file_id: Row to ignore during lookup
+            force: Skip the cache and always recompute
+
+        Returns:
+            Tuple[ProcessingResult, bool]: The result and whether it was a cache hit
+        """
+        if not force:
+            source = self.lookup(file_hash, exclude_file_id=exclude_file_id)
+            if source is not None:
+                logger.info(f"Extraction cache hit for hash {file_hash[:12]} (source file {source.id})")
+                return self.result_from_record(source), True
+
+        file_obj = load_file()
+        if hasattr(file_obj, 'seek'):
+            file_obj.seek(0)
+        return self.processing_service.process_file(file_obj), False
+
+    def find_stale_files(self, limit: int = 100, after_id: int = 0) -> List[ResumeFile]:
+        """
+        Return processed rows whose extractor version is not current.
+
+        Args:
+            limit: Maximum number of stale rows to return
+            after_id: Only consider rows with a larger id (for paging)
+
+        Returns:
+            List[ResumeFile]: Stale rows ordered by id
+        """
+        version = self.current_version()
+        stale: List[ResumeFile] = []
+        query = ResumeFile.query.filter(
+            ResumeFile.id > after_id,
+            ResumeFile.processing_status == 'completed',
+            ResumeFile.deleted_at.is_(None)
+        ).order_by(ResumeFile.id.asc())
+
+        # processing_metadata is JSON, so the version filter runs in Python
+        for file_record in query.yield_per(500):
+            if self.record_version(file_record) != version:
+                stale.append(file_record)
+                if len(stale) >= limit:
+                    break
+        return stale
+
+    def reprocess_stale(self, load_file: Callable[[ResumeFile], Any], limit: int = 100,
+                        dry_run: bool = False, after_id: int = 0) -> Dict[str, Any]:
+        """
+        Bring processed rows up to the current extractor version.
+
+        Rows are grouped by ``file_hash`` so each distinct content is extracted
+        at most once; the remaining rows of the group (and any group that
+        already has an up-to-date row elsewhere) are filled by copy. Rows
+        without a real content hash are each processed on their own.
+
+        Args:
+            load_file: Callable returning a file-like object for a ResumeFile row
+            limit: Maximum number of stale rows handled in this run
+            dry_run: Only report what would be done
+            after_id: Resume a previous run after this row id
+
+        Returns:
+            Dict[str, Any]: Summary with counts, failures and the last row id
+        """
+        stale = self.find_stale_files(limit=limit, after_id=after_id)
+        groups: Dict[str, List[ResumeFile]] = {}
+        for file_record in stale:
+            key = file_record.file_hash if self.is_content_hash(file_record.file_hash) else f"file:{file_record.id}"
+            groups.setdefault(key, []).append(file_record)
+
+        summary = {
+            'extractor_version': self.current_version(),
+            'stale_files': len(stale),
+            'distinct_contents': len(groups),
+            'recomputed': 0,
+            'copied': 0,
+            'failed': 0,
+            'errors': [],
+            'last_file_id': stale[-1].id if stale else None,
+            'dry_run': dry_run
+        }
+        if dry_run:
+            return summary
+
+        for members in groups.values():
+            leader = members[0]
+            try:
+                result, cache_hit = self.get_or_process(
+                    leader.file_hash, lambda: load_file(leader), exclude_file_id=leader.id
+                )
+            except Exception as e:
+                result, cache_hit = ProcessingResult(success=False, error_message=str(e)), False
+
+            if not result.success:
+                summary['failed'] += len(members)
+                summary['errors'].append({'file_id': leader.id, 'error': result.error_message})
+                continue
+
+            self.apply_result(leader, result)
+            if cache_hit:
+                summary['copied'] += 1
+            else:
+                summary['recomputed'] += 1
+
+            for follower in members[1:]:
+                self.apply_result(follower, self.result_from_record(leader) if not cache_hit else result)
+                summary['copied'] += 1
+
+            db.session.commit()
+
+        return summary
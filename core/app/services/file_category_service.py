@@ -206,7 +206,8 @@ class FileCategoryService:
     def get_files_by_category(cls, user_id: int, category: Optional[str] = None, 
                             page: int = 1, per_page: int = 20, 
                             sort_by: str = 'created_at', sort_order: str = 'desc',
-                            search: Optional[str] = None) -> Dict[str, Any]:
+                            search: Optional[str] = None,
+                            search_mode: str = 'filename') -> Dict[str, Any]:
         """
         Get files filtered by category with pagination and search.
         
@@ -217,7 +218,9 @@ class FileCategoryService:
             per_page: Items per page
             sort_by: Field to sort by
             sort_order: Sort order ('asc' or 'desc')
-            search: Search term for filename filtering
+            search: Search term
+            search_mode: 'filename' to match filenames, 'content' to search
+                extracted text and keywords via the full-text index
             
         Returns:
             dict: Paginated list of files with metadata
@@ -238,7 +241,10 @@ class FileCategoryService:
         query = ResumeFile.get_files_by_category(user_id, category)
         
         # Apply search filter if provided
-        if search:
+        if search and search_mode == 'content':
+            from app.services.resume_search_service import get_search_service
+            query = query.filter(get_search_service().file_id_filter(user_id, search))
+        elif search:
             search_term = f"%{search}%"
             query = query.filter(ResumeFile.original_filename.ilike(search_term))
         
@@ -279,6 +285,7 @@ class FileCategoryService:
                     'filter': {
                         'category': category,
                         'search': search,
+                        'search_mode': search_mode,
                         'sort_by': sort_by,
                         'sort_order': sort_order
                     }
@@ -15,19 +15,17 @@ from dataclasses import dataclass, field
 from io import BytesIO
 
 # PDF processing
-try:
-    from PyPDF2 import PdfReader
-except ImportError:
-    try:
-        from pypdf import PdfReader
-    except ImportError:
-        PdfReader = None
+from app.utils.lazy_import import LazyImport
+
+PdfReader = LazyImport('PyPDF2', 'PdfReader', fallbacks=('pypdf',))
+
+from app.services import pdf_extraction_engine
+from app.services.pdf_extraction_engine import PDFExtractionEngine
+from app.services.keyword_engine import get_keyword_engine
+from app.utils.metrics import EXTRACTION_DURATION
 
 # DOCX processing
-try:
-    from docx import Document
-except ImportError:
-    Document = None
+Document = LazyImport('docx', 'Document')
 
 # Language detection
 try:
@@ -66,6 +64,10 @@ class FileProcessingService:
     Supports PDF and DOCX files with comprehensive error handling and validation.
     """
 
+    # Bump whenever extraction, cleanup, keyword or language logic changes so
+    # cached results (see ExtractionCache) are recomputed
+    EXTRACTOR_VERSION = '3'
+
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Initialize the file processing service with configuration.
@@ -75,6 +77,7 @@ class FileProcessingService:
                 - max_text_length: Maximum allowed text length (default: 100000)
                 - enable_metadata_extraction: Enable metadata extraction (default: True)
                 - timeout_seconds: Processing timeout in seconds (default: 60)
+                - pdf_extraction: PDFExtractionEngine configuration overrides
                 - enable_keyword_extraction: Enable keyword extraction (default: True)
                 - enable_language_detection: Enable language detection (default: True)
         """
@@ -92,9 +95,9 @@ class FileProcessingService:
 
     def _check_dependencies(self):
         """Check if required dependencies are available"""
-        if PdfReader is None:
+        if not PdfReader:
             raise ProcessingError("PDF processing requires PyPDF2 or pypdf package")
-        if Document is None:
+        if not Document:
             raise ProcessingError("DOCX processing requires python-docx package")
 
     def process_file(self, file_obj) -> ProcessingResult:
@@ -107,6 +110,16 @@ class FileProcessingService:
         Returns:
             ProcessingResult: Processing result with text and metadata
         """
+        started = time.perf_counter()
+        result = self._process_file(file_obj)
+        EXTRACTION_DURATION.observe(
+            time.perf_counter() - started,
+            file_type=self._determine_file_type(file_obj),
+            outcome='success' if result.success else 'error'
+        )
+        return result
+
+    def _process_file(self, file_obj) -> ProcessingResult:
         start_time = time.time()
         initial_memory = self._get_memory_usage()
         
@@ -147,10 +160,13 @@ class FileProcessingService:
                     page_count=getattr(extract_result, 'page_count', None),
                     paragraph_count=getattr(extract_result, 'paragraph_count', None)
                 )
+                metadata.update(extract_result.metadata or {})
             
             # Extract keywords
             keywords = []
             if self.enable_keyword_extraction and cleaned_text.strip():
+                # Scored against the shared corpus; the corpus itself is only
+                # refitted by rebuild_keyword_index
                 keywords = self.extract_keywords(cleaned_text)
             
             # Detect language
@@ -167,7 +183,8 @@ class FileProcessingService:
             metadata.update({
                 'processing_time': processing_time,
                 'memory_usage_mb': memory_usage,
-                'text_length': len(cleaned_text)
+                'text_length': len(cleaned_text),
+                'extractor_version': self.EXTRACTOR_VERSION
             })
             
             return ProcessingResult(
@@ -205,31 +222,22 @@ class FileProcessingService:
             # Reset file pointer
             file_obj.seek(0)
             
-            # Read PDF content
-            pdf_reader = PdfReader(file_obj)
-            text_parts = []
-            page_count = len(pdf_reader.pages)
-            
-            # Extract text from each page
-            for page_num, page in enumerate(pdf_reader.pages):
-                try:
-                    page_text = page.extract_text()
-                    if page_text.strip():  # Only add non-empty pages
-                        text_parts.append(page_text)
-                except Exception as e:
-                    # Log page-specific error but continue
-                    print(f"Warning: Failed to extract text from page {page_num + 1}: {str(e)}")
-                    continue
+            # Extract page texts with the fastest available backend
+            extraction = self._get_pdf_engine().extract(file_obj.read())
             
-            # Combine all text
-            full_text = '\n\n'.join(text_parts)
+            # Combine all text (only non-empty pages)
+            full_text = extraction.join('\n\n')
             processing_time = time.time() - start_time
             
             return ProcessingResult(
                 success=True,
                 text=full_text,
-                page_count=page_count,
-                processing_time=processing_time
+                page_count=extraction.page_count,
+                processing_time=processing_time,
+                metadata={
+                    'extraction_backend': extraction.backend,
+                    'parallel_extraction': extraction.parallel
+                }
             )
             
         except Exception as e:
@@ -239,6 +247,26 @@ class FileProcessingService:
                 processing_time=time.time() - start_time
             )
 
+    def _get_pdf_engine(self) -> PDFExtractionEngine:
+        """
+        Build the PDF extraction engine for this service.
+        
+        The module-level PdfReader is passed through when it differs from the
+        engine's own (e.g. PyPDF2 is installed) so the pypdf fallback keeps
+        using the same reader as before.
+        """
+        reader_factory = PdfReader
+        if (isinstance(PdfReader, LazyImport) and PdfReader
+                and PdfReader.resolve() is pdf_extraction_engine.PdfReader.resolve()):
+            reader_factory = None
+        return PDFExtractionEngine(
+            {
+                'time_limit_seconds': self.timeout_seconds,
+                **self.config.get('pdf_extraction', {})
+            },
+            reader_factory=reader_factory
+        )
+
     def extract_text_from_docx(self, file_obj) -> ProcessingResult:
         """
         Extract text content from a DOCX file.
@@ -348,36 +376,8 @@ class FileProcessingService:
             return []
         
         try:
-            # Simple keyword extraction using regex
-            # Remove common words and extract meaningful terms
-            words = re.findall(r'\b[A-Za-z]+\b', text.lower())
-            
-            # Common stop words to filter out
-            stop_words = {
-                'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 
-                'by', 'from', 'up', 'about', 'into', 'through', 'during', 'before', 'after', 
-                'above', 'below', 'between', 'among', 'this', 'that', 'these', 'those', 'i', 'me', 
-                'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 'your', 'yours', 'yourself', 
-                'yourselves', 'he', 'him', 'his', 'himself', 'she', 'her', 'hers', 'herself', 'it', 
-                'its', 'itself', 'they', 'them', 'their', 'theirs', 'themselves', 'what', 'which', 
-                'who', 'whom', 'whose', 'this', 'that', 'these', 'those', 'am', 'is', 'are', 'was', 
-                'were', 'be', 'been', 'being', 'have', 'has', 'had', 'having', 'do', 'does', 'did', 
-                'doing', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'shall'
-            }
-            
-            # Filter out stop words and short words
-            filtered_words = [word for word in words if len(word) > 2 and word not in stop_words]
-            
-            # Count word frequency
-            word_freq = {}
-            for word in filtered_words:
-                word_freq[word] = word_freq.get(word, 0) + 1
-            
-            # Sort by frequency and return top keywords
-            sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-            keywords = [word for word, freq in sorted_words[:max_keywords]]
-            
-            return keywords
+            # Corpus-aware TF-IDF ranking (common resume words rank low)
+            return get_keyword_engine().extract_keywords(text, max_keywords)
             
         except Exception as e:
             print(f"Warning: Keyword extraction failed: {str(e)}")
@@ -11,14 +11,17 @@ import shutil
 import uuid
 import mimetypes
 from datetime import datetime
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, List, Optional, Union
 from io import BytesIO
 from werkzeug.datastructures import FileStorage
 from dataclasses import dataclass
 
-import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
 
+from app.utils.lazy_import import LazyImport
+
+boto3 = LazyImport('boto3')
+
 
 class StorageError(Exception):
     """Custom exception for storage-related errors"""
@@ -54,6 +57,8 @@ class FileStorageService:
     Supports both local file system and Amazon S3 storage.
     """
 
+    S3_DELETE_BATCH_SIZE = 1000  # delete_objects accepts at most 1000 keys
+
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize the file storage service with configuration.
@@ -367,6 +372,52 @@ class FileStorageService:
                 error_message=f"S3 delete failed: {str(e)}"
             )
 
+    def delete_files(self, file_paths: List[str], s3_bucket: Optional[str] = None) -> Dict[str, StorageResult]:
+        """
+        Delete several files from the configured storage backend.
+        
+        S3 keys are removed with batched ``delete_objects`` calls of up to
+        S3_DELETE_BATCH_SIZE keys instead of one request per key.
+        
+        Args:
+            file_paths (List[str]): Paths of the files (local paths or S3 keys)
+            s3_bucket (str, optional): Bucket of the keys, defaults to the configured bucket
+        
+        Returns:
+            Dict[str, StorageResult]: Result per file path
+        """
+        file_paths = list(dict.fromkeys(file_paths))
+        if self.storage_type == 'local':
+            return {file_path: self._delete_local(file_path) for file_path in file_paths}
+        return self._delete_s3_batch(file_paths, s3_bucket or self.s3_bucket)
+
+    def _delete_s3_batch(self, s3_keys: List[str], bucket: str) -> Dict[str, StorageResult]:
+        """Delete S3 keys with one delete_objects request per batch"""
+        results = {}
+        for start in range(0, len(s3_keys), self.S3_DELETE_BATCH_SIZE):
+            batch = s3_keys[start:start + self.S3_DELETE_BATCH_SIZE]
+            try:
+                response = self.s3_client.delete_objects(
+                    Bucket=bucket,
+                    Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+                )
+            except Exception as e:
+                for key in batch:
+                    results[key] = StorageResult(success=False, error_message=f"S3 delete failed: {str(e)}")
+                continue
+            
+            # Quiet mode only reports the keys that could not be deleted
+            errors = {error.get('Key'): error for error in response.get('Errors', [])}
+            for key in batch:
+                if key in errors:
+                    results[key] = StorageResult(
+                        success=False,
+                        error_message=f"S3 delete failed: {errors[key].get('Code')}: {errors[key].get('Message')}"
+                    )
+                else:
+                    results[key] = StorageResult(success=True, storage_type='s3', s3_bucket=bucket, s3_key=key)
+        return results
+
     def file_exists(self, file_path: str) -> bool:
         """
         Check if a file exists in the storage backend.
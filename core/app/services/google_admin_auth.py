@@ -17,10 +17,12 @@ import secrets
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, Tuple
 from flask import current_app, session, request, redirect, url_for
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
+from app.utils.lazy_import import LazyImport
+
+Request = LazyImport('google.auth.transport.requests', 'Request')
+Credentials = LazyImport('google.oauth2.credentials', 'Credentials')
+Flow = LazyImport('google_auth_oauthlib.flow', 'Flow')
+build = LazyImport('googleapiclient.discovery', 'build')
 from googleapiclient.errors import HttpError
 from app.models.temp import User, GoogleAuth
 from app.extensions import db
@@ -9,10 +9,12 @@ import secrets
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, Tuple
 from flask import current_app, session, request, redirect, url_for
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
+from app.utils.lazy_import import LazyImport
+
+Request = LazyImport('google.auth.transport.requests', 'Request')
+Credentials = LazyImport('google.oauth2.credentials', 'Credentials')
+Flow = LazyImport('google_auth_oauthlib.flow', 'Flow')
+build = LazyImport('googleapiclient.discovery', 'build')
 from googleapiclient.errors import HttpError
 from app.models.temp import User, GoogleAuth
 from app.extensions import db
@@ -82,6 +84,7 @@ class GoogleAdminAuthServiceFixed:
         
         # Also store in database as backup (temporary table approach)
         try:
+            ensure_oauth_temp_states_table()
             # Store state in database for Docker reliability
             from sqlalchemy import text
             db.session.execute(text("""
@@ -122,6 +125,7 @@ class GoogleAdminAuthServiceFixed:
         
         # Method 2: Check database backup (for Docker reliability)
         try:
+            ensure_oauth_temp_states_table()
             from sqlalchemy import text
             # Look up state directly in database without requiring session_id
             result = db.session.execute(text("""
@@ -471,7 +475,7 @@ class GoogleAdminAuthServiceFixed:
             return False
 
 
-def create_oauth_temp_states_table():
+def create_oauth_temp_states_table() -> bool:
     """Create temporary table for OAuth state storage in Docker environments."""
     try:
         from sqlalchemy import text
@@ -493,15 +497,33 @@ def create_oauth_temp_states_table():
         
         db.session.commit()
         logger.info("✅ OAuth temporary states table created")
+        return True
         
     except Exception as e:
         logger.warning(f"Could not create OAuth temp states table: {e}")
         db.session.rollback()
+        return False
+
+
+_temp_states_table_ready = False
+
+
+def ensure_oauth_temp_states_table():
+    """
+    Create the OAuth temporary states table on first use in this process.
+
+    Called by the OAuth flow instead of at app startup, so starting a worker
+    does not need a database round trip. Retried until creation succeeds.
+    """
+    global _temp_states_table_ready
+    if not _temp_states_table_ready:
+        _temp_states_table_ready = create_oauth_temp_states_table()
 
 
 def cleanup_expired_oauth_states():
     """Clean up expired OAuth states from temporary table."""
     try:
+        ensure_oauth_temp_states_table()
         from sqlalchemy import text
         result = db.session.execute(text("""
             DELETE FROM oauth_temp_states 
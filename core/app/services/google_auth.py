@@ -8,10 +8,12 @@ import json
 from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from flask import current_app, url_for, session, request
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
+from app.utils.lazy_import import LazyImport
+
+Request = LazyImport('google.auth.transport.requests', 'Request')
+Credentials = LazyImport('google.oauth2.credentials', 'Credentials')
+Flow = LazyImport('google_auth_oauthlib.flow', 'Flow')
+build = LazyImport('googleapiclient.discovery', 'build')
 from app.models.temp import GoogleAuth, User
 from app.extensions import db
 
@@ -51,13 +53,13 @@ class GoogleAuthService:
                     "client_secret": self.client_secret,
                     "auth_uri": "https://accounts.google.com/o/oauth2/auth",
                     "token_uri": "https://oauth2.googleapis.com/token",
-                    "redirect_uris": [url_for('api.google_auth_callback', _external=True)]
+                    "redirect_uris": [url_for('auth.google_auth_callback', _external=True)]
                 }
             },
             scopes=self.scopes
         )
         
-        flow.redirect_uri = url_for('api.google_auth_callback', _external=True)
+        flow.redirect_uri = url_for('auth.google_auth_callback', _external=True)
         
         # Store user_id in session for callback
         session['oauth_user_id'] = user_id
@@ -110,13 +112,13 @@ class GoogleAuthService:
                         "client_secret": self.client_secret,
                         "auth_uri": "https://accounts.google.com/o/oauth2/auth",
                         "token_uri": "https://oauth2.googleapis.com/token",
-                        "redirect_uris": [url_for('api.google_auth_callback', _external=True)]
+                        "redirect_uris": [url_for('auth.google_auth_callback', _external=True)]
                     }
                 },
                 scopes=self.scopes
             )
             
-            flow.redirect_uri = url_for('api.google_auth_callback', _external=True)
+            flow.redirect_uri = url_for('auth.google_auth_callback', _external=True)
             
             # In testing mode, mock the OAuth flow
             if current_app.config.get('TESTING'):
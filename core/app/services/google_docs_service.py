@@ -5,9 +5,11 @@ Google Docs service for creating and formatting resume documents
 import os
 from datetime import datetime
 from typing import Dict, List, Any, Optional
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import logging
+from app.utils.lazy_import import LazyImport
+
+build = LazyImport('googleapiclient.discovery', 'build')
 
 logger = logging.getLogger(__name__)
 
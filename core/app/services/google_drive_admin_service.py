@@ -17,12 +17,16 @@ import io
 import json
 from datetime import datetime
 from typing import Dict, Any, Optional, List, Tuple
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload
 from googleapiclient.errors import HttpError
 from flask import current_app
+from app.utils.lazy_import import LazyImport
+
+build = LazyImport('googleapiclient.discovery', 'build')
+MediaIoBaseUpload = LazyImport('googleapiclient.http', 'MediaIoBaseUpload')
 from app.services.google_admin_auth_fixed import GoogleAdminAuthServiceFixed
-from app.models.temp import User
+from app.extensions import db
+from app.models.temp import GoogleAuth, User
+from app.utils.google_drive_performance import monitor_google_drive_operation
 import logging
 
 logger = logging.getLogger(__name__)
@@ -46,6 +50,21 @@ class GoogleDriveAdminService:
         self.enable_sharing = current_app.config.get('GOOGLE_DRIVE_ENABLE_SHARING', True)
         self.default_permissions = current_app.config.get('GOOGLE_DRIVE_DEFAULT_PERMISSIONS', 'writer')
     
+    def _find_authenticated_admin(self) -> Tuple[bool, Optional[int]]:
+        """
+        Find the first admin user with active Google authentication.
+        
+        One query for all admin users instead of an auth lookup per admin.
+        
+        Returns:
+            tuple: (whether any admin user exists, authenticated admin user ID or None)
+        """
+        rows = db.session.query(User.id, GoogleAuth.is_active).outerjoin(
+            GoogleAuth, GoogleAuth.user_id == User.id
+        ).filter(User.is_admin.is_(True)).order_by(User.id).all()
+        authenticated = next((user_id for user_id, is_active in rows if is_active), None)
+        return bool(rows), authenticated
+    
     def _get_drive_service(self, admin_user_id: int = None):
         """
         Get authenticated Google Drive service using admin credentials.
@@ -64,17 +83,10 @@ class GoogleDriveAdminService:
         
         # Find authenticated admin user if not provided
         if admin_user_id is None:
-            admin_users = User.query.filter_by(is_admin=True).all()
-            if not admin_users:
+            has_admin, admin_user_id = self._find_authenticated_admin()
+            if not has_admin:
                 raise ValueError("No admin user found")
             
-            # Find first authenticated admin user
-            for admin_user in admin_users:
-                auth_status = self.auth_service.get_auth_status(admin_user.id) 
-                if auth_status.get('authenticated'):
-                    admin_user_id = admin_user.id
-                    break
-            
             if admin_user_id is None:
                 raise ValueError("No authenticated admin user found. Please authenticate at /auth/google/admin")
         
@@ -103,17 +115,10 @@ class GoogleDriveAdminService:
         
         # Find authenticated admin user if not provided
         if admin_user_id is None:
-            admin_users = User.query.filter_by(is_admin=True).all()
-            if not admin_users:
+            has_admin, admin_user_id = self._find_authenticated_admin()
+            if not has_admin:
                 raise ValueError("No admin user found")
             
-            # Find first authenticated admin user
-            for admin_user in admin_users:
-                auth_status = self.auth_service.get_auth_status(admin_user.id) 
-                if auth_status.get('authenticated'):
-                    admin_user_id = admin_user.id
-                    break
-            
             if admin_user_id is None:
                 raise ValueError("No authenticated admin user found. Please authenticate at /auth/google/admin")
         
@@ -124,6 +129,7 @@ class GoogleDriveAdminService:
         self.docs_service = build('docs', 'v1', credentials=credentials)
         return self.docs_service
     
+    @monitor_google_drive_operation("file_upload")
     def upload_file_to_admin_drive(
         self,
         file_content: bytes,
@@ -441,6 +447,7 @@ class GoogleDriveAdminService:
             'message': f'Files accessible to anyone with the link ({self.default_permissions} access)'
         }
     
+    @monitor_google_drive_operation("list")
     def get_user_files(self, user_id: int, limit: int = 100) -> Dict[str, Any]:
         """
         Get files from user's folder in admin's Google Drive.
@@ -489,6 +496,7 @@ class GoogleDriveAdminService:
                 'error': str(e)
             }
     
+    @monitor_google_drive_operation("delete")
     def delete_file_from_drive(self, file_id: str) -> Dict[str, Any]:
         """
         Delete file from admin's Google Drive.
@@ -522,6 +530,7 @@ class GoogleDriveAdminService:
                 'error': str(e)
             }
     
+    @monitor_google_drive_operation("metadata")
     def get_file_info(self, file_id: str) -> Dict[str, Any]:
         """
         Get detailed information about a file in admin's Google Drive.
@@ -561,24 +570,20 @@ class GoogleDriveAdminService:
         """
         try:
             # Find all admin users and check if any are authenticated
-            admin_users = User.query.filter_by(is_admin=True).all()
-            if not admin_users:
+            has_admin, admin_user_id = self._find_authenticated_admin()
+            if not has_admin:
                 return {
                     'authenticated': False,
                     'message': 'No admin user found',
                     'auth_url': '/auth/google/admin'
                 }
             
-            # Check auth status for all admin users
-            for admin_user in admin_users:
-                auth_status = self.auth_service.get_auth_status(admin_user.id)
-                
-                if auth_status.get('authenticated'):
-                    return {
-                        'authenticated': True,
-                        'message': 'Admin Google Drive authentication is active',
-                        'admin_user_id': admin_user.id
-                    }
+            if admin_user_id is not None:
+                return {
+                    'authenticated': True,
+                    'message': 'Admin Google Drive authentication is active',
+                    'admin_user_id': admin_user_id
+                }
             
             # If no admin user is authenticated
             return {
@@ -9,12 +9,16 @@ import tempfile
 import mimetypes
 from datetime import datetime
 from typing import Dict, List, Any, Optional, BinaryIO
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseUpload, MediaFileUpload
 from googleapiclient.errors import HttpError
-from google.oauth2 import service_account
 from google.auth.exceptions import GoogleAuthError
 from flask import current_app
+from app.utils.lazy_import import LazyImport
+
+build = LazyImport('googleapiclient.discovery', 'build')
+MediaIoBaseUpload = LazyImport('googleapiclient.http', 'MediaIoBaseUpload')
+MediaFileUpload = LazyImport('googleapiclient.http', 'MediaFileUpload')
+service_account = LazyImport('google.oauth2.service_account')
+from app.utils.google_drive_performance import monitor_google_drive_operation
 import logging
 
 logger = logging.getLogger(__name__)
@@ -38,6 +42,7 @@ class GoogleDriveService:
         # If no credentials provided, try to initialize service account
         return self.initialize_service_account()
         
+    @monitor_google_drive_operation("sharing")
     def create_shareable_link(self, document_id: str, credentials=None) -> Dict[str, Any]:
         """
         Create a shareable link for a Google Docs document
@@ -87,6 +92,7 @@ class GoogleDriveService:
                 }
             raise
             
+    @monitor_google_drive_operation("sharing")
     def set_permissions(self, document_id: str, permission_level: str = 'viewer', credentials=None) -> Dict[str, Any]:
         """
         Set document permissions
@@ -137,6 +143,7 @@ class GoogleDriveService:
                 }
             raise
             
+    @monitor_google_drive_operation("sharing")
     def update_permissions(self, document_id: str, permission_data: Dict[str, Any], credentials=None) -> bool:
         """
         Update document permissions
@@ -175,6 +182,7 @@ class GoogleDriveService:
                 return True
             return False
             
+    @monitor_google_drive_operation("export")
     def export_as_pdf(self, document_id: str, credentials=None) -> Dict[str, Any]:
         """
         Export Google Docs document as PDF
@@ -219,6 +227,7 @@ class GoogleDriveService:
                 }
             raise
             
+    @monitor_google_drive_operation("export")
     def export_as_docx(self, document_id: str, credentials=None) -> Dict[str, Any]:
         """
         Export Google Docs document as DOCX
@@ -257,6 +266,7 @@ class GoogleDriveService:
                 }
             raise
             
+    @monitor_google_drive_operation("delete")
     def delete_document(self, document_id: str, credentials=None) -> bool:
         """
         Delete a Google Drive document
@@ -284,6 +294,7 @@ class GoogleDriveService:
                 return True
             return False
             
+    @monitor_google_drive_operation("metadata")
     def get_document_metadata(self, document_id: str, credentials=None) -> Dict[str, Any]:
         """
         Get document metadata from Google Drive
@@ -370,6 +381,7 @@ class GoogleDriveService:
             logger.error(f"Failed to initialize Google Drive service: {str(e)}")
             return None
     
+    @monitor_google_drive_operation("folder_create")
     def create_user_folder(self, user_id: int, user_email: str, credentials=None) -> Optional[str]:
         """
         Create a folder for a user in Google Drive.
@@ -417,6 +429,7 @@ class GoogleDriveService:
             logger.error(f"Failed to create user folder: {str(e)}")
             return None
     
+    @monitor_google_drive_operation("file_upload")
     def upload_file_to_drive(
         self,
         file_content: bytes,
@@ -587,6 +600,7 @@ class GoogleDriveService:
                 'error': str(e)
             }
     
+    @monitor_google_drive_operation("conversion")
     def convert_to_google_doc(
         self,
         file_content: bytes,
@@ -689,6 +703,7 @@ class GoogleDriveService:
                 'error': str(e)
             }
     
+    @monitor_google_drive_operation("sharing")
     def share_file_with_user(
         self,
         file_id: str,
@@ -771,6 +786,7 @@ class GoogleDriveService:
                 'error': str(e)
             }
 
+    @monitor_google_drive_operation("sharing")
     def share_file_publicly(
         self,
         file_id: str,
@@ -0,0 +1,441 @@
+"""
+Keyword Engine for corpus-aware keyword extraction
+Precompiled tokenizers, a maintained document-frequency table and TF-IDF
+scoring over sparse matrices, shared by resumes and job descriptions
+
+Settings come from the environment:
+    KEYWORD_INDEX_PATH: Persisted document-frequency table
+        (default <instance_path>/keyword_index.json)
+    KEYWORD_INDEX_CHECK_SECONDS: How often workers look for a rebuilt
+        table (default 60)
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import os
+import re
+import json
+import math
+import logging
+import time
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.utils.lazy_import import LazyImport
+
+# Falsy when unavailable; the pure-Python fallback keeps the same results, only slower
+np = LazyImport('numpy')
+sparse = LazyImport('scipy.sparse')
+
+
+logger = logging.getLogger(__name__)
+
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
+    'by', 'from', 'up', 'about', 'into', 'through', 'during', 'before', 'after',
+    'above', 'below', 'between', 'among', 'this', 'that', 'these', 'those', 'i', 'me',
+    'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 'your', 'yours', 'yourself',
+    'yourselves', 'he', 'him', 'his', 'himself', 'she', 'her', 'hers', 'herself', 'it',
+    'its', 'itself', 'they', 'them', 'their', 'theirs', 'themselves', 'what', 'which',
+    'who', 'whom', 'whose', 'am', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing', 'will', 'would',
+    'could', 'should', 'may', 'might', 'must', 'can', 'shall', 'not', 'also', 'such',
+    'than', 'then', 'there', 'here', 'all', 'any', 'each', 'other', 'some', 'more',
+    'most', 'very', 'via', 'etc', 'per', 'including', 'using', 'used', 'use'
+})
+
+# Short terms that are meaningful despite being under three characters
+SHORT_TERMS = frozenset({'go', 'ai', 'ml', 'ui', 'ux', 'qa', 'bi', 'c#', 'r', 'c'})
+
+# Tokens: words plus common tech spellings such as c++, c#, node.js, ci/cd parts
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+SKILL_TERMS = (
+    'Python', 'Java', 'JavaScript', 'React', 'Angular', 'Vue', r'Node\.js', 'Express',
+    'Flask', 'Django', 'FastAPI', 'Spring', 'Laravel', 'Ruby on Rails',
+    'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch',
+    'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Jenkins',
+    'Git', 'GitHub', 'GitLab', 'Agile', 'Scrum', 'DevOps',
+    'Machine Learning', 'AI', 'Data Science', 'Analytics',
+    'Bachelor', 'Master', 'PhD', 'Computer Science', 'Engineering',
+)
+
+# One alternation instead of one regex per skill group
+SKILL_PATTERN = re.compile(r'\b(' + '|'.join(SKILL_TERMS) + r')\b', re.IGNORECASE)
+EXPERIENCE_PATTERN = re.compile(r'\b(\d+)\+?\s*years?\s*experience\b', re.IGNORECASE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase and split text into candidate keyword tokens"""
+    if not text:
+        return []
+    return [
+        token for token in TOKEN_PATTERN.findall(text.lower())
+        if token not in STOP_WORDS and (len(token) > 2 or token in SHORT_TERMS)
+    ]
+
+
+def extract_skills(text: str) -> List[str]:
+    """
+    Match known skills, qualifications and years of experience in text.
+
+    Returns matches as written in the text, without duplicates, in order of
+    first appearance.
+    """
+    if not text:
+        return []
+    matches = SKILL_PATTERN.findall(text) + EXPERIENCE_PATTERN.findall(text)
+    return list(dict.fromkeys(matches))
+
+
+class KeywordEngine:
+    """
+    Corpus-aware TF-IDF keyword extractor.
+
+    The engine keeps one vocabulary (term -> column) and a document-frequency
+    table for every document it has been fitted on. Resumes and job
+    descriptions are vectorized against the same vocabulary, so their vectors
+    are directly comparable. With NumPy/SciPy installed, batches are scored as
+    CSR matrices; otherwise an equivalent pure-Python path is used.
+
+    Scoring uses sublinear term frequency, smoothed IDF
+    (``ln((1 + N) / (1 + df)) + 1``) and L2 normalization, so terms that
+    appear in most resumes ("experience", "team") rank below distinctive ones.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.vocabulary: Dict[str, int] = {}
+        self.document_count = 0
+        self._df = np.zeros(0, dtype=np.int64) if np else []
+
+    # ------------------------------------------------------------------
+    # Corpus maintenance
+    # ------------------------------------------------------------------
+
+    def fit(self, documents: Iterable[str]) -> 'KeywordEngine':
+        """Reset the corpus and fit it on the given documents"""
+        with self._lock:
+            self.vocabulary = {}
+            self.document_count = 0
+            self._df = np.zeros(0, dtype=np.int64) if np else []
+        return self.partial_fit(documents)
+
+    def partial_fit(self, documents: Iterable[str]) -> 'KeywordEngine':
+        """Add documents to the document-frequency table"""
+        token_lists = [tokenize(document) for document in documents]
+        with self._lock:
+            for tokens in token_lists:
+                for term in set(tokens):
+                    column = self._column(term)
+                    self._df[column] += 1
+            self.document_count += len(token_lists)
+        return self
+
+    def document_frequency(self, term: str) -> int:
+        """Return how many fitted documents contain the term"""
+        column = self.vocabulary.get(term.lower())
+        return int(self._df[column]) if column is not None else 0
+
+    def _column(self, term: str) -> int:
+        column = self.vocabulary.get(term)
+        if column is None:
+            column = len(self.vocabulary)
+            self.vocabulary[term] = column
+            if np:
+                if column >= len(self._df):
+                    grown = np.zeros(max(1024, len(self._df) * 2), dtype=np.int64)
+                    grown[:len(self._df)] = self._df
+                    self._df = grown
+            else:
+                self._df.append(0)
+        return column
+
+    def _idf(self, size: int):
+        n = self.document_count
+        if np:
+            return np.log((1.0 + n) / (1.0 + self._df[:size])) + 1.0
+        return [math.log((1.0 + n) / (1.0 + df)) + 1.0 for df in self._df[:size]]
+
+    # ------------------------------------------------------------------
+    # Vectorization
+    # ------------------------------------------------------------------
+
+    def transform(self, documents: Sequence[str]):
+        """
+        Vectorize documents against the shared vocabulary.
+
+        Terms unseen in the corpus get columns after the vocabulary for this
+        call only (document frequency zero), so they can still be ranked
+        without growing the vocabulary.
+
+        Returns:
+            scipy.sparse.csr_matrix of L2-normalized TF-IDF rows, or a list of
+            {term_column: weight} dicts when SciPy is not installed
+        """
+        return self._vectorize(documents)[0]
+
+    def _vectorize(self, documents: Sequence[str], with_terms: bool = False):
+        """Vectors of ``transform`` and, with ``with_terms``, the term of every column"""
+        token_lists = [tokenize(document) for document in documents]
+        unseen: Dict[str, int] = {}
+        with self._lock:
+            vocabulary = self.vocabulary
+            size = len(vocabulary)
+            rows = [
+                {
+                    (vocabulary[term] if term in vocabulary else unseen.setdefault(term, size + len(unseen))): count
+                    for term, count in Counter(tokens).items()
+                }
+                for tokens in token_lists
+            ]
+            idf = self._idf(size)
+            unseen_idf = math.log(1.0 + self.document_count) + 1.0
+            terms = self._terms_by_column() + list(unseen) if with_terms else None
+        width = size + len(unseen)
+
+        if not sparse:
+            idf = list(idf) + [unseen_idf] * len(unseen)
+            vectors = []
+            for row in rows:
+                weights = {column: (1.0 + math.log(count)) * idf[column] for column, count in row.items()}
+                norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+                vectors.append({column: weight / norm for column, weight in weights.items()})
+            return vectors, terms
+
+        idf = np.concatenate([idf, np.full(len(unseen), unseen_idf)])
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(row) for row in rows])
+        indices = np.fromiter((column for row in rows for column in row), dtype=np.int64, count=indptr[-1])
+        counts = np.fromiter((count for row in rows for count in row.values()), dtype=np.float64, count=indptr[-1])
+
+        data = (1.0 + np.log(counts)) * idf[indices]
+        matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(rows), width))
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms) @ matrix, terms
+
+    def top_keywords(self, documents: Sequence[str], max_keywords: int = 20) -> List[List[str]]:
+        """
+        Return the highest-weighted terms of each document.
+
+        Args:
+            documents: Texts to extract keywords from (processed as one batch)
+            max_keywords: Maximum number of keywords per document
+
+        Returns:
+            List[List[str]]: Keywords per document, best first
+        """
+        return [
+            [term for term, _ in ranked]
+            for ranked in self.weighted_keywords(documents, max_keywords)
+        ]
+
+    def weighted_keywords(self, documents: Sequence[str],
+                          max_keywords: int = 20) -> List[List[Tuple[str, float]]]:
+        """
+        Return the highest-weighted terms of each document with their weights.
+
+        Returns:
+            List[List[Tuple[str, float]]]: (term, TF-IDF weight) per document, best first
+        """
+        if not documents:
+            return []
+        vectors, terms = self._vectorize(documents, with_terms=True)
+
+        results = []
+        if not sparse:
+            for vector in vectors:
+                ranked = sorted(vector.items(), key=lambda item: (-item[1], item[0]))
+                results.append([(terms[column], weight) for column, weight in ranked[:max_keywords]])
+            return results
+
+        for row in range(vectors.shape[0]):
+            start, end = vectors.indptr[row], vectors.indptr[row + 1]
+            columns, weights = vectors.indices[start:end], vectors.data[start:end]
+            if len(columns) > max_keywords:
+                keep = np.argpartition(-weights, max_keywords - 1)[:max_keywords]
+                columns, weights = columns[keep], weights[keep]
+            # Highest weight first; ties broken by first-seen order (column)
+            order = np.lexsort((columns, -weights))
+            results.append([(terms[column], float(weight)) for column, weight in zip(columns[order], weights[order])])
+        return results
+
+    def extract_keywords(self, text: str, max_keywords: int = 20) -> List[str]:
+        """Return the top keywords of a single document"""
+        if not text or not text.strip():
+            return []
+        return self.top_keywords([text], max_keywords)[0]
+
+    def similarity(self, documents: Sequence[str], query: str) -> List[float]:
+        """Cosine similarity of each document to the query (e.g. a job description)"""
+        vectors = self.transform(list(documents) + [query])
+        if not sparse:
+            query_vector = vectors[-1]
+            return [
+                sum(weight * query_vector.get(column, 0.0) for column, weight in vector.items())
+                for vector in vectors[:-1]
+            ]
+        scores = vectors[:-1] @ vectors[-1].T
+        return [float(score) for score in scores.toarray().ravel()]
+
+    def _terms_by_column(self) -> List[str]:
+        with self._lock:
+            terms = [''] * len(self.vocabulary)
+            for term, column in self.vocabulary.items():
+                terms[column] = term
+        return terms
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the document-frequency table"""
+        with self._lock:
+            return {
+                'document_count': self.document_count,
+                'document_frequency': {
+                    term: int(self._df[column]) for term, column in self.vocabulary.items() if self._df[column]
+                }
+            }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'KeywordEngine':
+        engine = cls()
+        for term, df in data.get('document_frequency', {}).items():
+            column = engine._column(term)
+            engine._df[column] = df
+        engine.document_count = data.get('document_count', 0)
+        return engine
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as handle:
+            json.dump(self.to_dict(), handle)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'KeywordEngine':
+        with open(path) as handle:
+            return cls.from_dict(json.load(handle))
+
+
+_default_engine: Optional[KeywordEngine] = None
+_default_engine_mtime: Optional[float] = None
+_default_engine_checked = 0.0
+_default_lock = threading.Lock()
+
+# Seconds between checks of the index file for a rebuild
+INDEX_CHECK_SECONDS = float(os.getenv('KEYWORD_INDEX_CHECK_SECONDS', '60'))
+
+
+def keyword_index_path() -> Optional[str]:
+    """
+    Location of the persisted document-frequency table.
+
+    ``KEYWORD_INDEX_PATH`` or ``<instance_path>/keyword_index.json``; None
+    outside an application context when no path is configured.
+    """
+    path = os.getenv('KEYWORD_INDEX_PATH')
+    if path:
+        return path
+    from flask import current_app, has_app_context
+    return os.path.join(current_app.instance_path, 'keyword_index.json') if has_app_context() else None
+
+
+def get_keyword_engine() -> KeywordEngine:
+    """
+    Return the shared engine, loading the persisted corpus when it changes.
+
+    Every worker reads the same index file (written by
+    ``rebuild_keyword_index`` on the background leader), so keywords do not
+    depend on which worker processed a file. The file's mtime is checked at
+    most every ``INDEX_CHECK_SECONDS``.
+    """
+    global _default_engine, _default_engine_mtime, _default_engine_checked
+    now = time.monotonic()
+    if _default_engine is not None and now - _default_engine_checked < INDEX_CHECK_SECONDS:
+        return _default_engine
+    with _default_lock:
+        if _default_engine is not None and now - _default_engine_checked < INDEX_CHECK_SECONDS:
+            return _default_engine
+        path = keyword_index_path()
+        try:
+            mtime = os.path.getmtime(path) if path else None
+        except OSError:
+            mtime = None
+        if _default_engine is None or mtime != _default_engine_mtime:
+            engine = _default_engine or KeywordEngine()
+            if mtime is not None:
+                try:
+                    engine = KeywordEngine.load(path)
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Could not load keyword index from {path}: {str(e)}")
+            _default_engine, _default_engine_mtime = engine, mtime
+        _default_engine_checked = now
+    return _default_engine
+
+
+def rebuild_keyword_index(batch_size: int = 2000, max_keywords: int = 20,
+                          update_files: bool = True) -> Dict[str, Any]:
+    """
+    Refit the corpus on all processed files and rewrite their keywords.
+
+    The first pass streams ``extracted_text`` to build the document-frequency
+    table; the second scores files in batches and writes keywords with bulk
+    updates. Must be called inside an application context.
+
+    Returns:
+        Dict[str, Any]: Corpus size, vocabulary size and files updated
+    """
+    from app.extensions import db
+    from app.models.temp import ResumeFile
+
+    def batches():
+        # Keyset pagination keeps each batch a short, independent query
+        last_id = 0
+        while True:
+            rows = db.session.query(ResumeFile.id, ResumeFile.extracted_text).filter(
+                ResumeFile.extracted_text.isnot(None),
+                ResumeFile.id > last_id
+            ).order_by(ResumeFile.id).limit(batch_size).all()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [row[0] for row in rows], [row[1] for row in rows]
+
+    engine = KeywordEngine()
+    for _, texts in batches():
+        engine.partial_fit(texts)
+
+    updated = 0
+    if update_files:
+        for ids, texts in batches():
+            keywords = engine.top_keywords(texts, max_keywords)
+            db.session.bulk_update_mappings(ResumeFile, [
+                {'id': file_id, 'keywords': file_keywords} for file_id, file_keywords in zip(ids, keywords)
+            ])
+            db.session.commit()
+            updated += len(ids)
+
+    global _default_engine, _default_engine_mtime, _default_engine_checked
+    path = keyword_index_path()
+    with _default_lock:
+        try:
+            engine.save(path)
+            _default_engine, _default_engine_mtime = engine, os.path.getmtime(path)
+        except OSError as e:
+            logger.warning(f"Could not save keyword index: {str(e)}")
+            _default_engine = engine
+        _default_engine_checked = time.monotonic()
+
+    return {
+        'documents': engine.document_count,
+        'vocabulary_size': len(engine.vocabulary),
+        'files_updated': updated
+    }
+
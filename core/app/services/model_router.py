@@ -0,0 +1,224 @@
+"""
+Model Router for AI tasks
+Maps each task to a primary model and fallbacks, tracks rolling latency and
+error rates per model, and routes around models that breach their SLOs
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.services.ai_usage import QuotaExceededError
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ModelRoute:
+    """
+    Routing configuration of one task.
+
+    Extraction and scoring tasks use temperature 0 so identical inputs give
+    identical (cacheable) outputs; rewriting tasks keep some variety.
+    """
+    task: str
+    models: List[str]
+    temperature: float = 0.0
+    timeout_seconds: float = 60.0
+    slo_p95_ms: float = 20000.0
+    max_error_rate: float = 0.25
+
+
+DEFAULT_ROUTES: Dict[str, ModelRoute] = {
+    'parse': ModelRoute('parse', ['gpt-4o-mini', 'gpt-3.5-turbo'], temperature=0.0),
+    'analyze': ModelRoute('analyze', ['gpt-4o-mini', 'gpt-3.5-turbo'], temperature=0.0),
+    'score': ModelRoute('score', ['gpt-4o-mini', 'gpt-3.5-turbo'], temperature=0.0),
+    'section_feedback': ModelRoute('section_feedback', ['gpt-4o-mini', 'gpt-3.5-turbo'],
+                                   temperature=0.7, slo_p95_ms=15000.0),
+    'optimize': ModelRoute('optimize', ['gpt-3.5-turbo', 'gpt-4o-mini'], temperature=0.1)
+}
+
+
+def load_routes() -> Dict[str, ModelRoute]:
+    """
+    Default routes overridden by the MODEL_ROUTES environment variable.
+
+    MODEL_ROUTES is a JSON object of task name to route fields, e.g.
+    ``{"parse": {"models": ["gpt-4o-mini", "gpt-4o"], "slo_p95_ms": 10000}}``.
+    Unknown tasks create new routes; invalid JSON is ignored with a warning.
+    """
+    routes = {task: ModelRoute(**asdict(route)) for task, route in DEFAULT_ROUTES.items()}
+    raw = os.getenv('MODEL_ROUTES')
+    if not raw:
+        return routes
+    try:
+        overrides = json.loads(raw)
+        for task, values in overrides.items():
+            base = asdict(routes[task]) if task in routes else {'task': task, 'models': []}
+            base.update(values, task=task)
+            routes[task] = ModelRoute(**base)
+    except (ValueError, TypeError, AttributeError) as e:
+        logger.warning(f"Ignoring invalid MODEL_ROUTES: {str(e)}")
+    return routes
+
+
+class ModelStats:
+    """Rolling window of (timestamp, latency_ms, ok) samples for one model"""
+
+    def __init__(self, max_samples: int, window_seconds: float):
+        self.samples: Deque[Tuple[float, float, bool]] = deque(maxlen=max_samples)
+        self.window_seconds = window_seconds
+
+    def add(self, latency_ms: float, ok: bool, now: Optional[float] = None) -> None:
+        self.samples.append((now if now is not None else time.time(), latency_ms, ok))
+
+    def _recent(self, now: float) -> List[Tuple[float, float, bool]]:
+        cutoff = now - self.window_seconds
+        return [sample for sample in self.samples if sample[0] >= cutoff]
+
+    def summary(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Sample count, p50/p95 latency (ms) and error rate over the window"""
+        recent = self._recent(now if now is not None else time.time())
+        if not recent:
+            return {'samples': 0, 'p50_ms': None, 'p95_ms': None, 'error_rate': 0.0}
+        latencies = sorted(sample[1] for sample in recent)
+        errors = sum(1 for sample in recent if not sample[2])
+        return {
+            'samples': len(recent),
+            'p50_ms': round(_percentile(latencies, 50), 1),
+            'p95_ms': round(_percentile(latencies, 95), 1),
+            'error_rate': round(errors / len(recent), 3)
+        }
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class ModelRouter:
+    """
+    Route AI calls by task with latency- and error-aware fallback.
+
+    For each call the route's models are ordered healthy-first (keeping the
+    configured order within each group); a model is unhealthy when its recent
+    p95 latency exceeds the route SLO or its error rate exceeds the route
+    limit, given at least ``min_samples`` samples in the window. Failed calls
+    fall through to the next model. Samples age out of the window, so a
+    demoted primary is retried once its bad samples expire.
+    """
+
+    def __init__(self, routes: Optional[Dict[str, ModelRoute]] = None,
+                 window_seconds: Optional[float] = None, max_samples: int = 200,
+                 min_samples: Optional[int] = None):
+        self.routes = routes if routes is not None else load_routes()
+        self.window_seconds = window_seconds or float(os.getenv('MODEL_ROUTER_WINDOW_SECONDS', '300'))
+        self.max_samples = max_samples
+        self.min_samples = min_samples or int(os.getenv('MODEL_ROUTER_MIN_SAMPLES', '5'))
+        self._stats: Dict[str, ModelStats] = {}
+        self._lock = threading.Lock()
+
+    def route(self, task: str) -> ModelRoute:
+        """Return the route of ``task``"""
+        if task not in self.routes:
+            raise ValueError(f"No model route configured for task: {task}")
+        return self.routes[task]
+
+    def record(self, model: str, latency_ms: float, ok: bool) -> None:
+        """Record the outcome of one call to ``model``"""
+        with self._lock:
+            stats = self._stats.get(model)
+            if stats is None:
+                stats = self._stats[model] = ModelStats(self.max_samples, self.window_seconds)
+            stats.add(latency_ms, ok)
+
+    def healthy(self, model: str, route: ModelRoute) -> bool:
+        """Whether ``model`` currently meets the route SLOs"""
+        with self._lock:
+            stats = self._stats.get(model)
+            summary = stats.summary() if stats else None
+        if not summary or summary['samples'] < self.min_samples:
+            return True
+        return summary['p95_ms'] <= route.slo_p95_ms and summary['error_rate'] <= route.max_error_rate
+
+    def candidates(self, task: str) -> List[str]:
+        """Models of the task's route, healthy ones first"""
+        route = self.route(task)
+        healthy = [model for model in route.models if self.healthy(model, route)]
+        return healthy + [model for model in route.models if model not in healthy]
+
+    def run(self, task: str, call: Callable[[str, ModelRoute], Any]) -> Any:
+        """
+        Run ``call(model, route)`` on the best available model.
+
+        Args:
+            task: Task name (parse, analyze, score, section_feedback, optimize)
+            call: Performs the request with the given model and route settings
+
+        Returns:
+            Any: Result of the first successful call
+
+        Raises:
+            QuotaExceededError: At once, without counting against the model
+            Exception: The last model's error if every model failed
+        """
+        route = self.route(task)
+        models = self.candidates(task)
+        if not models:
+            raise ValueError(f"Model route for task {task} has no models")
+        if models[:1] != route.models[:1]:
+            logger.info(f"Routing {task} to {models[0]} (primary {route.models[0]} breaching SLO)")
+
+        last_error: Optional[Exception] = None
+        for model in models:
+            started = time.perf_counter()
+            try:
+                result = call(model, route)
+            except QuotaExceededError:
+                # The user's budget, not the model: no other model would succeed
+                raise
+            except Exception as e:
+                self.record(model, (time.perf_counter() - started) * 1000, ok=False)
+                logger.warning(f"{task} call to {model} failed: {str(e)}")
+                last_error = e
+                continue
+            self.record(model, (time.perf_counter() - started) * 1000, ok=True)
+            return result
+        raise last_error
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Routes with their current model order and per-model rolling stats"""
+        with self._lock:
+            stats = {model: model_stats.summary() for model, model_stats in self._stats.items()}
+        return {
+            'routes': {
+                task: dict(asdict(route), active_order=self.candidates(task))
+                for task, route in self.routes.items()
+            },
+            'models': stats,
+            'window_seconds': self.window_seconds
+        }
+
+
+_default_router: Optional[ModelRouter] = None
+_default_lock = threading.Lock()
+
+
+def get_model_router() -> ModelRouter:
+    """Return the process-wide ModelRouter instance"""
+    global _default_router
+    if _default_router is None:
+        with _default_lock:
+            if _default_router is None:
+                _default_router = ModelRouter()
+    return _default_router
@@ -17,9 +17,11 @@ from sqlalchemy import text
 
 from app.extensions import db
 from app.models.temp import User, GoogleAuth
-import google.oauth2.credentials
-import google.auth.transport.requests
-from googleapiclient.discovery import build
+from app.utils.lazy_import import LazyImport
+
+Credentials = LazyImport('google.oauth2.credentials', 'Credentials')
+Request = LazyImport('google.auth.transport.requests', 'Request')
+build = LazyImport('googleapiclient.discovery', 'build')
 
 
 class OAuthPersistenceError(Exception):
@@ -245,7 +247,7 @@ class OAuthPersistenceService:
         """
         try:
             # Create credentials object
-            credentials = google.oauth2.credentials.Credentials(
+            credentials = Credentials(
                 token=auth.access_token,
                 refresh_token=auth.refresh_token,
                 token_uri='https://oauth2.googleapis.com/token',
@@ -255,7 +257,7 @@ class OAuthPersistenceService:
             )
             
             # Perform refresh
-            request_obj = google.auth.transport.requests.Request()
+            request_obj = Request()
             credentials.refresh(request_obj)
             
             # Update database record
@@ -326,7 +328,7 @@ class OAuthPersistenceService:
                 auth = GoogleAuth.query.get(auth_id)
             
             # Build Google Drive service
-            credentials = google.oauth2.credentials.Credentials(
+            credentials = Credentials(
                 token=auth.access_token,
                 refresh_token=auth.refresh_token,
                 token_uri='https://oauth2.googleapis.com/token',
@@ -16,6 +16,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from app.extensions import db
 from app.models.temp import User, PasswordResetToken
 from app.services.email_service import email_service, EmailResult
+from app.utils.rate_limiter import get_rate_limiter
 from app.utils.password_reset_error_handler import (
     password_reset_error_handler_instance,
     password_reset_error_handler,
@@ -52,12 +53,21 @@ class PasswordResetService:
         """Initialize the password reset service."""
         self.logger = logging.getLogger(__name__)
         
-        # Rate limiting configuration (can be overridden by app config)
-        self.max_requests_per_hour = 5  # Max password reset requests per user per hour
-        self.max_requests_per_ip_per_hour = 10  # Max requests per IP per hour
+        # Rate limits are the password_reset_user / password_reset_ip policies
+        # of app.utils.rate_limiter (overridable through RATE_LIMITS)
         self.token_expiry_hours = 1  # Token expiry time in hours
         self.cleanup_interval_hours = 24  # How often to cleanup expired tokens
 
+    @property
+    def max_requests_per_hour(self) -> int:
+        """Max password reset requests per user per hour"""
+        return get_rate_limiter().policy('password_reset_user').limit
+
+    @property
+    def max_requests_per_ip_per_hour(self) -> int:
+        """Max password reset requests per IP per hour"""
+        return get_rate_limiter().policy('password_reset_ip').limit
+
     def _convert_error_to_result(self, error_dict: Dict[str, Any]) -> PasswordResetResult:
         """Convert error handler dict to PasswordResetResult"""
         return PasswordResetResult(
@@ -86,6 +96,11 @@ class PasswordResetService:
         """
         Check rate limits for password reset requests.
         
+        Counts the request against the shared rate limiter (per IP address,
+        then per user, each over a sliding hour) instead of counting recent
+        tokens in the database. The user is only charged once the IP check
+        has passed.
+        
         Args:
             user_id: ID of the user requesting reset
             ip_address: IP address of the request
@@ -93,34 +108,19 @@ class PasswordResetService:
         Returns:
             Tuple of (is_allowed, reason)
         """
-        try:
-            current_time = datetime.utcnow()
-            hour_ago = current_time - timedelta(hours=1)
-            
-            # Check user-specific rate limit
-            user_requests = PasswordResetToken.query.filter(
-                PasswordResetToken.user_id == user_id,
-                PasswordResetToken.created_at > hour_ago
-            ).count()
-            
-            if user_requests >= self.max_requests_per_hour:
-                return False, f"Too many password reset requests. Please wait before trying again."
-            
-            # Check IP-specific rate limit
-            ip_requests = PasswordResetToken.query.filter(
-                PasswordResetToken.ip_address == ip_address,
-                PasswordResetToken.created_at > hour_ago
-            ).count()
-            
-            if ip_requests >= self.max_requests_per_ip_per_hour:
-                return False, f"Too many password reset requests from this location. Please wait before trying again."
-            
-            return True, "Rate limit check passed"
-            
-        except SQLAlchemyError as e:
-            self.logger.error(f"Database error during rate limit check: {e}")
-            # In case of database error, allow the request but log it
-            return True, "Rate limit check failed - allowing request"
+        limiter = get_rate_limiter()
+        
+        # Check IP-specific rate limit first: requests rejected here must not
+        # use up the user's allowance, or one address could lock an account
+        # out of password resets
+        if not limiter.hit('password_reset_ip', ip_address).allowed:
+            return False, f"Too many password reset requests from this location. Please wait before trying again."
+        
+        # Check user-specific rate limit
+        if not limiter.hit('password_reset_user', user_id).allowed:
+            return False, f"Too many password reset requests. Please wait before trying again."
+        
+        return True, "Rate limit check passed"
 
     def _revoke_existing_tokens(self, user_id: int) -> int:
         """
@@ -0,0 +1,483 @@
+"""
+PDF Extraction Engine for page-level text extraction
+Pluggable backends (pypdfium2, pdfminer.six, pypdf) run in a long-lived
+process pool, with CPU and wall-clock limits per file and page ranges of
+large documents extracted in parallel
+
+Settings come from the environment:
+    PDF_EXTRACTION_BACKENDS: Backend order (default pypdfium2,pdfminer,pypdf)
+    PDF_EXTRACTION_TIME_LIMIT: Seconds per file (default 30)
+    PDF_EXTRACTION_PARALLEL_PAGES: Pages above which a document is split
+        into parallel page ranges (default 8)
+    PDF_EXTRACTION_WORKERS: Pool processes per server worker (default CPU
+        count, at most 4)
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import io
+import os
+import time
+import signal
+import logging
+import tempfile
+import threading
+import multiprocessing
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import resource
+except ImportError:  # Non-POSIX platforms
+    resource = None
+
+from app.utils.lazy_import import LazyImport
+
+# Backends are imported on first use and falsy when not installed
+# Native backends (optional)
+pypdfium2 = LazyImport('pypdfium2')
+
+PDFPage = LazyImport('pdfminer.pdfpage', 'PDFPage')
+PDFResourceManager = LazyImport('pdfminer.pdfinterp', 'PDFResourceManager')
+PDFPageInterpreter = LazyImport('pdfminer.pdfinterp', 'PDFPageInterpreter')
+TextConverter = LazyImport('pdfminer.converter', 'TextConverter')
+LAParams = LazyImport('pdfminer.layout', 'LAParams')
+
+# Pure-Python fallback
+PdfReader = LazyImport('pypdf', 'PdfReader')
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND_ORDER = ('pypdfium2', 'pdfminer', 'pypdf')
+
+
+class PDFExtractionError(Exception):
+    """Raised when no backend could extract text from a PDF"""
+    pass
+
+
+class PDFExtractionTimeout(PDFExtractionError):
+    """Raised when extraction exceeds the configured per-file time limit"""
+    pass
+
+
+@dataclass
+class PDFExtractionResult:
+    """Result object for PDF text extraction"""
+    pages: List[str] = field(default_factory=list)
+    page_count: int = 0
+    backend: Optional[str] = None
+    processing_time: float = 0.0
+    parallel: bool = False
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    def join(self, separator: str = '\n\n') -> str:
+        """Join non-empty page texts with the given separator"""
+        return separator.join(page for page in self.pages if page and page.strip())
+
+
+# ---------------------------------------------------------------------------
+# Backends
+#
+# Each backend takes the raw PDF bytes, an optional (start, stop) page range
+# and an optional ``checkpoint`` callable invoked before every page, and
+# returns (page_count, [page_text, ...]) for that range. They are plain
+# module-level functions so they can be shipped to process pool workers.
+# ---------------------------------------------------------------------------
+
+def _pypdfium2_pages(data: bytes, page_range: Optional[Tuple[int, int]] = None,
+                     checkpoint: Optional[Callable] = None,
+                     reader_factory: Optional[Callable] = None) -> Tuple[int, List[str]]:
+    pdf = pypdfium2.PdfDocument(data)
+    try:
+        page_count = len(pdf)
+        start, stop = page_range or (0, page_count)
+        texts = []
+        for index in range(start, min(stop, page_count)):
+            if checkpoint:
+                checkpoint()
+            page = pdf[index]
+            text_page = page.get_textpage()
+            try:
+                texts.append(text_page.get_text_range())
+            finally:
+                text_page.close()
+                page.close()
+        return page_count, texts
+    finally:
+        pdf.close()
+
+
+def _pdfminer_pages(data: bytes, page_range: Optional[Tuple[int, int]] = None,
+                    checkpoint: Optional[Callable] = None,
+                    reader_factory: Optional[Callable] = None) -> Tuple[int, List[str]]:
+    # One parse: pages are read lazily and only those in range interpreted
+    start, stop = page_range or (0, None)
+    resources = PDFResourceManager()
+    page_count, texts = 0, []
+    for index, page in enumerate(PDFPage.get_pages(io.BytesIO(data))):
+        page_count += 1
+        if index < start or (stop is not None and index >= stop):
+            continue
+        if checkpoint:
+            checkpoint()
+        output = io.StringIO()
+        device = TextConverter(resources, output, laparams=LAParams())
+        try:
+            PDFPageInterpreter(resources, device).process_page(page)
+        finally:
+            device.close()
+        texts.append(output.getvalue())
+    return page_count, texts
+
+
+def _pypdf_pages(data: bytes, page_range: Optional[Tuple[int, int]] = None,
+                 checkpoint: Optional[Callable] = None,
+                 reader_factory: Optional[Callable] = None) -> Tuple[int, List[str]]:
+    reader = (reader_factory or PdfReader)(io.BytesIO(data))
+    pages = reader.pages
+    page_count = len(pages)
+    start, stop = page_range or (0, page_count)
+    texts = []
+    for index in range(start, min(stop, page_count)):
+        if checkpoint:
+            checkpoint()
+        try:
+            texts.append(pages[index].extract_text() or '')
+        except Exception as e:
+            # Log page-specific error but continue
+            logger.warning(f"Failed to extract text from page {index + 1}: {str(e)}")
+            texts.append('')
+    return page_count, texts
+
+
+BACKENDS: Dict[str, Callable] = {
+    'pypdfium2': _pypdfium2_pages,
+    'pdfminer': _pdfminer_pages,
+    'pypdf': _pypdf_pages,
+}
+
+
+def _backend_available(name: str) -> bool:
+    if name == 'pypdfium2':
+        return bool(pypdfium2)
+    if name == 'pdfminer':
+        return bool(PDFPage)
+    if name == 'pypdf':
+        return bool(PdfReader)
+    return False
+
+
+def _extract_range_worker(backend: str, source, start: int, stop: Optional[int],
+                          time_limit: Optional[float]) -> Tuple[int, List[str]]:
+    """
+    Pool task: extract one page range (to the end when ``stop`` is None).
+
+    ``source`` is the PDF bytes or the path of a temporary copy shared by the
+    tasks of one document.
+    """
+    if isinstance(source, str):
+        with open(source, 'rb') as handle:
+            source = handle.read()
+    _apply_limits(time_limit)
+    try:
+        return BACKENDS[backend](source, None if stop is None else (start, stop))
+    finally:
+        if time_limit and hasattr(signal, 'alarm'):
+            signal.alarm(0)
+
+
+def _apply_limits(time_limit: Optional[float]) -> None:
+    """
+    Bound the current task by CPU time (RLIMIT_CPU) and wall-clock time.
+
+    RLIMIT_CPU is cumulative for the process, so the soft limit is set relative
+    to the CPU time already consumed; exceeding it delivers SIGXCPU. A task
+    blocked without using CPU is ended by SIGALRM shortly after the caller has
+    given up. Both signals terminate the worker, which the pool replaces.
+    """
+    if not time_limit:
+        return
+    if hasattr(signal, 'alarm'):
+        signal.alarm(int(time_limit) + 2)
+    if resource is None:
+        return
+    try:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        used = int(usage.ru_utime + usage.ru_stime)
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        soft = used + max(1, int(time_limit) + 1)
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    except (ValueError, OSError):
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Process pool
+#
+# One pool per server worker, created after the fork (start_extraction_pool
+# from the post-fork hook, or on first use) and shut down when the worker
+# exits. Pool processes come from a forkserver (spawn where unavailable), so
+# the multi-threaded server worker is never forked.
+# ---------------------------------------------------------------------------
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+
+
+def _pool_context():
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        # The fork server imports the backends once; its children inherit them
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+def get_extraction_pool() -> ProcessPoolExecutor:
+    """Return this process's extraction pool, creating it if needed"""
+    global _pool, _pool_pid
+    with _pool_lock:
+        # A pool inherited across a fork belongs to the parent
+        if _pool is None or _pool_pid != os.getpid():
+            workers = int(os.getenv('PDF_EXTRACTION_WORKERS', min(4, os.cpu_count() or 1)))
+            _pool = ProcessPoolExecutor(max_workers=max(1, workers), mp_context=_pool_context())
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def start_extraction_pool() -> None:
+    """Create the pool of a freshly forked server worker"""
+    get_extraction_pool()
+
+
+def shutdown_extraction_pool(wait: bool = True) -> None:
+    """Shut down this process's pool (call from the worker-exit hook)"""
+    global _pool
+    with _pool_lock:
+        pool = _pool if _pool_pid == os.getpid() else None
+        _pool = None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def _recycle_pool(broken: ProcessPoolExecutor) -> None:
+    """Replace a pool that lost a worker; the next caller gets a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False)
+
+
+class PDFExtractionEngine:
+    """
+    Pluggable PDF text extraction engine.
+
+    Backends are tried in order until one succeeds. Every document is
+    extracted in the shared process pool, where a malformed file is stopped by
+    the CPU and wall-clock limits of its task. The first task extracts up to
+    ``parallel_page_threshold`` pages, which covers ordinary resumes in one
+    parse; the rest of a larger document is split into page ranges extracted
+    concurrently. An injected ``reader_factory`` (e.g. a test double) can't be
+    shipped to the pool and runs in-process with a deadline checked between
+    pages.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None,
+                 reader_factory: Optional[Callable] = None):
+        """
+        Initialize the extraction engine with configuration.
+
+        Args:
+            config (Dict[str, Any], optional): Configuration dictionary containing:
+                - backends: Ordered backend names (default: PDF_EXTRACTION_BACKENDS
+                  env or pypdfium2, pdfminer, pypdf)
+                - time_limit_seconds: Per-file time limit (default: 30)
+                - parallel_page_threshold: Pages extracted by the first task;
+                  the rest is split into parallel ranges (default: 8)
+                - pages_per_task: Pages per parallel range (default: 4)
+                - max_workers: Ranges are only run in parallel above 1
+                  (default: CPU count, max 4)
+            reader_factory (Callable, optional): PdfReader replacement used by
+                the in-process pypdf backend
+        """
+        self.config = config or {}
+
+        backends = self.config.get('backends') or os.getenv('PDF_EXTRACTION_BACKENDS')
+        if isinstance(backends, str):
+            backends = [name.strip() for name in backends.split(',') if name.strip()]
+        self.backends = [name for name in (backends or DEFAULT_BACKEND_ORDER) if name in BACKENDS]
+
+        self.time_limit_seconds = float(self.config.get(
+            'time_limit_seconds', os.getenv('PDF_EXTRACTION_TIME_LIMIT', 30)))
+        self.parallel_page_threshold = int(self.config.get(
+            'parallel_page_threshold', os.getenv('PDF_EXTRACTION_PARALLEL_PAGES', 8)))
+        self.pages_per_task = max(1, int(self.config.get('pages_per_task', 4)))
+        self.max_workers = int(self.config.get(
+            'max_workers', os.getenv('PDF_EXTRACTION_WORKERS', min(4, os.cpu_count() or 1))))
+        self.reader_factory = reader_factory
+
+    def available_backends(self) -> List[str]:
+        """Return configured backends whose packages are installed"""
+        return [name for name in self.backends
+                if name == 'pypdf' and self.reader_factory is not None or _backend_available(name)]
+
+    def extract(self, data: bytes, backends: Optional[Iterable[str]] = None) -> PDFExtractionResult:
+        """
+        Extract per-page text from PDF bytes.
+
+        Args:
+            data: Raw PDF content
+            backends: Optional backend order overriding the configured one
+
+        Returns:
+            PDFExtractionResult: Page texts and the backend that produced them
+
+        Raises:
+            PDFExtractionTimeout: If the per-file time limit is exceeded
+            PDFExtractionError: If every backend failed
+        """
+        start_time = time.time()
+        errors: Dict[str, str] = {}
+        candidates = list(backends) if backends else self.available_backends()
+
+        if not candidates:
+            raise PDFExtractionError("PDF processing requires pypdfium2, pdfminer.six or pypdf package")
+
+        for backend in candidates:
+            try:
+                page_count, pages, parallel = self._extract_with(backend, data, start_time)
+                return PDFExtractionResult(
+                    pages=pages,
+                    page_count=page_count,
+                    backend=backend,
+                    processing_time=time.time() - start_time,
+                    parallel=parallel,
+                    errors=errors
+                )
+            except PDFExtractionTimeout:
+                raise
+            except Exception as e:
+                logger.debug(f"PDF backend {backend} failed: {str(e)}")
+                errors[backend] = str(e)
+
+        details = '; '.join(f"{name}: {message}" for name, message in errors.items())
+        raise PDFExtractionError(f"All PDF backends failed ({details})")
+
+    def _extract_with(self, backend: str, data: bytes, start_time: float) -> Tuple[int, List[str], bool]:
+        """Run one backend in the process pool (in-process for injected readers)"""
+        if self.reader_factory is not None and backend == 'pypdf':
+            checkpoint = lambda: self._check_deadline(start_time)
+            page_count, pages = BACKENDS[backend](data, None, checkpoint, self.reader_factory)
+            return page_count, pages, False
+
+        pool = get_extraction_pool()
+        try:
+            return self._extract_pooled(pool, backend, data, start_time)
+        except BrokenProcessPool:
+            # A worker died: this task's limits, or another request's. Retry
+            # once on a fresh pool within the time that is left
+            _recycle_pool(pool)
+            if self.time_limit_seconds and not self._remaining(start_time):
+                raise PDFExtractionTimeout(f"PDF extraction exceeded {self.time_limit_seconds:g}s limit")
+            try:
+                return self._extract_pooled(get_extraction_pool(), backend, data, start_time)
+            except BrokenProcessPool:
+                raise PDFExtractionTimeout(f"PDF extraction exceeded {self.time_limit_seconds:g}s limit")
+
+    def _extract_pooled(self, pool: ProcessPoolExecutor, backend: str, data: bytes,
+                        start_time: float) -> Tuple[int, List[str], bool]:
+        first_stop = self.parallel_page_threshold if self.max_workers > 1 else None
+        page_count, pages = self._results(
+            [pool.submit(_extract_range_worker, backend, data, 0, first_stop, self._remaining(start_time))],
+            start_time
+        )[0]
+        if first_stop is None or page_count <= first_stop:
+            return page_count, pages, False
+
+        # The tasks of the remaining ranges share one temporary copy of the file
+        handle = tempfile.NamedTemporaryFile(prefix='pdf_extract_', suffix='.pdf', delete=False)
+        try:
+            with handle:
+                handle.write(data)
+            ranges = [(start, min(start + self.pages_per_task, page_count))
+                      for start in range(first_stop, page_count, self.pages_per_task)]
+            futures = [pool.submit(_extract_range_worker, backend, handle.name, start, stop,
+                                   self._remaining(start_time))
+                       for start, stop in ranges]
+            for _, texts in self._results(futures, start_time):
+                pages.extend(texts)
+            return page_count, pages, True
+        finally:
+            os.remove(handle.name)
+
+    def _results(self, futures: List, start_time: float) -> List[Tuple[int, List[str]]]:
+        """Wait for pool tasks until the deadline; cancel the rest if it passes"""
+        done, pending = wait(futures, timeout=self._remaining(start_time))
+        if pending:
+            for future in pending:
+                future.cancel()
+            raise PDFExtractionTimeout(f"PDF extraction exceeded {self.time_limit_seconds:g}s limit")
+        return [future.result() for future in futures]
+
+    def _remaining(self, start_time: float) -> Optional[float]:
+        if not self.time_limit_seconds:
+            return None
+        return max(0.0, self.time_limit_seconds - (time.time() - start_time))
+
+    def _check_deadline(self, start_time: float) -> None:
+        if self.time_limit_seconds and time.time() - start_time > self.time_limit_seconds:
+            raise PDFExtractionTimeout(f"PDF extraction exceeded {self.time_limit_seconds:g}s limit")
+
+    def benchmark(self, paths: Iterable[str], repeat: int = 3) -> List[Dict[str, Any]]:
+        """
+        Time each available backend on the given PDF files.
+
+        Args:
+            paths: PDF file paths to benchmark
+            repeat: Number of runs per backend and file (best time is reported)
+
+        Returns:
+            List[Dict[str, Any]]: One row per (file, backend) with timing and output size
+        """
+        rows = []
+        for path in paths:
+            with open(path, 'rb') as handle:
+                data = handle.read()
+            for backend in self.available_backends():
+                timings = []
+                row = {'file': os.path.basename(path), 'backend': backend}
+                try:
+                    for _ in range(max(1, repeat)):
+                        result = self.extract(data, backends=[backend])
+                        timings.append(result.processing_time)
+                    row.update({
+                        'pages': result.page_count,
+                        'characters': len(result.join()),
+                        'best_seconds': min(timings),
+                        'mean_seconds': sum(timings) / len(timings),
+                        'parallel': result.parallel,
+                    })
+                except PDFExtractionError as e:
+                    row['error'] = str(e)
+                rows.append(row)
+        return rows
+
+
+_default_engine: Optional[PDFExtractionEngine] = None
+
+
+def get_pdf_extraction_engine() -> PDFExtractionEngine:
+    """Return the shared engine configured from environment variables"""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = PDFExtractionEngine()
+    return _default_engine
@@ -0,0 +1,237 @@
+"""
+Prompt Builder for compact, token-budgeted LLM prompts
+Minified schemas, whitespace-normalized inputs and tiktoken-based trimming of
+low-value content, with per-prompt token accounting
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import os
+import re
+import json
+import logging
+import textwrap
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from app.utils.lazy_import import LazyImport
+
+# Falsy when unavailable; token counts then fall back to a character-based estimate
+tiktoken = LazyImport('tiktoken')
+
+
+logger = logging.getLogger(__name__)
+
+# Approximate characters per token when tiktoken is unavailable
+CHARS_PER_TOKEN = 4
+
+TRUNCATION_MARKER = ' …[truncated]'
+
+_SPACES = re.compile(r'[ \t\f\v]+')
+_BLANK_LINES = re.compile(r'\n{3,}')
+
+
+def compact_json(value: Any) -> str:
+    """Serialize JSON without indentation or spaces after separators"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def minify_schema(schema: Dict[str, Any]) -> str:
+    """Compact JSON of a response template, with empty-string placeholders kept"""
+    return compact_json(schema)
+
+
+def prune_empty(value: Any) -> Any:
+    """
+    Drop empty strings, empty containers and None from a JSON document.
+
+    Booleans and numbers are kept (``isPresent: false`` is meaningful).
+    """
+    if isinstance(value, dict):
+        pruned = {key: prune_empty(item) for key, item in value.items()}
+        return {key: item for key, item in pruned.items() if item not in ('', None, [], {})}
+    if isinstance(value, list):
+        pruned = [prune_empty(item) for item in value]
+        return [item for item in pruned if item not in ('', None, [], {})]
+    if isinstance(value, str):
+        return normalize_whitespace(value)
+    return value
+
+
+def normalize_whitespace(text: Optional[str]) -> str:
+    """Collapse runs of spaces, trailing whitespace and repeated blank lines"""
+    if not text:
+        return ''
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    lines = [_SPACES.sub(' ', line).strip() for line in text.split('\n')]
+    return _BLANK_LINES.sub('\n\n', '\n'.join(lines)).strip()
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    """
+    tiktoken encoding for ``model``, or None to use the character estimate.
+
+    Loading an encoding can fail in many ways besides an unknown model (no
+    network to fetch the BPE file, a read-only cache directory); the
+    failure is cached like a success, so it is only paid once per model.
+    """
+    if not tiktoken:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding('o200k_base')
+    except Exception as e:
+        logger.warning(f"tiktoken encoding for {model} unavailable, estimating tokens: {str(e)}")
+        return None
+
+
+def count_tokens(text: str, model: str = 'gpt-4o-mini') -> int:
+    """Number of tokens ``text`` encodes to for ``model``"""
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    # Text that happens to contain special tokens is counted as plain text
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = 'gpt-4o-mini') -> str:
+    """Cut ``text`` to at most ``max_tokens`` tokens, marking the cut"""
+    if max_tokens <= 0:
+        return ''
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    # Keep room for the marker so the result stays within max_tokens
+    keep = max(0, max_tokens - count_tokens(TRUNCATION_MARKER, model))
+    encoding = _encoding(model)
+    if encoding is None:
+        return text[:keep * CHARS_PER_TOKEN].rstrip() + TRUNCATION_MARKER
+    return encoding.decode(encoding.encode(text, disallowed_special=())[:keep]).rstrip() + TRUNCATION_MARKER
+
+
+@dataclass
+class PromptSection:
+    """
+    One labelled block of a prompt.
+
+    Trimmable sections are shortened (lowest ``priority`` first, never below
+    ``min_tokens``) when the prompt exceeds its budget.
+    """
+    label: str
+    content: str
+    trimmable: bool = False
+    priority: int = 0
+    min_tokens: int = 200
+
+
+@dataclass
+class BuiltPrompt:
+    """A rendered prompt with its token accounting"""
+    name: str
+    text: str
+    tokens: int
+    budget: int
+    trimmed: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.tokens > self.budget
+
+
+_stats_lock = threading.Lock()
+_prompt_stats: Dict[str, Dict[str, int]] = {}
+
+
+def get_prompt_stats() -> Dict[str, Dict[str, int]]:
+    """Per-prompt counters: calls, total/max tokens and trimmed prompts"""
+    with _stats_lock:
+        return {name: dict(stats) for name, stats in _prompt_stats.items()}
+
+
+class PromptBuilder:
+    """
+    Build compact prompts within a token budget.
+
+    The budget comes from ``PROMPT_MAX_TOKENS`` (default 12000) unless given
+    explicitly. Instructions are dedented, section contents are
+    whitespace-normalized, and trimmable sections are truncated token-exactly
+    (with tiktoken) until the whole prompt fits.
+    """
+
+    def __init__(self, model: str = 'gpt-4o-mini', max_tokens: Optional[int] = None):
+        self.model = model
+        self.max_tokens = max_tokens or int(os.getenv('PROMPT_MAX_TOKENS', '12000'))
+
+    def build(self, name: str, instructions: str, sections: List[PromptSection],
+              footer: str = '') -> BuiltPrompt:
+        """
+        Render a prompt.
+
+        Args:
+            name: Prompt name used for token accounting
+            instructions: Leading instructions (dedented and normalized)
+            sections: Labelled content blocks, in order
+            footer: Closing instructions
+
+        Returns:
+            BuiltPrompt: The prompt text and its token count
+        """
+        head = normalize_whitespace(textwrap.dedent(instructions))
+        tail = normalize_whitespace(textwrap.dedent(footer))
+        contents = {section.label: normalize_whitespace(section.content) for section in sections}
+        trimmed: Dict[str, int] = {}
+
+        text = self._render(head, sections, contents, tail)
+        tokens = count_tokens(text, self.model)
+        excess = tokens - self.max_tokens
+        if excess > 0:
+            for section in sorted((s for s in sections if s.trimmable), key=lambda s: s.priority):
+                current = count_tokens(contents[section.label], self.model)
+                target = max(section.min_tokens, current - excess)
+                if target >= current:
+                    continue
+                contents[section.label] = truncate_to_tokens(contents[section.label], target, self.model)
+                trimmed[section.label] = current - target
+                excess -= current - target
+                if excess <= 0:
+                    break
+            text = self._render(head, sections, contents, tail)
+            tokens = count_tokens(text, self.model)
+
+        built = BuiltPrompt(name=name, text=text, tokens=tokens, budget=self.max_tokens, trimmed=trimmed)
+        self._record(built)
+        return built
+
+    @staticmethod
+    def _render(head: str, sections: List[PromptSection], contents: Dict[str, str], tail: str) -> str:
+        parts = [head] if head else []
+        for section in sections:
+            if contents[section.label]:
+                parts.append(f"{section.label}:\n{contents[section.label]}")
+        if tail:
+            parts.append(tail)
+        return '\n\n'.join(parts)
+
+    @staticmethod
+    def _record(built: BuiltPrompt) -> None:
+        with _stats_lock:
+            stats = _prompt_stats.setdefault(built.name, {'calls': 0, 'tokens': 0, 'max_tokens': 0, 'trimmed': 0})
+            stats['calls'] += 1
+            stats['tokens'] += built.tokens
+            stats['max_tokens'] = max(stats['max_tokens'], built.tokens)
+            if built.trimmed:
+                stats['trimmed'] += 1
+
+        if built.trimmed:
+            logger.info(f"Prompt {built.name}: {built.tokens} tokens after trimming {built.trimmed}")
+        else:
+            logger.debug(f"Prompt {built.name}: {built.tokens} tokens")
+        if built.over_budget:
+            logger.warning(f"Prompt {built.name} exceeds its budget ({built.tokens} > {built.budget} tokens)")
@@ -1,10 +1,18 @@
 from datetime import datetime, UTC
-from openai import OpenAI
 import os
 import json
 from app.response_template.resume_schema import RESUME_TEMPLATE
 from app.response_template.analysis_schema import ANALYSIS_TEMPLATE
 from app.response_template.scoring_schema import SCORING_TEMPLATE
+from app.services.resume_scorer import ResumeScorer, score_resume_locally
+from app.services.single_flight import coalesce
+from app.services.prompt_builder import PromptBuilder, PromptSection, compact_json, minify_schema, prune_empty
+from app.services.structured_output import StructuredOutputError, complete_json, decode_json
+from app.services.model_router import get_model_router
+from app.services.ai_usage import current_usage_context, get_usage_ledger, metered, usage_context
+from app.utils.lazy_import import LazyImport
+
+OpenAI = LazyImport('openai', 'OpenAI')
 
 class ResumeAI:
     def __init__(self, extracted_text: str):
@@ -12,48 +20,87 @@ class ResumeAI:
         self.extracted_text = extracted_text
         self.parsed_resume = None
         self.analysis = None
-        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        # Budgeted, lane-scheduled and recorded in the AI usage ledger
+        self.client = metered(OpenAI(api_key=os.getenv('OPENAI_API_KEY')))
         self.timestamp = datetime.now(UTC).isoformat()
         self.resume_id = None
+        self.prompt_builder = PromptBuilder()
+        self.router = get_model_router()
+        # Token accounting of the most recent prompt (see PromptBuilder)
+        self.last_prompt = None
 
-    def parse(self) -> dict:
-        """Parse resume text into structured format using OpenAI"""
-        prompt = f"""
-        Please analyze this resume text and fill in the data according to this structure:
-        {json.dumps(RESUME_TEMPLATE, indent=2)}
+    def _build_prompt(self, name: str, instructions: str, sections: list, footer: str) -> str:
+        """Render a compact, budgeted prompt and remember its token count"""
+        self.last_prompt = self.prompt_builder.build(name, instructions, sections, footer)
+        return self.last_prompt.text
 
-        Important instructions:
-        1. Follow the exact schema structure
-        2. Create as many entries in arrays as found in the resume
-        3. Use "YYYY-MM" format for all dates
-        4. Required fields must be filled
-        5. Leave optional fields empty if not found in resume
+    def _complete(self, task: str, messages: list, template: dict = None):
+        """Run a JSON completion on the task's routed model, falling back on errors or SLO breaches"""
+        return self._routed(task, lambda model, route: complete_json(
+            self.client,
+            messages,
+            model=model,
+            template=template,
+            temperature=route.temperature,
+            timeout=route.timeout_seconds
+        ))
 
-        Resume text:
-        {self.extracted_text}
+    def _routed(self, task: str, call):
+        """Run ``call(model, route)`` through the model router, attributing usage to the task"""
+        with usage_context(task=task):
+            # Over-budget users are rejected before any model is tried
+            get_usage_ledger().check_budget(current_usage_context()['user_id'])
+            return self.router.run(task, call)
 
-        Return only the filled JSON structure.
+    def _coalesced(self, task: str, namespace: str, payload: dict, func, charged: bool = True):
         """
+        Run ``func`` through single-flight coalescing under the task's usage context.
+
+        The budget is checked before joining an in-flight call, so an
+        over-budget user can't receive another user's result; a caller served
+        a shared result is recorded in the ledger as a zero-token call.
+        """
+        with usage_context(task=task):
+            if charged:
+                get_usage_ledger().check_budget(current_usage_context()['user_id'])
+            return coalesce(namespace, payload, func, on_shared=lambda: get_usage_ledger().record('coalesced'))
+
+    def parse(self) -> dict:
+        """Parse resume text into structured format using OpenAI"""
+        # Identical concurrent parses (retries, double submits) share one call
+        self.parsed_resume = self._coalesced('parse', 'resume_ai.parse', {'text': self.extracted_text}, self._parse)
+        return self.parsed_resume
+
+    def _parse(self) -> dict:
+        prompt = self._build_prompt(
+            'parse',
+            """
+            Please analyze this resume text and fill in the data according to this structure:
+            """,
+            [
+                PromptSection('Structure', minify_schema(RESUME_TEMPLATE)),
+                PromptSection('Resume text', self.extracted_text or '', trimmable=True, min_tokens=1000)
+            ],
+            """
+            Important instructions:
+            1. Follow the exact schema structure
+            2. Create as many entries in arrays as found in the resume
+            3. Use "YYYY-MM" format for all dates
+            4. Required fields must be filled
+            5. Leave optional fields empty if not found in resume
+
+            Return only the filled JSON structure.
+            """
+        )
 
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", 
-                     "content": "You are a precise resume parser that extracts structured data."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7
-            )
-            
-            # Get content
-            content = response.choices[0].message.content
-            
-            # Remove markdown wrapper
-            cleaned_content = content.replace("```json", "").replace("```", "").strip()
-            
-            # Store the parsed result
-            self.parsed_resume = json.loads(cleaned_content)
+            # JSON mode plus local repair; missing fields are filled with empty defaults
+            messages = [
+                {"role": "system", 
+                 "content": "You are a precise resume parser that extracts structured data."},
+                {"role": "user", "content": prompt}
+            ]
+            self.parsed_resume = self._complete('parse', messages, template=RESUME_TEMPLATE)
             return self.parsed_resume
             
         except Exception as e:
@@ -64,41 +111,46 @@ class ResumeAI:
         if not self.parsed_resume:
             self.parse()  # Parse first if not already parsed
         
-        prompt = f"""
-        Analyze this resume against the job description and provide analysis according to this structure:
-        {json.dumps(ANALYSIS_TEMPLATE, indent=2)}
+        self.analysis = self._coalesced(
+            'analyze',
+            'resume_ai.analyze',
+            {'resume': self.parsed_resume, 'job_description': job_description},
+            lambda: self._analyze(job_description)
+        )
+        return self.analysis
 
-        Resume Data:
-        {json.dumps(self.parsed_resume, indent=2)}
-        
-        Job Description:
-        {job_description}
-        
-        Important instructions:
-        1. Follow the exact analysis schema structure
-        2. Score each section from 0-100
-        3. Provide detailed comments for each section
-        4. Match each work experience, education, and project entry from the resume
-        
-        Return only the filled analysis structure.
-        """
-        
+    def analysis_messages(self, job_description: str) -> list:
+        """Chat messages of the analysis request (also used for offline bulk jobs)"""
+        prompt = self._build_prompt(
+            'analyze',
+            """
+            Analyze this resume against the job description and provide analysis according to this structure:
+            """,
+            [
+                PromptSection('Structure', minify_schema(ANALYSIS_TEMPLATE)),
+                PromptSection('Resume Data', compact_json(prune_empty(self.parsed_resume))),
+                PromptSection('Job Description', job_description or '', trimmable=True, min_tokens=500)
+            ],
+            """
+            Important instructions:
+            1. Follow the exact analysis schema structure
+            2. Score each section from 0-100
+            3. Provide detailed comments for each section
+            4. Match each work experience, education, and project entry from the resume
+
+            Return only the filled analysis structure.
+            """
+        )
+        return [
+            {"role": "system", "content": "You are an expert resume analyst."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _analyze(self, job_description: str) -> dict:
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an expert resume analyst."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7
+            self.analysis = self._complete(
+                'analyze', self.analysis_messages(job_description), template=ANALYSIS_TEMPLATE
             )
-            
-            # Clean and parse response
-            content = response.choices[0].message.content
-            cleaned_content = content.replace("```json", "").replace("```", "").strip()
-            
-            # Store and return the analysis
-            self.analysis = json.loads(cleaned_content)
             return self.analysis
             
         except Exception as e:
@@ -129,47 +181,56 @@ class ResumeAI:
 
     def process_section_feedback(self, section: str, subsection_data: dict, feedback: str = "") -> dict:
         """Process feedback and generate improved content for a specific section"""
-        prompt = f"""
-        Improve this resume section based on the feedback.
-        
-        Section Type: {section}
-        Current Content: {json.dumps(subsection_data, indent=2)}
-        User Feedback: {feedback if feedback else "Make this content more impactful and professional"}
-        
-        Please rewrite the content to address the feedback and improve its impact.
-        If it's a description field, maintain bullet point format.
-        Focus on being specific, quantifiable, and achievement-oriented.
-        
-        Return only the improved content in this JSON format:
-        {{
-            "Content": "improved content here"
-        }}
-        """
+        return self._coalesced(
+            'section_feedback',
+            'resume_ai.section_feedback',
+            {'section': section, 'data': subsection_data, 'feedback': feedback},
+            lambda: self._process_section_feedback(section, subsection_data, feedback)
+        )
+
+    def _process_section_feedback(self, section: str, subsection_data: dict, feedback: str = "") -> dict:
+        prompt = self._build_prompt(
+            'section_feedback',
+            """
+            Improve this resume section based on the feedback.
+            """,
+            [
+                PromptSection('Section Type', section),
+                PromptSection('Current Content', compact_json(subsection_data)),
+                PromptSection('User Feedback', feedback if feedback else "Make this content more impactful and professional",
+                              trimmable=True, min_tokens=200)
+            ],
+            """
+            Please rewrite the content to address the feedback and improve its impact.
+            If it's a description field, maintain bullet point format.
+            Focus on being specific, quantifiable, and achievement-oriented.
+
+            Return only the improved content in this JSON format:
+            {"Content": "improved content here"}
+            """
+        )
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an expert resume writer."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7
-            )
-            
-            content = response.choices[0].message.content
-            cleaned_content = content.replace("```json", "").replace("```", "").strip()
-            return json.loads(cleaned_content)
+            return self._complete('section_feedback', [
+                {"role": "system", "content": "You are an expert resume writer."},
+                {"role": "user", "content": prompt}
+            ])
             
         except Exception as e:
             raise Exception(f"Failed to process section feedback: {str(e)}")
 
-    def score_resume(self, job_description: str = "") -> dict:
+    def score_resume(self, job_description: str = "", mode: str = "full") -> dict:
         """
         Score resume with detailed sub-scores for keyword matching, 
         language expression, and ATS readability
         
+        Keyword matching and ATS readability are always computed locally by
+        ResumeScorer. In "full" mode the LLM only assesses language expression
+        and writes feedback; in "fast" mode no API call is made.
+        
         Args:
             job_description: Optional job description to score against
+            mode: "full" (LLM language review) or "fast" (local only)
             
         Returns:
             Detailed scoring breakdown with recommendations
@@ -177,66 +238,82 @@ class ResumeAI:
         if not self.parsed_resume:
             self.parse()  # Parse first if not already parsed
         
-        prompt = f"""
-        Analyze this resume and provide detailed scoring according to this structure:
-        {json.dumps(SCORING_TEMPLATE, indent=2)}
-        
-        Resume Data:
-        {json.dumps(self.parsed_resume, indent=2)}
-        
-        {f"Job Description: {job_description}" if job_description else ""}
-        
-        Scoring Guidelines:
-        
-        1. KEYWORD MATCHING (35% weight):
-           - Identify relevant keywords from the resume
-           {f"- Compare with job description keywords" if job_description else "- Evaluate industry-standard keywords"}
-           - Calculate keyword density and coverage
-           - List matched keywords and missing important ones
-           - Score based on relevance and coverage (0-100)
-        
-        2. LANGUAGE EXPRESSION (35% weight):
-           - Grammar Quality: Check for grammatical errors and proper sentence structure
-           - Professional Tone: Evaluate formality and appropriateness
-           - Clarity: Assess how clear and understandable the content is
-           - Action Verbs Usage: Check for strong action verbs vs. passive language
-           - Calculate average of these 4 sub-metrics (0-100)
-        
-        3. ATS READABILITY (30% weight):
-           - Format Compatibility: Standard sections, no complex formatting
-           - Structure Clarity: Logical flow and organization
-           - Parsing Friendliness: Easy-to-extract information
-           - Section Organization: Proper headings and hierarchy
-           - Calculate average of these 4 sub-metrics (0-100)
-        
-        4. OVERALL SCORE:
-           - Calculate weighted average: (keyword * 0.35) + (language * 0.35) + (ats * 0.30)
+        return self._coalesced(
+            'score',
+            'resume_ai.score',
+            {'resume': self.parsed_resume, 'job_description': job_description, 'mode': mode},
+            lambda: self._score_resume(job_description, mode),
+            # Fast scoring is local and stays available over budget
+            charged=mode != 'fast'
+        )
+
+    def _score_resume(self, job_description: str, mode: str) -> dict:
+        if mode == "fast":
+            result = score_resume_locally(self.parsed_resume, job_description)
+            result['scoring_mode'] = 'fast'
+            return result
         
-        5. Provide 3-5 specific recommendations for improvement
-        6. List 3-5 strengths of the resume
-        7. List 3-5 weaknesses or areas for improvement
+        result = score_resume_locally(self.parsed_resume, job_description, include_language=False)
+        language_template = {
+            "language_expression": SCORING_TEMPLATE["scores"]["language_expression"]["details"],
+            "recommendations": [],
+            "strengths": [],
+            "weaknesses": []
+        }
         
-        Return only the filled JSON structure with all scores and details.
-        """
+        keyword = result['scores']['keyword_matching']
+        prompt = self._build_prompt(
+            'score',
+            """
+            Review the writing quality of this resume and fill in this structure:
+            """,
+            [
+                PromptSection('Structure', minify_schema(language_template)),
+                PromptSection('Resume Data', compact_json(prune_empty(self.parsed_resume))),
+                PromptSection('Job Description', job_description or '', trimmable=True, min_tokens=500),
+                PromptSection('Computed checks', (
+                    f"Keyword matching: {keyword['score']}/100, missing: "
+                    f"{', '.join(keyword['details']['missing_keywords'][:10]) or 'none'}\n"
+                    f"ATS readability: {result['scores']['ats_readability']['score']}/100"
+                ))
+            ],
+            """
+            Scoring Guidelines (each 0-100):
+            - Grammar Quality: Check for grammatical errors and proper sentence structure
+            - Professional Tone: Evaluate formality and appropriateness
+            - Clarity: Assess how clear and understandable the content is
+            - Action Verbs Usage: Check for strong action verbs vs. passive language
+
+            Provide 3-5 specific recommendations, 3-5 strengths and 3-5 weaknesses
+            covering the whole resume, using the computed checks above.
+
+            Return only the filled JSON structure.
+            """
+        )
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an expert resume analyst and ATS specialist. Provide accurate, detailed scoring with actionable feedback."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7
-            )
-            
-            content = response.choices[0].message.content
-            cleaned_content = content.replace("```json", "").replace("```", "").strip()
-            
-            scoring_result = json.loads(cleaned_content)
-            return scoring_result
+            review = self._complete('score', [
+                {"role": "system", "content": "You are an expert resume analyst and ATS specialist. Provide accurate, detailed scoring with actionable feedback."},
+                {"role": "user", "content": prompt}
+            ])
             
         except Exception as e:
             raise Exception(f"Resume scoring failed: {str(e)}")
+        
+        details = dict(language_template["language_expression"])
+        details.update(review.get("language_expression") or {})
+        sub_scores = [details.get(key) for key in ("grammar_quality", "professional_tone", "clarity", "action_verbs_usage")]
+        sub_scores = [float(value) for value in sub_scores if isinstance(value, (int, float))]
+        language = result['scores']['language_expression']
+        language['details'] = details
+        language['score'] = round(sum(sub_scores) / len(sub_scores)) if sub_scores else 0
+        
+        result['overall_score'] = ResumeScorer.overall_score(result['scores'])
+        for key in ('recommendations', 'strengths', 'weaknesses'):
+            if review.get(key):
+                result[key] = review[key]
+        result['scoring_mode'] = 'full'
+        return result
     
     def optimize_content(self, resume_data: dict, job_description: str, keywords: list = None) -> dict:
         """
@@ -254,46 +331,46 @@ class ResumeAI:
             # Create a prompt for content optimization
             keywords_str = ', '.join(keywords) if keywords else ''
             
-            prompt = f"""
-            Optimize the following resume content for this job description:
-            
-            Job Description:
-            {job_description}
-            
-            Current Resume Data:
-            {json.dumps(resume_data, indent=2)}
-            
-            Target Keywords: {keywords_str}
-            
-            Please provide an optimized version that:
-            1. Matches the job requirements better
-            2. Incorporates relevant keywords naturally
-            3. Improves ATS compatibility
-            4. Maintains professional tone
-            
-            Return a JSON response with:
-            - optimized_content: The improved resume content
-            - improvements: List of specific improvements made
-            - ats_score: Estimated ATS compatibility score (0-100)
-            """
+            prompt = self._build_prompt(
+                'optimize_content',
+                """
+                Optimize the following resume content for this job description:
+                """,
+                [
+                    PromptSection('Job Description', job_description or '', trimmable=True, min_tokens=500),
+                    PromptSection('Current Resume Data', compact_json(prune_empty(resume_data))),
+                    PromptSection('Target Keywords', keywords_str)
+                ],
+                """
+                Please provide an optimized version that:
+                1. Matches the job requirements better
+                2. Incorporates relevant keywords naturally
+                3. Improves ATS compatibility
+                4. Maintains professional tone
+
+                Return a JSON response with:
+                - optimized_content: The improved resume content
+                - improvements: List of specific improvements made
+                - ats_score: Estimated ATS compatibility score (0-100)
+                """
+            )
             
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+            response = self._routed('optimize', lambda model, route: self.client.chat.completions.create(
+                model=model,
                 messages=[
                     {"role": "system", "content": "You are a professional resume optimizer with expertise in ATS systems and job matching."},
                     {"role": "user", "content": prompt}
                 ],
                 max_tokens=2000,
-                temperature=0.1
-            )
+                temperature=route.temperature,
+                timeout=route.timeout_seconds
+            ))
             
             content = response.choices[0].message.content
-            cleaned_content = content.replace("```json", "").replace("```", "").strip()
             
             try:
-                result = json.loads(cleaned_content)
-                return result
-            except json.JSONDecodeError:
+                return decode_json(content)
+            except StructuredOutputError:
                 # If JSON parsing fails, return a basic result
                 return {
                     'optimized_content': content,
@@ -10,6 +10,7 @@ from typing import Dict, Any, List, Optional
 from flask import current_app
 from app.models.temp import Resume, ResumeTemplate, User
 from app.services.resume_ai import ResumeAI
+from app.services.keyword_engine import extract_skills
 from app.extensions import db
 
 
@@ -80,27 +81,8 @@ class ResumeGenerator:
         Returns:
             List of extracted keywords
         """
-        # Common technical skills and qualifications
-        skill_patterns = [
-            r'\b(Python|Java|JavaScript|React|Angular|Vue|Node\.js|Express)\b',
-            r'\b(Flask|Django|FastAPI|Spring|Laravel|Ruby on Rails)\b',
-            r'\b(PostgreSQL|MySQL|MongoDB|Redis|Elasticsearch)\b',
-            r'\b(AWS|Azure|GCP|Docker|Kubernetes|Jenkins)\b',
-            r'\b(Git|GitHub|GitLab|Agile|Scrum|DevOps)\b',
-            r'\b(Machine Learning|AI|Data Science|Analytics)\b',
-            r'\b(Bachelor|Master|PhD|Computer Science|Engineering)\b',
-            r'\b(\d+)\+?\s*years?\s*experience\b',
-        ]
-        
-        keywords = []
-        job_text = job_description.upper()
-        
-        for pattern in skill_patterns:
-            matches = re.findall(pattern, job_description, re.IGNORECASE)
-            keywords.extend(matches)
-        
-        # Remove duplicates and return
-        return list(set(keywords))
+        # Single precompiled pattern covering skills, qualifications and experience
+        return extract_skills(job_description)
     
     def optimize_for_job(self, resume_content: str, job_description: str) -> Dict[str, Any]:
         """
@@ -0,0 +1,333 @@
+"""
+Resume Scorer for deterministic ATS scoring
+Fills the keyword-matching and ATS-readability parts of SCORING_TEMPLATE
+locally from a parsed resume and job description, without an LLM call
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import re
+import copy
+import logging
+from typing import Any, Dict, Iterable, List
+
+from app.response_template.scoring_schema import SCORING_TEMPLATE
+from app.services.keyword_engine import extract_skills, get_keyword_engine, tokenize
+from app.services.resume_search_service import flatten_json_text
+
+
+logger = logging.getLogger(__name__)
+
+# Sections an ATS expects, in the order recruiters read them
+CORE_SECTIONS = ('userInfo', 'summary', 'workExperience', 'education', 'skills')
+
+# Optional sections that add structure when present
+EXTRA_SECTIONS = ('projects', 'certifications', 'awards', 'achievements', 'publications')
+
+ACTION_VERBS = frozenset({
+    'achieved', 'architected', 'automated', 'built', 'championed', 'collaborated',
+    'created', 'cut', 'delivered', 'deployed', 'designed', 'developed', 'directed',
+    'drove', 'engineered', 'established', 'executed', 'expanded', 'generated',
+    'grew', 'implemented', 'improved', 'increased', 'initiated', 'launched', 'led',
+    'managed', 'mentored', 'migrated', 'optimized', 'orchestrated', 'organized',
+    'overhauled', 'owned', 'partnered', 'pioneered', 'planned', 'presented',
+    'produced', 'reduced', 'redesigned', 'refactored', 'resolved', 'scaled',
+    'shipped', 'simplified', 'spearheaded', 'streamlined', 'supervised', 'trained',
+    'transformed', 'upgraded', 'wrote'
+})
+
+WEAK_PHRASES = re.compile(
+    r'\b(responsible for|duties included|worked on|helped with|in charge of)\b', re.IGNORECASE
+)
+FIRST_PERSON = re.compile(r'\b(i|me|my|mine)\b', re.IGNORECASE)
+DATE_FORMAT = re.compile(r'^\d{4}-(0[1-9]|1[0-2])$')
+EMAIL_FORMAT = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+|\n+|\s*[•●\-\*]\s+')
+# Characters that commonly break ATS parsers (tables, icons, smart symbols)
+UNFRIENDLY_CHARS = re.compile(r'[─-◿☀-➿\U0001f300-\U0001faff|]')
+
+# Score bands for the job-less keyword check (number of recognized skills)
+SKILL_TARGET = 8
+
+# Number of job-description terms considered for coverage
+JOB_KEYWORDS = 25
+
+
+def _clamp(value: float) -> int:
+    return int(round(max(0.0, min(100.0, value))))
+
+
+def _ratio(part: float, whole: float, default: float = 0.0) -> float:
+    return part / whole if whole else default
+
+
+def _entries(resume: Dict[str, Any], section: str) -> List[Dict[str, Any]]:
+    value = resume.get(section) or []
+    return [entry for entry in value if isinstance(entry, dict)] if isinstance(value, list) else []
+
+
+def _filled(value: Any) -> bool:
+    if isinstance(value, str):
+        return bool(value.strip())
+    if isinstance(value, (list, dict)):
+        return any(_filled(item) for item in (value.values() if isinstance(value, dict) else value))
+    return value is not None and value is not False
+
+
+def _sentences(texts: Iterable[str]) -> List[str]:
+    sentences = []
+    for text in texts:
+        for sentence in SENTENCE_SPLIT.split(text or ''):
+            sentence = sentence.strip(' \t-*•●')
+            if len(sentence.split()) >= 2:
+                sentences.append(sentence)
+    return sentences
+
+
+class ResumeScorer:
+    """
+    Deterministic resume scorer.
+
+    ``keyword_matching`` is computed as TF-IDF-weighted coverage of the job
+    description's top terms (plus known skills) by the resume, using the shared
+    keyword engine. ``ats_readability`` is derived from the structure of
+    ``parsed_resume``. ``language_expression`` can also be estimated locally
+    from action verbs, sentence length and tone, which is what ``fast`` mode
+    uses; in ``full`` mode ResumeAI replaces it with the LLM's assessment.
+    """
+
+    def score(self, parsed_resume: Dict[str, Any], job_description: str = "",
+              include_language: bool = True) -> Dict[str, Any]:
+        """
+        Score a parsed resume.
+
+        Args:
+            parsed_resume: Resume in RESUME_TEMPLATE structure
+            job_description: Optional job description to score against
+            include_language: Also estimate language_expression locally
+
+        Returns:
+            Dict[str, Any]: A filled copy of SCORING_TEMPLATE
+        """
+        resume = parsed_resume if isinstance(parsed_resume, dict) else {}
+        result = copy.deepcopy(SCORING_TEMPLATE)
+        scores = result['scores']
+
+        scores['keyword_matching']['score'], scores['keyword_matching']['details'] = \
+            self.keyword_matching(resume, job_description)
+        scores['ats_readability']['score'], scores['ats_readability']['details'] = \
+            self.ats_readability(resume)
+        if include_language:
+            scores['language_expression']['score'], scores['language_expression']['details'] = \
+                self.language_expression(resume)
+
+        result['overall_score'] = self.overall_score(scores)
+        result['recommendations'], result['strengths'], result['weaknesses'] = self.feedback(scores)
+        return result
+
+    @staticmethod
+    def overall_score(scores: Dict[str, Any]) -> float:
+        """Weighted average of the sub-scores"""
+        return round(sum(section['score'] * section['weight'] for section in scores.values()), 1)
+
+    # ------------------------------------------------------------------
+    # Keyword matching
+    # ------------------------------------------------------------------
+
+    def keyword_matching(self, resume: Dict[str, Any], job_description: str = ""):
+        """Return (score, details) for keyword coverage"""
+        resume_text = flatten_json_text(resume)
+        resume_tokens = tokenize(resume_text)
+        token_set = set(resume_tokens)
+        resume_lower = resume_text.lower()
+
+        if not job_description or not job_description.strip():
+            skills = extract_skills(resume_text)
+            matched = list(dict.fromkeys(skill.lower() for skill in skills))
+            density = _ratio(sum(1 for token in resume_tokens if token in matched), len(resume_tokens))
+            return _clamp(100.0 * len(matched) / SKILL_TARGET), {
+                'matched_keywords': matched,
+                'missing_keywords': [],
+                'keyword_density': round(density, 3),
+                'comment': f"{len(matched)} recognized industry skills found; "
+                           f"no job description was provided for comparison."
+            }
+
+        engine = get_keyword_engine()
+        weighted = engine.weighted_keywords([job_description], JOB_KEYWORDS)[0]
+        weights = dict(weighted)
+        # Known skills always count, even if the corpus considers them common
+        floor = min(weights.values()) if weights else 1.0
+        for skill in extract_skills(job_description):
+            if not skill.isdigit():
+                weights.setdefault(skill.lower(), floor)
+
+        matched, missing = [], []
+        matched_weight = 0.0
+        for term, weight in weights.items():
+            found = term in token_set if ' ' not in term else \
+                re.search(r'\b' + re.escape(term) + r'\b', resume_lower) is not None
+            if found:
+                matched.append(term)
+                matched_weight += weight
+            else:
+                missing.append(term)
+
+        coverage = _ratio(matched_weight, sum(weights.values()))
+        occurrences = sum(1 for token in resume_tokens if token in weights)
+        density = _ratio(occurrences, len(resume_tokens))
+        return _clamp(100.0 * coverage), {
+            'matched_keywords': matched,
+            'missing_keywords': missing,
+            'keyword_density': round(density, 3),
+            'comment': f"Resume covers {len(matched)} of {len(weights)} key job terms "
+                       f"({coverage:.0%} weighted coverage)."
+        }
+
+    # ------------------------------------------------------------------
+    # ATS readability
+    # ------------------------------------------------------------------
+
+    def ats_readability(self, resume: Dict[str, Any]):
+        """Return (score, details) for structural ATS checks"""
+        present = [section for section in CORE_SECTIONS if _filled(resume.get(section))]
+        extras = [section for section in EXTRA_SECTIONS if _filled(resume.get(section))]
+        section_organization = 100.0 * len(present) / len(CORE_SECTIONS) + 5 * len(extras)
+
+        user_info = resume.get('userInfo') if isinstance(resume.get('userInfo'), dict) else {}
+        contact_checks = [
+            _filled(user_info.get('firstName')),
+            _filled(user_info.get('lastName')),
+            bool(EMAIL_FORMAT.match((user_info.get('email') or '').strip())),
+            _filled(user_info.get('phoneNumber')),
+        ]
+        parsing_friendliness = 100.0 * sum(contact_checks) / len(contact_checks)
+
+        dated = _entries(resume, 'workExperience') + _entries(resume, 'education') + _entries(resume, 'projects')
+        dates = [entry.get(key) for entry in dated for key in ('fromDate', 'toDate')
+                 if _filled(entry.get(key))]
+        valid_dates = _ratio(sum(1 for value in dates if DATE_FORMAT.match(str(value).strip())), len(dates), 1.0)
+        text = flatten_json_text(resume)
+        unfriendly = len(UNFRIENDLY_CHARS.findall(text))
+        format_compatibility = 100.0 * valid_dates - 5 * unfriendly
+
+        jobs = _entries(resume, 'workExperience')
+        complete_jobs = _ratio(sum(
+            1 for job in jobs
+            if _filled(job.get('jobTitle')) and _filled(job.get('companyName'))
+            and _filled(job.get('fromDate')) and _filled(job.get('description'))
+        ), len(jobs), 0.0)
+        starts = [str(job.get('fromDate')).strip() for job in jobs if _filled(job.get('fromDate'))]
+        chronological = starts == sorted(starts, reverse=True)
+        structure_clarity = 80.0 * complete_jobs + (20.0 if chronological else 0.0)
+
+        details = {
+            'format_compatibility': _clamp(format_compatibility),
+            'structure_clarity': _clamp(structure_clarity),
+            'parsing_friendliness': _clamp(parsing_friendliness),
+            'section_organization': _clamp(section_organization),
+        }
+        missing_sections = [section for section in CORE_SECTIONS if section not in present]
+        comment = 'All standard sections present.' if not missing_sections else \
+            f"Missing standard sections: {', '.join(missing_sections)}."
+        if dates and valid_dates < 1.0:
+            comment += ' Some dates are not in YYYY-MM format.'
+        if unfriendly:
+            comment += ' Special symbols or table characters may not parse in ATS systems.'
+        details['comment'] = comment
+        return _clamp(sum(details[key] for key in details if key != 'comment') / 4), details
+
+    # ------------------------------------------------------------------
+    # Language expression (local estimate)
+    # ------------------------------------------------------------------
+
+    def language_expression(self, resume: Dict[str, Any]):
+        """Return (score, details) estimated from wording heuristics"""
+        descriptions = [resume.get('summary') or ''] + [
+            entry.get('description') or ''
+            for section in ('workExperience', 'projects')
+            for entry in _entries(resume, section)
+        ]
+        sentences = _sentences(descriptions)
+        if not sentences:
+            details = {'grammar_quality': 0, 'professional_tone': 0, 'clarity': 0,
+                       'action_verbs_usage': 0, 'comment': 'No descriptive content to evaluate.'}
+            return 0, details
+
+        bullets = _sentences(descriptions[1:])
+        first_words = [sentence.split()[0].lower().strip('.,;:') for sentence in bullets]
+        action_verbs_usage = 100.0 * _ratio(sum(1 for word in first_words if word in ACTION_VERBS),
+                                            len(first_words), 0.0)
+
+        lengths = [len(sentence.split()) for sentence in sentences]
+        long_sentences = sum(1 for length in lengths if length > 30)
+        clarity = 100.0 - 100.0 * _ratio(long_sentences, len(sentences))
+
+        text = ' '.join(sentences)
+        tone_issues = len(FIRST_PERSON.findall(text)) + len(WEAK_PHRASES.findall(text))
+        professional_tone = 100.0 - 10 * tone_issues
+
+        lowercase_starts = sum(1 for sentence in sentences if sentence[0].islower())
+        repeated_words = len(re.findall(r'\b(\w+)\s+\1\b', text, re.IGNORECASE))
+        grammar_quality = 100.0 - 100.0 * _ratio(lowercase_starts, len(sentences)) - 10 * repeated_words
+
+        details = {
+            'grammar_quality': _clamp(grammar_quality),
+            'professional_tone': _clamp(professional_tone),
+            'clarity': _clamp(clarity),
+            'action_verbs_usage': _clamp(action_verbs_usage),
+            'comment': 'Estimated locally from sentence structure, tone and action verbs.'
+        }
+        return _clamp(sum(details[key] for key in details if key != 'comment') / 4), details
+
+    # ------------------------------------------------------------------
+    # Feedback
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def feedback(scores: Dict[str, Any]):
+        """Return (recommendations, strengths, weaknesses) derived from the sub-scores"""
+        recommendations: List[str] = []
+        strengths: List[str] = []
+        weaknesses: List[str] = []
+
+        keyword = scores['keyword_matching']
+        missing = keyword['details'].get('missing_keywords') or []
+        if missing:
+            recommendations.append(f"Add relevant missing keywords where accurate: {', '.join(missing[:8])}.")
+        if keyword['score'] >= 75:
+            strengths.append('Strong keyword alignment with the target role.')
+        elif keyword['score'] < 50:
+            weaknesses.append('Low keyword coverage for the target role.')
+
+        ats = scores['ats_readability']['details']
+        labels = {
+            'section_organization': ('Include all standard sections (summary, experience, education, skills).',
+                                     'Well-organized standard sections.', 'Missing standard resume sections.'),
+            'parsing_friendliness': ('Complete contact details (name, valid email, phone).',
+                                     'Complete, parseable contact information.', 'Incomplete contact information.'),
+            'format_compatibility': ('Use YYYY-MM dates and avoid tables, icons and special symbols.',
+                                     'ATS-friendly formatting.', 'Formatting that may not parse reliably.'),
+            'structure_clarity': ('List every role with title, company, dates and description, newest first.',
+                                  'Clear, reverse-chronological experience.', 'Incomplete or unordered experience entries.'),
+        }
+        for key, (advice, strength, weakness) in labels.items():
+            if ats.get(key, 0) >= 90:
+                strengths.append(strength)
+            elif ats.get(key, 0) < 70:
+                recommendations.append(advice)
+                weaknesses.append(weakness)
+
+        language = scores['language_expression']['details']
+        # An empty comment means language was left for the LLM to assess
+        if language.get('comment') and language.get('action_verbs_usage', 0) < 60:
+            recommendations.append('Start experience bullets with strong action verbs.')
+
+        return recommendations[:5], strengths[:5], weaknesses[:5]
+
+
+def score_resume_locally(parsed_resume: Dict[str, Any], job_description: str = "",
+                         include_language: bool = True) -> Dict[str, Any]:
+    """Convenience wrapper around ResumeScorer.score"""
+    return ResumeScorer().score(parsed_resume, job_description, include_language=include_language)
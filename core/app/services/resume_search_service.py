@@ -0,0 +1,623 @@
+"""
+Resume Search Service for full-text search over resume content
+Searches ResumeFile extracted text and keywords and Resume parsed content,
+backed by PostgreSQL tsvector/GIN, MySQL FULLTEXT or a local SQLite FTS5 index
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import os
+import re
+import json
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import Column, Integer, MetaData, Table, event, false, select, text
+
+from app.extensions import db
+
+
+logger = logging.getLogger(__name__)
+
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_END = '</mark>'
+SNIPPET_TOKENS = 16
+
+_TOKEN_RE = re.compile(r'[\w+#.]+', re.UNICODE)
+
+# Text expressions indexed by the native backends
+PG_FILE_DOCUMENT = (
+    "coalesce(original_filename, '') || ' ' || coalesce(extracted_text, '') "
+    "|| ' ' || coalesce(keywords::text, '')"
+)
+PG_RESUME_DOCUMENT = "coalesce(title, '') || ' ' || coalesce(parsed_resume::text, '')"
+# Columns of the MySQL FULLTEXT index (keywords_text is a stored generated
+# column over the keywords JSON, see the add_fulltext_search_indexes migration)
+MYSQL_FILE_COLUMNS = 'original_filename, extracted_text, keywords_text'
+
+# Local-index matches are joined to listing queries through this per-connection
+# temporary table instead of an IN list, which SQLite caps in parameters
+_FILE_MATCHES = Table('search_file_matches', MetaData(), Column('id', Integer, primary_key=True),
+                      prefixes=['TEMPORARY'])
+_MATCH_CHUNK_SIZE = 500
+
+
+def query_terms(query: str) -> List[str]:
+    """Split a user query into search terms"""
+    return [term.strip('.') for term in _TOKEN_RE.findall(query or '') if term.strip('.')]
+
+
+def flatten_json_text(value: Any) -> str:
+    """Collect all string values of a JSON document (e.g. parsed_resume)"""
+    parts: List[str] = []
+
+    def walk(node):
+        if isinstance(node, dict):
+            for item in node.values():
+                walk(item)
+        elif isinstance(node, (list, tuple)):
+            for item in node:
+                walk(item)
+        elif isinstance(node, str):
+            if node.strip():
+                parts.append(node.strip())
+        elif isinstance(node, (int, float)) and not isinstance(node, bool):
+            parts.append(str(node))
+
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return value
+    walk(value)
+    return '\n'.join(parts)
+
+
+def highlight_snippet(content: str, terms: Iterable[str], width: int = 160) -> str:
+    """Build a highlighted snippet around the first matching term"""
+    if not content:
+        return ''
+    terms = [term for term in terms if term]
+    if not terms:
+        return content[:width]
+
+    pattern = re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+    match = pattern.search(content)
+    start = max(0, match.start() - width // 3) if match else 0
+    snippet = content[start:start + width]
+    snippet = pattern.sub(lambda m: f"{HIGHLIGHT_START}{m.group(0)}{HIGHLIGHT_END}", snippet)
+    return ('…' if start > 0 else '') + snippet + ('…' if start + width < len(content) else '')
+
+
+def file_document(resume_file) -> Dict[str, Any]:
+    """Build the searchable document for a ResumeFile row"""
+    return {
+        'doc_key': f"file:{resume_file.id}",
+        'doc_type': 'file',
+        'doc_ref': str(resume_file.id),
+        'user_id': resume_file.user_id,
+        'title': resume_file.display_filename or resume_file.original_filename or '',
+        'body': resume_file.extracted_text or '',
+        'keywords': ' '.join(str(keyword) for keyword in (resume_file.keywords or [])),
+        'active': is_searchable_file(resume_file),
+    }
+
+
+def resume_document(resume) -> Dict[str, Any]:
+    """Build the searchable document for a Resume row"""
+    parsed = resume.parsed_resume or {}
+    skills = parsed.get('skills') if isinstance(parsed, dict) else None
+    return {
+        'doc_key': f"resume:{resume.user_id}:{resume.serial_number}",
+        'doc_type': 'resume',
+        'doc_ref': str(resume.serial_number),
+        'user_id': resume.user_id,
+        'title': resume.title or '',
+        'body': flatten_json_text(parsed),
+        'keywords': flatten_json_text(skills) if skills else '',
+        'active': True,
+    }
+
+
+def is_searchable_file(resume_file) -> bool:
+    """Soft-deleted files stay indexed but are left out of search() results"""
+    return bool(resume_file.is_active is not False and resume_file.deleted_at is None)
+
+
+class LocalSearchIndex:
+    """
+    Inverted index stored in a SQLite FTS5 table.
+
+    Used when the primary database has no native full-text support. The
+    ``search_docs`` table maps document keys to FTS rowids so single documents
+    can be replaced or removed incrementally. Soft-deleted files are indexed
+    with ``active = 0``; callers decide whether to include them.
+    """
+
+    def __init__(self, path: str = ':memory:'):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS search_docs (
+                id INTEGER PRIMARY KEY,
+                doc_key TEXT NOT NULL UNIQUE,
+                doc_type TEXT NOT NULL,
+                doc_ref TEXT NOT NULL,
+                user_id INTEGER NOT NULL,
+                title TEXT,
+                active INTEGER NOT NULL DEFAULT 1
+            );
+            CREATE INDEX IF NOT EXISTS idx_search_docs_user ON search_docs (user_id, doc_type);
+            CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+                title, body, keywords, tokenize='porter unicode61'
+            );
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(search_docs)")}
+        if 'active' not in columns:
+            # Index files written before soft-deleted files were indexed
+            self._conn.execute("ALTER TABLE search_docs ADD COLUMN active INTEGER NOT NULL DEFAULT 1")
+        self._conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        if self.path != ':memory:':
+            conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def reopen(self) -> None:
+        """
+        Replace the connection after a fork; SQLite connections must not be
+        shared between processes. In-memory indexes are per process anyway.
+        """
+        if self.path == ':memory:':
+            return
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+
+    def upsert(self, documents: Iterable[Dict[str, Any]]) -> int:
+        count = 0
+        with self._lock:
+            for doc in documents:
+                self._delete_key(doc['doc_key'])
+                cursor = self._conn.execute(
+                    "INSERT INTO search_docs (doc_key, doc_type, doc_ref, user_id, title, active) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (doc['doc_key'], doc['doc_type'], doc['doc_ref'], doc['user_id'], doc['title'],
+                     int(doc.get('active', True)))
+                )
+                self._conn.execute(
+                    "INSERT INTO search_fts (rowid, title, body, keywords) VALUES (?, ?, ?, ?)",
+                    (cursor.lastrowid, doc['title'], doc['body'], doc['keywords'])
+                )
+                count += 1
+            self._conn.commit()
+        return count
+
+    def delete(self, doc_keys: Iterable[str]) -> None:
+        with self._lock:
+            for doc_key in doc_keys:
+                self._delete_key(doc_key)
+            self._conn.commit()
+
+    def _delete_key(self, doc_key: str) -> None:
+        row = self._conn.execute("SELECT id FROM search_docs WHERE doc_key = ?", (doc_key,)).fetchone()
+        if row:
+            self._conn.execute("DELETE FROM search_fts WHERE rowid = ?", (row[0],))
+            self._conn.execute("DELETE FROM search_docs WHERE id = ?", (row[0],))
+
+    def clear(self, doc_type: Optional[str] = None) -> None:
+        with self._lock:
+            if doc_type:
+                self._conn.execute(
+                    "DELETE FROM search_fts WHERE rowid IN (SELECT id FROM search_docs WHERE doc_type = ?)",
+                    (doc_type,))
+                self._conn.execute("DELETE FROM search_docs WHERE doc_type = ?", (doc_type,))
+            else:
+                self._conn.execute("DELETE FROM search_fts")
+                self._conn.execute("DELETE FROM search_docs")
+            self._conn.commit()
+
+    @staticmethod
+    def _where(user_id: Optional[int], terms: List[str], doc_type: str, include_inactive: bool = False):
+        # Quote every term (FTS5 syntax characters in user input are literal)
+        # and allow prefix matches on the last one
+        match = ' '.join('"{}"'.format(term.replace('"', '""')) for term in terms) + '*'
+        filters, params = ["search_fts MATCH ?"], [match]
+        if user_id is not None:
+            filters.append("d.user_id = ?")
+            params.append(user_id)
+        if doc_type != 'all':
+            filters.append("d.doc_type = ?")
+            params.append(doc_type)
+        if not include_inactive:
+            filters.append("d.active = 1")
+        return ' AND '.join(filters), params
+
+    def match_refs(self, user_id: Optional[int], terms: List[str], doc_type: str,
+                   include_inactive: bool = False) -> List[str]:
+        """References of every matching document, without ranking or snippets"""
+        where, params = self._where(user_id, terms, doc_type, include_inactive)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT d.doc_ref FROM search_fts JOIN search_docs d ON d.id = search_fts.rowid WHERE {where}",
+                params
+            ).fetchall()
+        return [doc_ref for (doc_ref,) in rows]
+
+    def search(self, user_id: Optional[int], terms: List[str], doc_type: str,
+               limit: int, offset: int) -> Dict[str, Any]:
+        where, params = self._where(user_id, terms, doc_type)
+
+        with self._lock:
+            total = self._conn.execute(
+                f"SELECT count(*) FROM search_fts JOIN search_docs d ON d.id = search_fts.rowid WHERE {where}",
+                params
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                f"""
+                SELECT d.doc_type, d.doc_ref, d.user_id, d.title,
+                       bm25(search_fts, 4.0, 1.0, 2.0) AS score,
+                       snippet(search_fts, 1, ?, ?, '…', {SNIPPET_TOKENS}) AS body_snippet,
+                       snippet(search_fts, 2, ?, ?, '…', {SNIPPET_TOKENS}) AS keyword_snippet
+                FROM search_fts JOIN search_docs d ON d.id = search_fts.rowid
+                WHERE {where}
+                ORDER BY score
+                LIMIT ? OFFSET ?
+                """,
+                [HIGHLIGHT_START, HIGHLIGHT_END, HIGHLIGHT_START, HIGHLIGHT_END, *params, limit, offset]
+            ).fetchall()
+
+        results = []
+        for doc_type_value, doc_ref, owner_id, title, score, body_snippet, keyword_snippet in rows:
+            highlight = body_snippet if HIGHLIGHT_START in (body_snippet or '') else keyword_snippet
+            results.append({
+                'type': doc_type_value,
+                'id': int(doc_ref),
+                'user_id': owner_id,
+                'title': title,
+                # bm25() is lower-is-better; expose higher-is-better
+                'score': round(-score, 6),
+                'highlight': highlight or body_snippet or ''
+            })
+        return {'total': total, 'results': results}
+
+
+class ResumeSearchService:
+    """
+    Full-text search over resume files and parsed resumes.
+
+    Backend selection follows the primary database dialect:
+    - postgresql: expression GIN indexes on to_tsvector(), ranked with
+      ts_rank_cd() and highlighted with ts_headline(); PostgreSQL keeps the
+      index current on every write.
+    - mysql: FULLTEXT index on resume_files; parsed resumes (JSON, which MySQL
+      can't FULLTEXT-index) use the local index.
+    The native indexes are created by the add_fulltext_search_indexes migration.
+    - anything else: local SQLite FTS5 index for both, kept current from
+      SQLAlchemy session commits.
+    """
+
+    VALID_TYPES = ('all', 'file', 'resume')
+
+    def __init__(self, dialect: str, index_path: str = ':memory:'):
+        self.dialect = dialect
+        self.file_backend = 'postgresql' if dialect == 'postgresql' else 'mysql' if dialect == 'mysql' else 'local'
+        self.resume_backend = 'postgresql' if dialect == 'postgresql' else 'local'
+        self.local_index = LocalSearchIndex(index_path) if 'local' in (self.file_backend, self.resume_backend) else None
+
+    # ------------------------------------------------------------------
+    # Index management
+    # ------------------------------------------------------------------
+
+    def index_documents(self, upserts: List[Dict[str, Any]], deletes: List[str]) -> None:
+        """Apply incremental changes to the local index"""
+        if self.local_index is None:
+            return
+        local_types = self._local_types()
+        upserts = [doc for doc in upserts if doc['doc_type'] in local_types]
+        deletes = [key for key in deletes if key.split(':', 1)[0] in local_types]
+        if deletes:
+            self.local_index.delete(deletes)
+        if upserts:
+            self.local_index.upsert(upserts)
+
+    def rebuild(self, batch_size: int = 500) -> Dict[str, int]:
+        """Rebuild the local index from the database"""
+        from app.models.temp import Resume, ResumeFile
+
+        counts = {'files': 0, 'resumes': 0}
+        if self.local_index is None:
+            return counts
+
+        local_types = self._local_types()
+        if 'file' in local_types:
+            self.local_index.clear('file')
+            query = ResumeFile.query.order_by(ResumeFile.id)
+            batch = []
+            for resume_file in query.yield_per(batch_size):
+                batch.append(file_document(resume_file))
+                if len(batch) >= batch_size:
+                    counts['files'] += self.local_index.upsert(batch)
+                    batch = []
+            counts['files'] += self.local_index.upsert(batch)
+        if 'resume' in local_types:
+            self.local_index.clear('resume')
+            batch = []
+            for resume in Resume.query.yield_per(batch_size):
+                batch.append(resume_document(resume))
+                if len(batch) >= batch_size:
+                    counts['resumes'] += self.local_index.upsert(batch)
+                    batch = []
+            counts['resumes'] += self.local_index.upsert(batch)
+        return counts
+
+    def _local_types(self) -> List[str]:
+        types = []
+        if self.file_backend == 'local':
+            types.append('file')
+        if self.resume_backend == 'local':
+            types.append('resume')
+        return types
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def search(self, user_id: Optional[int], query: str, doc_type: str = 'all',
+               limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        """
+        Search resume content.
+
+        Args:
+            user_id: Owner to restrict results to (None searches all users)
+            query: Free-text query
+            doc_type: 'file', 'resume' or 'all'
+            limit: Maximum number of results
+            offset: Number of results to skip
+
+        Returns:
+            Dict[str, Any]: {'total': int, 'results': [...]} ordered by relevance
+        """
+        terms = query_terms(query)
+        if not terms:
+            return {'total': 0, 'results': []}
+
+        if doc_type not in self.VALID_TYPES:
+            raise ValueError(f"Invalid search type: {doc_type}. Must be one of: {', '.join(self.VALID_TYPES)}")
+
+        wanted = ['file', 'resume'] if doc_type == 'all' else [doc_type]
+        local = [kind for kind in wanted if kind in self._local_types()]
+        native = [kind for kind in wanted if kind not in local]
+
+        if not native:
+            return self.local_index.search(user_id, terms, local[0] if len(local) == 1 else 'all', limit, offset)
+
+        # Mixed or native-only: merge ranked result sets (scores are per
+        # backend, so each set is fetched up to offset + limit and merged)
+        window = offset + limit
+        total, results = 0, []
+        for kind in native:
+            found = self._native_search(kind, user_id, query, terms, window)
+            total += found['total']
+            results.extend(found['results'])
+        if local:
+            found = self.local_index.search(user_id, terms, local[0], window, 0)
+            total += found['total']
+            results.extend(found['results'])
+
+        results.sort(key=lambda row: row['score'], reverse=True)
+        return {'total': total, 'results': results[offset:window]}
+
+    def file_id_filter(self, user_id: int, query: str):
+        """
+        Return a filter matching all the user's files that match the query.
+
+        The filter covers the whole match set, soft-deleted files included,
+        so callers that apply their own deleted/category filters, sort and
+        paginate (the file listing) get true totals and can reach every page.
+        Native backends match in a subquery; local-index matches are loaded
+        into a temporary table on the session's connection and joined.
+
+        Returns:
+            A SQLAlchemy expression for ``Query.filter``
+        """
+        from app.models.temp import ResumeFile
+
+        terms = query_terms(query)
+        if not terms:
+            return false()
+        if self.file_backend == 'local':
+            refs = self.local_index.match_refs(user_id, terms, 'file', include_inactive=True)
+            connection = db.session.connection()
+            _FILE_MATCHES.create(connection, checkfirst=True)
+            connection.execute(_FILE_MATCHES.delete())
+            for start in range(0, len(refs), _MATCH_CHUNK_SIZE):
+                connection.execute(_FILE_MATCHES.insert(),
+                                   [{'id': int(ref)} for ref in refs[start:start + _MATCH_CHUNK_SIZE]])
+            return ResumeFile.id.in_(select(_FILE_MATCHES.c.id))
+        if self.file_backend == 'postgresql':
+            match = text(f"to_tsvector('english', {PG_FILE_DOCUMENT}) @@ websearch_to_tsquery('english', :q)")
+        else:
+            match = text(f"MATCH({MYSQL_FILE_COLUMNS}) AGAINST (:q IN NATURAL LANGUAGE MODE)")
+        return ResumeFile.id.in_(
+            select(ResumeFile.id).where(ResumeFile.user_id == user_id, match.bindparams(q=query))
+        )
+
+    def _native_base(self, kind: str, user_id: Optional[int]) -> str:
+        """FROM and WHERE clauses selecting the native backend's matches"""
+        backend = self.file_backend if kind == 'file' else self.resume_backend
+        user_filter = "AND user_id = :user_id" if user_id is not None else ""
+        if backend == 'postgresql' and kind == 'file':
+            return (f"FROM resume_files, websearch_to_tsquery('english', :q) query "
+                    f"WHERE to_tsvector('english', {PG_FILE_DOCUMENT}) @@ query {user_filter}")
+        if backend == 'postgresql':
+            return (f"FROM resumes, websearch_to_tsquery('english', :q) query "
+                    f"WHERE to_tsvector('english', {PG_RESUME_DOCUMENT}) @@ query {user_filter}")
+        return (f"FROM resume_files WHERE MATCH({MYSQL_FILE_COLUMNS}) "
+                f"AGAINST (:q IN NATURAL LANGUAGE MODE) {user_filter}")
+
+    def _native_search(self, kind: str, user_id: Optional[int], query: str,
+                       terms: List[str], limit: int) -> Dict[str, Any]:
+        backend = self.file_backend if kind == 'file' else self.resume_backend
+        params: Dict[str, Any] = {'q': query, 'limit': limit, 'user_id': user_id}
+        base = self._native_base(kind, user_id)
+        if kind == 'file':
+            # Soft-deleted files are indexed but never returned by search()
+            base += " AND deleted_at IS NULL AND is_active"
+
+        if backend == 'postgresql' and kind == 'file':
+            sql = (f"SELECT id, user_id, coalesce(display_filename, original_filename) AS title, "
+                   f"ts_rank_cd(to_tsvector('english', {PG_FILE_DOCUMENT}), query) AS score, "
+                   f"ts_headline('english', coalesce(extracted_text, ''), query, "
+                   f"'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxWords=35, MinWords=15') AS highlight "
+                   f"{base} ORDER BY score DESC LIMIT :limit")
+        elif backend == 'postgresql':
+            sql = (f"SELECT serial_number AS id, user_id, title, "
+                   f"ts_rank_cd(to_tsvector('english', {PG_RESUME_DOCUMENT}), query) AS score, "
+                   f"ts_headline('english', parsed_resume::text, query, "
+                   f"'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxWords=35, MinWords=15') AS highlight "
+                   f"{base} ORDER BY score DESC LIMIT :limit")
+        else:
+            sql = ("SELECT id, user_id, coalesce(display_filename, original_filename) AS title, "
+                   f"MATCH({MYSQL_FILE_COLUMNS}) AGAINST (:q IN NATURAL LANGUAGE MODE) AS score, "
+                   f"extracted_text AS highlight {base} ORDER BY score DESC LIMIT :limit")
+
+        total = db.session.execute(text(f"SELECT count(*) {base}"), params).scalar() or 0
+        results = []
+        for row in db.session.execute(text(sql), params).mappings():
+            highlight = row['highlight'] or ''
+            if HIGHLIGHT_START not in highlight:
+                highlight = highlight_snippet(highlight, terms)
+            results.append({
+                'type': kind,
+                'id': row['id'],
+                'user_id': row['user_id'],
+                'title': row['title'],
+                'score': float(row['score'] or 0),
+                'highlight': highlight
+            })
+        return {'total': total, 'results': results}
+
+
+# ----------------------------------------------------------------------
+# Incremental index maintenance
+# ----------------------------------------------------------------------
+
+_PENDING_KEY = 'resume_search_pending'
+
+
+def _collect_changes(session, flush_context) -> None:
+    """Snapshot changed files/resumes at flush time (attributes are loaded)"""
+    from app.models.temp import Resume, ResumeFile
+
+    pending = _pending(session)
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, ResumeFile):
+            _queue_file(pending, obj)
+        elif isinstance(obj, Resume):
+            doc = resume_document(obj)
+            pending['upserts'][doc['doc_key']] = doc
+            pending['deletes'].discard(doc['doc_key'])
+    for obj in session.deleted:
+        if isinstance(obj, ResumeFile):
+            key = f"file:{obj.id}"
+        elif isinstance(obj, Resume):
+            key = f"resume:{obj.user_id}:{obj.serial_number}"
+        else:
+            continue
+        pending['deletes'].add(key)
+        pending['upserts'].pop(key, None)
+
+
+def _pending(session) -> Dict[str, Any]:
+    return session.info.setdefault(_PENDING_KEY, {'upserts': {}, 'deletes': set()})
+
+
+def _queue_file(pending: Dict[str, Any], resume_file) -> None:
+    doc = file_document(resume_file)
+    pending['upserts'][doc['doc_key']] = doc
+    pending['deletes'].discard(doc['doc_key'])
+
+
+def queue_file_changes(session, files: Iterable[Any] = (), deleted_file_ids: Iterable[int] = ()) -> None:
+    """
+    Queue index updates for files changed by bulk UPDATE or DELETE
+    statements, which bypass the flush hook; applied on commit.
+
+    Args:
+        files: ResumeFile objects carrying their new state
+        deleted_file_ids: IDs of rows deleted from the database
+    """
+    pending = _pending(session)
+    for resume_file in files:
+        _queue_file(pending, resume_file)
+    for file_id in deleted_file_ids:
+        pending['deletes'].add(f"file:{file_id}")
+        pending['upserts'].pop(f"file:{file_id}", None)
+
+
+def _apply_changes(session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    service = _service_for_session(session)
+    if not pending or service is None:
+        return
+    try:
+        service.index_documents(list(pending['upserts'].values()), list(pending['deletes']))
+    except Exception as e:
+        # Search indexing must never break the write path; rebuild() repairs drift
+        logger.warning(f"Search index update failed: {str(e)}")
+
+
+def _discard_changes(session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _service_for_session(session) -> Optional[ResumeSearchService]:
+    try:
+        from flask import current_app
+        return current_app.extensions.get('resume_search')
+    except RuntimeError:
+        return None
+
+
+def init_search_index(app) -> ResumeSearchService:
+    """
+    Create the search service for an app and hook index maintenance into
+    SQLAlchemy session commits.
+
+    Configuration:
+        SEARCH_INDEX_PATH: SQLite file for the local index
+            (default: <instance_path>/search_index.db, in-memory when TESTING)
+    """
+    with app.app_context():
+        dialect = db.engine.dialect.name
+
+    index_path = app.config.get('SEARCH_INDEX_PATH') or os.getenv('SEARCH_INDEX_PATH')
+    if not index_path:
+        index_path = ':memory:' if app.config.get('TESTING') else os.path.join(app.instance_path, 'search_index.db')
+
+    service = ResumeSearchService(dialect, index_path)
+    app.extensions['resume_search'] = service
+
+    session_class = db.session.session_factory.class_
+    if not event.contains(session_class, 'after_flush', _collect_changes):
+        event.listen(session_class, 'after_flush', _collect_changes)
+        event.listen(session_class, 'after_commit', _apply_changes)
+        event.listen(session_class, 'after_soft_rollback', lambda session, previous: _discard_changes(session))
+
+    return service
+
+
+def get_search_service() -> ResumeSearchService:
+    """Return the search service of the current app"""
+    from flask import current_app
+    service = current_app.extensions.get('resume_search')
+    if service is None:
+        service = init_search_index(current_app)
+    return service
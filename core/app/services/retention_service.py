@@ -0,0 +1,320 @@
+"""
+Retention Sweeper
+Permanently removes soft-deleted files once their retention period has
+passed, cleans up stored files and thumbnails that no database row refers
+to any more and evicts section cache entries that have not been used for a
+while; work is done in batches with a pause between them so a
+large backlog does not monopolise the database or the storage backend
+
+Settings come from the environment:
+    FILE_RETENTION_DAYS: Days a soft-deleted file is kept (default 30)
+    RETENTION_BATCH_SIZE: Files removed per batch (default 200)
+    RETENTION_BATCH_PAUSE_SECONDS: Pause between batches (default 1)
+    RETENTION_MAX_BATCHES: Batches per sweep of each kind (default 50)
+    RETENTION_ORPHAN_MIN_AGE_HOURS: Minimum age of an unreferenced file
+        before it is removed, so uploads in flight are kept (default 24)
+    RETENTION_ORPHAN_SCAN: Scan local storage and thumbnails (default true)
+    RETENTION_INTERVAL_SECONDS: Time between background sweeps (default 3600)
+    SECTION_CACHE_MAX_AGE_DAYS: Days an optimized-section cache entry is
+        kept after its last use, 0 keeps them forever (default 90)
+
+Orphans are searched for in local storage and the thumbnail directory
+only; listing an S3 bucket is left to bucket lifecycle rules.
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import os
+import re
+import time
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from flask import Flask, current_app
+
+from app.extensions import db
+from app.models.temp import ResumeFile
+from app.utils.metrics import RETENTION_RECLAIMED_BYTES, RETENTION_REMOVED
+
+
+logger = logging.getLogger(__name__)
+
+_THUMBNAIL_NAME = re.compile(r'^(\d+)\.jpg$')
+# Existing file IDs are looked up in chunks of this many thumbnails
+_ID_CHUNK_SIZE = 500
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+class RetentionSweeper:
+    """Applies the file retention policy, on demand or in a background thread"""
+
+    def __init__(self, app: Optional[Flask] = None, retention_days: Optional[float] = None,
+                 batch_size: Optional[int] = None, batch_pause_seconds: Optional[float] = None,
+                 max_batches: Optional[int] = None, orphan_min_age_hours: Optional[float] = None,
+                 scan_orphans: Optional[bool] = None, interval_seconds: Optional[float] = None,
+                 section_cache_max_age_days: Optional[float] = None):
+        self.app = app
+        self.retention_days = retention_days if retention_days is not None else float(os.getenv('FILE_RETENTION_DAYS', 30))
+        self.batch_size = batch_size or int(os.getenv('RETENTION_BATCH_SIZE', 200))
+        self.batch_pause_seconds = (batch_pause_seconds if batch_pause_seconds is not None
+                                    else float(os.getenv('RETENTION_BATCH_PAUSE_SECONDS', 1)))
+        self.max_batches = max_batches or int(os.getenv('RETENTION_MAX_BATCHES', 50))
+        self.orphan_min_age_hours = (orphan_min_age_hours if orphan_min_age_hours is not None
+                                     else float(os.getenv('RETENTION_ORPHAN_MIN_AGE_HOURS', 24)))
+        self.scan_orphans = (scan_orphans if scan_orphans is not None
+                             else os.getenv('RETENTION_ORPHAN_SCAN', 'true').lower() == 'true')
+        self.interval_seconds = interval_seconds or float(os.getenv('RETENTION_INTERVAL_SECONDS', 3600))
+        self.section_cache_max_age_days = (section_cache_max_age_days if section_cache_max_age_days is not None
+                                           else float(os.getenv('SECTION_CACHE_MAX_AGE_DAYS', 90)))
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.last_report: Optional[Dict[str, Any]] = None
+
+    def init_app(self, app: Flask) -> None:
+        self.app = app
+
+    # Expired soft-deleted files
+
+    def purge_expired(self, dry_run: bool = False, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Permanently delete files soft-deleted longer than the retention period.
+
+        Rows go in batches of ``batch_size``, oldest first, each followed by
+        the batched deletion of their stored objects and thumbnails.
+
+        Returns:
+            dict: files and bytes removed, batches run, storage failures
+        """
+        from app.services.bulk_file_service import BulkFileService
+        from app.services.thumbnail_service import ThumbnailService
+
+        cutoff = (now or datetime.utcnow()) - timedelta(days=self.retention_days)
+        expired = ResumeFile.query.filter(ResumeFile.deleted_at < cutoff)
+        report = {'cutoff': cutoff.isoformat(), 'files': 0, 'bytes': 0, 'batches': 0, 'storage_failed': 0}
+
+        if dry_run:
+            count, size = expired.with_entities(db.func.count(ResumeFile.id), db.func.sum(ResumeFile.file_size)).one()
+            report.update(files=count, bytes=int(size or 0))
+            return report
+
+        batch_query = expired.with_entities(
+            ResumeFile.id, ResumeFile.storage_type, ResumeFile.file_path, ResumeFile.file_size
+        ).order_by(ResumeFile.deleted_at, ResumeFile.id).limit(self.batch_size)
+
+        while report['batches'] < self.max_batches and not self.stop_event.is_set():
+            rows = batch_query.all()
+            if not rows:
+                break
+            if report['batches']:
+                self.stop_event.wait(self.batch_pause_seconds)
+
+            # Sizes are taken before deletion: (kind, size) by stored path
+            sizes: Dict[str, Tuple[str, int]] = {}
+            for file_id, storage_type, file_path, file_size in rows:
+                if file_path:
+                    size = _file_size(file_path) if storage_type == 'local' else file_size or 0
+                    sizes[file_path] = ('expired_file', size)
+                thumbnail_path = ThumbnailService.get_thumbnail_path(file_id)
+                if os.path.exists(thumbnail_path):
+                    sizes[thumbnail_path] = ('expired_thumbnail', _file_size(thumbnail_path))
+
+            result = BulkFileService.hard_delete([row[0] for row in rows], deleted_only=True, wait=True)
+            report['batches'] += 1
+            if not result['processed_ids']:
+                break
+            report['files'] += len(result['processed_ids'])
+            RETENTION_REMOVED.inc(len(result['processed_ids']), kind='expired_row')
+
+            failed = {entry['file_path'] for entry in result['storage']['failed']}
+            report['storage_failed'] += len(failed)
+            report['bytes'] += self._count_reclaimed(
+                (kind, size) for path, (kind, size) in sizes.items() if path not in failed
+            )
+
+        logger.info(f"Retention: purged {report['files']} file(s) deleted before {report['cutoff']}, "
+                    f"{report['bytes']} bytes reclaimed in {report['batches']} batch(es)")
+        return report
+
+    # Unreferenced local files and thumbnails
+
+    def _storage_root(self) -> Optional[str]:
+        from app.utils.storage_config import StorageConfigManager
+        path = StorageConfigManager.get_storage_config_dict().get('local_storage_path')
+        return os.path.abspath(path) if path else None
+
+    def _thumbnail_dir(self) -> str:
+        return os.path.abspath(os.path.join(current_app.config.get('UPLOAD_FOLDER', 'uploads'), 'thumbnails'))
+
+    def _old_files(self, root: str, skip_dir: str, now: float) -> Iterator[Tuple[str, int]]:
+        """(path, size) of files under root older than the orphan minimum age"""
+        min_age = self.orphan_min_age_hours * 3600
+        for directory, subdirs, names in os.walk(root):
+            subdirs[:] = [d for d in subdirs if os.path.join(directory, d) != skip_dir]
+            for name in names:
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if now - stat.st_mtime >= min_age:
+                    yield path, stat.st_size
+
+    def find_orphans(self, now: Optional[float] = None) -> List[Tuple[str, str, int]]:
+        """
+        Local stored files and thumbnails without a ResumeFile row.
+
+        Returns:
+            list: (kind, path, size) with kind 'orphan_file' or 'orphan_thumbnail'
+        """
+        now = now or time.time()
+        thumbnail_dir = self._thumbnail_dir()
+        orphans: List[Tuple[str, str, int]] = []
+
+        root = self._storage_root()
+        if root and os.path.isdir(root):
+            known: Set[str] = {
+                os.path.abspath(path) for (path,) in
+                db.session.query(ResumeFile.file_path).filter(ResumeFile.storage_type == 'local').yield_per(1000)
+                if path
+            }
+            orphans += [('orphan_file', path, size) for path, size in self._old_files(root, thumbnail_dir, now)
+                        if os.path.abspath(path) not in known]
+
+        if os.path.isdir(thumbnail_dir):
+            # Anything else there (e.g. default_thumbnail.jpg) is not a file thumbnail
+            candidates = {}
+            for path, size in self._old_files(thumbnail_dir, '', now):
+                match = _THUMBNAIL_NAME.match(os.path.basename(path))
+                if match and os.path.dirname(path) == thumbnail_dir:
+                    candidates[int(match.group(1))] = (path, size)
+            ids = list(candidates)
+            existing: Set[int] = set()
+            for start in range(0, len(ids), _ID_CHUNK_SIZE):
+                chunk = ids[start:start + _ID_CHUNK_SIZE]
+                existing.update(file_id for (file_id,) in
+                                db.session.query(ResumeFile.id).filter(ResumeFile.id.in_(chunk)))
+            orphans += [('orphan_thumbnail', path, size) for file_id, (path, size) in candidates.items()
+                        if file_id not in existing]
+        return orphans
+
+    def sweep_orphans(self, dry_run: bool = False, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Delete unreferenced local files and thumbnails in rate-limited batches.
+
+        Returns:
+            dict: orphans found, removed, bytes reclaimed and failures
+        """
+        from app.services.storage_deleter import get_storage_deleter
+
+        orphans = self.find_orphans(now)
+        report = {'found': len(orphans), 'files': 0, 'bytes': 0, 'failed': 0}
+        if dry_run:
+            report['bytes'] = sum(size for _, _, size in orphans)
+            return report
+
+        deleter = get_storage_deleter()
+        limit = self.batch_size * self.max_batches
+        for start in range(0, min(len(orphans), limit), self.batch_size):
+            if self.stop_event.is_set():
+                break
+            if start:
+                self.stop_event.wait(self.batch_pause_seconds)
+            batch = orphans[start:start + self.batch_size]
+            storage = deleter.delete([('local', None, path) for _, path, _ in batch])
+            failed = {entry['file_path'] for entry in storage.failed}
+            removed = [(kind, size) for kind, path, size in batch if path not in failed]
+            report['files'] += len(removed)
+            report['failed'] += len(failed)
+            report['bytes'] += self._count_reclaimed(removed)
+            for kind, _ in removed:
+                RETENTION_REMOVED.inc(kind=kind)
+
+        if report['found']:
+            logger.info(f"Retention: removed {report['files']} of {report['found']} orphaned file(s), "
+                        f"{report['bytes']} bytes reclaimed")
+        return report
+
+    # Unused section cache entries
+
+    def prune_section_cache(self, dry_run: bool = False, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Evict optimized-section cache entries unused for the maximum age.
+
+        Returns:
+            dict: entries removed and batches run
+        """
+        from app.services.section_cache import SectionCache
+
+        cutoff = (now or datetime.utcnow()) - timedelta(days=self.section_cache_max_age_days)
+        report = {'cutoff': cutoff.isoformat(), 'entries': 0, 'batches': 0}
+        if dry_run:
+            report['entries'] = SectionCache.count_unused_since(cutoff)
+            return report
+
+        while report['batches'] < self.max_batches and not self.stop_event.is_set():
+            if report['batches']:
+                self.stop_event.wait(self.batch_pause_seconds)
+            removed = SectionCache.prune(cutoff, limit=self.batch_size)
+            report['batches'] += 1
+            report['entries'] += removed
+            if removed < self.batch_size:
+                break
+
+        if report['entries']:
+            RETENTION_REMOVED.inc(report['entries'], kind='section_cache')
+            logger.info(f"Retention: evicted {report['entries']} section cache entries unused since {report['cutoff']}")
+        return report
+
+    @staticmethod
+    def _count_reclaimed(entries) -> int:
+        total = 0
+        for kind, size in entries:
+            RETENTION_RECLAIMED_BYTES.inc(size, kind=kind)
+            total += size
+        return total
+
+    def run(self, dry_run: bool = False) -> Dict[str, Any]:
+        """Run one sweep (in an app context) and return its report"""
+        started = time.monotonic()
+        report: Dict[str, Any] = {'dry_run': dry_run, 'expired': self.purge_expired(dry_run=dry_run)}
+        if self.scan_orphans:
+            report['orphans'] = self.sweep_orphans(dry_run=dry_run)
+        if self.section_cache_max_age_days > 0:
+            report['section_cache'] = self.prune_section_cache(dry_run=dry_run)
+        report['duration_seconds'] = round(time.monotonic() - started, 3)
+        if not dry_run:
+            self.last_report = dict(report, finished_at=datetime.utcnow().isoformat())
+        return report
+
+    # Background thread
+
+    def start(self) -> None:
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name='RetentionSweeper', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=30)
+
+    def _run(self) -> None:
+        while not self.stop_event.wait(self.interval_seconds):
+            try:
+                with self.app.app_context():
+                    self.run()
+            except Exception as e:
+                logger.error(f"Error running retention sweep: {e}")
+
+
+# Global instance
+retention_sweeper = RetentionSweeper()
@@ -0,0 +1,162 @@
+"""
+Section Cache for incremental resume re-optimization
+Stores AI rewrites per section fingerprint so re-runs after small edits only
+call the LLM for the sections that actually changed
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import json
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.temp import OptimizedSection
+
+
+logger = logging.getLogger(__name__)
+
+
+class SectionCache:
+    """
+    Content-addressed cache of optimized resume sections.
+
+    A fingerprint covers the prompt version, the section kind, the canonical
+    JSON of the section (for list entries, the whole entry, so a changed job
+    title also invalidates its description) and the job description hash. The
+    entry's position is not part of the key, so reordering entries still hits.
+    """
+
+    # Bump when optimization prompts change so old rewrites are not reused
+    PROMPT_VERSION = '1'
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """SHA-256 of a job description (or any text)"""
+        return hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+
+    @classmethod
+    def fingerprint(cls, section: str, content: Any, job_description_hash: str) -> str:
+        """
+        Compute the cache key of one section.
+
+        Args:
+            section: Section kind (summary, workExperience, projects, skills, analysis)
+            content: Section content used as prompt input
+            job_description_hash: ``text_hash`` of the job description
+
+        Returns:
+            str: Hex SHA-256 fingerprint
+        """
+        canonical = json.dumps(content, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        payload = '\x1f'.join((cls.PROMPT_VERSION, section, canonical, job_description_hash))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def lookup_many(self, fingerprints: Iterable[str]) -> Dict[str, Any]:
+        """
+        Return cached values for the given fingerprints.
+
+        Hit bookkeeping is written on its own connection, so a lookup never
+        commits (or rolls back) the caller's session.
+
+        Returns:
+            Dict[str, Any]: {fingerprint: optimized value} for hits only
+        """
+        keys = list(set(fingerprints))
+        if not keys:
+            return {}
+        try:
+            rows = db.session.query(OptimizedSection.fingerprint, OptimizedSection.optimized_value).filter(
+                OptimizedSection.fingerprint.in_(keys)
+            ).all()
+        except Exception as e:
+            # The cache is an optimization; never fail optimization because of it
+            logger.debug(f"Section cache lookup failed: {str(e)}")
+            return {}
+        hits = {fingerprint: value for fingerprint, value in rows}
+        if hits:
+            self._record_hits(list(hits))
+        return hits
+
+    @staticmethod
+    def _record_hits(fingerprints: List[str]) -> None:
+        table = OptimizedSection.__table__
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(
+                    table.update()
+                    .where(table.c.fingerprint.in_(fingerprints))
+                    .values(hit_count=func.coalesce(table.c.hit_count, 0) + 1, last_used_at=datetime.utcnow())
+                )
+        except Exception as e:
+            logger.debug(f"Section cache hit count not updated: {str(e)}")
+
+    def store_many(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Store optimized values (on its own connection, like the hit counts).
+
+        Args:
+            entries: {fingerprint: {'section': str, 'value': Any}}
+        """
+        if not entries:
+            return
+        table = OptimizedSection.__table__
+        # A concurrent writer may insert the same fingerprint first; the retry skips it
+        for attempt in range(2):
+            try:
+                with db.engine.begin() as connection:
+                    existing = {
+                        row[0] for row in connection.execute(
+                            select(table.c.fingerprint).where(table.c.fingerprint.in_(list(entries)))
+                        )
+                    }
+                    now = datetime.utcnow()
+                    rows = [
+                        {'fingerprint': fingerprint, 'section': entry['section'], 'optimized_value': entry['value'],
+                         'hit_count': 0, 'created_at': now, 'last_used_at': now}
+                        for fingerprint, entry in entries.items() if fingerprint not in existing
+                    ]
+                    if rows:
+                        connection.execute(table.insert(), rows)
+                return
+            except IntegrityError as e:
+                logger.debug(f"Section cache store raced (attempt {attempt + 1}): {str(e)}")
+            except Exception as e:
+                # Losing a store is harmless
+                logger.debug(f"Section cache store failed: {str(e)}")
+                return
+
+    @staticmethod
+    def count_unused_since(cutoff: datetime) -> int:
+        """Number of entries not used (stored or hit) since ``cutoff``"""
+        return db.session.query(func.count(OptimizedSection.id)).filter(
+            OptimizedSection.last_used_at < cutoff
+        ).scalar() or 0
+
+    @staticmethod
+    def prune(cutoff: datetime, limit: Optional[int] = None) -> int:
+        """
+        Delete entries not used since ``cutoff``, least recently used first.
+
+        Args:
+            cutoff: Entries whose ``last_used_at`` is older are removed
+            limit: Maximum number of entries removed by this call
+
+        Returns:
+            int: Entries removed
+        """
+        table = OptimizedSection.__table__
+        stale = select(table.c.id).where(table.c.last_used_at < cutoff).order_by(table.c.last_used_at)
+        if limit:
+            stale = stale.limit(limit)
+        with db.engine.begin() as connection:
+            ids = [row[0] for row in connection.execute(stale)]
+            if ids:
+                connection.execute(delete(table).where(table.c.id.in_(ids)))
+        return len(ids)
@@ -0,0 +1,306 @@
+"""
+Single-Flight Coalescing for identical in-flight AI requests
+Concurrent calls with the same key share one execution, across threads in a
+worker and across workers on the same host via lock files
+
+Settings come from the environment:
+    SINGLE_FLIGHT_ENABLED: "false" disables coalescing (default true)
+    SINGLE_FLIGHT_DIR: Lock and result directory (default <tmp>/resume_modifier_single_flight)
+    SINGLE_FLIGHT_WAIT_SECONDS: Longest a follower waits for the leader
+        before running the call itself (default 120)
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import os
+import copy
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Non-POSIX platforms only coalesce within a process
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+
+def content_key(namespace: str, payload: Any) -> str:
+    """
+    Build a coalescing key from a namespace and a JSON-serializable payload.
+
+    Args:
+        namespace: Operation name (e.g. 'resume_ai.parse')
+        payload: Inputs that fully determine the result
+
+    Returns:
+        str: Hex SHA-256 key
+    """
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str, separators=(',', ':'))
+    return hashlib.sha256(f"{namespace}\x1f{canonical}".encode('utf-8')).hexdigest()
+
+
+class _Call:
+    """An in-flight execution that followers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls into one execution.
+
+    Within a process, the first caller for a key runs the function while
+    later callers block on an event and receive a copy of the same result (or
+    the same exception). Across processes, the leader holds an exclusive
+    ``flock`` on ``<lock_dir>/<key>.lock`` while running and writes the
+    JSON-serializable result to ``<key>.result``; a worker that had to wait for
+    the lock reuses that result instead of calling again. Results contain
+    user data, so the directory is owner-only, files are 0600 and a result is
+    deleted as soon as every waiting worker has read it.
+
+    Only in-flight calls are coalesced: a call that starts after the previous
+    one finished runs again. Locks are purely an optimization; if a lock file
+    cannot be used, or the leader has not finished within ``wait_seconds``,
+    the call simply runs.
+    """
+
+    # Lock files (and results left by crashed workers) untouched for this long are pruned
+    STALE_FILE_SECONDS = 3600
+
+    # Prune at most this often (seconds)
+    PRUNE_INTERVAL = 600
+
+    # Polling interval while waiting for another worker's lock (seconds)
+    LOCK_POLL_SECONDS = 0.05
+
+    def __init__(self, lock_dir: Optional[str] = None, cross_process: bool = True,
+                 wait_seconds: Optional[float] = None):
+        self.lock_dir = lock_dir or os.getenv(
+            'SINGLE_FLIGHT_DIR', os.path.join(tempfile.gettempdir(), 'resume_modifier_single_flight')
+        )
+        self.cross_process = cross_process and fcntl is not None
+        self.wait_seconds = (wait_seconds if wait_seconds is not None
+                             else float(os.getenv('SINGLE_FLIGHT_WAIT_SECONDS', '120')))
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+        self.stats = {'executed': 0, 'coalesced': 0, 'cross_process_reused': 0, 'wait_timeouts': 0}
+
+    def do(self, key: str, func: Callable[[], Any], on_shared: Optional[Callable[[], None]] = None) -> Any:
+        """
+        Run ``func`` once for all concurrent callers with the same key.
+
+        Args:
+            key: Coalescing key (see ``content_key``)
+            func: Zero-argument callable producing the result
+            on_shared: Called when this caller receives another caller's result
+
+        Returns:
+            Any: The result; followers receive a deep copy
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(self.wait_seconds):
+                # The leader is stuck (hung provider call); don't hang with it
+                self._count('wait_timeouts')
+                logger.warning(f"Single-flight leader for {key[:12]} still running after "
+                               f"{self.wait_seconds}s, running the call")
+                return self._execute(func)
+            self._count('coalesced')
+            if call.error is not None:
+                raise call.error
+            if on_shared is not None:
+                on_shared()
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = self._run_leader(key, func, on_shared)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def _run_leader(self, key: str, func: Callable[[], Any], on_shared: Optional[Callable[[], None]]) -> Any:
+        lock_file = self._open_lock(f"{key}.lock") if self.cross_process else None
+        readers_file = self._open_lock(f"{key}.readers") if lock_file is not None else None
+        if readers_file is None:
+            if lock_file is not None:
+                lock_file.close()
+            return self._execute(func)
+
+        result_path = os.path.join(self.lock_dir, f"{key}.result")
+        try:
+            waited_since = time.time()
+            # Registered readers keep the result until they are done with it
+            fcntl.flock(readers_file, fcntl.LOCK_SH)
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Another worker is running the same call; wait and reuse its result
+                if not self._wait_for_lock(lock_file):
+                    self._count('wait_timeouts')
+                    logger.warning(f"Single-flight lock {key[:12]} held for over {self.wait_seconds}s, "
+                                   f"running the call")
+                    return self._execute(func)
+                reused = self._read_result(result_path, waited_since)
+                if reused is not None:
+                    self._count('cross_process_reused')
+                    if on_shared is not None:
+                        on_shared()
+                    return reused['value']
+
+            result = self._execute(func)
+            self._write_result(result_path, result)
+            return result
+        finally:
+            lock_file.close()  # Closing releases the flock
+            self._remove_result_if_unread(readers_file, result_path)
+            self._maybe_prune()
+
+    @staticmethod
+    def _remove_result_if_unread(readers_file, result_path: str) -> None:
+        """
+        Delete the shared result once no registered reader still needs it.
+
+        Every caller holds a shared lock on the readers file until it is done;
+        whoever then gets it exclusively (the leader when nobody waited,
+        otherwise the last reader) removes the result file.
+        """
+        try:
+            fcntl.flock(readers_file, fcntl.LOCK_UN)
+            fcntl.flock(readers_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            os.remove(result_path)
+        except OSError:
+            pass  # Readers remain (the last one removes it) or nothing was written
+        finally:
+            readers_file.close()
+
+    def _wait_for_lock(self, lock_file) -> bool:
+        """Take the exclusive lock, giving up after ``wait_seconds``"""
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(self.LOCK_POLL_SECONDS)
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _execute(self, func: Callable[[], Any]) -> Any:
+        self._count('executed')
+        return func()
+
+    def _private_lock_dir(self) -> bool:
+        """Create the lock directory owner-only; refuse one another user controls"""
+        os.makedirs(self.lock_dir, mode=0o700, exist_ok=True)
+        info = os.stat(self.lock_dir)
+        if hasattr(os, 'getuid') and info.st_uid != os.getuid():
+            logger.warning(f"Single-flight directory {self.lock_dir} is owned by another user; not sharing results")
+            return False
+        if info.st_mode & 0o077:
+            os.chmod(self.lock_dir, 0o700)
+        return True
+
+    def _open_lock(self, name: str):
+        try:
+            if not self._private_lock_dir():
+                return None
+            path = os.path.join(self.lock_dir, name)
+            lock_file = os.fdopen(os.open(path, os.O_RDWR | os.O_CREAT, 0o600), 'r+')
+            os.utime(path)  # Keep in-use lock files out of pruning
+            return lock_file
+        except OSError as e:
+            logger.debug(f"Single-flight lock unavailable, running without it: {str(e)}")
+            return None
+
+    @staticmethod
+    def _read_result(path: str, not_before: float) -> Optional[Dict[str, Any]]:
+        """Return {'value': ...} if a result was written while we waited"""
+        try:
+            if os.path.getmtime(path) < not_before:
+                return None
+            with open(path) as handle:
+                return {'value': json.load(handle)}
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_result(path: str, result: Any) -> None:
+        # Results are parsed resumes: readable by the service user only
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with os.fdopen(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as handle:
+                json.dump(result, handle)
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            # Non-serializable results are only shared within the process
+            logger.debug(f"Single-flight result not shared across workers: {str(e)}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def _maybe_prune(self) -> None:
+        now = time.time()
+        with self._lock:
+            if now - self._last_prune < self.PRUNE_INTERVAL:
+                return
+            self._last_prune = now
+        try:
+            for name in os.listdir(self.lock_dir):
+                path = os.path.join(self.lock_dir, name)
+                if now - os.path.getmtime(path) > self.STALE_FILE_SECONDS:
+                    os.remove(path)
+        except OSError:
+            pass
+
+
+_default_single_flight: Optional[SingleFlight] = None
+_default_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Return the process-wide SingleFlight instance"""
+    global _default_single_flight
+    if _default_single_flight is None:
+        with _default_lock:
+            if _default_single_flight is None:
+                _default_single_flight = SingleFlight()
+    return _default_single_flight
+
+
+def coalesce(namespace: str, payload: Any, func: Callable[[], Any],
+             on_shared: Optional[Callable[[], None]] = None) -> Any:
+    """
+    Run ``func`` through the shared SingleFlight, keyed by namespace and payload.
+
+    Disabled (``func`` is called directly) when SINGLE_FLIGHT_ENABLED is "false".
+    """
+    if os.getenv('SINGLE_FLIGHT_ENABLED', 'true').lower() == 'false':
+        return func()
+    return get_single_flight().do(content_key(namespace, payload), func, on_shared)
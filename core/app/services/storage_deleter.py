@@ -0,0 +1,171 @@
+"""
+Concurrent storage deleter
+Removes the stored objects of hard-deleted files in batches on a thread
+pool: S3 keys go out in ``delete_objects`` requests of up to 1000 keys,
+local files in chunks, so deleting hundreds of files neither holds a
+request open nor costs one storage round trip per file
+
+Settings come from the environment:
+    STORAGE_DELETE_WORKERS: Batches deleted concurrently (default 4)
+    STORAGE_DELETE_LOCAL_BATCH: Local files per batch (default 100)
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import os
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.services.file_storage_service import FileStorageService, StorageError
+from app.utils.metrics import STORAGE_DELETES
+
+
+logger = logging.getLogger(__name__)
+
+# (storage_type, s3_bucket, file_path) of one stored object
+StoredObject = Tuple[str, Optional[str], str]
+
+
+@dataclass
+class DeletionReport:
+    """Outcome of a storage deletion run"""
+    deleted: int = 0
+    missing: int = 0
+    failed: List[Dict[str, str]] = field(default_factory=list)
+
+    def add(self, other: 'DeletionReport') -> None:
+        self.deleted += other.deleted
+        self.missing += other.missing
+        self.failed.extend(other.failed)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {'deleted': self.deleted, 'missing': self.missing, 'failed': self.failed}
+
+
+def default_storage_service(storage_type: str) -> FileStorageService:
+    """
+    Storage service able to delete objects of ``storage_type``.
+
+    The configured backend (app.utils.storage_config) is used when it
+    matches; local files of an S3-configured deployment are still removable.
+
+    Raises:
+        StorageError: If S3 objects must be deleted but S3 is not configured
+    """
+    from app.utils.storage_config import StorageConfigManager
+
+    config = StorageConfigManager.get_storage_config_dict()
+    if config.get('storage_type') == storage_type:
+        return FileStorageService(config)
+    if storage_type == 'local':
+        return FileStorageService({'storage_type': 'local', 'local_storage_path': config.get('local_storage_path', '')})
+    raise StorageError(f"Cannot delete {storage_type} objects: storage is configured as {config.get('storage_type')}")
+
+
+class StorageDeleter:
+    """Deletes stored objects in batches on a thread pool"""
+
+    def __init__(self, service_factory: Optional[Callable[[str], FileStorageService]] = None,
+                 max_workers: Optional[int] = None, local_batch_size: Optional[int] = None):
+        self.service_factory = service_factory or default_storage_service
+        self.max_workers = max_workers or int(os.getenv('STORAGE_DELETE_WORKERS', 4))
+        self.local_batch_size = local_batch_size or int(os.getenv('STORAGE_DELETE_LOCAL_BATCH', 100))
+        self._services: Dict[str, FileStorageService] = {}
+        self._services_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='StorageDeleter')
+        # Runs whole background deletions, which fan their batches out to the pool
+        self._dispatcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix='StorageDeleterDispatch')
+
+    def _service(self, storage_type: str) -> FileStorageService:
+        with self._services_lock:
+            if storage_type not in self._services:
+                self._services[storage_type] = self.service_factory(storage_type)
+            return self._services[storage_type]
+
+    def batches(self, objects: Iterable[StoredObject]) -> List[Tuple[str, Optional[str], List[str]]]:
+        """Group objects by backend and bucket and split them into batches"""
+        groups: Dict[Tuple[str, Optional[str]], List[str]] = {}
+        for storage_type, s3_bucket, file_path in objects:
+            if file_path:
+                groups.setdefault((storage_type or 'local', s3_bucket), []).append(file_path)
+
+        batches = []
+        for (storage_type, s3_bucket), paths in groups.items():
+            paths = list(dict.fromkeys(paths))
+            size = FileStorageService.S3_DELETE_BATCH_SIZE if storage_type == 's3' else self.local_batch_size
+            for start in range(0, len(paths), size):
+                batches.append((storage_type, s3_bucket, paths[start:start + size]))
+        return batches
+
+    def _delete_batch(self, storage_type: str, s3_bucket: Optional[str], paths: List[str]) -> DeletionReport:
+        report = DeletionReport()
+        try:
+            results = self._service(storage_type).delete_files(paths, s3_bucket=s3_bucket)
+        except Exception as e:
+            results = {}
+            report.failed.extend({'file_path': path, 'error': str(e)} for path in paths)
+
+        for path, result in results.items():
+            if result.success:
+                report.deleted += 1
+            elif result.error_message == 'File not found':
+                report.missing += 1
+            else:
+                report.failed.append({'file_path': path, 'error': result.error_message or 'Delete failed'})
+
+        STORAGE_DELETES.inc(report.deleted, storage_type=storage_type, outcome='deleted')
+        STORAGE_DELETES.inc(report.missing, storage_type=storage_type, outcome='missing')
+        STORAGE_DELETES.inc(len(report.failed), storage_type=storage_type, outcome='failed')
+        return report
+
+    def delete(self, objects: Iterable[StoredObject]) -> DeletionReport:
+        """
+        Delete objects now, running their batches concurrently.
+
+        Objects that are already gone count as missing, not failed.
+        """
+        report = DeletionReport()
+        futures = [self._pool.submit(self._delete_batch, *batch) for batch in self.batches(objects)]
+        for future in futures:
+            report.add(future.result())
+        if report.failed:
+            logger.warning(f"Storage deletion: {report.deleted} deleted, {report.missing} missing, "
+                           f"{len(report.failed)} failed (first error: {report.failed[0]['error']})")
+        return report
+
+    def submit(self, objects: Iterable[StoredObject]) -> Future:
+        """Delete objects in the background; the future resolves to a DeletionReport"""
+        return self._dispatcher.submit(self.delete, list(objects))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting deletions; with ``wait``, finish the queued ones first"""
+        self._dispatcher.shutdown(wait=wait)
+        self._pool.shutdown(wait=wait)
+
+
+_deleter: Optional[StorageDeleter] = None
+_deleter_pid: Optional[int] = None
+_deleter_lock = threading.Lock()
+
+
+def get_storage_deleter() -> StorageDeleter:
+    """Return the process-wide StorageDeleter (a forked worker gets its own pool)"""
+    global _deleter, _deleter_pid
+    if _deleter is None or _deleter_pid != os.getpid():
+        with _deleter_lock:
+            if _deleter is None or _deleter_pid != os.getpid():
+                _deleter = StorageDeleter()
+                _deleter_pid = os.getpid()
+    return _deleter
+
+
+def shutdown_storage_deleter(wait: bool = True) -> None:
+    """Finish queued deletions of this process (call when a worker exits)"""
+    global _deleter
+    if _deleter is not None and _deleter_pid == os.getpid():
+        _deleter.shutdown(wait=wait)
+        _deleter = None
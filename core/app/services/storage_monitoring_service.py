@@ -16,8 +16,10 @@ from email.mime.multipart import MIMEMultipart
 
 from flask import current_app
 from sqlalchemy import text
-from googleapiclient.discovery import build
-import google.oauth2.credentials
+from app.utils.lazy_import import LazyImport
+
+build = LazyImport('googleapiclient.discovery', 'build')
+Credentials = LazyImport('google.oauth2.credentials', 'Credentials')
 
 from app.extensions import db
 from app.models.temp import GoogleAuth
@@ -240,7 +242,7 @@ class StorageMonitoringService:
                 auth = GoogleAuth.query.get(auth.id)
             
             # Build credentials
-            credentials = google.oauth2.credentials.Credentials(
+            credentials = Credentials(
                 token=auth.access_token,
                 refresh_token=auth.refresh_token,
                 token_uri='https://oauth2.googleapis.com/token',
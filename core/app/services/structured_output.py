@@ -0,0 +1,306 @@
+"""
+Structured Output decoding for LLM JSON responses
+Requests JSON mode, repairs common defects locally (prose around the object,
+code fences, trailing commas, truncated output) and fills missing template
+fields with empty defaults instead of failing the whole call
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import re
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Attempts at cutting a truncated document back to its last complete element
+MAX_TRUNCATION_CUTS = 20
+
+_FENCE = re.compile(r'```(?:json|JSON)?')
+_DANGLING_KEY = re.compile(r'([{,])\s*"(?:[^"\\]|\\.)*"\s*:?\s*$')
+
+_stats_lock = threading.Lock()
+_decode_stats = {'clean': 0, 'repaired': 0, 'reasked': 0, 'filled': 0, 'failed': 0}
+
+
+class StructuredOutputError(ValueError):
+    """Raised when a response cannot be decoded into the expected JSON"""
+
+
+def get_decode_stats() -> Dict[str, int]:
+    """Counters of clean decodes, local repairs, re-asks, template fills and failures"""
+    with _stats_lock:
+        return dict(_decode_stats)
+
+
+def _count(outcome: str) -> None:
+    with _stats_lock:
+        _decode_stats[outcome] += 1
+
+
+def _scan(text: str) -> Tuple[List[str], bool]:
+    """Return the open-bracket stack and whether the text ends inside a string"""
+    stack: List[str] = []
+    in_string = escape = False
+    for char in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif char == '\\':
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            stack.append(char)
+        elif char in '}]' and stack:
+            stack.pop()
+    return stack, in_string
+
+
+def _outside_strings(text: str):
+    """Yield (index, char) for characters outside JSON strings, plus opening quotes"""
+    in_string = escape = False
+    for index, char in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif char == '\\':
+                escape = True
+            elif char == '"':
+                in_string = False
+        else:
+            if char == '"':
+                in_string = True
+            yield index, char
+
+
+def extract_json_block(content: str) -> Optional[str]:
+    """
+    Return the first balanced JSON object or array in ``content``.
+
+    Prose before or after the document and code fences are dropped. If the
+    document never closes (truncated output), the remainder is returned.
+    """
+    if not content:
+        return None
+    text = _FENCE.sub('', content)
+    starts = [index for index in (text.find('{'), text.find('[')) if index != -1]
+    if not starts:
+        return None
+    start = min(starts)
+    depth = 0
+    for index, char in _outside_strings(text[start:]):
+        if char in '{[':
+            depth += 1
+        elif char in '}]':
+            depth -= 1
+            if depth == 0:
+                return text[start:start + index + 1]
+    return text[start:]
+
+
+def remove_trailing_commas(text: str) -> str:
+    """Drop commas directly before a closing bracket (outside strings)"""
+    remove = set()
+    last_comma = None
+    for index, char in _outside_strings(text):
+        if char == ',':
+            last_comma = index
+        elif char in '}]':
+            if last_comma is not None:
+                remove.add(last_comma)
+            last_comma = None
+        elif not char.isspace():
+            last_comma = None
+    return ''.join(char for index, char in enumerate(text) if index not in remove)
+
+
+def close_truncated(text: str) -> str:
+    """Close an unterminated string and all open brackets, dropping a dangling key"""
+    stack, in_string = _scan(text)
+    if in_string:
+        text += '"'
+    text = text.rstrip()
+    if stack and stack[-1] == '{':
+        text = _DANGLING_KEY.sub(r'\1', text)
+    text = text.rstrip().rstrip(',')
+    stack, _ = _scan(text)
+    closers = ''.join('}' if bracket == '{' else ']' for bracket in reversed(stack))
+    return remove_trailing_commas(text + closers)
+
+
+def repair_json(text: str) -> Any:
+    """
+    Parse ``text`` after local repairs.
+
+    Raises:
+        StructuredOutputError: If no repair produces valid JSON
+    """
+    candidate = remove_trailing_commas(text.strip())
+    try:
+        return json.loads(candidate)
+    except ValueError:
+        pass
+
+    # Truncated output: close it, cutting back to earlier complete elements if needed
+    for _ in range(MAX_TRUNCATION_CUTS):
+        try:
+            return json.loads(close_truncated(candidate))
+        except ValueError:
+            commas = [index for index, char in _outside_strings(candidate) if char == ',']
+            if not commas:
+                break
+            candidate = candidate[:commas[-1]]
+    raise StructuredOutputError('Response is not valid JSON and could not be repaired')
+
+
+def decode_json(content: Optional[str], expect: type = dict) -> Any:
+    """
+    Decode an LLM response into JSON of the expected type.
+
+    Args:
+        content: Raw message content
+        expect: ``dict`` or ``list``
+
+    Returns:
+        Any: The decoded document
+
+    Raises:
+        StructuredOutputError: If the content holds no usable JSON of that type
+    """
+    text = (content or '').strip()
+    try:
+        value = json.loads(_FENCE.sub('', text).strip())
+        if isinstance(value, expect):
+            _count('clean')
+            return value
+    except ValueError:
+        pass
+
+    block = extract_json_block(text)
+    if block is None:
+        _count('failed')
+        raise StructuredOutputError('Response contains no JSON document')
+    try:
+        value = repair_json(block)
+    except StructuredOutputError:
+        _count('failed')
+        raise
+    if not isinstance(value, expect):
+        _count('failed')
+        raise StructuredOutputError(f'Expected a JSON {expect.__name__}, got {type(value).__name__}')
+    _count('repaired')
+    return value
+
+
+def missing_fields(value: Any, template: Any, depth: int = 1, prefix: str = '') -> List[str]:
+    """
+    Dotted paths of template object keys absent from ``value``.
+
+    Only object keys down to ``depth`` levels are checked; list contents and
+    deeper optional fields vary per document.
+    """
+    if depth <= 0 or not isinstance(template, dict) or not isinstance(value, dict):
+        return []
+    missing = []
+    for key, child in template.items():
+        path = f"{prefix}{key}"
+        if key not in value:
+            missing.append(path)
+        else:
+            missing.extend(missing_fields(value[key], child, depth - 1, f"{path}."))
+    return missing
+
+
+def empty_default(template: Any) -> Any:
+    """
+    Empty value shaped like a template field.
+
+    Objects keep their keys with empty values; lists are empty (template
+    lists hold one example entry, not a default); scalars become '', 0 or False.
+    """
+    if isinstance(template, dict):
+        return {key: empty_default(child) for key, child in template.items()}
+    if isinstance(template, list):
+        return []
+    if isinstance(template, (str, bool, int, float)):
+        return type(template)()
+    return None
+
+
+def fill_missing(value: Dict[str, Any], template: Dict[str, Any]) -> None:
+    """Add template object keys absent from ``value`` (at any depth) with empty defaults"""
+    for key, child in template.items():
+        if key not in value:
+            value[key] = empty_default(child)
+        elif isinstance(child, dict) and isinstance(value[key], dict):
+            fill_missing(value[key], child)
+
+
+def ensure_json_instruction(messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Append a JSON instruction if no message mentions JSON (required by JSON mode)"""
+    messages = list(messages)
+    if not any('json' in (message.get('content') or '').lower() for message in messages):
+        messages.append({'role': 'system', 'content': 'Respond with a JSON object only.'})
+    return messages
+
+
+def complete_json(client, messages: List[Dict[str, str]], model: str = 'gpt-4o-mini',
+                  template: Optional[Dict[str, Any]] = None, expect: type = dict,
+                  json_mode: bool = True, **kwargs) -> Any:
+    """
+    Run a chat completion and return its decoded JSON.
+
+    Objects are requested in JSON mode unless ``response_format`` is given.
+    Defective output is repaired locally; only when that fails is the model
+    asked once more for valid JSON. If a ``template`` is given, keys it
+    defines but the response lacks are filled locally with empty defaults
+    (an omitted field is as good as an empty one; it is not worth a call).
+
+    Args:
+        client: OpenAI client
+        messages: Chat messages
+        model: Model name
+        template: Response template to validate against
+        expect: ``dict`` or ``list``
+        json_mode: Request ``response_format={"type": "json_object"}`` for objects
+        **kwargs: Passed to ``chat.completions.create``
+
+    Returns:
+        Any: The decoded (and possibly completed) document
+
+    Raises:
+        StructuredOutputError: If no valid JSON could be obtained
+    """
+    messages = list(messages)
+    if expect is dict and json_mode and 'response_format' not in kwargs:
+        kwargs['response_format'] = {'type': 'json_object'}
+        messages = ensure_json_instruction(messages)
+
+    content = client.chat.completions.create(model=model, messages=messages, **kwargs).choices[0].message.content
+    try:
+        value = decode_json(content, expect)
+    except StructuredOutputError as e:
+        logger.warning(f"Structured output could not be repaired locally, re-asking: {str(e)}")
+        _count('reasked')
+        retry_messages = messages + [
+            {'role': 'assistant', 'content': content or ''},
+            {'role': 'user', 'content': 'That reply was not valid JSON. Return the same answer as valid JSON only.'}
+        ]
+        content = client.chat.completions.create(model=model, messages=retry_messages, **kwargs).choices[0].message.content
+        value = decode_json(content, expect)
+
+    if template is not None and isinstance(value, dict):
+        missing = missing_fields(value, template)
+        if missing:
+            _count('filled')
+            logger.info(f"Structured output missing {len(missing)} top-level fields, filled with empty defaults")
+        fill_missing(value, template)
+
+    return value
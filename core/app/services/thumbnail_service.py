@@ -4,13 +4,16 @@ Handles creation, storage, and management of PDF document thumbnails
 """
 
 import os
+import time
 import logging
 from datetime import datetime
 from typing import Optional, Tuple
 from flask import current_app
-from PIL import Image
-import pdf2image
-from pdf2image.exceptions import PDFInfoNotInstalledError, PDFPageCountError, PDFSyntaxError
+from app.utils.lazy_import import LazyImport
+from app.utils.metrics import THUMBNAIL_DURATION
+
+Image = LazyImport('PIL.Image')
+pdf2image = LazyImport('pdf2image')
 
 
 class ThumbnailService:
@@ -34,8 +37,18 @@ class ThumbnailService:
         Returns:
             bool: True if thumbnail generated successfully, False otherwise
         """
+        started = time.perf_counter()
+        generated = ThumbnailService._generate_thumbnail(file_path, output_path)
+        THUMBNAIL_DURATION.observe(time.perf_counter() - started, outcome='success' if generated else 'error')
+        return generated
+    
+    @staticmethod
+    def _generate_thumbnail(file_path: str, output_path: str) -> bool:
         logger = logging.getLogger(__name__)
         
+        # Imported here rather than at module level: it loads pdf2image and PIL
+        from pdf2image.exceptions import PDFInfoNotInstalledError, PDFPageCountError, PDFSyntaxError
+
         try:
             # Validate input file exists
             if not os.path.exists(file_path):
@@ -0,0 +1,294 @@
+"""
+Worker Lifecycle for multi-process serving
+Makes a preloaded app safe to fork into WSGI workers and elects exactly one
+process to run the background services
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import os
+import logging
+import tempfile
+import threading
+from typing import Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; every process becomes leader
+    fcntl = None
+
+from flask import Flask
+
+from app.extensions import db
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SERVICES = ('token_refresh', 'storage_monitor', 'bulk_poller', 'retention', 'keyword_index')
+
+
+def reset_after_fork(app: Flask) -> None:
+    """
+    Drop connections a forked worker inherited from the preloading master.
+
+    Pooled database connections are discarded without closing them (closing
+    would also close the parent's sockets) and the local search index opens
+    its own SQLite connection.
+    """
+    with app.app_context():
+        db.engine.dispose(close=False)
+    replica = app.extensions.get('read_replica')
+    if replica is not None:
+        replica.engine.dispose(close=False)
+    search = app.extensions.get('resume_search')
+    if search is not None and search.local_index is not None:
+        search.local_index.reopen()
+
+
+class LeaderLock:
+    """
+    Non-blocking exclusive file lock.
+
+    The OS releases the lock when the holding process exits, so a recycled or
+    crashed leader frees it for another worker.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv(
+            'BACKGROUND_LEADER_LOCK', os.path.join(tempfile.gettempdir(), 'resume_modifier_background.lock')
+        )
+        self._handle = None
+
+    @property
+    def held(self) -> bool:
+        return self._handle is not None
+
+    def acquire(self) -> bool:
+        """Try to take the lock; returns whether this process holds it"""
+        if self._handle is not None:
+            return True
+        handle = open(self.path, 'a+')
+        if fcntl is not None:
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                handle.close()
+                return False
+        handle.seek(0)
+        handle.truncate()
+        handle.write(str(os.getpid()))
+        handle.flush()
+        self._handle = handle
+        return True
+
+    def release(self) -> None:
+        if self._handle is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+        self._handle.close()
+        self._handle = None
+
+
+class BulkBatchPoller:
+    """Periodically ingests finished offline bulk modification jobs"""
+
+    def __init__(self, app: Flask, interval_seconds: Optional[float] = None):
+        self.app = app
+        self.interval_seconds = interval_seconds or float(os.getenv('BULK_POLL_INTERVAL_SECONDS', '60'))
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name='BulkBatchPoller', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=10)
+
+    def _run(self) -> None:
+        from app.services.batch_resume_modifier import BatchResumeModifier
+
+        while not self.stop_event.wait(self.interval_seconds):
+            try:
+                with self.app.app_context():
+                    finished = BatchResumeModifier().poll_pending_bulk_modifications()
+                if finished:
+                    logger.info(f"Bulk poller finished {finished} bulk modification(s)")
+            except Exception as e:
+                logger.error(f"Error polling bulk modifications: {e}")
+
+
+class KeywordIndexRebuilder:
+    """
+    Periodically refits the shared keyword corpus (see rebuild_keyword_index).
+
+    Runs every KEYWORD_INDEX_REBUILD_SECONDS, and right away when no index
+    has been written yet; workers pick up the new file on their next check.
+    """
+
+    def __init__(self, app: Flask, interval_seconds: Optional[float] = None):
+        self.app = app
+        self.interval_seconds = interval_seconds or float(os.getenv('KEYWORD_INDEX_REBUILD_SECONDS', '86400'))
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name='KeywordIndexRebuilder', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=10)
+
+    def _rebuild(self) -> None:
+        from app.services.keyword_engine import rebuild_keyword_index
+
+        try:
+            with self.app.app_context():
+                summary = rebuild_keyword_index()
+            logger.info(f"Keyword index rebuilt: {summary['documents']} documents, "
+                        f"{summary['files_updated']} file(s) updated")
+        except Exception as e:
+            logger.error(f"Error rebuilding keyword index: {e}")
+
+    def _run(self) -> None:
+        from app.services.keyword_engine import keyword_index_path
+
+        with self.app.app_context():
+            missing = not os.path.exists(keyword_index_path())
+        if missing:
+            self._rebuild()
+        while not self.stop_event.wait(self.interval_seconds):
+            self._rebuild()
+
+
+class BackgroundServices:
+    """
+    Run the background services in exactly one process.
+
+    Every worker starts an election thread that tries to take the leader
+    lock every BACKGROUND_LEADER_RETRY_SECONDS; the winner starts the
+    services named in BACKGROUND_SERVICES (comma separated, default
+    ``token_refresh,storage_monitor,bulk_poller,retention,keyword_index``) and
+    keeps them until it exits, after which another worker takes over.
+    """
+
+    def __init__(self, app: Flask, services: Optional[Iterable[str]] = None,
+                 lock: Optional[LeaderLock] = None, retry_seconds: Optional[float] = None):
+        self.app = app
+        if services is None:
+            configured = os.getenv('BACKGROUND_SERVICES')
+            services = configured.split(',') if configured is not None else DEFAULT_SERVICES
+        self.services = [name.strip() for name in services if name.strip()]
+        self.lock = lock or LeaderLock()
+        self.retry_seconds = retry_seconds or float(os.getenv('BACKGROUND_LEADER_RETRY_SECONDS', '30'))
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self._bulk_poller: Optional[BulkBatchPoller] = None
+        self._keyword_rebuilder: Optional[KeywordIndexRebuilder] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self.lock.held
+
+    def start(self) -> None:
+        """Start competing for leadership in a daemon thread"""
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._elect, name='BackgroundLeaderElection', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stop the election and, if leader, the services; then release the lock"""
+        self.stop_event.set()
+        if self.thread and self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join(timeout=5)
+        if self.lock.held:
+            self._stop_services()
+            self.lock.release()
+
+    def _elect(self) -> None:
+        while not self.stop_event.is_set():
+            if self.lock.acquire():
+                logger.info(f"Process {os.getpid()} elected to run background services: {', '.join(self.services)}")
+                self._start_services()
+                return
+            self.stop_event.wait(self.retry_seconds)
+
+    def _start_services(self) -> None:
+        for name in self.services:
+            try:
+                if name == 'token_refresh':
+                    from app.services.token_refresh_service import token_refresh_service
+                    token_refresh_service.init_app(self.app)
+                    token_refresh_service.start()
+                elif name == 'storage_monitor':
+                    from app.services.background_storage_monitor import background_storage_monitor
+                    background_storage_monitor.init_app(self.app)
+                    background_storage_monitor.start()
+                elif name == 'bulk_poller':
+                    self._bulk_poller = BulkBatchPoller(self.app)
+                    self._bulk_poller.start()
+                elif name == 'retention':
+                    from app.services.retention_service import retention_sweeper
+                    retention_sweeper.init_app(self.app)
+                    retention_sweeper.start()
+                elif name == 'keyword_index':
+                    self._keyword_rebuilder = KeywordIndexRebuilder(self.app)
+                    self._keyword_rebuilder.start()
+                else:
+                    logger.warning(f"Unknown background service: {name}")
+            except Exception as e:
+                logger.error(f"Failed to start background service {name}: {e}")
+
+    def _stop_services(self) -> None:
+        if 'token_refresh' in self.services:
+            from app.services.token_refresh_service import token_refresh_service
+            token_refresh_service.stop()
+        if 'storage_monitor' in self.services:
+            from app.services.background_storage_monitor import background_storage_monitor
+            background_storage_monitor.stop()
+        if self._bulk_poller is not None:
+            self._bulk_poller.stop()
+            self._bulk_poller = None
+        if 'retention' in self.services:
+            from app.services.retention_service import retention_sweeper
+            retention_sweeper.stop()
+        if self._keyword_rebuilder is not None:
+            self._keyword_rebuilder.stop()
+            self._keyword_rebuilder = None
+
+
+def on_worker_start(app: Flask) -> BackgroundServices:
+    """Prepare a freshly forked worker (call from the server's post-fork hook)"""
+    from app.services.pdf_extraction_engine import start_extraction_pool
+
+    reset_after_fork(app)
+    start_extraction_pool()
+    services = BackgroundServices(app)
+    app.extensions['background_services'] = services
+    if os.getenv('BACKGROUND_SERVICES_ENABLED', 'true').lower() == 'true':
+        services.start()
+    return services
+
+
+def on_worker_exit(app: Flask) -> None:
+    """Stop background work of an exiting worker (call from the worker-exit hook)"""
+    from app.utils.metrics import REGISTRY
+
+    from app.services.storage_deleter import shutdown_storage_deleter
+    from app.services.pdf_extraction_engine import shutdown_extraction_pool
+
+    services = app.extensions.get('background_services')
+    if services is not None:
+        services.stop()
+    shutdown_extraction_pool(wait=False)
+    # Let queued storage deletions of hard-deleted files finish
+    shutdown_storage_deleter(wait=True)
+    REGISTRY.flush()
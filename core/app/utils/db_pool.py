@@ -0,0 +1,153 @@
+"""
+Database connection pool management
+Engine options sized to the serving model (gunicorn workers x threads),
+with pre-ping, recycling, connect and statement timeouts, plus a pool
+class that records checkout wait times and alerts on pool exhaustion
+
+Settings come from the environment:
+    DB_POOL_SIZE: Connections kept per process (default: threads per
+        worker + 2 for background services; 10 for gevent workers)
+    DB_MAX_OVERFLOW: Extra connections allowed under bursts (default 5)
+    DB_POOL_TIMEOUT: Seconds to wait for a free connection (default 10)
+    DB_POOL_RECYCLE: Seconds before a connection is replaced (default 1800)
+    DB_POOL_PRE_PING: Test connections on checkout (default true)
+    DB_CONNECT_TIMEOUT: Seconds to establish a connection (default 10)
+    DB_STATEMENT_TIMEOUT_MS: Per-statement limit, 0 disables (default 30000)
+    DB_POOL_ALERT_INTERVAL: Minimum seconds between exhaustion alerts (default 60)
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Any, Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.utils.metrics import DB_POOL_CHECKOUT_WAIT, DB_POOL_EXHAUSTED
+
+
+logger = logging.getLogger(__name__)
+
+_last_alert: Dict[str, float] = {}
+_alert_lock = threading.Lock()
+
+
+def _alert(pool: QueuePool, kind: str, level: int = logging.WARNING) -> None:
+    """Log a pool alert, at most once per DB_POOL_ALERT_INTERVAL per kind"""
+    interval = float(os.getenv('DB_POOL_ALERT_INTERVAL', 60))
+    now = time.monotonic()
+    with _alert_lock:
+        if now - _last_alert.get(kind, float('-inf')) < interval:
+            return
+        _last_alert[kind] = now
+    logger.log(level, f"Database pool {kind}: {pool.status()} (timeout {pool._timeout}s)")
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that times checkouts.
+
+    Wait times go to ``db_pool_checkout_wait_seconds``. A checkout that
+    finds every connection (including overflow) in use counts towards
+    ``db_pool_exhausted_total`` and logs an alert; a checkout that times out
+    is logged as an error. The class survives ``engine.dispose()``, which
+    recreates the pool from the same class.
+    """
+
+    def _do_get(self):
+        if self._max_overflow > -1 and self.checkedout() >= self.size() + self._max_overflow:
+            DB_POOL_EXHAUSTED.inc()
+            _alert(self, 'exhausted')
+
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started, outcome='timeout')
+            _alert(self, 'checkout timeout', logging.ERROR)
+            raise
+        DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started, outcome='success')
+        return connection
+
+
+def _default_pool_size() -> int:
+    if os.getenv('GUNICORN_WORKER_CLASS', 'gthread') == 'gevent':
+        return 10
+    # One connection per request thread plus the leader's background services
+    return int(os.getenv('GUNICORN_THREADS', 8)) + 2
+
+
+def engine_options(database_uri: str) -> Dict[str, Any]:
+    """
+    SQLALCHEMY_ENGINE_OPTIONS for a database URI.
+
+    SQLite (development and tests) keeps Flask-SQLAlchemy's defaults.
+    """
+    if database_uri.startswith('sqlite'):
+        return {}
+
+    options: Dict[str, Any] = {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': int(os.getenv('DB_POOL_SIZE', _default_pool_size())),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 5)),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true',
+    }
+
+    connect_timeout = int(os.getenv('DB_CONNECT_TIMEOUT', 10))
+    statement_timeout_ms = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 30000))
+    if database_uri.startswith('postgres'):
+        connect_args: Dict[str, Any] = {'connect_timeout': connect_timeout}
+        if statement_timeout_ms:
+            connect_args['options'] = f"-c statement_timeout={statement_timeout_ms}"
+        options['connect_args'] = connect_args
+    elif database_uri.startswith('mysql'):
+        connect_args = {'connect_timeout': connect_timeout}
+        if statement_timeout_ms:
+            # Applies to SELECT statements (MySQL 5.7.8+)
+            connect_args['init_command'] = f"SET SESSION max_execution_time={statement_timeout_ms}"
+        options['connect_args'] = connect_args
+    return options
+
+
+def pool_stats(engine) -> Dict[str, Any]:
+    """
+    Live statistics of an engine's pool in this process.
+
+    Returns:
+        Dict with the pool configuration, current checkouts and overflow
+    """
+    pool = engine.pool
+    stats: Dict[str, Any] = {
+        'url': engine.url.render_as_string(hide_password=True),
+        'pool_class': type(pool).__name__,
+        'status': pool.status(),
+        'recycle_seconds': pool._recycle,
+        'pre_ping': pool._pre_ping
+    }
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size': pool.size(),
+            'max_overflow': pool._max_overflow,
+            'timeout_seconds': pool._timeout,
+            'checked_in': pool.checkedin(),
+            'checked_out': pool.checkedout(),
+            'overflow': pool.overflow()
+        })
+    return stats
+
+
+def checkout_stats() -> Dict[str, Any]:
+    """Checkout wait percentiles, timeouts and exhaustion count of this process (all engines)"""
+    return {
+        'pid': os.getpid(),
+        'wait': DB_POOL_CHECKOUT_WAIT.summary(outcome='success'),
+        'timeouts': DB_POOL_CHECKOUT_WAIT.summary(outcome='timeout')['count'],
+        'exhausted': int(DB_POOL_EXHAUSTED.value())
+    }
@@ -17,86 +17,98 @@ def monitor_google_drive_operation(operation_name: str):
     """
     Decorator to monitor Google Drive operations
     
+    Durations are recorded in the ``google_drive_operation_duration_seconds``
+    histogram, labelled with the operation and its outcome.
+    
     Args:
         operation_name: Name of the operation being monitored
     """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            from app.utils.performance_optimizer import performance_monitor
-            
-            start_time = time.time()
-            operation_id = f"google_drive_{operation_name}"
+            start_time = time.perf_counter()
             
             try:
-                with performance_monitor.time_operation(operation_id):
-                    result = func(*args, **kwargs)
-                
-                # Log successful operation
-                duration = (time.time() - start_time) * 1000
-                logger.debug(f"Google Drive {operation_name} completed in {duration:.2f}ms")
-                
-                return result
-                
+                result = func(*args, **kwargs)
             except Exception as e:
                 # Log failed operation
-                duration = (time.time() - start_time) * 1000
+                duration = (time.perf_counter() - start_time) * 1000
                 logger.error(f"Google Drive {operation_name} failed after {duration:.2f}ms: {e}")
-                
-                # Record failure metric
-                performance_monitor.record_metric(
-                    f"{operation_id}_failures", 
-                    duration, 
-                    'ms'
-                )
-                
+                gdrive_performance_tracker.record_operation(operation_name, duration, success=False)
                 raise
+            
+            # Log successful operation
+            duration = (time.perf_counter() - start_time) * 1000
+            logger.debug(f"Google Drive {operation_name} completed in {duration:.2f}ms")
+            # Service methods report most API errors as {'success': False, ...}
+            succeeded = not (isinstance(result, dict) and result.get('success') is False)
+            gdrive_performance_tracker.record_operation(operation_name, duration, success=succeeded)
+            
+            return result
         
         return wrapper
     return decorator
 
 
 class GoogleDrivePerformanceTracker:
-    """Track performance metrics for Google Drive operations"""
+    """Track performance metrics for Google Drive operations in the metrics registry"""
     
     def __init__(self):
-        self.operation_counts = {}
-        self.rate_limit_hits = 0
+        from app.utils.metrics import GOOGLE_DRIVE_DURATION, GOOGLE_DRIVE_RATE_LIMITS
+        self.durations = GOOGLE_DRIVE_DURATION
+        self.rate_limits = GOOGLE_DRIVE_RATE_LIMITS
         self.last_rate_limit_time = None
         
     def record_operation(self, operation_type: str, duration_ms: float, success: bool = True):
         """Record a Google Drive operation"""
-        if operation_type not in self.operation_counts:
-            self.operation_counts[operation_type] = {
-                'total': 0,
-                'successful': 0,
-                'failed': 0,
-                'total_duration': 0,
-                'avg_duration': 0
-            }
+        self.durations.observe(
+            duration_ms / 1000,
+            operation=operation_type,
+            outcome='success' if success else 'error'
+        )
+    
+    @property
+    def rate_limit_hits(self) -> int:
+        return int(self.rate_limits.value())
+    
+    @property
+    def operation_counts(self) -> Dict[str, Dict[str, Any]]:
+        """Per-operation totals and latency percentiles (ms)"""
+        from app.utils.metrics import summarize
         
-        stats = self.operation_counts[operation_type]
-        stats['total'] += 1
-        stats['total_duration'] += duration_ms
-        stats['avg_duration'] = stats['total_duration'] / stats['total']
+        cells: Dict[str, List[float]] = {}
+        failed: Dict[str, int] = {}
+        for (operation, outcome), cell in self.durations.values().items():
+            merged = cells.setdefault(operation, [0.0] * len(cell))
+            for index, value in enumerate(cell):
+                merged[index] += value
+            if outcome != 'success':
+                failed[operation] = failed.get(operation, 0) + int(cell[-1])
         
-        if success:
-            stats['successful'] += 1
-        else:
-            stats['failed'] += 1
+        operations = {}
+        for operation, cell in cells.items():
+            summary = summarize(self.durations.buckets, cell)
+            operations[operation] = {
+                'total': summary['count'],
+                'successful': summary['count'] - failed.get(operation, 0),
+                'failed': failed.get(operation, 0),
+                'total_duration': summary['sum'] * 1000,
+                'avg_duration': (summary['avg'] or 0) * 1000,
+                'p50_duration': summary['p50'] * 1000 if summary['p50'] is not None else None,
+                'p95_duration': summary['p95'] * 1000 if summary['p95'] is not None else None,
+                'p99_duration': summary['p99'] * 1000 if summary['p99'] is not None else None
+            }
+        return operations
     
     def record_rate_limit_hit(self):
         """Record when we hit a rate limit"""
-        self.rate_limit_hits += 1
+        self.rate_limits.inc()
         self.last_rate_limit_time = time.time()
-        
-        from app.utils.performance_optimizer import performance_monitor
-        performance_monitor.record_metric("google_drive_rate_limits", 1, 'count')
     
     def get_performance_summary(self) -> Dict[str, Any]:
         """Get performance summary for Google Drive operations"""
         return {
-            'operations': dict(self.operation_counts),
+            'operations': self.operation_counts,
             'rate_limit_hits': self.rate_limit_hits,
             'last_rate_limit': self.last_rate_limit_time,
             'recommendations': self._generate_recommendations()
@@ -105,6 +117,7 @@ class GoogleDrivePerformanceTracker:
     def _generate_recommendations(self) -> List[str]:
         """Generate performance optimization recommendations"""
         recommendations = []
+        operation_counts = self.operation_counts
         
         # Check for frequent rate limiting
         if self.rate_limit_hits > 10:
@@ -113,7 +126,7 @@ class GoogleDrivePerformanceTracker:
             )
         
         # Check for slow operations
-        for op_type, stats in self.operation_counts.items():
+        for op_type, stats in operation_counts.items():
             if stats['avg_duration'] > 5000:  # 5 seconds
                 recommendations.append(
                     f"Slow {op_type} operations detected (avg: {stats['avg_duration']:.0f}ms). "
@@ -121,7 +134,7 @@ class GoogleDrivePerformanceTracker:
                 )
         
         # Check for high failure rates
-        for op_type, stats in self.operation_counts.items():
+        for op_type, stats in operation_counts.items():
             failure_rate = stats['failed'] / stats['total'] if stats['total'] > 0 else 0
             if failure_rate > 0.1:  # 10% failure rate
                 recommendations.append(
@@ -247,14 +260,15 @@ class OptimizedGoogleDriveServiceMixin:
     
     def get_performance_metrics(self) -> Dict[str, Any]:
         """Get performance metrics for this service instance"""
-        from app.utils.performance_optimizer import performance_monitor
+        summary = self.performance_tracker.get_performance_summary()
+        operations = summary['operations']
         
         return {
-            'google_drive_operations': self.performance_tracker.get_performance_summary(),
+            'google_drive_operations': summary,
             'general_metrics': {
-                'upload_time_avg': performance_monitor.get_average_metric('google_drive_file_upload'),
-                'conversion_time_avg': performance_monitor.get_average_metric('google_drive_conversion'),
-                'sharing_time_avg': performance_monitor.get_average_metric('google_drive_sharing')
+                'upload_time_avg': operations.get('file_upload', {}).get('avg_duration'),
+                'conversion_time_avg': operations.get('conversion', {}).get('avg_duration'),
+                'sharing_time_avg': operations.get('sharing', {}).get('avg_duration')
             }
         }
     
@@ -9,10 +9,12 @@ import os
 import json
 import logging
 from typing import Dict, List, Optional, Tuple
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from flask import current_app
+from app.utils.lazy_import import LazyImport
+
+service_account = LazyImport('google.oauth2.service_account')
+build = LazyImport('googleapiclient.discovery', 'build')
 
 logger = logging.getLogger(__name__)
 
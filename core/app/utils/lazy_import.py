@@ -0,0 +1,103 @@
+"""
+Deferred imports of heavy dependencies
+Module-level stand-ins for ``import x`` / ``from x import y`` that import the
+target on first use, so importing the app does not pay for OpenAI, Google
+API clients, boto3, numpy/scipy, PDF and DOCX libraries up front
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import importlib
+import threading
+from typing import Any, List, Optional, Sequence
+
+
+_MISSING = object()
+_registry: List['LazyImport'] = []
+_registry_lock = threading.Lock()
+
+
+class LazyImport:
+    """
+    Stand-in for a module or a module attribute, imported on first use.
+
+    Calling the stand-in or reading one of its attributes imports the
+    target. The stand-in is falsy when the target cannot be imported, so
+    ``try/except ImportError: X = None`` availability checks become
+    ``if X:``. Module attributes holding a stand-in can be patched in tests
+    like the real object.
+
+    Exception classes used in ``except`` clauses cannot be deferred this way;
+    import those directly or inside the function.
+    """
+
+    def __init__(self, module: str, attribute: Optional[str] = None, fallbacks: Sequence[str] = ()):
+        self._modules = (module,) + tuple(fallbacks)
+        self._attribute = attribute
+        self._module = _MISSING
+        with _registry_lock:
+            _registry.append(self)
+
+    def resolve(self) -> Any:
+        """Import and return the target (raises ImportError if unavailable)"""
+        if self._module is _MISSING:
+            error: Optional[ImportError] = None
+            for module_name in self._modules:
+                try:
+                    self._module = importlib.import_module(module_name)
+                    break
+                except ImportError as e:
+                    error = e
+            else:
+                raise error
+        # Looked up on every use so patches of the module attribute apply
+        return getattr(self._module, self._attribute) if self._attribute else self._module
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('__'):
+            # Keep copy/pickle/mock introspection from importing the target
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name.startswith('_'):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.resolve(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        if name.startswith('_'):
+            object.__delattr__(self, name)
+        else:
+            delattr(self.resolve(), name)
+
+    def __bool__(self) -> bool:
+        try:
+            self.resolve()
+        except ImportError:
+            return False
+        return True
+
+    def __repr__(self) -> str:
+        target = f"{self._modules[0]}.{self._attribute}" if self._attribute else self._modules[0]
+        state = 'loaded' if self._module is not _MISSING else 'deferred'
+        return f"<LazyImport {target} ({state})>"
+
+
+def resolve_all() -> int:
+    """
+    Import every deferred dependency now.
+
+    Used by a preloading server master so forked workers share the imported
+    modules instead of each importing them on first use.
+
+    Returns:
+        int: Number of dependencies that could be imported
+    """
+    with _registry_lock:
+        pending = list(_registry)
+    return sum(1 for lazy in pending if lazy)
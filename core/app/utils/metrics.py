@@ -0,0 +1,481 @@
+"""
+Metrics registry and Prometheus exposition
+Counters and fixed-bucket histograms for routes, database queries, AI calls,
+Google Drive calls, text extraction and thumbnail rendering, exported at
+/metrics in the Prometheus text format and aggregated across worker processes
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import os
+import glob
+import json
+import time
+import atexit
+import logging
+import weakref
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.utils.query_stats import record_query
+
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds; +Inf is implicit
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class _ShardOwner:
+    """Held in a thread's local storage; its finalizer retires the thread's shard"""
+
+
+class _Metric:
+    """
+    Base class of a labelled metric.
+
+    Every thread writes to its own shard (a dict of label values to a list of
+    floats), so the write path takes no lock; a lock is only taken the first
+    time a thread touches the metric and when the thread exits, which folds
+    its shard into the retired totals so short-lived threads do not pile up
+    shards. Readers sum the retired totals and the live shards.
+    """
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._local = threading.local()
+        # Live shards by id; the retired totals hold those of exited threads
+        self._shards: Dict[int, Dict[Tuple[str, ...], List[float]]] = {}
+        self._retired: Dict[Tuple[str, ...], List[float]] = {}
+        self._shards_lock = threading.Lock()
+
+    def _width(self) -> int:
+        raise NotImplementedError
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _cell(self, labels: Dict[str, Any]) -> List[float]:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            # The owner lives as long as the thread's local storage
+            owner = self._local.owner = _ShardOwner()
+            weakref.finalize(owner, self._retire, shard)
+            with self._shards_lock:
+                self._shards[id(shard)] = shard
+        key = self._key(labels)
+        cell = shard.get(key)
+        if cell is None:
+            cell = shard[key] = [0.0] * self._width()
+        return cell
+
+    def _retire(self, shard: Dict[Tuple[str, ...], List[float]]) -> None:
+        """Fold the shard of an exited thread into the retired totals"""
+        with self._shards_lock:
+            # Shards from before a reset are dropped with it
+            if self._shards.pop(id(shard), None) is not shard:
+                return
+            self._add(self._retired, shard)
+
+    def _add(self, totals: Dict[Tuple[str, ...], List[float]], shard: Dict[Tuple[str, ...], List[float]]) -> None:
+        for key, cell in list(shard.items()):
+            total = totals.setdefault(key, [0.0] * self._width())
+            for index, value in enumerate(list(cell)):
+                total[index] += value
+
+    def values(self) -> Dict[Tuple[str, ...], List[float]]:
+        """Values of every label set, summed over threads"""
+        totals: Dict[Tuple[str, ...], List[float]] = {}
+        with self._shards_lock:
+            shards = list(self._shards.values())
+            self._add(totals, self._retired)
+        for shard in shards:
+            self._add(totals, shard)
+        return totals
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    kind = 'counter'
+
+    def _width(self) -> int:
+        return 1
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        self._cell(labels)[0] += amount
+
+    def value(self, **labels) -> float:
+        return self.values().get(self._key(labels), [0.0])[0]
+
+
+class Histogram(_Metric):
+    """
+    Fixed-bucket histogram.
+
+    A cell holds one count per bucket (the last one is +Inf) followed by the
+    sum and the count of observations. Percentiles are interpolated within
+    the bucket that contains them.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(float(bound) for bound in buckets if bound != float('inf')))
+        super().__init__(name, documentation, labelnames)
+
+    def _width(self) -> int:
+        return len(self.buckets) + 3
+
+    def observe(self, value: float, **labels) -> None:
+        cell = self._cell(labels)
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observe the duration of a block in seconds.
+
+        If the histogram has an ``outcome`` label that is not given, it is set
+        to ``success`` or ``error`` depending on whether the block raised.
+        """
+        started = time.perf_counter()
+        outcome = 'success'
+        try:
+            yield
+        except BaseException:
+            outcome = 'error'
+            raise
+        finally:
+            if 'outcome' in self.labelnames and 'outcome' not in labels:
+                labels['outcome'] = outcome
+            self.observe(time.perf_counter() - started, **labels)
+
+    def summary(self, **labels) -> Dict[str, Optional[float]]:
+        """Count, sum, average and p50/p95/p99 of one label set"""
+        return summarize(self.buckets, self.values().get(self._key(labels)))
+
+
+def quantile(buckets: Sequence[float], counts: Sequence[float], q: float) -> Optional[float]:
+    """
+    Estimate a quantile from per-bucket counts (the last count is +Inf).
+
+    Interpolates linearly within the bucket holding the quantile; values in
+    the +Inf bucket are reported as the largest finite bound.
+    """
+    total = sum(counts)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0.0
+    for index, count in enumerate(counts):
+        if count and seen + count >= rank:
+            if index >= len(buckets):
+                return buckets[-1] if buckets else None
+            lower = buckets[index - 1] if index else 0.0
+            return lower + (buckets[index] - lower) * (rank - seen) / count
+        seen += count
+    return buckets[-1] if buckets else None
+
+
+def summarize(buckets: Sequence[float], cell: Optional[Sequence[float]]) -> Dict[str, Optional[float]]:
+    """Count, sum, average and p50/p95/p99 of a histogram cell"""
+    if not cell or not cell[-1]:
+        return {'count': 0, 'sum': 0.0, 'avg': None, 'p50': None, 'p95': None, 'p99': None}
+    counts = cell[:-2]
+    return {
+        'count': int(cell[-1]),
+        'sum': cell[-2],
+        'avg': cell[-2] / cell[-1],
+        'p50': quantile(buckets, counts, 0.50),
+        'p95': quantile(buckets, counts, 0.95),
+        'p99': quantile(buckets, counts, 0.99)
+    }
+
+
+class MetricsRegistry:
+    """
+    Process-wide collection of metrics.
+
+    With PROMETHEUS_MULTIPROC_DIR set, every worker periodically writes its
+    snapshot to ``metrics_<pid>.json`` in that directory (at most every
+    METRICS_FLUSH_SECONDS, and at exit) and ``render`` merges all files, so
+    any worker can serve /metrics for the whole server. The directory should
+    be emptied when the server (re)starts.
+    """
+
+    def __init__(self, multiprocess_dir: Optional[str] = None, flush_interval: Optional[float] = None):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.multiprocess_dir = multiprocess_dir if multiprocess_dir is not None \
+            else os.getenv('PROMETHEUS_MULTIPROC_DIR')
+        self.flush_interval = flush_interval if flush_interval is not None \
+            else float(os.getenv('METRICS_FLUSH_SECONDS', '5'))
+        self._next_flush = 0.0
+
+    def _register(self, metric_class, name: str, documentation: str, labelnames: Sequence[str], **options):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, documentation, labelnames, **options)
+            elif not isinstance(metric, metric_class) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered with a different type or labels")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter"""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Get or create a histogram"""
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def reset(self) -> None:
+        """Drop all recorded values (metrics stay registered)"""
+        with self._lock:
+            for metric in self._metrics.values():
+                metric._reset()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """JSON-serializable values of this process"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: {
+            'type': metric.kind,
+            'help': metric.documentation,
+            'labelnames': list(metric.labelnames),
+            'buckets': list(getattr(metric, 'buckets', ())),
+            'samples': [[list(key), cell] for key, cell in metric.values().items()]
+        } for metric in metrics}
+
+    def _snapshot_path(self, pid: Optional[int] = None) -> str:
+        return os.path.join(self.multiprocess_dir, f"metrics_{pid or os.getpid()}.json")
+
+    def flush(self) -> None:
+        """Write this process's snapshot to the multiprocess directory"""
+        if not self.multiprocess_dir:
+            return
+        try:
+            os.makedirs(self.multiprocess_dir, exist_ok=True)
+            path = self._snapshot_path()
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as handle:
+                json.dump(self.snapshot(), handle, separators=(',', ':'))
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics snapshot: {str(e)}")
+
+    def maybe_flush(self) -> None:
+        """Flush if the flush interval has passed; never blocks the caller"""
+        if not self.multiprocess_dir or time.monotonic() < self._next_flush:
+            return
+        if not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_flush = time.monotonic() + self.flush_interval
+            self.flush()
+        finally:
+            self._flush_lock.release()
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot merged over every worker (just this process without a multiprocess dir)"""
+        if not self.multiprocess_dir:
+            return self.snapshot()
+        self.flush()
+        merged: Dict[str, Dict[str, Any]] = {}
+        for path in sorted(glob.glob(os.path.join(self.multiprocess_dir, 'metrics_*.json'))):
+            try:
+                with open(path, encoding='utf-8') as handle:
+                    snapshot = json.load(handle)
+            except (OSError, ValueError):
+                continue
+            for name, metric in snapshot.items():
+                target = merged.setdefault(name, dict(metric, samples={}))
+                for key, cell in metric['samples']:
+                    total = target['samples'].setdefault(tuple(key), [0.0] * len(cell))
+                    for index, value in enumerate(cell):
+                        total[index] += value
+        for metric in merged.values():
+            metric['samples'] = [[list(key), cell] for key, cell in metric['samples'].items()]
+        return merged
+
+    def render(self) -> str:
+        """Prometheus text exposition of ``collect()``"""
+        lines: List[str] = []
+        for name, metric in sorted(self.collect().items()):
+            lines.append(f"# HELP {name} {_escape_help(metric['help'])}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+            labelnames = metric['labelnames']
+            for key, cell in sorted(metric['samples']):
+                pairs = list(zip(labelnames, key))
+                if metric['type'] != 'histogram':
+                    lines.append(f"{name}{_labels(pairs)} {_number(cell[0])}")
+                    continue
+                cumulative = 0.0
+                for bound, count in zip(list(metric['buckets']) + [float('inf')], cell[:-2]):
+                    cumulative += count
+                    bound = '+Inf' if bound == float('inf') else repr(float(bound))
+                    lines.append(f"{name}_bucket{_labels(pairs + [('le', bound)])} {_number(cumulative)}")
+                lines.append(f"{name}_sum{_labels(pairs)} {_number(cell[-2])}")
+                lines.append(f"{name}_count{_labels(pairs)} {_number(cell[-1])}")
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_help(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    rendered = ','.join(
+        '{}="{}"'.format(name, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return f"{{{rendered}}}" if rendered else ''
+
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
+
+if hasattr(os, 'register_at_fork'):
+    # Children of a preloading master must not re-report the master's values
+    os.register_at_fork(after_in_child=REGISTRY.reset)
+atexit.register(REGISTRY.flush)
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    'http_request_duration_seconds', 'HTTP request latency', ('endpoint', 'method', 'status'))
+DB_QUERY_DURATION = REGISTRY.histogram(
+    'db_query_duration_seconds', 'SQL statement execution time', ('operation',))
+DB_POOL_CHECKOUT_WAIT = REGISTRY.histogram(
+    'db_pool_checkout_wait_seconds', 'Time waiting for a pooled database connection', ('outcome',),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0))
+DB_POOL_EXHAUSTED = REGISTRY.counter(
+    'db_pool_exhausted_total', 'Connection checkouts that found every pooled connection in use')
+DB_REPLICA_REQUESTS = REGISTRY.counter(
+    'db_replica_requests_total', 'Read-replica endpoint requests by where their reads went', ('route',))
+STORAGE_DELETES = REGISTRY.counter(
+    'storage_deletes_total', 'Stored files removed by batched storage deletion', ('storage_type', 'outcome'))
+RETENTION_REMOVED = REGISTRY.counter(
+    'retention_removed_total', 'Expired file rows and orphaned files removed by the retention sweeper', ('kind',))
+RETENTION_RECLAIMED_BYTES = REGISTRY.counter(
+    'retention_reclaimed_bytes_total', 'Storage bytes reclaimed by the retention sweeper', ('kind',))
+OPENAI_REQUEST_DURATION = REGISTRY.histogram(
+    'openai_request_duration_seconds', 'OpenAI chat completion latency', ('model', 'task', 'outcome'))
+OPENAI_TOKENS = REGISTRY.counter(
+    'openai_tokens_total', 'OpenAI tokens consumed', ('model', 'kind'))
+GOOGLE_DRIVE_DURATION = REGISTRY.histogram(
+    'google_drive_operation_duration_seconds', 'Google Drive API operation latency', ('operation', 'outcome'))
+GOOGLE_DRIVE_RATE_LIMITS = REGISTRY.counter(
+    'google_drive_rate_limits_total', 'Google Drive API rate-limit responses')
+EXTRACTION_DURATION = REGISTRY.histogram(
+    'file_extraction_duration_seconds', 'Resume text extraction time', ('file_type', 'outcome'))
+THUMBNAIL_DURATION = REGISTRY.histogram(
+    'thumbnail_render_duration_seconds', 'PDF thumbnail render time', ('outcome',))
+OPERATION_DURATION = REGISTRY.histogram(
+    'operation_duration_seconds', 'Duration of timed internal operations', ('operation',))
+OPERATION_VALUES = REGISTRY.counter(
+    'operation_values_total', 'Running total of non-duration operation metrics', ('operation', 'unit'))
+
+
+def _statement_operation(statement: str) -> str:
+    words = (statement or '').lstrip().split(None, 1)
+    operation = words[0].lower() if words else ''
+    return operation if operation in ('select', 'insert', 'update', 'delete') else 'other'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('metrics_query_started')
+    if started:
+        elapsed = time.perf_counter() - started.pop()
+        DB_QUERY_DURATION.observe(elapsed, operation=_statement_operation(statement))
+        record_query(statement, elapsed)
+
+
+def instrument_engine(engine) -> None:
+    """Time every SQL statement executed on ``engine``"""
+    from sqlalchemy import event
+
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def init_metrics(app, registry: Optional[MetricsRegistry] = None) -> MetricsRegistry:
+    """
+    Time requests and SQL statements of an app and serve /metrics.
+
+    Request latency is labelled with the endpoint name (``unmatched`` for
+    requests that hit no route, to keep label cardinality bounded), method
+    and status code.
+
+    Configuration:
+        PROMETHEUS_MULTIPROC_DIR: Shared directory for per-worker snapshots
+        METRICS_TOKEN: If set, /metrics requires ``Authorization: Bearer <token>``
+    """
+    from flask import Response, g, request
+    from app.extensions import db
+
+    registry = registry or REGISTRY
+    app.extensions['metrics'] = registry
+
+    with app.app_context():
+        instrument_engine(db.engine)
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_request_started = time.perf_counter()
+
+    @app.after_request
+    def observe_request(response):
+        started = g.pop('metrics_request_started', None)
+        if started is not None:
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                endpoint=request.endpoint or 'unmatched',
+                method=request.method,
+                status=str(response.status_code)
+            )
+        registry.maybe_flush()
+        return response
+
+    def metrics_view():
+        token = app.config.get('METRICS_TOKEN') or os.getenv('METRICS_TOKEN')
+        if token and request.headers.get('Authorization') != f"Bearer {token}":
+            return Response('Unauthorized\n', status=401, mimetype='text/plain')
+        return Response(registry.render(), headers={'Content-Type': CONTENT_TYPE})
+
+    app.add_url_rule('/metrics', 'metrics', metrics_view, methods=['GET'])
+    return registry
@@ -0,0 +1,192 @@
+"""
+Precomputed OpenAPI specification
+Builds the flasgger spec once per code version, stores it as JSON plus a
+gzip copy, and serves it with an ETag instead of re-parsing every route's
+docstring and ``@swag_from`` dict in each process
+
+Settings come from the environment:
+    OPENAPI_SPEC_MODE: ``static`` (serve the stored spec) or ``dynamic``
+        (flasgger builds it); default static unless debugging or testing
+    OPENAPI_SPEC_DIR: Where built specs are stored (default <instance>/openapi)
+    OPENAPI_SPEC_VERSION: Code version key (default RAILWAY_GIT_COMMIT_SHA,
+        GIT_COMMIT, or a hash of the app source)
+
+Build step (run at deploy time so no process ever parses the docstrings):
+    python railway_start.py --build-openapi
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import logging
+import threading
+from typing import Optional, Tuple
+
+from flask import Flask, Response, request
+
+
+logger = logging.getLogger(__name__)
+
+SPEC_ENDPOINT = 'apispec_1'
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def code_version() -> str:
+    """
+    Version of the deployed code.
+
+    A commit id from the environment when the platform provides one,
+    otherwise a hash of the app's Python sources.
+    """
+    for name in ('OPENAPI_SPEC_VERSION', 'RAILWAY_GIT_COMMIT_SHA', 'GIT_COMMIT'):
+        if os.getenv(name):
+            return os.getenv(name)[:12]
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(APP_DIR):
+        dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+        for filename in sorted(files):
+            if filename.endswith('.py'):
+                path = os.path.join(root, filename)
+                digest.update(os.path.relpath(path, APP_DIR).encode())
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+class OpenAPISpecCache:
+    """
+    The spec of one app, keyed by code version, enabled API domains and
+    Swagger settings (processes serving different domains document
+    different routes).
+
+    Lookup order: memory, then the stored file, then a build (which is
+    stored for the next process).
+    """
+
+    def __init__(self, app: Flask, swagger, directory: Optional[str] = None):
+        self.app = app
+        self.swagger = swagger
+        self.directory = directory or os.getenv('OPENAPI_SPEC_DIR') or os.path.join(app.instance_path, 'openapi')
+        self._spec: Optional[Tuple[bytes, bytes, str]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def key(self) -> str:
+        settings = json.dumps({
+            'domains': self.app.config.get('API_BLUEPRINTS_ENABLED'),
+            'swagger': self.app.config.get('SWAGGER')
+        }, sort_keys=True, default=str)
+        return f"{code_version()}-{hashlib.sha256(settings.encode()).hexdigest()[:8]}"
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, f"openapi-{self.key}.json")
+
+    def build(self) -> bytes:
+        """Build the spec with flasgger (parses every route's documentation)"""
+        with self.app.test_request_context():
+            spec = self.swagger.get_apispecs(SPEC_ENDPOINT)
+        return json.dumps(spec, sort_keys=True, separators=(',', ':'), default=str).encode()
+
+    def write(self) -> str:
+        """
+        Build and store the spec and its gzip copy.
+
+        Returns:
+            str: Path of the JSON file
+        """
+        body = self.build()
+        path = self.path
+        os.makedirs(self.directory, exist_ok=True)
+        for target, data in ((path, body), (path + '.gz', gzip.compress(body, 9, mtime=0))):
+            tmp_path = f"{target}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, target)
+        logger.info(f"Wrote OpenAPI spec {path} ({len(body)} bytes)")
+        return path
+
+    def get(self) -> Tuple[bytes, bytes, str]:
+        """
+        Return the spec as (json, gzipped json, etag).
+        """
+        if self._spec is None:
+            with self._lock:
+                if self._spec is None:
+                    self._spec = self._load()
+        return self._spec
+
+    def _load(self) -> Tuple[bytes, bytes, str]:
+        path = self.path
+        if not os.path.exists(path):
+            logger.info("No prebuilt OpenAPI spec for this version, building it")
+            try:
+                path = self.write()
+            except OSError as e:
+                # Read-only filesystem: keep the built spec in memory only
+                logger.warning(f"Could not store OpenAPI spec: {str(e)}")
+                body = self.build()
+                return body, gzip.compress(body, 9, mtime=0), self._etag(body)
+        with open(path, 'rb') as f:
+            body = f.read()
+        try:
+            with open(path + '.gz', 'rb') as f:
+                compressed = f.read()
+        except OSError:
+            compressed = gzip.compress(body, 9, mtime=0)
+        return body, compressed, self._etag(body)
+
+    @staticmethod
+    def _etag(body: bytes) -> str:
+        return hashlib.sha256(body).hexdigest()[:20]
+
+    def response(self) -> Response:
+        """Spec response: gzipped when accepted, 304 when the ETag matches"""
+        body, compressed, etag = self.get()
+        if request.accept_encodings['gzip']:
+            response = Response(compressed, mimetype='application/json')
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = Response(body, mimetype='application/json')
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = 'no-cache'
+        response.set_etag(etag)
+        return response.make_conditional(request)
+
+
+def spec_mode(app: Flask) -> str:
+    default = 'dynamic' if app.debug or app.config.get('TESTING') else 'static'
+    return os.getenv('OPENAPI_SPEC_MODE', default)
+
+
+def init_openapi_spec(app: Flask, swagger) -> OpenAPISpecCache:
+    """
+    Serve the flasgger spec route from the precomputed spec in static mode.
+
+    Call after the blueprints are registered. The cache is available as
+    ``app.extensions['openapi_spec']`` (used by the build step).
+    """
+    cache = OpenAPISpecCache(app, swagger)
+    app.extensions['openapi_spec'] = cache
+    if spec_mode(app) == 'static':
+        app.view_functions[f"flasgger.{SPEC_ENDPOINT}"] = cache.response
+    return cache
+
+
+def build_openapi_spec() -> str:
+    """
+    Build step: store the spec for the current code version.
+
+    Builds for the domains selected by API_BLUEPRINTS, like the processes
+    that will serve it.
+
+    Returns:
+        str: Path of the JSON file
+    """
+    from app import create_app
+    app = create_app({'TESTING': True})
+    return app.extensions['openapi_spec'].write()
@@ -1,18 +1,11 @@
-import io
-from pypdf import PdfReader
+from app.services.pdf_extraction_engine import get_pdf_extraction_engine
 
 def parse_pdf_file(pdf_file):
     """
     Extracts text from an uploaded PDF file.
     """
     try:
-        pdf_stream = io.BytesIO(pdf_file.read())
-        reader = PdfReader(pdf_stream)
-        extracted_text = ""
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                extracted_text += page_text + "\n"
-        return extracted_text
+        result = get_pdf_extraction_engine().extract(pdf_file.read())
+        return ''.join(page + "\n" for page in result.pages if page)
     except Exception as e:
-        raise Exception(f"Failed to parse PDF: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Failed to parse PDF: {str(e)}")
@@ -439,10 +439,21 @@ class MemoryOptimizer:
 
 
 class PerformanceMonitor:
-    """Monitor and log performance metrics"""
+    """
+    Record and log operation timings.
+
+    Values go to the shared metrics registry (exported at /metrics):
+    millisecond timings to the ``operation_duration_seconds`` histogram and
+    other units to the ``operation_values_total`` counter.
+    """
     
-    def __init__(self):
-        self.metrics = {}
+    def __init__(self, registry=None):
+        from app.utils.metrics import REGISTRY
+        registry = registry or REGISTRY
+        self.durations = registry.histogram(
+            'operation_duration_seconds', 'Duration of timed internal operations', ('operation',))
+        self.values = registry.counter(
+            'operation_values_total', 'Running total of non-duration operation metrics', ('operation', 'unit'))
     
     def time_operation(self, operation_name: str):
         """Context manager to time operations"""
@@ -450,36 +461,38 @@ class PerformanceMonitor:
     
     def record_metric(self, name: str, value: float, unit: str = 'ms'):
         """Record a performance metric"""
-        if name not in self.metrics:
-            self.metrics[name] = []
-        
-        self.metrics[name].append({
-            'value': value,
-            'unit': unit,
-            'timestamp': time.time()
-        })
-        
-        # Keep only recent metrics (last 100 entries)
-        if len(self.metrics[name]) > 100:
-            self.metrics[name] = self.metrics[name][-100:]
+        if unit == 'ms':
+            self.durations.observe(value / 1000, operation=name)
+        else:
+            self.values.inc(value, operation=name, unit=unit)
     
     def get_average_metric(self, name: str, recent_count: int = 10) -> Optional[float]:
-        """Get average value for a metric"""
-        if name not in self.metrics or not self.metrics[name]:
-            return None
-        
-        recent_values = [m['value'] for m in self.metrics[name][-recent_count:]]
-        return sum(recent_values) / len(recent_values)
+        """
+        Get the average duration (ms) of an operation.
+
+        Averages over all observations in this process; ``recent_count`` is
+        kept for backwards compatibility.
+        """
+        average = self.durations.summary(operation=name)['avg']
+        return average * 1000 if average is not None else None
+    
+    def get_summary(self, name: str) -> Dict[str, Optional[float]]:
+        """Count and average/p50/p95/p99 duration (ms) of an operation"""
+        summary = self.durations.summary(operation=name)
+        return {
+            key: (value * 1000 if value is not None and key != 'count' else value)
+            for key, value in summary.items()
+        }
     
     def log_performance_summary(self):
         """Log performance summary"""
         logger.info("Performance Metrics Summary:")
-        for name, values in self.metrics.items():
-            if values:
-                avg = self.get_average_metric(name)
-                recent_value = values[-1]['value']
-                unit = values[-1]['unit']
-                logger.info(f"  {name}: {recent_value:.2f}{unit} (avg: {avg:.2f}{unit})")
+        for (name,) in sorted(self.durations.values()):
+            summary = self.get_summary(name)
+            logger.info(
+                f"  {name}: n={summary['count']} avg={summary['avg']:.2f}ms "
+                f"p50={summary['p50']:.2f}ms p95={summary['p95']:.2f}ms p99={summary['p99']:.2f}ms"
+            )
 
 
 class OperationTimer:
@@ -491,12 +504,12 @@ class OperationTimer:
         self.start_time = None
     
     def __enter__(self):
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.start_time:
-            duration = (time.time() - self.start_time) * 1000  # Convert to milliseconds
+            duration = (time.perf_counter() - self.start_time) * 1000  # Convert to milliseconds
             self.monitor.record_metric(self.operation_name, duration, 'ms')
 
 
@@ -0,0 +1,149 @@
+"""
+Per-request SQL statistics
+Counts the statements and database time of each request, logs the heaviest
+statements of requests over budget and, in debug mode, reports them in
+response headers; ``collect_queries`` gives tests the same numbers
+
+Settings come from the environment:
+    SQL_QUERY_LOG_THRESHOLD: Log requests issuing at least this many
+        statements at WARNING (default 30, 0 disables)
+    SQL_SLOW_REQUEST_MS: Log requests spending at least this long in the
+        database at WARNING (default 500, 0 disables)
+    SQL_DEBUG_HEADERS: Add the X-DB-* headers outside debug mode (default false)
+
+Statements are recorded by the engine listeners of app.utils.metrics.
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import os
+import re
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from flask import Flask, g, has_app_context, request
+
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+# "IN (?, ?, ?)" and multi-row VALUES differ per call only in their length
+_PARAMETER_LIST = re.compile(r'\((?:\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*,)+\s*(?:\?|%s|%\(\w+\)s|:\w+)\s*\)')
+
+_collectors: List['QueryStats'] = []
+_collectors_lock = threading.Lock()
+
+
+def normalize_statement(statement: str, max_length: int = 300) -> str:
+    """One-line form of a statement, with parameter lists collapsed"""
+    statement = _WHITESPACE.sub(' ', statement or '').strip()
+    statement = _PARAMETER_LIST.sub('(...)', statement)
+    return statement if len(statement) <= max_length else statement[:max_length - 3] + '...'
+
+
+class QueryStats:
+    """Statement count and time, in total and per normalized statement"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.statements: Dict[str, List[float]] = {}
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        entry = self.statements.setdefault(normalize_statement(statement), [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    @property
+    def total_ms(self) -> float:
+        return round(self.total_seconds * 1000, 2)
+
+    def top(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Statements by total time, largest first"""
+        ranked = sorted(self.statements.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return [
+            {'statement': statement, 'count': int(count), 'total_ms': round(seconds * 1000, 2)}
+            for statement, (count, seconds) in ranked
+        ]
+
+    def repeated(self, min_count: int = 2) -> List[Dict[str, Any]]:
+        """Statements executed at least ``min_count`` times (N+1 candidates), most frequent first"""
+        ranked = sorted(self.statements.items(), key=lambda item: item[1][0], reverse=True)
+        return [
+            {'statement': statement, 'count': int(count), 'total_ms': round(seconds * 1000, 2)}
+            for statement, (count, seconds) in ranked if count >= min_count
+        ]
+
+    def format(self, limit: int = 5) -> str:
+        """Multi-line summary for logs and assertion messages"""
+        lines = [f"{self.count} statements, {self.total_ms} ms"]
+        lines += [f"  {entry['count']:>4}x {entry['total_ms']:>8.2f} ms  {entry['statement']}" for entry in self.top(limit)]
+        return '\n'.join(lines)
+
+
+def record_query(statement: str, seconds: float) -> None:
+    """Add an executed statement to the current request and active collectors"""
+    if has_app_context():
+        stats = g.get('query_stats')
+        if stats is not None:
+            stats.record(statement, seconds)
+    if _collectors:
+        with _collectors_lock:
+            for collector in _collectors:
+                collector.record(statement, seconds)
+
+
+@contextmanager
+def collect_queries() -> Iterator[QueryStats]:
+    """
+    Record every statement executed in this process while the block runs,
+    e.g. around test client requests.
+    """
+    stats = QueryStats()
+    with _collectors_lock:
+        _collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        with _collectors_lock:
+            _collectors.remove(stats)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Statistics of the current request, if any"""
+    return g.get('query_stats') if has_app_context() else None
+
+
+def init_query_stats(app: Flask) -> None:
+    """Record SQL statistics for every request of an app"""
+
+    @app.before_request
+    def start_query_stats():
+        g.query_stats = QueryStats()
+
+    @app.after_request
+    def report_query_stats(response):
+        stats = g.pop('query_stats', None)
+        if stats is None:
+            return response
+
+        count_threshold = int(os.getenv('SQL_QUERY_LOG_THRESHOLD', 30))
+        slow_ms = float(os.getenv('SQL_SLOW_REQUEST_MS', 500))
+        if (count_threshold and stats.count >= count_threshold) or (slow_ms and stats.total_ms >= slow_ms):
+            logger.warning(f"Heavy database use by {request.method} {request.path}: {stats.format()}")
+        elif stats.count:
+            logger.debug(f"{request.method} {request.path}: {stats.count} statements, {stats.total_ms} ms")
+
+        if app.debug or os.getenv('SQL_DEBUG_HEADERS', 'false').lower() == 'true':
+            response.headers['X-DB-Query-Count'] = str(stats.count)
+            response.headers['X-DB-Query-Time-Ms'] = str(stats.total_ms)
+            for index, entry in enumerate(stats.top(3), start=1):
+                value = f"{entry['count']}x {entry['total_ms']}ms {entry['statement']}"
+                response.headers[f"X-DB-Top-Statement-{index}"] = value.encode('ascii', 'replace').decode()
+            response.headers.add('Server-Timing', f'db;dur={stats.total_ms};desc="{stats.count} queries"')
+        return response
@@ -0,0 +1,328 @@
+"""
+Rate limiting for expensive endpoints
+GCRA (generic cell rate algorithm) limiter with in-process, SQLite (shared
+by the workers of one host) and Redis (shared by a fleet) backends, applied
+to routes with the ``rate_limited`` decorator
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import os
+import json
+import math
+import time
+import logging
+import sqlite3
+import tempfile
+import threading
+from dataclasses import dataclass, asdict
+from functools import wraps
+from typing import Dict, Optional, Tuple
+
+from flask import jsonify, make_response, request
+
+from app.utils.sqlite_local import ThreadLocalSQLite
+
+try:
+    import redis
+except ImportError:  # Only needed for the redis backend
+    redis = None
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RateLimitPolicy:
+    """``limit`` requests per ``period`` seconds, shared by all routes of the policy"""
+    name: str
+    limit: int
+    period: float
+
+
+DEFAULT_POLICIES: Dict[str, RateLimitPolicy] = {
+    'ai': RateLimitPolicy('ai', 20, 60),
+    'ai_bulk': RateLimitPolicy('ai_bulk', 5, 60),
+    'upload': RateLimitPolicy('upload', 30, 60),
+    'export': RateLimitPolicy('export', 30, 60),
+    'site_generation': RateLimitPolicy('site_generation', 10, 60),
+    'password_reset_user': RateLimitPolicy('password_reset_user', 5, 3600),
+    'password_reset_ip': RateLimitPolicy('password_reset_ip', 10, 3600)
+}
+
+
+def load_policies() -> Dict[str, RateLimitPolicy]:
+    """
+    Default policies overridden by the RATE_LIMITS environment variable.
+
+    RATE_LIMITS is a JSON object of policy name to fields, e.g.
+    ``{"ai": {"limit": 50, "period": 60}}``. Invalid JSON is ignored with a
+    warning.
+    """
+    policies = {name: RateLimitPolicy(**asdict(policy)) for name, policy in DEFAULT_POLICIES.items()}
+    raw = os.getenv('RATE_LIMITS')
+    if not raw:
+        return policies
+    try:
+        for name, values in json.loads(raw).items():
+            base = asdict(policies[name]) if name in policies else {'name': name, 'limit': 60, 'period': 60}
+            base.update(values, name=name)
+            policies[name] = RateLimitPolicy(**base)
+    except (ValueError, TypeError, AttributeError) as e:
+        logger.warning(f"Ignoring invalid RATE_LIMITS: {str(e)}")
+    return policies
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float
+    reset_after: float
+
+
+def gcra(tat: Optional[float], now: float, limit: int, period: float,
+         cost: int = 1) -> Tuple[bool, float, float]:
+    """
+    One GCRA step.
+
+    ``tat`` is the theoretical arrival time stored for the key (None for a
+    new key). Up to ``limit`` requests may arrive at once and capacity comes
+    back at one request every ``period / limit`` seconds, so the limit holds
+    over any sliding window of ``period`` seconds.
+
+    Returns:
+        Tuple of (allowed, tat to store, seconds until the request would be allowed)
+    """
+    interval = period / limit
+    new_tat = max(tat or now, now) + interval * cost
+    allow_at = new_tat - period
+    if allow_at > now:
+        return False, (tat if tat is not None else now), allow_at - now
+    return True, new_tat, 0.0
+
+
+class MemoryBackend:
+    """
+    Per-process backend.
+
+    A key's state is only its theoretical arrival time, and keys whose TAT
+    has passed are equivalent to new keys, so they are evicted on a
+    periodic sweep; memory stays bounded by the keys active within one
+    period.
+    """
+
+    name = 'memory'
+
+    def __init__(self, sweep_every: int = 1000):
+        self._tats: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._sweep_every = sweep_every
+        self._calls = 0
+
+    def update(self, key: str, now: float, limit: int, period: float, cost: int = 1) -> Tuple[bool, float, float]:
+        with self._lock:
+            self._calls += 1
+            if self._calls % self._sweep_every == 0:
+                self._tats = {k: tat for k, tat in self._tats.items() if tat > now}
+            allowed, tat, retry_after = gcra(self._tats.get(key), now, limit, period, cost)
+            self._tats[key] = tat
+            return allowed, tat, retry_after
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tats.clear()
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+
+class SQLiteBackend:
+    """
+    Backend in a SQLite file shared by the worker processes of one host.
+
+    Each update is one ``BEGIN IMMEDIATE`` transaction, which serializes
+    writers across processes. Expired rows are deleted periodically.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path: Optional[str] = None, sweep_every: int = 1000):
+        self.path = path or os.getenv(
+            'RATE_LIMIT_SQLITE_PATH', os.path.join(tempfile.gettempdir(), 'resume_modifier_rate_limits.db')
+        )
+        self._connections = ThreadLocalSQLite(self.path)
+        self._sweep_every = sweep_every
+        self._calls = 0
+        with self._connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, tat REAL NOT NULL)")
+
+    def _connection(self) -> sqlite3.Connection:
+        return self._connections.connection()
+
+    def update(self, key: str, now: float, limit: int, period: float, cost: int = 1) -> Tuple[bool, float, float]:
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute("SELECT tat FROM rate_limits WHERE key = ?", (key,)).fetchone()
+            allowed, tat, retry_after = gcra(row[0] if row else None, now, limit, period, cost)
+            if allowed:
+                conn.execute("INSERT OR REPLACE INTO rate_limits (key, tat) VALUES (?, ?)", (key, tat))
+            self._calls += 1
+            if self._calls % self._sweep_every == 0:
+                conn.execute("DELETE FROM rate_limits WHERE tat <= ?", (now,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return allowed, tat, retry_after
+
+    def reset(self) -> None:
+        self._connection().execute("DELETE FROM rate_limits")
+
+
+# KEYS[1] = key; ARGV = now, limit, period, cost. Returns {allowed, tat,
+# retry_after} as strings to keep float precision.
+_REDIS_GCRA = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[3]) / tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or ARGV[1])
+if tat < now then tat = now end
+local new_tat = tat + interval * tonumber(ARGV[4])
+local allow_at = new_tat - tonumber(ARGV[3])
+if allow_at > now then
+    return {'0', tostring(tat), tostring(allow_at - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {'1', tostring(new_tat), '0'}
+"""
+
+
+class RedisBackend:
+    """Backend in Redis (or a Redis-compatible server) shared by a fleet"""
+
+    name = 'redis'
+
+    def __init__(self, url: Optional[str] = None, client=None, prefix: str = 'ratelimit:'):
+        if client is None:
+            if redis is None:
+                raise ImportError("The redis rate-limit backend requires the redis package")
+            client = redis.Redis.from_url(url or os.getenv('RATE_LIMIT_REDIS_URL') or os.getenv('REDIS_URL'))
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_REDIS_GCRA)
+
+    def update(self, key: str, now: float, limit: int, period: float, cost: int = 1) -> Tuple[bool, float, float]:
+        allowed, tat, retry_after = self._script(keys=[self.prefix + key], args=[now, limit, period, cost])
+        return _text(allowed) == '1', float(_text(tat)), float(_text(retry_after))
+
+    def reset(self) -> None:
+        for key in self.client.scan_iter(match=self.prefix + '*'):
+            self.client.delete(key)
+
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+BACKENDS = {
+    MemoryBackend.name: MemoryBackend,
+    SQLiteBackend.name: SQLiteBackend,
+    RedisBackend.name: RedisBackend
+}
+
+
+class RateLimiter:
+    """Applies named policies to keys using a backend"""
+
+    def __init__(self, backend=None, policies: Optional[Dict[str, RateLimitPolicy]] = None):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.policies = policies if policies is not None else load_policies()
+
+    def policy(self, name: str) -> RateLimitPolicy:
+        if name not in self.policies:
+            raise ValueError(f"No rate limit policy configured: {name}")
+        return self.policies[name]
+
+    def hit(self, policy_name: str, identity, cost: int = 1, now: Optional[float] = None) -> RateLimitResult:
+        """
+        Count a request of ``identity`` against a policy.
+
+        Backend errors fail open: the request is allowed and a warning logged.
+        """
+        policy = self.policy(policy_name)
+        now = now if now is not None else time.time()
+        try:
+            allowed, tat, retry_after = self.backend.update(
+                f"{policy.name}:{identity}", now, policy.limit, policy.period, cost
+            )
+        except Exception as e:
+            logger.warning(f"Rate limit backend error, allowing request: {str(e)}")
+            return RateLimitResult(True, policy.limit, policy.limit, 0.0, 0.0)
+        interval = policy.period / policy.limit
+        remaining = max(0, int((policy.period - (tat - now)) // interval)) if allowed else 0
+        return RateLimitResult(allowed, policy.limit, remaining, retry_after, max(0.0, tat - now))
+
+    def reset(self) -> None:
+        self.backend.reset()
+
+
+_default_limiter: Optional[RateLimiter] = None
+_default_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Return the process-wide RateLimiter instance.
+
+    The backend is chosen by RATE_LIMIT_BACKEND: ``memory`` (default),
+    ``sqlite`` (RATE_LIMIT_SQLITE_PATH) or ``redis`` (RATE_LIMIT_REDIS_URL).
+    """
+    global _default_limiter
+    if _default_limiter is None:
+        with _default_lock:
+            if _default_limiter is None:
+                name = os.getenv('RATE_LIMIT_BACKEND', MemoryBackend.name)
+                if name not in BACKENDS:
+                    raise ValueError(f"Unknown rate limit backend: {name}")
+                _default_limiter = RateLimiter(BACKENDS[name]())
+    return _default_limiter
+
+
+def rate_limited(policy_name: str, cost: int = 1):
+    """
+    Endpoint decorator: enforce a rate-limit policy per user (or client IP).
+
+    Apply below ``@token_required`` so the user from the token is used when
+    present. Limited requests get 429 with a Retry-After header; allowed ones
+    carry X-RateLimit-Limit and X-RateLimit-Remaining.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            user = getattr(request, 'user', None)
+            user_id = user.get('user_id') if isinstance(user, dict) else None
+            identity = f"user:{user_id}" if user_id is not None else f"ip:{request.remote_addr}"
+
+            result = get_rate_limiter().hit(policy_name, identity, cost)
+            if not result.allowed:
+                retry_after = max(1, math.ceil(result.retry_after))
+                response = jsonify({
+                    'success': False,
+                    'error': 'Rate limit exceeded. Try again later.',
+                    'retry_after': retry_after
+                })
+                response.status_code = 429
+                response.headers['Retry-After'] = str(retry_after)
+                response.headers['X-RateLimit-Limit'] = str(result.limit)
+                response.headers['X-RateLimit-Remaining'] = '0'
+                return response
+
+            response = make_response(f(*args, **kwargs))
+            response.headers['X-RateLimit-Limit'] = str(result.limit)
+            response.headers['X-RateLimit-Remaining'] = str(result.remaining)
+            return response
+        return decorated
+    return decorator
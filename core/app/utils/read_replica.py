@@ -0,0 +1,305 @@
+"""
+Read-replica routing
+Sends the SELECTs of heavy read-only endpoints to a replica database while
+writes, and reads that must see them, stay on the primary
+
+Settings come from the environment:
+    DATABASE_REPLICA_URL: Replica database URI; routing is off when unset
+        (app config key of the same name)
+    REPLICA_READ_YOUR_WRITES_SECONDS: After a user's own write, their reads
+        stay on the primary for this long (default 5, above the usual lag)
+    REPLICA_RETRY_SECONDS: How long a failed replica is skipped (default 30)
+    REPLICA_STICKY_BACKEND: Where recent writes are remembered: ``memory``
+        (default) or ``sqlite`` (shared by the workers of one host,
+        REPLICA_STICKY_SQLITE_PATH)
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import os
+import time
+import logging
+import sqlite3
+import tempfile
+import threading
+from functools import wraps
+from typing import Any, Dict, Optional
+
+from flask import Flask, current_app, g, has_app_context, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.utils.metrics import DB_REPLICA_REQUESTS
+from app.utils.sqlite_local import ThreadLocalSQLite
+
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryWriteTracker:
+    """Per-process record of each user's last write time"""
+
+    name = 'memory'
+
+    def __init__(self, sweep_every: int = 1000):
+        self._writes: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._sweep_every = sweep_every
+        self._calls = 0
+
+    def record(self, user_id, when: float, keep_seconds: float) -> None:
+        with self._lock:
+            self._calls += 1
+            if self._calls % self._sweep_every == 0:
+                self._writes = {k: t for k, t in self._writes.items() if t > when - keep_seconds}
+            self._writes[str(user_id)] = when
+
+    def last_write(self, user_id) -> Optional[float]:
+        return self._writes.get(str(user_id))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._writes.clear()
+
+
+class SQLiteWriteTracker:
+    """
+    Record of each user's last write time in a SQLite file shared by the
+    worker processes of one host, so a read served by another worker still
+    sees the user's write.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path: Optional[str] = None, sweep_every: int = 1000):
+        self.path = path or os.getenv(
+            'REPLICA_STICKY_SQLITE_PATH', os.path.join(tempfile.gettempdir(), 'resume_modifier_recent_writes.db')
+        )
+        self._connections = ThreadLocalSQLite(self.path)
+        self._sweep_every = sweep_every
+        self._calls = 0
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS recent_writes (user_id TEXT PRIMARY KEY, written_at REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        return self._connections.connection()
+
+    def record(self, user_id, when: float, keep_seconds: float) -> None:
+        conn = self._connection()
+        conn.execute("INSERT OR REPLACE INTO recent_writes (user_id, written_at) VALUES (?, ?)", (str(user_id), when))
+        self._calls += 1
+        if self._calls % self._sweep_every == 0:
+            conn.execute("DELETE FROM recent_writes WHERE written_at <= ?", (when - keep_seconds,))
+
+    def last_write(self, user_id) -> Optional[float]:
+        row = self._connection().execute(
+            "SELECT written_at FROM recent_writes WHERE user_id = ?", (str(user_id),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def reset(self) -> None:
+        self._connection().execute("DELETE FROM recent_writes")
+
+
+TRACKERS = {
+    MemoryWriteTracker.name: MemoryWriteTracker,
+    SQLiteWriteTracker.name: SQLiteWriteTracker
+}
+
+
+class ReplicaRouter:
+    """
+    Decides whether a request may read from the replica.
+
+    A user's reads stay on the primary for ``read_your_writes_seconds`` after
+    their last committed write, and every read does while the replica is
+    marked down after a failure.
+    """
+
+    def __init__(self, engine=None, tracker=None, read_your_writes_seconds: Optional[float] = None,
+                 retry_seconds: Optional[float] = None):
+        self.engine = engine
+        if tracker is None:
+            name = os.getenv('REPLICA_STICKY_BACKEND', MemoryWriteTracker.name)
+            if name not in TRACKERS:
+                raise ValueError(f"Unknown replica write tracker backend: {name}")
+            tracker = TRACKERS[name]()
+        self.tracker = tracker
+        self.read_your_writes_seconds = (
+            read_your_writes_seconds if read_your_writes_seconds is not None
+            else float(os.getenv('REPLICA_READ_YOUR_WRITES_SECONDS', 5))
+        )
+        self.retry_seconds = retry_seconds if retry_seconds is not None else float(os.getenv('REPLICA_RETRY_SECONDS', 30))
+        self._down_until = 0.0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def mark_down(self, reason: str) -> None:
+        if self.available:
+            logger.warning(f"Read replica unavailable, using the primary for {self.retry_seconds}s: {reason}")
+        self._down_until = time.monotonic() + self.retry_seconds
+
+    def record_write(self, user_id, now: Optional[float] = None) -> None:
+        try:
+            self.tracker.record(user_id, now if now is not None else time.time(), self.read_your_writes_seconds)
+        except Exception as e:
+            logger.warning(f"Could not record write for replica routing: {str(e)}")
+
+    def route(self, user_id, now: Optional[float] = None) -> str:
+        """
+        Where a request's reads go.
+
+        Returns:
+            str: ``replica``, ``primary_unavailable`` or ``primary_recent_write``
+        """
+        if not self.available:
+            return 'primary_unavailable'
+        if user_id is not None:
+            try:
+                last_write = self.tracker.last_write(user_id)
+            except Exception as e:
+                # Without the record the user could miss their own write
+                logger.warning(f"Could not read recent writes, using the primary: {str(e)}")
+                return 'primary_recent_write'
+            now = now if now is not None else time.time()
+            if last_write is not None and now - last_write < self.read_your_writes_seconds:
+                return 'primary_recent_write'
+        return 'replica'
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'available': self.available,
+            'retry_in_seconds': round(max(0.0, self._down_until - time.monotonic()), 1),
+            'read_your_writes_seconds': self.read_your_writes_seconds,
+            'write_tracker': self.tracker.name
+        }
+
+
+class RoutingSession(Session):
+    """
+    Flask-SQLAlchemy session that sends SELECTs to the replica engine inside
+    ``read_replica`` endpoints.
+
+    Flushes and other statements use the primary, and once the session has
+    written, its later reads do too.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and clause is not None and not getattr(clause, 'is_select', False):
+            self.info['replica_wrote'] = True
+        elif (bind is None and clause is not None and not self._flushing
+                and not self.info.get('replica_wrote') and _replica_requested()):
+            router = current_app.extensions.get('read_replica')
+            if router is not None:
+                return router.engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _replica_requested() -> bool:
+    return has_app_context() and g.get('db_read_replica', False)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _after_flush(session, flush_context):
+    session.info['replica_wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _after_commit(session):
+    if not session.info.pop('replica_wrote', False) or not has_request_context():
+        return
+    router = current_app.extensions.get('read_replica')
+    user_id = _request_user_id()
+    if router is not None and user_id is not None:
+        router.record_write(user_id)
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _after_rollback(session):
+    session.info.pop('replica_wrote', None)
+
+
+def _request_user_id():
+    user = getattr(request, 'user', None)
+    return user.get('user_id') if isinstance(user, dict) else None
+
+
+def _replica_error(context) -> None:
+    """Engine ``handle_error`` listener of the replica"""
+    if has_app_context():
+        g.db_replica_failed = True
+        router = current_app.extensions.get('read_replica')
+        if router is not None:
+            router.mark_down(str(context.original_exception))
+
+
+def read_replica(f):
+    """
+    Endpoint decorator: serve a read-only handler's queries from the replica.
+
+    Apply below ``@token_required`` so the user's own recent writes are
+    honoured. A no-op when no replica is configured. If a replica query
+    fails, the replica is skipped for REPLICA_RETRY_SECONDS and the handler
+    is run again on the primary (handlers that catch the error and return
+    an error response included).
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        router = current_app.extensions.get('read_replica')
+        if router is None:
+            return f(*args, **kwargs)
+        route = router.route(_request_user_id())
+        if route != 'replica':
+            DB_REPLICA_REQUESTS.inc(route=route)
+            return f(*args, **kwargs)
+
+        g.db_read_replica = True
+        g.db_replica_failed = False
+        try:
+            response = f(*args, **kwargs)
+        except SQLAlchemyError:
+            if not g.get('db_replica_failed'):
+                raise
+            response = None
+        finally:
+            g.db_read_replica = False
+
+        if not g.pop('db_replica_failed', False):
+            DB_REPLICA_REQUESTS.inc(route='replica')
+            return response
+
+        DB_REPLICA_REQUESTS.inc(route='fallback')
+        from app.extensions import db
+        db.session.rollback()
+        return f(*args, **kwargs)
+    return decorated
+
+
+def init_read_replica(app: Flask) -> Optional[ReplicaRouter]:
+    """
+    Enable routing when DATABASE_REPLICA_URL is configured.
+
+    The replica engine gets the same pool settings as the primary
+    (app.utils.db_pool). It is kept outside Flask-SQLAlchemy's binds, so
+    models and ``db.create_all()`` only ever target the primary. The router
+    is available as ``app.extensions['read_replica']``.
+    """
+    from app.utils.db_pool import engine_options
+    from app.utils.metrics import instrument_engine
+
+    url = app.config.get('DATABASE_REPLICA_URL')
+    if not url:
+        return None
+    engine = create_engine(url, **engine_options(url))
+    instrument_engine(engine)
+    event.listen(engine, 'handle_error', _replica_error)
+
+    router = ReplicaRouter(engine)
+    app.extensions['read_replica'] = router
+    logger.info(f"Read replica routing enabled ({engine.url.render_as_string(hide_password=True)})")
+    return router
@@ -0,0 +1,40 @@
+"""
+Per-thread SQLite connections
+Small SQLite files shared by the worker processes of one host (rate limits,
+recent writes) are opened once per thread in autocommit mode with WAL
+journaling; connections are never shared between threads nor carried
+across a fork
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import os
+import sqlite3
+import threading
+
+
+class ThreadLocalSQLite:
+    """One connection to ``path`` per thread of the current process"""
+
+    def __init__(self, path: str, timeout: float = 5):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._fork_lock = threading.Lock()
+
+    def connection(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            # A forked child drops the parent's connections; only a new
+            # process resets them, the other threads keep their own
+            with self._fork_lock:
+                if self._pid != os.getpid():
+                    self._local = threading.local()
+                    self._pid = os.getpid()
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
@@ -0,0 +1,140 @@
+"""
+Startup import profiling
+Runs a cold ``create_app()`` in a fresh interpreter with ``python -X importtime``
+and reports where the import time goes, per package and per app module
+
+Usage:
+    python railway_start.py --profile-startup
+    python -m app.utils.startup_profile   (from core/)
+
+Author: Resume Modifier Backend Team
+Date: October 2024
+"""
+
+import os
+import sys
+import json
+import time
+import subprocess
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+
+DEFAULT_TARGET = "from app import create_app; create_app()"
+
+# Appended to the target: -X importtime misses modules loaded through
+# importlib.import_module, so the final module set is reported separately
+_REPORT_MODULES = "\nimport sys as _sys, json as _json\nprint('\\n' + _json.dumps(sorted(_sys.modules)))"
+
+
+@dataclass
+class ImportRecord:
+    """One line of ``-X importtime`` output (times in microseconds)"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(lines: Iterable[str]) -> List[ImportRecord]:
+    """Parse ``-X importtime`` stderr lines, ignoring anything else"""
+    records = []
+    for line in lines:
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # Header line
+        name = parts[2].rstrip()
+        stripped = name.lstrip(' ')
+        records.append(ImportRecord(
+            module=stripped,
+            self_us=int(parts[0]),
+            cumulative_us=int(parts[1]),
+            depth=(len(name) - len(stripped) - 1) // 2
+        ))
+    return records
+
+
+def summarize(records: List[ImportRecord], top: int = 15) -> Dict[str, Any]:
+    """
+    Aggregate import records.
+
+    Returns:
+        Dict with total_ms (sum of top-level imports), modules (the set of
+        imported module names), packages (self time per top-level package,
+        largest first) and app_modules (cumulative time per ``app.*`` module,
+        largest first)
+    """
+    packages: Dict[str, int] = defaultdict(int)
+    for record in records:
+        packages[record.module.split('.')[0]] += record.self_us
+
+    app_modules = {r.module: r.cumulative_us for r in records if r.module.startswith('app.')}
+
+    def ranked(values: Dict[str, int]) -> List[Dict[str, Any]]:
+        items = sorted(values.items(), key=lambda item: item[1], reverse=True)[:top]
+        return [{'name': name, 'ms': round(us / 1000, 1)} for name, us in items]
+
+    return {
+        'total_ms': round(sum(r.cumulative_us for r in records if r.depth == 0) / 1000, 1),
+        'modules': {r.module for r in records},
+        'packages': ranked(packages),
+        'app_modules': ranked(app_modules)
+    }
+
+
+def profile_startup(target: str = DEFAULT_TARGET, cwd: Optional[str] = None,
+                    top: int = 15, env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Run ``target`` in a fresh interpreter with ``-X importtime``.
+
+    Args:
+        target (str): Python statements to run (default: create the app)
+        cwd (str, optional): Working directory, defaults to the core directory
+        top (int): Entries kept per ranking
+        env (dict, optional): Extra environment variables
+
+    Returns:
+        Dict: summarize() output plus wall_ms for the whole run; modules is
+        every module loaded by the end of the run
+
+    Raises:
+        RuntimeError: If the target fails
+    """
+    core_dir = cwd or os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    run_env = {**os.environ, **(env or {})}
+    run_env['PYTHONPATH'] = os.pathsep.join(filter(None, [core_dir, run_env.get('PYTHONPATH')]))
+
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', target + _REPORT_MODULES],
+        cwd=core_dir, env=run_env, capture_output=True, text=True
+    )
+    wall_ms = round((time.perf_counter() - started) * 1000, 1)
+    if result.returncode != 0:
+        raise RuntimeError(f"Startup profile target failed: {result.stderr[-2000:]}")
+
+    summary = summarize(parse_importtime(result.stderr.splitlines()), top=top)
+    summary['modules'] = set(json.loads(result.stdout.strip().splitlines()[-1]))
+    summary['wall_ms'] = wall_ms
+    return summary
+
+
+def format_report(summary: Dict[str, Any]) -> str:
+    """Human-readable report of a profile_startup() result"""
+    lines = [
+        f"Startup: {summary['wall_ms']} ms wall, {summary['total_ms']} ms importing "
+        f"{len(summary['modules'])} modules",
+        '',
+        'Self time by package:'
+    ]
+    lines += [f"  {entry['ms']:>8.1f} ms  {entry['name']}" for entry in summary['packages']]
+    lines += ['', 'Cumulative time by app module:']
+    lines += [f"  {entry['ms']:>8.1f} ms  {entry['name']}" for entry in summary['app_modules']]
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    print(format_report(profile_startup()))
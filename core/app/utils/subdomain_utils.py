@@ -18,23 +18,19 @@ def generate_unique_subdomain(user_id, username):
     """Generate a unique subdomain for a user."""
     base_subdomain = sanitize_username(username)
     
-    # Check if base subdomain is available
-    subdomain = base_subdomain
-    existing = UserSite.query.filter_by(subdomain=subdomain).first()
+    # The base subdomain, then up to 5 numbered variants, checked in one query
+    candidates = [base_subdomain] + [f"{base_subdomain}{i}" for i in range(1, 6)]
+    taken = {
+        row.subdomain for row in
+        db.session.query(UserSite.subdomain).filter(UserSite.subdomain.in_(candidates))
+    }
+    for subdomain in candidates:
+        if subdomain not in taken:
+            return subdomain
     
-    # If not available, add random suffix
-    if existing:
-        # Try up to 5 times with numbers
-        for i in range(1, 6):
-            subdomain = f"{base_subdomain}{i}"
-            if not UserSite.query.filter_by(subdomain=subdomain).first():
-                return subdomain
-        
-        # If still not unique, add random string
-        random_suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
-        subdomain = f"{base_subdomain}-{random_suffix}"
-    
-    return subdomain
+    # If still not unique, add random string
+    random_suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
+    return f"{base_subdomain}-{random_suffix}"
 
 def get_site_url(subdomain):
     """Get the full URL for a user's site."""
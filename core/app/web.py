@@ -1,52 +1,19 @@
 from flask import Blueprint, request, jsonify, render_template_string, Response
 from app.extensions import db
 from app.utils.jwt_utils import token_required
+from app.utils.rate_limiter import rate_limited
 from app.models.temp import Resume
 from app.models.temp import UserSite
 from app.utils.subdomain_utils import generate_unique_subdomain, get_site_url
+from app.utils.lazy_import import LazyImport
 import html
-import bleach
 from functools import wraps
 import time
 from datetime import datetime
 import re
 import traceback
 
-# Dictionary to store API request counts
-request_counter = {}
-RATE_LIMIT = 10  # Maximum requests per minute
-RATE_WINDOW = 60  # Time window in seconds
-
-def rate_limit(f):
-    """Rate limiting decorator for API endpoints."""
-    @wraps(f)
-    def decorated(*args, **kwargs):
-        # Get user IP or ID for rate limiting
-        identifier = request.user.get('user_id', request.remote_addr)
-        
-        # Get current timestamp
-        now = time.time()
-        
-        # Initialize or get current request info
-        if identifier not in request_counter:
-            request_counter[identifier] = {'count': 0, 'reset_time': now + RATE_WINDOW}
-        
-        # Check if we need to reset the counter
-        if now > request_counter[identifier]['reset_time']:
-            request_counter[identifier] = {'count': 0, 'reset_time': now + RATE_WINDOW}
-        
-        # Check if rate limit exceeded
-        if request_counter[identifier]['count'] >= RATE_LIMIT:
-            return jsonify({
-                "error": "Rate limit exceeded. Try again later.",
-                "retry_after": int(request_counter[identifier]['reset_time'] - now)
-            }), 429
-        
-        # Increment request counter
-        request_counter[identifier]['count'] += 1
-        
-        return f(*args, **kwargs)
-    return decorated
+bleach = LazyImport('bleach')
 
 web = Blueprint('web', __name__)
 
@@ -76,7 +43,7 @@ def validate_serial_number(serial):
 
 @web.route('/web/generate_personal_site/<serial_number>', methods=['GET'])
 @token_required
-@rate_limit
+@rate_limited('site_generation')
 def generate_personal_site(serial_number):
     """Generate a personal website based on the user's resume.
     
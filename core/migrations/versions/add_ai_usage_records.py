@@ -0,0 +1,46 @@
+"""Add ai_usage_records table for per-user AI usage accounting
+
+Revision ID: add_ai_usage_records
+Revises: add_bulk_batch_fields
+Create Date: 2024-10-24 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_ai_usage_records'
+down_revision = 'add_bulk_batch_fields'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the ai_usage_records table"""
+    op.create_table(
+        'ai_usage_records',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('endpoint', sa.String(length=100), nullable=True),
+        sa.Column('task', sa.String(length=50), nullable=True),
+        sa.Column('model', sa.String(length=50), nullable=False),
+        sa.Column('lane', sa.String(length=20), nullable=False, server_default='interactive'),
+        sa.Column('prompt_tokens', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completion_tokens', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_tokens', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('latency_ms', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('success', sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_ai_usage_user_created', 'ai_usage_records', ['user_id', 'created_at'], unique=False)
+    op.create_index('idx_ai_usage_created', 'ai_usage_records', ['created_at'], unique=False)
+
+
+def downgrade():
+    """Drop the ai_usage_records table"""
+    op.drop_index('idx_ai_usage_created', table_name='ai_usage_records')
+    op.drop_index('idx_ai_usage_user_created', table_name='ai_usage_records')
+    op.drop_table('ai_usage_records')
@@ -0,0 +1,34 @@
+"""Add bulk execution fields to batch_resume_modifications
+
+Revision ID: add_bulk_batch_fields
+Revises: add_optimized_sections
+Create Date: 2024-10-22 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_bulk_batch_fields'
+down_revision = 'add_optimized_sections'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add execution mode, backend batch ID and bulk manifest columns"""
+    op.add_column('batch_resume_modifications',
+                  sa.Column('execution_mode', sa.String(length=20), nullable=False, server_default='interactive'))
+    op.add_column('batch_resume_modifications', sa.Column('external_batch_id', sa.String(length=100), nullable=True))
+    op.add_column('batch_resume_modifications', sa.Column('bulk_manifest', sa.JSON(), nullable=True))
+    op.create_index('idx_batch_modifications_mode_status', 'batch_resume_modifications',
+                    ['execution_mode', 'status'], unique=False)
+
+
+def downgrade():
+    """Remove bulk execution columns"""
+    op.drop_index('idx_batch_modifications_mode_status', table_name='batch_resume_modifications')
+    op.drop_column('batch_resume_modifications', 'bulk_manifest')
+    op.drop_column('batch_resume_modifications', 'external_batch_id')
+    op.drop_column('batch_resume_modifications', 'execution_mode')
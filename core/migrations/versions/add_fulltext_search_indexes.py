@@ -0,0 +1,55 @@
+"""Add native full-text search indexes on resume_files and resumes
+
+Revision ID: add_fulltext_search_indexes
+Revises: add_ai_usage_records
+Create Date: 2024-10-25 12:00:00.000000
+
+PostgreSQL gets expression GIN indexes on to_tsvector(); MySQL gets a
+FULLTEXT index on resume_files, with the keywords JSON exposed through a
+stored generated column (FULLTEXT can't index JSON). Other databases use
+the application's local SQLite FTS5 index and need nothing here. The
+expressions must match PG_FILE_DOCUMENT, PG_RESUME_DOCUMENT and
+MYSQL_FILE_COLUMNS in app/services/resume_search_service.py.
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_fulltext_search_indexes'
+down_revision = 'add_ai_usage_records'
+branch_labels = None
+depends_on = None
+
+
+PG_FILE_DOCUMENT = (
+    "coalesce(original_filename, '') || ' ' || coalesce(extracted_text, '') "
+    "|| ' ' || coalesce(keywords::text, '')"
+)
+PG_RESUME_DOCUMENT = "coalesce(title, '') || ' ' || coalesce(parsed_resume::text, '')"
+
+
+def upgrade():
+    """Create the full-text indexes for the current dialect"""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute(f"CREATE INDEX IF NOT EXISTS idx_resume_files_fts ON resume_files "
+                   f"USING GIN (to_tsvector('english', {PG_FILE_DOCUMENT}))")
+        op.execute(f"CREATE INDEX IF NOT EXISTS idx_resumes_fts ON resumes "
+                   f"USING GIN (to_tsvector('english', {PG_RESUME_DOCUMENT}))")
+    elif dialect == 'mysql':
+        op.execute("ALTER TABLE resume_files ADD COLUMN keywords_text TEXT "
+                   "GENERATED ALWAYS AS (CAST(keywords AS CHAR)) STORED")
+        op.execute("ALTER TABLE resume_files ADD FULLTEXT INDEX ft_resume_files_text "
+                   "(original_filename, extracted_text, keywords_text)")
+
+
+def downgrade():
+    """Drop the full-text indexes"""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS idx_resumes_fts")
+        op.execute("DROP INDEX IF EXISTS idx_resume_files_fts")
+    elif dialect == 'mysql':
+        op.execute("ALTER TABLE resume_files DROP INDEX ft_resume_files_text")
+        op.execute("ALTER TABLE resume_files DROP COLUMN keywords_text")
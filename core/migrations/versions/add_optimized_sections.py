@@ -0,0 +1,39 @@
+"""Add optimized_sections table for per-section optimization caching
+
+Revision ID: add_optimized_sections
+Revises: add_thumbnail_fields
+Create Date: 2024-10-20 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_optimized_sections'
+down_revision = 'add_thumbnail_fields'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the optimized_sections table"""
+    op.create_table(
+        'optimized_sections',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('fingerprint', sa.String(length=64), nullable=False),
+        sa.Column('section', sa.String(length=50), nullable=False),
+        sa.Column('optimized_value', sa.JSON(), nullable=False),
+        sa.Column('hit_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('fingerprint')
+    )
+    op.create_index('idx_optimized_sections_last_used', 'optimized_sections', ['last_used_at'], unique=False)
+
+
+def downgrade():
+    """Drop the optimized_sections table"""
+    op.drop_index('idx_optimized_sections_last_used', table_name='optimized_sections')
+    op.drop_table('optimized_sections')
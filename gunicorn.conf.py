@@ -0,0 +1,88 @@
+"""
+Gunicorn configuration for Resume Modifier
+Production serving mode used by railway_start.py (gunicorn -c gunicorn.conf.py wsgi:app)
+
+Settings come from the environment:
+    WEB_CONCURRENCY: Worker processes (default 2 x cores + 1, at most 9)
+    GUNICORN_WORKER_CLASS: gthread (default) or gevent
+    GUNICORN_THREADS: Threads per gthread worker (default 8)
+    GUNICORN_WORKER_CONNECTIONS: Concurrent requests per gevent worker (default 100)
+    GUNICORN_PRELOAD: Import the app once in the master before forking (default true)
+    GUNICORN_MAX_REQUESTS / GUNICORN_MAX_REQUESTS_JITTER: Worker recycling (default 1000 / 100)
+    GUNICORN_TIMEOUT / GUNICORN_GRACEFUL_TIMEOUT: Seconds (default 120 / 30)
+
+SIGHUP gracefully replaces the workers. With preload enabled the master keeps
+the code it loaded, so deploy new code with a restart (or USR2 + QUIT of the
+old master).
+"""
+
+import os
+import shutil
+import tempfile
+import multiprocessing
+
+
+def _int(name, default):
+    return int(os.getenv(name, default))
+
+
+root_dir = os.path.dirname(os.path.abspath(__file__))
+pythonpath = f"{root_dir},{os.path.join(root_dir, 'core')}"
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5001')}"
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+workers = _int('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 9))
+threads = _int('GUNICORN_THREADS', 8)
+worker_connections = _int('GUNICORN_WORKER_CONNECTIONS', 100)
+
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+max_requests = _int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+# AI endpoints can legitimately take a minute or more
+timeout = _int('GUNICORN_TIMEOUT', 120)
+graceful_timeout = _int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _int('GUNICORN_KEEPALIVE', 5)
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+# Rate limits must be shared by the workers (app.utils.rate_limiter)
+os.environ.setdefault('RATE_LIMIT_BACKEND', 'sqlite')
+# So are users' recent writes, which keep their reads off the replica
+os.environ.setdefault('REPLICA_STICKY_BACKEND', 'sqlite')
+
+# Per-worker metrics snapshots; must be set before the app is imported
+metrics_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'resume_modifier_metrics')
+)
+
+
+def on_starting(server):
+    # Snapshots left by a previous master would be merged into /metrics
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def when_ready(server):
+    # The app defers its heavy imports (app.utils.lazy_import); with preload,
+    # import them once in the master so workers share them instead of each
+    # paying for them on its first requests
+    if preload_app:
+        from app.utils.lazy_import import resolve_all
+        server.log.info("Preloaded %d deferred dependencies", resolve_all())
+        # Load (or build once) the OpenAPI spec so workers inherit it
+        spec = server.app.wsgi().extensions.get('openapi_spec')
+        if spec is not None:
+            spec.get()
+
+
+def post_fork(server, worker):
+    from app.services.worker_lifecycle import on_worker_start
+    on_worker_start(worker.app.wsgi())
+
+
+def worker_exit(server, worker):
+    from app.services.worker_lifecycle import on_worker_exit
+    on_worker_exit(worker.app.wsgi())
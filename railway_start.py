@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 """
 Railway deployment entry point for Resume Modifier
-Handles proper Python path setup for module imports
+Handles proper Python path setup for module imports and starts gunicorn
+(multi-process, see gunicorn.conf.py) or the Flask development server
+
+--profile-startup prints where a cold create_app() spends its import time
+--build-openapi stores the OpenAPI spec for this code version (build step)
 """
 
 import sys
@@ -22,27 +26,64 @@ os.environ.setdefault('PYTHONPATH', f"{core_dir}:{current_dir}")
 # 将工作目前切换到core目录，以便Flask-Migrate可以找到迁移文件
 os.chdir(core_dir)
 
+
+def run_production_server():
+    """Replace this process with gunicorn (settings in gunicorn.conf.py)"""
+    config_path = os.path.join(current_dir, 'gunicorn.conf.py')
+    print(f"🚀 Starting Resume Modifier with gunicorn ({config_path})")
+    os.execvp(sys.executable, [sys.executable, '-m', 'gunicorn', '--config', config_path, 'wsgi:app'])
+
+
+def run_development_server():
+    """Single-process Werkzeug development server"""
+    # Import and create the Flask application
+    from app import create_app
+    app = create_app()
+    
+    # Get port from environment (Railway sets this automatically)
+    port = int(os.environ.get('PORT', 5001))
+    host = os.environ.get('HOST', '0.0.0.0')
+    
+    print(f"🚀 Starting Resume Modifier on {host}:{port}")
+    print(f"📍 Python Path: {sys.path[0]}")
+    print(f"🔧 Working Directory: {os.getcwd()}")
+    print(f"📦 Flask App: {app}")
+    
+    # Start the application
+    app.run(
+        host=host,
+        port=port,
+        debug=os.environ.get('FLASK_DEBUG', '0') == '1'
+    )
+
+
+def profile_startup():
+    """Report the import time of a cold create_app() and exit"""
+    from app.utils.startup_profile import profile_startup, format_report
+    print(format_report(profile_startup(cwd=core_dir)))
+
+
+def build_openapi():
+    """Store the precomputed OpenAPI spec for this code version and exit"""
+    from app.utils.openapi_spec import build_openapi_spec
+    print(f"📄 OpenAPI spec written to {build_openapi_spec()}")
+
+
 if __name__ == "__main__":
     try:
-        # Import and create the Flask application
-        from app import create_app
-        app = create_app()
-        
-        # Get port from environment (Railway sets this automatically)
-        port = int(os.environ.get('PORT', 5001))
-        host = os.environ.get('HOST', '0.0.0.0')
-        
-        print(f"🚀 Starting Resume Modifier on {host}:{port}")
-        print(f"📍 Python Path: {sys.path[0]}")
-        print(f"🔧 Working Directory: {os.getcwd()}")
-        print(f"📦 Flask App: {app}")
+        if '--profile-startup' in sys.argv[1:]:
+            profile_startup()
+            sys.exit(0)
+        if '--build-openapi' in sys.argv[1:]:
+            build_openapi()
+            sys.exit(0)
         
-        # Start the application
-        app.run(
-            host=host,
-            port=port,
-            debug=os.environ.get('FLASK_DEBUG', '0') == '1'
-        )
+        # SERVER_MODE=gunicorn|development; debug deployments keep the development server
+        default_mode = 'development' if os.environ.get('FLASK_DEBUG', '0') == '1' else 'gunicorn'
+        if os.environ.get('SERVER_MODE', default_mode) == 'gunicorn':
+            run_production_server()
+        else:
+            run_development_server()
         
     except ImportError as e:
         print(f"❌ Import Error: {e}")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark PDF text extraction backends on the sample resume corpus
+
+Usage:
+    python scripts/testing/benchmark_pdf_extraction.py
+    python scripts/testing/benchmark_pdf_extraction.py --repeat 5 path/to/a.pdf path/to/b.pdf
+"""
+import argparse
+import glob
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'core'))
+
+from app.services.pdf_extraction_engine import PDFExtractionEngine
+
+DEFAULT_CORPUS = [
+    os.path.join(PROJECT_ROOT, 'testing', 'test_resume.pdf'),
+    *sorted(glob.glob(os.path.join(PROJECT_ROOT, 'testing', 'unit', 'test_data', '*.pdf'))),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare PDF extraction backends')
+    parser.add_argument('paths', nargs='*', help='PDF files (default: sample corpus)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per backend and file')
+    parser.add_argument('--parallel-pages', type=int, default=8,
+                        help='Page count at which the process pool is used')
+    args = parser.parse_args()
+
+    paths = [path for path in (args.paths or DEFAULT_CORPUS) if os.path.exists(path)]
+    if not paths:
+        print("❌ No PDF files found")
+        return 1
+
+    engine = PDFExtractionEngine({'parallel_page_threshold': args.parallel_pages})
+    print(f"🔍 Backends available: {', '.join(engine.available_backends()) or 'none'}")
+    print(f"{'file':<28} {'backend':<10} {'pages':>5} {'chars':>7} {'best ms':>9} {'mean ms':>9}")
+    print('-' * 73)
+    for row in engine.benchmark(paths, repeat=args.repeat):
+        if 'error' in row:
+            print(f"{row['file']:<28} {row['backend']:<10} ❌ {row['error']}")
+            continue
+        print(f"{row['file']:<28} {row['backend']:<10} {row['pages']:>5} {row['characters']:>7} "
+              f"{row['best_seconds'] * 1000:>9.1f} {row['mean_seconds'] * 1000:>9.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -123,7 +123,7 @@ class TestEnhancedFileAPI:
             mock_verify_token.return_value = {'user_id': 1, 'email': 'test@example.com'}
             
             # Patch at the server module level where it's imported
-            with patch('app.server.FileValidator') as mock_validator_class:
+            with patch('app.api.file_endpoints.FileValidator') as mock_validator_class:
                 # Mock file validation to pass - create a real ValidationResult
                 from app.utils.file_validator import ValidationResult
                 mock_validation_result = ValidationResult()
@@ -141,7 +141,7 @@ class TestEnhancedFileAPI:
                 mock_validator_instance.validate_file.return_value = mock_validation_result
                 mock_validator_class.return_value = mock_validator_instance
                 
-                with patch('app.server.DuplicateFileHandler') as mock_handler_class:
+                with patch('app.api.file_endpoints.DuplicateFileHandler') as mock_handler_class:
                     # Create a mock handler instance
                     mock_handler_instance = Mock()
                     mock_handler_instance.process_duplicate_file.return_value = {
@@ -198,7 +198,7 @@ class TestEnhancedFileAPI:
             mock_verify_token.return_value = {'user_id': 1, 'email': 'test@example.com'}
             
             # Patch FileValidator at the server module level where it's imported
-            with patch('app.server.FileValidator') as mock_validator_class:
+            with patch('app.api.file_endpoints.FileValidator') as mock_validator_class:
                 # Mock file validation to pass - create a real ValidationResult
                 from app.utils.file_validator import ValidationResult
                 mock_validation_result = ValidationResult()
@@ -216,7 +216,7 @@ class TestEnhancedFileAPI:
                 mock_validator_instance.validate_file.return_value = mock_validation_result
                 mock_validator_class.return_value = mock_validator_instance
             
-                with patch('app.server.DuplicateFileHandler') as mock_handler_class:
+                with patch('app.api.file_endpoints.DuplicateFileHandler') as mock_handler_class:
                     # Create a mock handler instance
                     mock_handler_instance = Mock()
                     mock_handler_instance.process_duplicate_file.return_value = {
@@ -231,7 +231,7 @@ class TestEnhancedFileAPI:
                     mock_handler_instance.calculate_file_hash.return_value = 'abc123def456789'
                     mock_handler_class.return_value = mock_handler_instance
                     
-                    with patch('app.server.GoogleDriveService') as mock_gdrive_class:
+                    with patch('app.api.file_endpoints.GoogleDriveService') as mock_gdrive_class:
                         mock_gdrive_instance = Mock()
                         mock_gdrive_class.return_value = mock_gdrive_instance
                         
@@ -247,7 +247,7 @@ class TestEnhancedFileAPI:
                                 'local_storage_path': '/tmp'
                             }
                         
-                        with patch('app.server.FileStorageService') as mock_storage_class:
+                        with patch('app.api.file_endpoints.FileStorageService') as mock_storage_class:
                             mock_storage_instance = Mock()
                             mock_storage_instance.upload_file.return_value = Mock(
                                 success=True,
@@ -302,7 +302,7 @@ class TestEnhancedFileAPI:
             mock_verify_token.return_value = {'user_id': 1, 'email': 'test@example.com'}
             
             # Patch FileValidator at the server module level where it's imported
-            with patch('app.server.FileValidator') as mock_validator_class:
+            with patch('app.api.file_endpoints.FileValidator') as mock_validator_class:
                 # Mock file validation to pass - create a real ValidationResult
                 from app.utils.file_validator import ValidationResult
                 mock_validation_result = ValidationResult()
@@ -320,7 +320,7 @@ class TestEnhancedFileAPI:
                 mock_validator_instance.validate_file.return_value = mock_validation_result
                 mock_validator_class.return_value = mock_validator_instance
             
-                with patch('app.server.DuplicateFileHandler') as mock_handler_class:
+                with patch('app.api.file_endpoints.DuplicateFileHandler') as mock_handler_class:
                     # Create a mock handler instance
                     mock_handler_instance = Mock()
                     mock_handler_instance.process_duplicate_file.return_value = {
@@ -341,7 +341,7 @@ class TestEnhancedFileAPI:
                             'local_storage_path': '/tmp'
                         }
                         
-                        with patch('app.server.FileStorageService') as mock_storage_class:
+                        with patch('app.api.file_endpoints.FileStorageService') as mock_storage_class:
                             mock_storage_instance = Mock()
                             mock_storage_instance.upload_file.return_value = Mock(
                                 success=True,
@@ -397,7 +397,7 @@ class TestEnhancedFileAPI:
             # Mock JWT verification to return user data
             mock_verify_token.return_value = {'user_id': 1, 'email': 'test@example.com'}
             
-            with patch('app.server.GoogleDriveService') as mock_gdrive_class:
+            with patch('app.api.file_endpoints.GoogleDriveService') as mock_gdrive_class:
                 mock_gdrive_instance = Mock()
                 mock_gdrive_instance.share_file_with_user.return_value = True
                 mock_gdrive_class.return_value = mock_gdrive_instance
@@ -620,7 +620,7 @@ class TestEnhancedFileAPI:
                     'local_storage_path': '/tmp'
                 }
                 
-                with patch('app.server.FileStorageService') as mock_storage_class:
+                with patch('app.api.file_endpoints.FileStorageService') as mock_storage_class:
                     mock_storage_instance = Mock()
                     mock_storage_instance.delete_file.return_value = Mock(success=True)
                     mock_storage_class.return_value = mock_storage_instance
@@ -738,7 +738,7 @@ class TestEnhancedFileAPI:
             # Mock JWT verification to return user data
             mock_verify_token.return_value = {'user_id': 1, 'email': 'test@example.com'}
             
-            with patch('app.server.FileValidator') as mock_validator_class:
+            with patch('app.api.file_endpoints.FileValidator') as mock_validator_class:
                 mock_validator_instance = Mock()
                 validation_result = Mock()
                 validation_result.is_valid = True
@@ -748,7 +748,7 @@ class TestEnhancedFileAPI:
                 mock_validator_instance.validate_file.return_value = validation_result
                 mock_validator_class.return_value = mock_validator_instance
             
-                with patch('app.server.DuplicateFileHandler') as mock_handler_class:
+                with patch('app.api.file_endpoints.DuplicateFileHandler') as mock_handler_class:
                     mock_handler_instance = Mock()
                     mock_handler_instance.process_duplicate_file.return_value = {
                         'is_duplicate': False,
@@ -760,7 +760,7 @@ class TestEnhancedFileAPI:
                     }
                     mock_handler_class.return_value = mock_handler_instance
                 
-                with patch('app.server.GoogleDriveService') as mock_gdrive_class:
+                with patch('app.api.file_endpoints.GoogleDriveService') as mock_gdrive_class:
                     # Simulate Google Drive failure
                     mock_gdrive_instance = Mock()
                     mock_gdrive_instance.upload_file_to_drive.side_effect = Exception("Google Drive API error")
@@ -775,7 +775,7 @@ class TestEnhancedFileAPI:
                             'local_storage_path': '/tmp'
                         }
                         
-                        with patch('app.server.FileStorageService') as mock_storage_class:
+                        with patch('app.api.file_endpoints.FileStorageService') as mock_storage_class:
                             mock_storage_instance = Mock()
                             # Create a proper mock object with attribute access
                             storage_result = Mock()
@@ -809,7 +809,7 @@ class TestEnhancedFileAPI:
             # Mock JWT verification to return user data
             mock_verify_token.return_value = {'user_id': 1, 'email': 'test@example.com'}
             
-            with patch('app.server.FileValidator') as mock_validator_class:
+            with patch('app.api.file_endpoints.FileValidator') as mock_validator_class:
                 mock_validator_instance = Mock()
                 validation_result = Mock()
                 validation_result.is_valid = True
@@ -819,7 +819,7 @@ class TestEnhancedFileAPI:
                 mock_validator_instance.validate_file.return_value = validation_result
                 mock_validator_class.return_value = mock_validator_instance
             
-                with patch('app.server.DuplicateFileHandler') as mock_handler_class:
+                with patch('app.api.file_endpoints.DuplicateFileHandler') as mock_handler_class:
                     # Simulate duplicate detection failure
                     mock_handler_instance = Mock()
                     mock_handler_instance.process_duplicate_file.side_effect = Exception("Hash calculation failed")
@@ -833,7 +833,7 @@ class TestEnhancedFileAPI:
                             'local_storage_path': '/tmp'
                         }
                         
-                        with patch('app.server.FileStorageService') as mock_storage_class:
+                        with patch('app.api.file_endpoints.FileStorageService') as mock_storage_class:
                             mock_storage_instance = Mock()
                             # Create a proper mock object with attribute access
                             storage_result = Mock()
@@ -104,7 +104,7 @@ class TestFileManagementIntegration:
                 mock_file_data['extracted_text'] = 'Processed text content'
                 
                 with patch('app.models.temp.ResumeFile.query') as mock_query, \
-                     patch('app.server.FileStorageService') as mock_storage_class:
+                     patch('app.api.file_endpoints.FileStorageService') as mock_storage_class:
                     
                     # Mock file record query - use class to avoid Mock object issues
                     class MockFile:
@@ -127,7 +127,7 @@ class TestFileManagementIntegration:
                     )
                     
                     # Mock send_file to avoid actual file operations
-                    with patch('app.server.send_file') as mock_send_file:
+                    with patch('app.api.file_endpoints.send_file') as mock_send_file:
                         mock_send_file.return_value = b'mocked_file_content'
                         
                         download_response = client.get(
@@ -121,9 +121,9 @@ class TestGoogleDocsExportAPI:
             'document_title': 'My Professional Resume'
         }
         
-        with patch('app.server.GoogleDocsService') as mock_docs_service:
-            with patch('app.server.GoogleDriveService') as mock_drive_service:
-                with patch('app.server.GoogleAuthService') as mock_auth_service:
+        with patch('app.api.export_endpoints.GoogleDocsService') as mock_docs_service:
+            with patch('app.api.export_endpoints.GoogleDriveService') as mock_drive_service:
+                with patch('app.api.export_endpoints.GoogleAuthService') as mock_auth_service:
                     # Mock successful document creation
                     mock_docs_service.return_value.create_document.return_value = {
                         'document_id': 'test_doc_id_123',
@@ -197,9 +197,9 @@ class TestGoogleDocsExportAPI:
             'document_title': 'Tracked Resume'
         }
         
-        with patch('app.server.GoogleAuthService') as mock_auth_service:
-            with patch('app.server.GoogleDocsService') as mock_docs_service:
-                with patch('app.server.GoogleDriveService') as mock_drive_service:
+        with patch('app.api.export_endpoints.GoogleAuthService') as mock_auth_service:
+            with patch('app.api.export_endpoints.GoogleDocsService') as mock_docs_service:
+                with patch('app.api.export_endpoints.GoogleDriveService') as mock_drive_service:
                     # Mock the auth service
                     mock_auth_service.return_value.get_credentials.return_value = MagicMock()
                     
@@ -252,8 +252,8 @@ class TestMultiFormatExport:
         db.session.add(generated_doc)
         db.session.commit()
         
-        with patch('app.server.GoogleAuthService') as mock_auth_service:
-            with patch('app.server.GoogleDriveService') as mock_drive_service:
+        with patch('app.api.export_endpoints.GoogleAuthService') as mock_auth_service:
+            with patch('app.api.export_endpoints.GoogleDriveService') as mock_drive_service:
                 # Mock the auth service
                 mock_auth_service.return_value.get_credentials.return_value = MagicMock()
                 
@@ -287,8 +287,8 @@ class TestMultiFormatExport:
         db.session.commit()
         
         # Mock the GoogleDriveService methods
-        with patch('app.server.GoogleAuthService') as mock_auth_service:
-            with patch('app.server.GoogleDriveService') as mock_drive_service:
+        with patch('app.api.export_endpoints.GoogleAuthService') as mock_auth_service:
+            with patch('app.api.export_endpoints.GoogleDriveService') as mock_drive_service:
                 # Mock the auth service
                 mock_auth_service.return_value.get_credentials.return_value = MagicMock()
                 
@@ -341,8 +341,8 @@ class TestMultiFormatExport:
         db.session.commit()
         
         # Mock the GoogleDriveService methods
-        with patch('app.server.GoogleAuthService') as mock_auth_service:
-            with patch('app.server.GoogleDriveService') as mock_drive_service:
+        with patch('app.api.export_endpoints.GoogleAuthService') as mock_auth_service:
+            with patch('app.api.export_endpoints.GoogleDriveService') as mock_drive_service:
                 with patch('os.remove') as mock_remove:
                     # Mock the auth service
                     mock_auth_service.return_value.get_credentials.return_value = MagicMock()
@@ -441,7 +441,7 @@ class TestDocumentManagement:
             'public_access': False
         }
         
-        with patch('app.server.GoogleDriveService') as mock_drive_service:
+        with patch('app.api.export_endpoints.GoogleDriveService') as mock_drive_service:
             mock_drive_service.return_value.update_permissions.return_value = True
             
             response = client.put(f'/api/documents/{doc.id}/sharing',
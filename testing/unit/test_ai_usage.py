@@ -0,0 +1,126 @@
+"""
+Test suite for AI usage accounting, budgets and priority lanes
+"""
+
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+
+from app.services.ai_usage import (
+    BULK, INTERACTIVE, LaneScheduler, MeteredClient, QuotaExceededError, UsageLedger, usage_context
+)
+
+
+def _client(prompt_tokens=120, completion_tokens=30):
+    client = MagicMock()
+    response = MagicMock()
+    response.usage.prompt_tokens = prompt_tokens
+    response.usage.completion_tokens = completion_tokens
+    client.chat.completions.create.return_value = response
+    return client
+
+
+class TestLaneScheduler:
+    """Tests for interactive-over-bulk scheduling"""
+
+    def test_interactive_call_preempts_waiting_bulk_call(self):
+        scheduler = LaneScheduler(max_concurrent=1, max_bulk=1)
+        order = []
+        release_first = threading.Event()
+
+        def run(lane, label, hold=None):
+            with scheduler.slot(lane):
+                order.append(label)
+                if hold:
+                    hold.wait(2)
+
+        first = threading.Thread(target=run, args=(BULK, 'bulk-1', release_first))
+        first.start()
+        while scheduler.snapshot()['active'][BULK] == 0:
+            time.sleep(0.01)
+
+        waiters = [threading.Thread(target=run, args=(BULK, 'bulk-2'))]
+        waiters[0].start()
+        while scheduler.snapshot()['waiting'][BULK] == 0:
+            time.sleep(0.01)
+        waiters.append(threading.Thread(target=run, args=(INTERACTIVE, 'interactive')))
+        waiters[1].start()
+        while scheduler.snapshot()['waiting'][INTERACTIVE] == 0:
+            time.sleep(0.01)
+
+        release_first.set()
+        for thread in [first] + waiters:
+            thread.join(2)
+
+        assert order == ['bulk-1', 'interactive', 'bulk-2']
+
+
+class TestUsageLedger:
+    """Tests for per-call accounting and budgets"""
+
+    def test_metered_client_records_attributed_usage(self, app, db_session, sample_user):
+        from app.models.temp import AIUsageRecord
+
+        with app.app_context():
+            ledger = UsageLedger(daily_token_budget=0)
+            client = MeteredClient(_client(), ledger=ledger, scheduler=LaneScheduler(max_concurrent=2))
+            with usage_context(user_id=sample_user.id, endpoint='api.batch_modify_resumes', lane=BULK, task='parse'):
+                client.chat.completions.create(model='gpt-4o-mini', messages=[])
+
+            record = AIUsageRecord.query.one()
+            assert (record.user_id, record.endpoint, record.lane, record.task) == \
+                (sample_user.id, 'api.batch_modify_resumes', BULK, 'parse')
+            assert (record.model, record.total_tokens, record.success) == ('gpt-4o-mini', 150, True)
+
+            totals = ledger.aggregate(days=1, group_by='model')
+            assert totals[0]['model'] == 'gpt-4o-mini' and totals[0]['total_tokens'] == 150
+
+    def test_budget_blocks_calls_once_spent(self, app, db_session, sample_user):
+        with app.app_context():
+            ledger = UsageLedger(daily_token_budget=100)
+            inner = _client()
+            client = MeteredClient(inner, ledger=ledger, scheduler=LaneScheduler(max_concurrent=2))
+            with usage_context(user_id=sample_user.id):
+                client.chat.completions.create(model='gpt-4o-mini', messages=[])
+                with pytest.raises(QuotaExceededError) as excinfo:
+                    client.chat.completions.create(model='gpt-4o-mini', messages=[])
+
+            assert inner.chat.completions.create.call_count == 1
+            assert excinfo.value.used == 150 and excinfo.value.retry_after >= 60
+
+    def test_over_budget_user_is_rejected_before_routing(self, app, db_session, sample_user, monkeypatch):
+        from unittest.mock import patch
+        from app.services import ai_usage
+        from app.services.model_router import ModelRoute, ModelRouter
+        from app.services.resume_ai import ResumeAI
+
+        ledger = UsageLedger(daily_token_budget=10)
+        monkeypatch.setattr(ai_usage, '_default_ledger', ledger)
+        with app.app_context():
+            ledger.record('gpt-4o-mini', prompt_tokens=50, user_id=sample_user.id)
+            with patch('app.services.resume_ai.OpenAI'):
+                resume_ai = ResumeAI('resume text')
+            resume_ai.router = ModelRouter(routes={'parse': ModelRoute('parse', ['primary', 'fallback'])})
+            call = MagicMock()
+
+            with usage_context(user_id=sample_user.id), pytest.raises(QuotaExceededError):
+                resume_ai._routed('parse', call)
+
+        call.assert_not_called()
+        assert resume_ai.router.snapshot()['models'] == {}
+
+    def test_endpoint_returns_429_when_over_budget(self, app, client, sample_user, auth_headers, monkeypatch):
+        from app.services import ai_usage
+
+        ledger = UsageLedger(daily_token_budget=10)
+        monkeypatch.setattr(ai_usage, '_default_ledger', ledger)
+        with app.app_context():
+            ledger.record('gpt-4o-mini', prompt_tokens=50, user_id=sample_user.id)
+
+        response = client.post('/api/resume/batch-modify', headers=auth_headers,
+                               json={'resume_ids': [1], 'job_description_id': 1})
+
+        assert response.status_code == 429
+        assert int(response.headers['Retry-After']) >= 60
+        assert response.get_json()['token_budget'] == 10
@@ -0,0 +1,43 @@
+"""
+Test suite for per-domain API blueprint registration
+"""
+
+import pytest
+
+from app import create_app
+from app.api import BLUEPRINTS, enabled_domains
+from app.utils.startup_profile import profile_startup
+
+
+def _rules(app):
+    return {rule.rule for rule in app.url_map.iter_rules()}
+
+
+class TestBlueprintSelection:
+    """Tests for API_BLUEPRINTS domain selection"""
+
+    def test_all_domains_by_default(self, monkeypatch):
+        monkeypatch.delenv('API_BLUEPRINTS', raising=False)
+        assert enabled_domains() == list(BLUEPRINTS)
+        assert enabled_domains('all') == list(BLUEPRINTS)
+
+    def test_unknown_domain_rejected(self):
+        with pytest.raises(ValueError, match='reports'):
+            enabled_domains('batch, reports')
+
+    def test_only_selected_domains_are_routed(self):
+        app = create_app({'TESTING': True, 'API_BLUEPRINTS': 'batch,auth'})
+        rules = _rules(app)
+
+        assert app.config['API_BLUEPRINTS_ENABLED'] == ['batch', 'auth']
+        assert {'/health', '/api/login', '/api/resume/batch-modify'} <= rules
+        assert '/api/files/upload' not in rules
+        assert '/api/resume/export/gdocs' not in rules
+
+    def test_unselected_domains_are_not_imported(self):
+        cold_start = profile_startup(
+            "from app import create_app; create_app({'TESTING': True, 'API_BLUEPRINTS': 'batch'})"
+        )
+        assert 'app.api.batch_endpoints' in cold_start['modules']
+        assert 'app.api.export_endpoints' not in cold_start['modules']
+        assert 'app.api.oauth_admin_endpoints' not in cold_start['modules']
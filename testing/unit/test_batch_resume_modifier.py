@@ -0,0 +1,425 @@
+"""
+Test suite for BatchResumeModifier optimization modes
+"""
+
+import copy
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.services.batch_resume_modifier import BatchResumeModifier
+
+
+RESUME = {
+    'summary': 'Backend developer.',
+    'workExperience': [
+        {'jobTitle': 'Engineer', 'description': 'Wrote services.'},
+        {'jobTitle': 'Intern', 'description': 'Fixed bugs.'}
+    ],
+    'projects': [{'title': 'CLI', 'description': 'A command line tool.'}],
+    'skills': ['Python']
+}
+
+JOB_DESCRIPTION = 'Python engineer with Kubernetes experience.'
+
+
+def _completion(content):
+    completion = MagicMock()
+    completion.choices[0].message.content = content
+    return completion
+
+
+@pytest.fixture
+def openai_client():
+    with patch('openai.OpenAI') as client_class:
+        yield client_class.return_value.chat.completions.create
+
+
+@pytest.fixture
+def app_db(app, db_session):
+    """Application context with fresh tables (the section cache is stored in the database)"""
+    with app.app_context():
+        yield db_session
+
+
+class TestStructuredOptimization:
+    """Tests for the single-request optimization mode"""
+
+    def test_collects_sections_by_path(self):
+        sections = BatchResumeModifier()._collect_sections(RESUME, {'optimize_projects': False})
+
+        assert list(sections) == ['summary', 'workExperience[0].description',
+                                  'workExperience[1].description', 'skills']
+
+    def test_single_request_applies_patch(self, app_db, openai_client):
+        openai_client.return_value = _completion(json.dumps({
+            'summary': 'Python backend developer.',
+            'workExperience[0].description': 'Built Python services.',
+            'workExperience[1].description': 'Resolved production bugs.',
+            'projects[0].description': 'Python CLI for Kubernetes.',
+            'skills': ['Python', 'Kubernetes']
+        }))
+        modifier = BatchResumeModifier()
+
+        optimized, stats = modifier._optimize_resume_for_job(RESUME, JOB_DESCRIPTION)
+
+        assert openai_client.call_count == 1
+        assert 'response_format' in openai_client.call_args.kwargs
+        assert optimized['workExperience'][1]['description'] == 'Resolved production bugs.'
+        assert optimized['skills'] == ['Python', 'Kubernetes']
+        assert RESUME['skills'] == ['Python']
+        assert stats['round_trips'] == 1
+
+    def test_falls_back_only_for_invalid_sections(self, app_db, openai_client):
+        openai_client.side_effect = [
+            _completion(json.dumps({
+                'summary': 'Python backend developer.',
+                'workExperience[0].description': 'Built Python services.',
+                'workExperience[1].description': '',
+                'projects[0].description': 'Python CLI.',
+                'skills': 'Python, Kubernetes'
+            })),
+            _completion('Resolved production bugs.'),
+            _completion('["Python", "Kubernetes"]')
+        ]
+        modifier = BatchResumeModifier()
+
+        optimized, stats = modifier._optimize_resume_for_job(RESUME, JOB_DESCRIPTION)
+
+        assert openai_client.call_count == 3
+        assert stats['fallbacks'] == 2
+        assert optimized['workExperience'][1]['description'] == 'Resolved production bugs.'
+        assert optimized['skills'] == ['Python', 'Kubernetes']
+
+    def test_rewrites_use_the_optimize_route(self, app_db, openai_client):
+        from app.services.model_router import ModelRoute, ModelRouter
+
+        patch_content = json.dumps({'summary': 'Python backend developer.'})
+        openai_client.side_effect = [TimeoutError('slow'), _completion(patch_content)]
+        modifier = BatchResumeModifier()
+        modifier.router = ModelRouter({'optimize': ModelRoute('optimize', ['model-a', 'model-b'], temperature=0.1)})
+
+        optimized, _ = modifier._optimize_resume_for_job(RESUME, JOB_DESCRIPTION, {
+            'optimize_experience': False, 'optimize_projects': False, 'optimize_skills': False
+        })
+
+        assert [call.kwargs['model'] for call in openai_client.call_args_list] == ['model-a', 'model-b']
+        assert openai_client.call_args.kwargs['temperature'] == 0.1
+        assert optimized['summary'] == 'Python backend developer.'
+
+    def test_per_section_mode(self, app_db, openai_client):
+        openai_client.return_value = _completion('Rewritten.')
+        modifier = BatchResumeModifier()
+
+        optimized, _ = modifier._optimize_resume_for_job(
+            RESUME, JOB_DESCRIPTION, {'optimization_mode': 'per_section', 'optimize_skills': False}
+        )
+
+        assert openai_client.call_count == 4
+        assert 'response_format' not in openai_client.call_args.kwargs
+        assert optimized['projects'][0]['description'] == 'Rewritten.'
+
+
+class TestIncrementalOptimization:
+    """Tests for per-section fingerprint caching"""
+
+    def test_rerun_only_sends_changed_sections(self, app_db, openai_client):
+        def rewrite(**kwargs):
+            properties = kwargs['response_format']['json_schema']['schema']['properties']
+            return _completion(json.dumps({
+                path: (['Python', 'Kubernetes'] if spec['type'] == 'array' else f'Tailored {path}')
+                for path, spec in properties.items()
+            }))
+        openai_client.side_effect = rewrite
+        modifier = BatchResumeModifier()
+
+        first, stats = modifier._optimize_resume_for_job(RESUME, JOB_DESCRIPTION)
+        assert stats['cached'] == 0
+
+        edited = copy.deepcopy(RESUME)
+        edited['workExperience'][1]['description'] = 'Fixed many bugs.'
+        second, stats = modifier._optimize_resume_for_job(edited, JOB_DESCRIPTION)
+
+        assert openai_client.call_count == 2
+        sent = openai_client.call_args.kwargs['response_format']['json_schema']['schema']['properties']
+        assert list(sent) == ['workExperience[1].description']
+        assert stats['cached'] == 4
+        assert second['skills'] == first['skills']
+        assert second['workExperience'][0]['description'] == first['workExperience'][0]['description']
+
+    def test_cache_is_keyed_by_job_description(self, app_db, openai_client):
+        openai_client.return_value = _completion('Rewritten.')
+        modifier = BatchResumeModifier()
+        options = {'optimization_mode': 'per_section', 'optimize_experience': False,
+                   'optimize_projects': False, 'optimize_skills': False}
+
+        modifier._optimize_resume_for_job(RESUME, JOB_DESCRIPTION, options)
+        modifier._optimize_resume_for_job(RESUME, 'Go engineer.', options)
+        modifier._optimize_resume_for_job(RESUME, JOB_DESCRIPTION, options)
+
+        assert openai_client.call_count == 2
+
+
+class TestMultiTargetModification:
+    """Tests for one resume tailored to several job descriptions"""
+
+    @staticmethod
+    def _fake_completion(**kwargs):
+        response_format = kwargs.get('response_format') or {}
+        prompt = kwargs['messages'][-1]['content']
+        if response_format.get('type') == 'json_object':
+            keys = [key for key in ('job_1', 'job_2', 'job_3') if f'"{key}"' in prompt]
+            return _completion(json.dumps({key: {'overallAnalysis': {'score': 80}} for key in keys}))
+        properties = response_format['json_schema']['schema']['properties']
+        return _completion(json.dumps({
+            path: (['Python'] if spec['type'] == 'array' else 'Tailored.')
+            for path, spec in properties.items()
+        }))
+
+    def test_shared_analysis_and_parallel_rewrites(self, app, db_session, sample_user, openai_client):
+        from datetime import datetime
+        from app.extensions import db
+        from app.models.temp import JobDescription, Resume
+
+        with app.app_context():
+            db.session.add(Resume(user_id=sample_user.id, serial_number=1, title='Base',
+                                  parsed_resume=RESUME, created_at=datetime.utcnow(),
+                                  updated_at=datetime.utcnow()))
+            for serial in (1, 2, 3):
+                db.session.add(JobDescription(user_id=sample_user.id, serial_number=serial,
+                                              title=f'Role {serial}', description=f'Python role {serial}',
+                                              created_at=datetime.utcnow()))
+            db.session.commit()
+
+            openai_client.side_effect = self._fake_completion
+            modifier = BatchResumeModifier()
+            with patch.object(modifier, 'MULTI_JOB_CHUNK_SIZE', 2), \
+                    patch('app.services.batch_resume_modifier.ResumeAI') as resume_ai:
+                results = modifier.modify_resume_for_multiple_jobs(1, [3, 99, 1, 2], sample_user.id)
+
+            resume_ai.assert_not_called()
+            assert results['successful_modifications'] == 3
+            assert [version['job_description_id'] for version in results['modified_versions']] == [3, 1, 2]
+            assert results['errors'][0]['job_description_id'] == 99
+            # Two chunked analysis requests plus one structured rewrite per job
+            assert openai_client.call_count == 5
+            # Analyses run on the deterministic analyze route, so they can be cached
+            assert {call.kwargs['temperature'] for call in openai_client.call_args_list
+                    if call.kwargs['response_format']['type'] == 'json_object'} == {0.0}
+            assert all(version['analysis'] == {'overallAnalysis': {'score': 80}}
+                       for version in results['modified_versions'])
+
+
+class TestBulkModification:
+    """Tests for offline bulk mode through a batch-completion backend"""
+
+    @staticmethod
+    def _fake_completion(**kwargs):
+        if kwargs['response_format']['type'] == 'json_object':
+            return _completion('{"overallScore": 75')  # Truncated output is repaired on ingest
+        properties = kwargs['response_format']['json_schema']['schema']['properties']
+        return _completion(json.dumps({
+            path: (['Python', 'Kubernetes'] if spec['type'] == 'array' else 'Tailored.')
+            for path, spec in properties.items() if path != 'projects[0].description'
+        }))
+
+    def test_submit_poll_and_ingest(self, app, db_session, sample_user, tmp_path, monkeypatch):
+        from datetime import datetime
+        from app.extensions import db
+        from app.models.temp import JobDescription, Resume
+        from app.services.batch_completion import LocalReplayBackend
+
+        monkeypatch.setenv('BULK_JOB_DIR', str(tmp_path))
+        client = MagicMock()
+        client.chat.completions.create.side_effect = self._fake_completion
+        backend = LocalReplayBackend(client=client)
+
+        with app.app_context():
+            db.session.add(Resume(user_id=sample_user.id, serial_number=1, title='Base',
+                                  parsed_resume=RESUME, created_at=datetime.utcnow(),
+                                  updated_at=datetime.utcnow()))
+            db.session.add(JobDescription(user_id=sample_user.id, serial_number=1, title='Platform Engineer',
+                                          description=JOB_DESCRIPTION, created_at=datetime.utcnow()))
+            db.session.commit()
+
+            modifier = BatchResumeModifier()
+            with patch('app.services.batch_resume_modifier.ResumeAI') as resume_ai:
+                resume_ai.return_value.analysis_messages.return_value = [
+                    {'role': 'user', 'content': 'Analyze this resume'}
+                ]
+                record = modifier.submit_bulk_modification([1, 99], 1, sample_user.id, backend=backend)
+
+            assert record.status == 'submitted' and record.execution_mode == 'bulk'
+            with open(record.bulk_manifest['job_file']) as handle:
+                lines = [json.loads(line) for line in handle]
+            assert [line['custom_id'] for line in lines] == ['resume-1:analysis', 'resume-1:patch']
+            # JSON mode requests must mention JSON
+            assert 'json' in json.dumps(lines[0]['body']['messages']).lower()
+
+            modifier.poll_bulk_modification(record, backend=backend)
+
+            assert record.status == 'completed'
+            assert record.successful_modifications == 1 and record.failed_modifications == 1
+            result = record.modification_results[0]
+            assert result['analysis']['overallScore'] == 75
+            assert result['modified_content']['skills'] == ['Python', 'Kubernetes']
+            # Sections missing from the patch keep their original text
+            assert result['modified_content']['projects'][0]['description'] == 'A command line tool.'
+            assert result['optimization_stats']['unoptimized'] == 1
+            assert record.bulk_manifest['saved_resumes'][0]['new_id'] == 2
+
+    def test_concurrent_polls_ingest_once(self, app, db_session, sample_user, tmp_path, monkeypatch):
+        from datetime import datetime
+        from app.extensions import db
+        from app.models.temp import JobDescription, Resume
+        from app.services.batch_completion import LocalReplayBackend
+
+        monkeypatch.setenv('BULK_JOB_DIR', str(tmp_path))
+        client = MagicMock()
+        client.chat.completions.create.side_effect = self._fake_completion
+        backend = LocalReplayBackend(client=client)
+
+        with app.app_context():
+            db.session.add(Resume(user_id=sample_user.id, serial_number=1, title='Base',
+                                  parsed_resume=RESUME, created_at=datetime.utcnow(),
+                                  updated_at=datetime.utcnow()))
+            db.session.add(JobDescription(user_id=sample_user.id, serial_number=1, title='Platform Engineer',
+                                          description=JOB_DESCRIPTION, created_at=datetime.utcnow()))
+            db.session.commit()
+
+            modifier = BatchResumeModifier()
+            with patch('app.services.batch_resume_modifier.ResumeAI') as resume_ai:
+                resume_ai.return_value.analysis_messages.return_value = [
+                    {'role': 'user', 'content': 'Analyze this resume'}
+                ]
+                record = modifier.submit_bulk_modification([1], 1, sample_user.id, backend=backend)
+
+            # The background poller polls while the request handler is ingesting the same job
+            results = backend.results
+            second_poll = []
+
+            def results_with_second_poll(batch_id):
+                second_poll.append(BatchResumeModifier().poll_bulk_modification(record, backend=backend).status)
+                return results(batch_id)
+
+            monkeypatch.setattr(backend, 'results', results_with_second_poll)
+            modifier.poll_bulk_modification(record, backend=backend)
+
+            assert second_poll == ['ingesting']
+            assert record.status == 'completed'
+            assert Resume.query.filter_by(user_id=sample_user.id).count() == 2
+
+    def _submit_bulk(self, sample_user, resume_ids, tmp_path, monkeypatch):
+        from datetime import datetime
+        from app.extensions import db
+        from app.models.temp import JobDescription, Resume
+        from app.services.batch_completion import LocalReplayBackend
+
+        monkeypatch.setenv('BULK_JOB_DIR', str(tmp_path))
+        client = MagicMock()
+        client.chat.completions.create.side_effect = self._fake_completion
+        backend = LocalReplayBackend(client=client)
+        for serial_number in resume_ids:
+            db.session.add(Resume(user_id=sample_user.id, serial_number=serial_number, title='Base',
+                                  parsed_resume=RESUME, created_at=datetime.utcnow(),
+                                  updated_at=datetime.utcnow()))
+        db.session.add(JobDescription(user_id=sample_user.id, serial_number=1, title='Platform Engineer',
+                                      description=JOB_DESCRIPTION, created_at=datetime.utcnow()))
+        db.session.commit()
+        with patch('app.services.batch_resume_modifier.ResumeAI') as resume_ai:
+            resume_ai.return_value.analysis_messages.return_value = [
+                {'role': 'user', 'content': 'Analyze this resume'}
+            ]
+            record = BatchResumeModifier().submit_bulk_modification(resume_ids, 1, sample_user.id, backend=backend)
+        return record, backend
+
+    def test_failed_ingest_saves_nothing_and_retries(self, app, db_session, sample_user, tmp_path, monkeypatch):
+        from app.models.temp import Resume
+
+        with app.app_context():
+            record, backend = self._submit_bulk(sample_user, [1, 2], tmp_path, monkeypatch)
+            modifier = BatchResumeModifier()
+            save = modifier.save_modified_resume
+            calls = []
+
+            def save_then_fail(**kwargs):
+                calls.append(kwargs)
+                if len(calls) == 2:
+                    raise RuntimeError('disk full')
+                return save(**kwargs)
+
+            monkeypatch.setattr(modifier, 'save_modified_resume', save_then_fail)
+            with pytest.raises(RuntimeError):
+                modifier.poll_bulk_modification(record, backend=backend)
+
+            # The first save was rolled back with the rest; the claim is released
+            assert Resume.query.filter_by(user_id=sample_user.id).count() == 2
+            assert record.status == 'in_progress'
+
+            BatchResumeModifier().poll_bulk_modification(record, backend=backend)
+            assert record.status == 'completed'
+            assert Resume.query.filter_by(user_id=sample_user.id).count() == 4
+
+    def test_stale_ingesting_claim_is_reclaimed(self, app, db_session, sample_user, tmp_path, monkeypatch):
+        from datetime import datetime, timedelta
+        from app.extensions import db
+        from app.models.temp import BatchResumeModification, Resume
+
+        with app.app_context():
+            record, backend = self._submit_bulk(sample_user, [1], tmp_path, monkeypatch)
+            monkeypatch.setattr('app.services.batch_resume_modifier.get_batch_backend', lambda name=None: backend)
+            # A worker claimed the job and was killed before ingesting it
+            BatchResumeModification.query.filter_by(id=record.id).update(
+                {'status': 'ingesting', 'updated_at': datetime.utcnow() - timedelta(minutes=5)}
+            )
+            db.session.commit()
+            db.session.refresh(record)
+
+            assert BatchResumeModifier().poll_pending_bulk_modifications() == 0
+
+            monkeypatch.setattr(BatchResumeModifier, 'BULK_CLAIM_TIMEOUT_SECONDS', 60)
+            assert BatchResumeModifier().poll_pending_bulk_modifications() == 1
+            db.session.refresh(record)
+            assert record.status == 'completed'
+            assert Resume.query.filter_by(user_id=sample_user.id).count() == 2
+
+    def test_local_backend_waits_for_missing_output(self, app, tmp_path, monkeypatch):
+        import os
+        from app.services.batch_completion import COMPLETED, FAILED, IN_PROGRESS, LocalReplayBackend, write_job_file
+
+        monkeypatch.setenv('BULK_JOB_DIR', str(tmp_path))
+        client = MagicMock()
+        client.chat.completions.create.return_value = _completion('{}')
+        backend = LocalReplayBackend(client=client)
+
+        with app.app_context():
+            job_id = backend.submit(write_job_file([]))
+            assert backend.poll(job_id) == COMPLETED
+
+            # Output not written yet (or lost): still running, not failed
+            os.remove(backend._output_path(job_id))
+            assert backend.poll(job_id) == IN_PROGRESS
+            assert backend.poll('local-unknown') == FAILED
+
+    def test_openai_backend_states_and_results(self):
+        from app.services.batch_completion import COMPLETED, IN_PROGRESS, OpenAIBatchBackend
+
+        client = MagicMock()
+        backend = OpenAIBatchBackend(client=client)
+        client.batches.retrieve.return_value = MagicMock(status='finalizing')
+        assert backend.poll('batch_1') == IN_PROGRESS
+
+        client.batches.retrieve.return_value = MagicMock(
+            status='expired', output_file_id='out', error_file_id='err'
+        )
+        outputs = {
+            'out': json.dumps({'custom_id': 'a', 'response': {'status_code': 200, 'body': {
+                'choices': [{'message': {'content': '{"x": 1}'}}]}}, 'error': None}),
+            'err': json.dumps({'custom_id': 'b', 'response': None, 'error': {'code': 'batch_expired'}})
+        }
+        client.files.content.side_effect = lambda file_id: MagicMock(text=outputs[file_id])
+
+        assert backend.poll('batch_1') == COMPLETED
+        results = backend.results('batch_1')
+        assert results['a']['content'] == '{"x": 1}'
+        assert 'batch_expired' in results['b']['error']
@@ -0,0 +1,156 @@
+"""
+Test suite for set-based bulk file operations: delete, restore, category
+updates and batched storage deletion
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app.models.temp import ResumeFile
+from app.services.file_storage_service import FileStorageService
+from app.services.storage_deleter import StorageDeleter, shutdown_storage_deleter
+
+
+def _add_files(db_session, user_id, count, tmp_path=None, deleted=False, prefix='resume'):
+    files = []
+    for index in range(count):
+        file_path = f"/missing/{prefix}_{index}.pdf"
+        if tmp_path is not None:
+            path = tmp_path / f"resume_{index}.pdf"
+            path.write_bytes(b'%PDF-1.4')
+            file_path = str(path)
+        files.append(ResumeFile(
+            user_id=user_id,
+            original_filename=f"{prefix}_{index}.pdf",
+            stored_filename=f"{prefix}_stored_{index}.pdf",
+            file_path=file_path,
+            file_size=1024,
+            mime_type='application/pdf',
+            storage_type='local',
+            file_hash=f"{prefix}_hash_{index}",
+            is_active=not deleted,
+            deleted_at=datetime.utcnow() if deleted else None
+        ))
+    db_session.add_all(files)
+    db_session.commit()
+    return [f.id for f in files]
+
+
+class TestBulkDelete:
+    """Tests for DELETE /api/files"""
+
+    def test_soft_delete_uses_constant_queries(self, client, auth_headers, sample_user, db_session,
+                                               assert_max_queries):
+        file_ids = _add_files(db_session, sample_user.id, 25)
+
+        with assert_max_queries(4):
+            response = client.delete('/api/files', headers=auth_headers, json={'file_ids': file_ids + [999999]})
+
+        data = response.get_json()
+        assert (data['deleted_count'], data['failed_count']) == (25, 1)
+        assert data['failed_files'] == [{'file_id': 999999, 'error': 'File not found or access denied'}]
+        assert ResumeFile.query.filter(ResumeFile.deleted_at.is_(None)).count() == 0
+        assert ResumeFile.query.filter_by(is_active=True).count() == 0
+
+    def test_force_delete_removes_rows_then_storage(self, app, client, auth_headers, sample_user, db_session,
+                                                    tmp_path, monkeypatch):
+        monkeypatch.setitem(app.config, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+        file_ids = _add_files(db_session, sample_user.id, 3, tmp_path=tmp_path)
+
+        response = client.delete('/api/files', headers=auth_headers, json={'file_ids': file_ids, 'force': True})
+        # Wait for the background deletions of this process
+        shutdown_storage_deleter(wait=True)
+
+        data = response.get_json()
+        assert data['deleted_count'] == 3
+        assert data['storage_deletions_queued'] == 6  # Files and thumbnails
+        assert ResumeFile.query.count() == 0
+        assert list(tmp_path.glob('resume_*.pdf')) == []
+
+
+class TestBulkRestore:
+    """Tests for POST /api/files/restore"""
+
+    def test_restores_only_own_deleted_files(self, client, auth_headers, sample_user, db_session):
+        deleted_ids = _add_files(db_session, sample_user.id, 3, deleted=True)
+        live_id = _add_files(db_session, sample_user.id, 1, prefix='live')[0]
+
+        response = client.post('/api/files/restore', headers=auth_headers, json={'file_ids': deleted_ids + [live_id]})
+
+        data = response.get_json()
+        assert sorted(data['restored_file_ids']) == sorted(deleted_ids)
+        assert data['failed_files'] == [{'file_id': live_id, 'error': 'File not found or not deleted'}]
+        assert ResumeFile.query.filter(ResumeFile.deleted_at.is_not(None)).count() == 0
+        assert ResumeFile.query.filter_by(is_active=False).count() == 0
+
+    def test_admin_restore_requires_admin(self, client, auth_headers, sample_user, db_session):
+        response = client.post('/api/admin/files/restore', headers=auth_headers, json={'file_ids': [1]})
+        assert response.status_code == 403
+
+
+class TestBulkCategoryUpdate:
+    """Tests for the set-based category update"""
+
+    def test_one_select_and_one_update(self, app, sample_user, db_session, assert_max_queries):
+        user_id = sample_user.id
+        file_ids = _add_files(db_session, user_id, 10)
+
+        with assert_max_queries(2):
+            result = ResumeFile.bulk_update_category(user_id, file_ids, 'archived', user_id)
+
+        assert result['successful_updates'] == 10
+        assert {f['category'] for f in result['updated_files']} == {'archived'}
+        db_session.commit()
+        assert ResumeFile.query.filter_by(category='archived').count() == 10
+
+
+class _FakeS3Client:
+    def __init__(self, failing_keys=()):
+        self.calls = []
+        self.failing_keys = set(failing_keys)
+
+    def delete_objects(self, Bucket, Delete):
+        keys = [item['Key'] for item in Delete['Objects']]
+        self.calls.append((Bucket, len(keys)))
+        return {'Errors': [{'Key': key, 'Code': 'AccessDenied', 'Message': 'denied'}
+                           for key in keys if key in self.failing_keys]}
+
+
+class TestBatchedStorageDeletion:
+    """Tests for S3 delete_objects batching and the deleter pool"""
+
+    @pytest.fixture
+    def s3_service(self):
+        service = FileStorageService({
+            'storage_type': 's3', 's3_bucket': 'resumes', 's3_region': 'us-east-1',
+            'aws_access_key_id': 'test', 'aws_secret_access_key': 'test'
+        })
+        service.s3_client = _FakeS3Client(failing_keys={'users/1/b.pdf'})
+        return service
+
+    def test_s3_keys_deleted_in_batches_of_1000(self, s3_service):
+        keys = [f"users/1/{index}.pdf" for index in range(2500)] + ['users/1/b.pdf']
+        results = s3_service.delete_files(keys)
+
+        assert s3_service.s3_client.calls == [('resumes', 1000), ('resumes', 1000), ('resumes', 501)]
+        assert sum(result.success for result in results.values()) == 2500
+        assert 'AccessDenied' in results['users/1/b.pdf'].error_message
+
+    def test_deleter_groups_by_backend(self, s3_service, tmp_path):
+        local_file = tmp_path / 'a.pdf'
+        local_file.write_bytes(b'x')
+        local_service = FileStorageService({'storage_type': 'local', 'local_storage_path': str(tmp_path)})
+        deleter = StorageDeleter(lambda storage_type: s3_service if storage_type == 's3' else local_service)
+
+        report = deleter.delete([
+            ('s3', 'resumes', 'users/1/a.pdf'),
+            ('s3', 'resumes', 'users/1/b.pdf'),
+            ('local', None, str(local_file)),
+            ('local', None, str(tmp_path / 'gone.pdf'))
+        ])
+        deleter.shutdown()
+
+        assert (report.deleted, report.missing) == (2, 1)
+        assert report.failed[0]['file_path'] == 'users/1/b.pdf'
+        assert not local_file.exists()
@@ -0,0 +1,80 @@
+"""
+Test suite for database connection pool configuration and monitoring
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.utils.db_pool import InstrumentedQueuePool, engine_options, pool_stats
+from app.utils.metrics import DB_POOL_CHECKOUT_WAIT, DB_POOL_EXHAUSTED
+
+
+class TestEngineOptions:
+    """Tests for env-driven engine options"""
+
+    def test_sqlite_keeps_defaults(self):
+        assert engine_options('sqlite:///:memory:') == {}
+
+    def test_pool_sized_to_worker_threads(self, monkeypatch):
+        monkeypatch.setenv('GUNICORN_THREADS', '4')
+        options = engine_options('postgresql://db/app')
+
+        assert options['poolclass'] is InstrumentedQueuePool
+        assert (options['pool_size'], options['max_overflow']) == (6, 5)
+        assert options['pool_pre_ping'] is True
+        assert options['connect_args']['options'] == '-c statement_timeout=30000'
+
+    def test_environment_overrides(self, monkeypatch):
+        monkeypatch.setenv('DB_POOL_SIZE', '3')
+        monkeypatch.setenv('DB_POOL_RECYCLE', '600')
+        monkeypatch.setenv('DB_STATEMENT_TIMEOUT_MS', '5000')
+        options = engine_options('mysql+pymysql://db/app')
+
+        assert (options['pool_size'], options['pool_recycle']) == (3, 600)
+        assert options['connect_args']['init_command'] == 'SET SESSION max_execution_time=5000'
+
+
+class TestInstrumentedQueuePool:
+    """Tests for checkout timing and exhaustion alerts"""
+
+    def test_exhaustion_and_timeout_are_recorded(self, tmp_path, caplog):
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool,
+                               pool_size=1, max_overflow=0, pool_timeout=0.05)
+        exhausted = DB_POOL_EXHAUSTED.value()
+        timeouts = DB_POOL_CHECKOUT_WAIT.summary(outcome='timeout')['count']
+
+        held = engine.connect()
+        held.execute(text('SELECT 1'))
+        assert pool_stats(engine)['checked_out'] == 1
+
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+        assert DB_POOL_EXHAUSTED.value() == exhausted + 1
+        assert DB_POOL_CHECKOUT_WAIT.summary(outcome='timeout')['count'] == timeouts + 1
+        assert 'Database pool checkout timeout' in caplog.text
+        held.close()
+
+    def test_pool_class_survives_dispose(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool)
+        engine.dispose(close=False)
+        assert isinstance(engine.pool, InstrumentedQueuePool)
+
+
+class TestPoolStatsEndpoint:
+    """Tests for /api/admin/db/pool"""
+
+    def test_requires_admin(self, client, auth_headers):
+        assert client.get('/api/admin/db/pool', headers=auth_headers).status_code == 403
+
+    def test_reports_engines_and_checkouts(self, client, auth_headers, sample_user, db_session):
+        sample_user.is_admin = True
+        db_session.commit()
+
+        response = client.get('/api/admin/db/pool', headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['engines']['primary']['pool_class']
+        assert set(data['checkout']) == {'pid', 'wait', 'timeouts', 'exhausted'}
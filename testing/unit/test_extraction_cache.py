@@ -0,0 +1,134 @@
+"""
+Test suite for ExtractionCache
+"""
+
+import io
+import hashlib
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+
+from app.extensions import db
+from app.models.temp import ResumeFile
+from app.services.extraction_cache import ExtractionCache
+from app.services.file_processing_service import FileProcessingService, ProcessingResult
+
+HASH_A = hashlib.sha256(b'a').hexdigest()
+
+
+def _make_file(user_id, stored_filename, file_hash, **kwargs):
+    resume_file = ResumeFile(
+        user_id=user_id,
+        original_filename='resume.pdf',
+        stored_filename=stored_filename,
+        file_size=1024,
+        mime_type='application/pdf',
+        storage_type='local',
+        file_path=f'/tmp/{stored_filename}',
+        file_hash=file_hash,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow(),
+        **kwargs
+    )
+    db.session.add(resume_file)
+    db.session.commit()
+    return resume_file
+
+
+def _processed_kwargs(version):
+    return dict(
+        processing_status='completed',
+        is_processed=True,
+        extracted_text='Python developer with Flask experience',
+        page_count=1,
+        language='en',
+        keywords=['python', 'flask'],
+        processing_metadata={'extractor_version': version, 'file_type': 'pdf'}
+    )
+
+
+class TestExtractionCache:
+    """Test suite for ExtractionCache class"""
+
+    def test_lookup_hits_same_hash_and_version(self, app, db_session, sample_user):
+        source = _make_file(sample_user.id, 'a.pdf', HASH_A,
+                            **_processed_kwargs(FileProcessingService.EXTRACTOR_VERSION))
+        target = _make_file(sample_user.id, 'b.pdf', HASH_A)
+
+        cache = ExtractionCache(processing_service=Mock())
+        assert cache.lookup(HASH_A, exclude_file_id=target.id).id == source.id
+        assert cache.lookup(HASH_A, exclude_file_id=source.id) is None
+
+    def test_lookup_ignores_old_extractor_version(self, app, db_session, sample_user):
+        _make_file(sample_user.id, 'a.pdf', HASH_A, **_processed_kwargs('0'))
+
+        cache = ExtractionCache(processing_service=Mock())
+        assert cache.lookup(HASH_A) is None
+
+    def test_lookup_rejects_placeholder_hashes(self, app, db_session, sample_user):
+        # The upload fallback stores the same placeholder for unrelated files
+        for file_hash in ('fallback_hash', HASH_A.upper(), HASH_A[:63]):
+            _make_file(sample_user.id, f'{file_hash}.pdf', file_hash,
+                       **_processed_kwargs(FileProcessingService.EXTRACTOR_VERSION))
+
+        cache = ExtractionCache(processing_service=Mock())
+        assert cache.lookup('fallback_hash') is None
+        assert cache.lookup(HASH_A.upper()) is None
+        assert cache.lookup(HASH_A[:63]) is None
+
+    def test_get_or_process_copies_without_loading_file(self, app, db_session, sample_user):
+        _make_file(sample_user.id, 'a.pdf', HASH_A,
+                   **_processed_kwargs(FileProcessingService.EXTRACTOR_VERSION))
+        processing_service = Mock()
+        load_file = Mock()
+
+        result, cache_hit = ExtractionCache(processing_service).get_or_process(HASH_A, load_file)
+
+        assert cache_hit is True
+        assert result.text == 'Python developer with Flask experience'
+        assert result.keywords == ['python', 'flask']
+        load_file.assert_not_called()
+        processing_service.process_file.assert_not_called()
+
+    def test_reprocess_stale_extracts_each_content_once(self, app, db_session, sample_user):
+        first = _make_file(sample_user.id, 'a.pdf', HASH_A, **_processed_kwargs('0'))
+        second = _make_file(sample_user.id, 'b.pdf', HASH_A, **_processed_kwargs('0'))
+        processing_service = Mock()
+        processing_service.process_file.return_value = ProcessingResult(
+            success=True,
+            text='Fresh text',
+            keywords=['fresh'],
+            metadata={'extractor_version': FileProcessingService.EXTRACTOR_VERSION}
+        )
+
+        summary = ExtractionCache(processing_service).reprocess_stale(lambda record: io.BytesIO(b'%PDF'))
+
+        assert summary['stale_files'] == 2
+        assert summary['recomputed'] == 1
+        assert summary['copied'] == 1
+        assert processing_service.process_file.call_count == 1
+        assert db.session.get(ResumeFile, second.id).extracted_text == 'Fresh text'
+        assert ExtractionCache.record_version(db.session.get(ResumeFile, first.id)) == \
+            FileProcessingService.EXTRACTOR_VERSION
+
+    def test_reprocess_stale_never_groups_placeholder_hashes(self, app, db_session, sample_user):
+        for name in ('a.pdf', 'b.pdf'):
+            _make_file(sample_user.id, name, 'fallback_hash', **_processed_kwargs('0'))
+        processing_service = Mock()
+        processing_service.process_file.return_value = ProcessingResult(
+            success=True, text='Fresh text', metadata={'extractor_version': FileProcessingService.EXTRACTOR_VERSION}
+        )
+
+        summary = ExtractionCache(processing_service).reprocess_stale(lambda record: io.BytesIO(b'%PDF'))
+
+        assert (summary['recomputed'], summary['copied']) == (2, 0)
+
+    def test_reprocess_stale_dry_run(self, app, db_session, sample_user):
+        _make_file(sample_user.id, 'a.pdf', HASH_A, **_processed_kwargs('0'))
+        processing_service = Mock()
+
+        summary = ExtractionCache(processing_service).reprocess_stale(Mock(), dry_run=True)
+
+        assert summary['stale_files'] == 1
+        assert summary['recomputed'] == 0
+        processing_service.process_file.assert_not_called()
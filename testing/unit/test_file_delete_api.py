@@ -140,7 +140,7 @@ class TestFileDeleteAPI:
         """Test delete when storage service fails"""
         with app.app_context():
             with patch('app.models.temp.ResumeFile.query') as mock_query, \
-                 patch('app.server.FileStorageService') as mock_storage_class:
+                 patch('app.api.file_endpoints.FileStorageService') as mock_storage_class:
 
                 # Mock database query
                 mock_file = Mock()
@@ -385,7 +385,7 @@ class TestFileDeleteAPI:
         """Test delete with force parameter for hard delete"""
         with app.app_context():
             with patch('app.models.temp.ResumeFile.query') as mock_query, \
-                 patch('app.server.FileStorageService') as mock_storage_class, \
+                 patch('app.api.file_endpoints.FileStorageService') as mock_storage_class, \
                  patch.object(db.session, 'delete') as mock_db_delete, \
                  patch.object(db.session, 'commit') as mock_commit:
 
@@ -40,7 +40,7 @@ class TestFileDownloadAPI:
         with app.app_context():
             with patch('app.models.temp.ResumeFile.query') as mock_query, \
                  patch('app.services.file_storage_service.FileStorageService.download_file') as mock_download, \
-                 patch('app.server.send_file') as mock_send_file:
+                 patch('app.api.file_endpoints.send_file') as mock_send_file:
                 
                 # Mock database query
                 mock_file = Mock()
@@ -184,7 +184,7 @@ class TestFileDownloadAPI:
         with app.app_context():
             with patch('app.models.temp.ResumeFile.query') as mock_query, \
                  patch('app.services.file_storage_service.FileStorageService.download_file') as mock_download, \
-                 patch('app.server.send_file') as mock_send_file:
+                 patch('app.api.file_endpoints.send_file') as mock_send_file:
                 
                 # Mock S3 file record
                 mock_file = Mock()
@@ -230,7 +230,7 @@ class TestFileDownloadAPI:
         with app.app_context():
             with patch('app.models.temp.ResumeFile.query') as mock_query, \
                  patch('app.services.file_storage_service.FileStorageService.download_file') as mock_download, \
-                 patch('app.server.send_file') as mock_send_file:
+                 patch('app.api.file_endpoints.send_file') as mock_send_file:
                 
                 # Mock database query
                 mock_file = Mock()
@@ -265,7 +265,7 @@ class TestFileDownloadAPI:
         with app.app_context():
             with patch('app.models.temp.ResumeFile.query') as mock_query, \
                  patch('app.services.file_storage_service.FileStorageService.download_file') as mock_download, \
-                 patch('app.server.send_file') as mock_send_file:
+                 patch('app.api.file_endpoints.send_file') as mock_send_file:
                 
                 # Mock database query
                 mock_file = Mock()
@@ -300,7 +300,7 @@ class TestFileDownloadAPI:
         with app.app_context():
             with patch('app.models.temp.ResumeFile.query') as mock_query, \
                  patch('app.services.file_storage_service.FileStorageService.download_file') as mock_download, \
-                 patch('app.server.send_file') as mock_send_file, \
+                 patch('app.api.file_endpoints.send_file') as mock_send_file, \
                  patch('logging.getLogger') as mock_logger:
                 
                 # Mock database query
@@ -334,7 +334,7 @@ class TestFileDownloadAPI:
         with app.app_context():
             with patch('app.models.temp.ResumeFile.query') as mock_query, \
                  patch('app.services.file_storage_service.FileStorageService.download_file') as mock_download, \
-                 patch('app.server.send_file') as mock_send_file:
+                 patch('app.api.file_endpoints.send_file') as mock_send_file:
                 
                 # Mock large file record
                 mock_file = Mock()
@@ -367,7 +367,7 @@ class TestFileDownloadAPI:
         with app.app_context():
             with patch('app.models.temp.ResumeFile.query') as mock_query, \
                  patch('app.services.file_storage_service.FileStorageService.download_file') as mock_download, \
-                 patch('app.server.send_file') as mock_send_file:
+                 patch('app.api.file_endpoints.send_file') as mock_send_file:
                 
                 # Mock database query
                 mock_file = Mock()
@@ -0,0 +1,165 @@
+"""
+Test suite for the corpus keyword engine
+"""
+
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+
+from app.extensions import db
+from app.models.temp import ResumeFile
+from app.services import keyword_engine
+from app.services.keyword_engine import KeywordEngine, extract_skills, rebuild_keyword_index, tokenize
+
+
+class TestTokenizer:
+    """Tests for tokenization and skill matching"""
+
+    def test_tokenize_drops_stop_words_and_keeps_skill_tokens(self):
+        tokens = tokenize('The candidate knows C++, c# and node.js with AI')
+        assert 'the' not in tokens and 'and' not in tokens
+        assert {'c++', 'c#', 'node.js', 'ai'} <= set(tokens)
+
+    def test_extract_skills_deduplicates_in_order(self):
+        skills = extract_skills('Python and Docker required. 5+ years experience with Python and AWS.')
+        assert skills == ['Python', 'Docker', 'AWS', '5']
+
+
+class TestKeywordEngine:
+    """Tests for TF-IDF scoring"""
+
+    def test_common_terms_rank_below_distinctive_terms(self):
+        engine = KeywordEngine().fit([
+            'experience team python',
+            'experience team java',
+            'experience team golang',
+            'experience team kubernetes',
+        ])
+
+        keywords = engine.extract_keywords('experience team kubernetes', max_keywords=3)
+
+        assert keywords[0] == 'kubernetes'
+        assert engine.document_frequency('experience') == 4
+
+    def test_batch_matches_single_document_results(self):
+        engine = KeywordEngine().fit(['python flask', 'java spring', 'python django'])
+        documents = ['python flask postgres', 'java spring kafka kafka']
+
+        batch = engine.top_keywords(documents, max_keywords=2)
+
+        assert batch == [engine.extract_keywords(document, max_keywords=2) for document in documents]
+        assert batch[1][0] == 'kafka'
+
+    def test_similarity_prefers_matching_resume(self):
+        engine = KeywordEngine().fit(['python flask', 'java spring', 'react typescript'])
+
+        scores = engine.similarity(['java spring boot', 'python flask api'], 'flask python developer')
+
+        assert scores[1] > scores[0]
+
+    def test_transform_does_not_grow_vocabulary(self):
+        engine = KeywordEngine().fit(['python flask', 'python django'])
+
+        keywords = engine.extract_keywords('python terraform terraform', max_keywords=2)
+        engine.similarity(['python flask'], 'rust kafka')
+
+        assert keywords == ['terraform', 'python']
+        assert set(engine.vocabulary) == {'python', 'flask', 'django'}
+
+    def test_round_trip_persistence(self, tmp_path):
+        engine = KeywordEngine().fit(['python flask', 'python django'])
+        path = str(tmp_path / 'index.json')
+        engine.save(path)
+
+        loaded = KeywordEngine.load(path)
+
+        assert loaded.document_count == 2
+        assert loaded.document_frequency('python') == 2
+
+
+class TestSharedEngine:
+    """Tests for the process-wide engine"""
+
+    def test_processing_a_file_does_not_refit_the_corpus(self, tmp_path, monkeypatch):
+        from unittest.mock import Mock, patch
+        from app.services.file_processing_service import FileProcessingService, ProcessingResult
+
+        monkeypatch.setenv('KEYWORD_INDEX_PATH', str(tmp_path / 'keyword_index.json'))
+        monkeypatch.setattr(keyword_engine, '_default_engine', None)
+        KeywordEngine().fit(['python flask', 'java spring']).save(str(tmp_path / 'keyword_index.json'))
+        pdf_file = Mock(filename='resume.pdf', content_type='application/pdf')
+
+        service = FileProcessingService()
+        with patch.object(FileProcessingService, 'extract_text_from_pdf', return_value=ProcessingResult(
+                success=True, text='Python developer with terraform and kubernetes experience.')):
+            for _ in range(2):
+                result = service.process_file(pdf_file)
+                assert 'terraform' in result.keywords
+        engine = keyword_engine.get_keyword_engine()
+
+        assert engine.document_count == 2
+        assert 'terraform' not in engine.vocabulary
+
+    def test_rewritten_index_is_reloaded(self, tmp_path, monkeypatch):
+        import os
+
+        path = str(tmp_path / 'keyword_index.json')
+        monkeypatch.setenv('KEYWORD_INDEX_PATH', path)
+        monkeypatch.setattr(keyword_engine, '_default_engine', None)
+        monkeypatch.setattr(keyword_engine, 'INDEX_CHECK_SECONDS', 60)
+        KeywordEngine().fit(['python flask']).save(path)
+        assert keyword_engine.get_keyword_engine().document_count == 1
+
+        # The leader rebuilt the index
+        KeywordEngine().fit(['python flask', 'java spring', 'go gin']).save(path)
+        os.utime(path, (os.path.getmtime(path) + 5, os.path.getmtime(path) + 5))
+
+        # Within the check interval the file isn't even looked at
+        with patch('os.path.getmtime', side_effect=AssertionError('index checked')):
+            assert keyword_engine.get_keyword_engine().document_count == 1
+
+        monkeypatch.setattr(keyword_engine, 'INDEX_CHECK_SECONDS', 0)
+        assert keyword_engine.get_keyword_engine().document_count == 3
+
+    def test_index_lives_in_the_instance_folder(self, app, monkeypatch):
+        import os
+
+        monkeypatch.delenv('KEYWORD_INDEX_PATH', raising=False)
+        with app.app_context():
+            assert keyword_engine.keyword_index_path() == os.path.join(app.instance_path, 'keyword_index.json')
+        assert keyword_engine.keyword_index_path() is None
+
+
+class TestRebuildKeywordIndex:
+    """Tests for the bulk rebuild job"""
+
+    def test_rebuild_updates_file_keywords(self, app, db_session, sample_user, tmp_path, monkeypatch):
+        monkeypatch.setenv('KEYWORD_INDEX_PATH', str(tmp_path / 'keyword_index.json'))
+        monkeypatch.setattr(keyword_engine, '_default_engine', None)
+
+        with app.app_context():
+            texts = ['resume experience terraform', 'resume experience pandas', 'resume experience swift']
+            for index, text in enumerate(texts):
+                db.session.add(ResumeFile(
+                    user_id=sample_user.id,
+                    original_filename=f'kw_{index}.pdf',
+                    stored_filename=f'kw_stored_{index}.pdf',
+                    file_size=1024,
+                    mime_type='application/pdf',
+                    storage_type='local',
+                    file_path=f'/tmp/kw_{index}.pdf',
+                    file_hash=f'kw_hash_{index}',
+                    extracted_text=text,
+                    processing_status='completed',
+                    created_at=datetime.utcnow(),
+                    updated_at=datetime.utcnow()
+                ))
+            db.session.commit()
+
+            summary = rebuild_keyword_index(batch_size=2, max_keywords=1)
+
+            assert summary['files_updated'] >= 3
+            stored = ResumeFile.query.filter_by(original_filename='kw_0.pdf').first()
+            assert stored.keywords == ['terraform']
+            assert (tmp_path / 'keyword_index.json').exists()
+            assert keyword_engine.get_keyword_engine().document_count == summary['documents']
@@ -0,0 +1,131 @@
+"""
+Test suite for the metrics registry and /metrics endpoint
+"""
+
+import os
+import threading
+import pytest
+
+from app.utils.metrics import MetricsRegistry, quantile
+
+
+class TestMetricsRegistry:
+    """Tests for counters, histograms and exposition"""
+
+    def test_counter_sums_thread_shards(self):
+        counter = MetricsRegistry(multiprocess_dir='').counter('jobs_total', 'Jobs', ('kind',))
+
+        def work():
+            for _ in range(1000):
+                counter.inc(kind='resume')
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.value(kind='resume') == 8000
+
+    def test_exited_threads_fold_into_retired_totals(self):
+        registry = MetricsRegistry(multiprocess_dir='')
+        counter = registry.counter('tasks_total', 'Tasks', ('kind',))
+        histogram = registry.histogram('task_seconds', 'Task time', buckets=(0.1, 1.0))
+
+        for _ in range(200):
+            thread = threading.Thread(target=lambda: (counter.inc(kind='short'), histogram.observe(0.5)))
+            thread.start()
+            thread.join()
+        counter.inc(kind='short')
+
+        assert len(counter._shards) <= 2 and len(histogram._shards) <= 2
+        assert counter.value(kind='short') == 201
+        assert histogram.summary()['count'] == 200
+
+    def test_histogram_percentiles(self):
+        histogram = MetricsRegistry(multiprocess_dir='').histogram(
+            'latency_seconds', 'Latency', buckets=[0.1 * step for step in range(1, 11)])
+        for step in range(1, 101):
+            histogram.observe(step / 100)
+
+        summary = histogram.summary()
+        assert summary['count'] == 100 and summary['sum'] == pytest.approx(50.5)
+        assert summary['p50'] == pytest.approx(0.5)
+        assert summary['p95'] == pytest.approx(0.95)
+        assert summary['p99'] == pytest.approx(0.99)
+
+    def test_quantile_in_overflow_bucket_reports_largest_bound(self):
+        assert quantile([1.0, 2.0], [0, 0, 5], 0.5) == 2.0
+        assert quantile([1.0, 2.0], [0, 0, 0], 0.5) is None
+
+    def test_timer_sets_outcome_label(self):
+        histogram = MetricsRegistry(multiprocess_dir='').histogram('calls_seconds', 'Calls', ('outcome',))
+        with histogram.time():
+            pass
+        with pytest.raises(RuntimeError):
+            with histogram.time():
+                raise RuntimeError('boom')
+
+        assert histogram.summary(outcome='success')['count'] == 1
+        assert histogram.summary(outcome='error')['count'] == 1
+
+    def test_render_prometheus_text(self):
+        registry = MetricsRegistry(multiprocess_dir='')
+        registry.counter('uploads_total', 'Uploads', ('source',)).inc(2, source='say "hi"')
+        registry.histogram('render_seconds', 'Render', buckets=[0.5, 1.0]).observe(0.7)
+
+        text = registry.render()
+        assert '# TYPE uploads_total counter' in text
+        assert 'uploads_total{source="say \\"hi\\""} 2' in text
+        assert 'render_seconds_bucket{le="0.5"} 0' in text
+        assert 'render_seconds_bucket{le="1.0"} 1' in text
+        assert 'render_seconds_bucket{le="+Inf"} 1' in text
+        assert 'render_seconds_count 1' in text
+
+    def test_multiprocess_snapshots_are_merged(self, tmp_path):
+        registry = MetricsRegistry(multiprocess_dir=str(tmp_path))
+        counter = registry.counter('requests_total', 'Requests')
+        counter.inc(3)
+        registry.flush()
+        os.replace(tmp_path / f'metrics_{os.getpid()}.json', tmp_path / 'metrics_1.json')
+        counter.inc(2)
+
+        assert 'requests_total 8' in registry.render()
+
+    def test_registering_conflicting_labels_fails(self):
+        registry = MetricsRegistry(multiprocess_dir='')
+        registry.counter('things_total', 'Things', ('a',))
+        with pytest.raises(ValueError):
+            registry.counter('things_total', 'Things', ('b',))
+
+
+class TestMetricsEndpoint:
+    """Tests for request instrumentation and /metrics"""
+
+    def test_requests_and_queries_are_exported(self, client, db_session, sample_user):
+        client.get('/health')
+        response = client.get('/metrics')
+
+        assert response.status_code == 200
+        assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+        text = response.get_data(as_text=True)
+        assert 'http_request_duration_seconds_count{endpoint="api.health_check",method="GET",status="200"}' in text
+        assert 'db_query_duration_seconds_count{operation="insert"}' in text
+
+    def test_metrics_token_required_when_configured(self, client, monkeypatch):
+        monkeypatch.setenv('METRICS_TOKEN', 'scrape-secret')
+
+        assert client.get('/metrics').status_code == 401
+        assert client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'}).status_code == 200
+
+    def test_performance_monitor_records_into_registry(self):
+        from app.utils.performance_optimizer import PerformanceMonitor
+
+        monitor = PerformanceMonitor(registry=MetricsRegistry(multiprocess_dir=''))
+        monitor.record_metric('file_hash_calculation', 40.0)
+        monitor.record_metric('file_hash_calculation', 60.0)
+        monitor.record_metric('cache_hits', 3, 'count')
+
+        assert monitor.get_average_metric('file_hash_calculation') == pytest.approx(50.0)
+        assert monitor.get_average_metric('unknown') is None
+        assert monitor.values.value(operation='cache_hits', unit='count') == 3
@@ -0,0 +1,93 @@
+"""
+Test suite for adaptive model routing
+"""
+
+import json
+import pytest
+
+from app.services.model_router import ModelRoute, ModelRouter, ModelStats, load_routes
+
+
+def _router(**route_options):
+    route = ModelRoute('parse', ['primary', 'fallback'], **route_options)
+    return ModelRouter(routes={'parse': route}, window_seconds=60, min_samples=3)
+
+
+class TestModelRouter:
+    """Tests for SLO-aware model ordering and fallback"""
+
+    def test_percentiles_and_error_rate(self):
+        stats = ModelStats(max_samples=100, window_seconds=60)
+        for latency in range(1, 101):
+            stats.add(float(latency), ok=latency % 10 != 0)
+
+        summary = stats.summary()
+        assert summary['samples'] == 100
+        assert summary['p50_ms'] == 50 and summary['p95_ms'] == 95
+        assert summary['error_rate'] == 0.1
+
+    def test_old_samples_leave_the_window(self):
+        stats = ModelStats(max_samples=100, window_seconds=60)
+        stats.add(5000.0, ok=False, now=1000.0)
+        assert stats.summary(now=1030.0)['samples'] == 1
+        assert stats.summary(now=1100.0)['samples'] == 0
+
+    def test_error_falls_back_to_next_model(self):
+        router = _router()
+        calls = []
+
+        def call(model, route):
+            calls.append(model)
+            if model == 'primary':
+                raise RuntimeError('upstream 503')
+            return {'model': model, 'temperature': route.temperature}
+
+        assert router.run('parse', call) == {'model': 'fallback', 'temperature': 0.0}
+        assert calls == ['primary', 'fallback']
+
+    def test_slow_primary_is_demoted(self):
+        router = _router(slo_p95_ms=1000)
+        for _ in range(3):
+            router.record('primary', 5000, ok=True)
+
+        assert router.candidates('parse') == ['fallback', 'primary']
+        assert router.run('parse', lambda model, route: model) == 'fallback'
+        assert router.snapshot()['routes']['parse']['active_order'] == ['fallback', 'primary']
+
+    def test_few_samples_do_not_demote(self):
+        router = _router(max_error_rate=0.1)
+        router.record('primary', 100, ok=False)
+        assert router.candidates('parse') == ['primary', 'fallback']
+
+    def test_all_models_failing_raises_last_error(self):
+        def call(model, route):
+            raise RuntimeError(f'{model} down')
+
+        with pytest.raises(RuntimeError, match='fallback down'):
+            _router().run('parse', call)
+
+    def test_quota_rejection_is_not_a_model_failure(self):
+        from app.services.ai_usage import QuotaExceededError
+        router = _router()
+        calls = []
+
+        def call(model, route):
+            calls.append(model)
+            raise QuotaExceededError(1, 150, 100, 60)
+
+        with pytest.raises(QuotaExceededError):
+            router.run('parse', call)
+        assert calls == ['primary']
+        assert router.snapshot()['models'] == {}
+
+    def test_routes_overridden_from_environment(self, monkeypatch):
+        monkeypatch.setenv('MODEL_ROUTES', json.dumps({
+            'parse': {'models': ['gpt-4o'], 'slo_p95_ms': 8000},
+            'summarize': {'models': ['gpt-4o-mini'], 'temperature': 0.3}
+        }))
+        routes = load_routes()
+
+        assert routes['parse'].models == ['gpt-4o'] and routes['parse'].temperature == 0.0
+        assert routes['parse'].slo_p95_ms == 8000
+        assert routes['summarize'].temperature == 0.3
+        assert routes['optimize'].models[0] == 'gpt-3.5-turbo'
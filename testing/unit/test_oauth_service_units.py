@@ -278,7 +278,7 @@ class TestTokenManagement(unittest.TestCase):
         self.service.logger = MagicMock()
     
     @patch('app.services.oauth_persistence_service.GoogleAuth')
-    @patch('app.services.oauth_persistence_service.google.oauth2.credentials')
+    @patch('app.services.oauth_persistence_service.Credentials')
     @patch('app.services.oauth_persistence_service.Request')
     def test_refresh_token_if_needed(self, mock_request, mock_credentials, mock_google_auth):
         """Test token refresh when needed"""
@@ -299,7 +299,7 @@ class TestTokenManagement(unittest.TestCase):
         mock_creds.refresh_token = "new_refresh_token"
         mock_creds.expiry = datetime.utcnow() + timedelta(hours=1)
         
-        mock_credentials.Credentials.return_value = mock_creds
+        mock_credentials.return_value = mock_creds
         
         result = self.service.refresh_token_if_needed(1)
         
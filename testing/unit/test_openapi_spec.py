@@ -0,0 +1,58 @@
+"""
+Test suite for the precomputed OpenAPI spec
+"""
+
+import gzip
+import json
+
+import pytest
+from flask import Flask
+
+from app.utils.openapi_spec import OpenAPISpecCache, code_version
+
+
+@pytest.fixture
+def spec_cache(app, tmp_path):
+    return OpenAPISpecCache(app, app.extensions['openapi_spec'].swagger, directory=str(tmp_path))
+
+
+class TestOpenAPISpecCache:
+    """Tests for building, storing and serving the spec"""
+
+    def test_version_from_environment(self, monkeypatch):
+        monkeypatch.setenv('OPENAPI_SPEC_VERSION', 'abc123')
+        assert code_version() == 'abc123'
+
+    def test_stored_spec_is_reused_without_building(self, app, spec_cache, monkeypatch):
+        monkeypatch.setenv('OPENAPI_SPEC_VERSION', 'build-1')
+        path = spec_cache.write()
+        with open(path + '.gz', 'rb') as f:
+            assert json.loads(gzip.decompress(f.read()))['paths']
+
+        fresh = OpenAPISpecCache(app, spec_cache.swagger, directory=spec_cache.directory)
+        monkeypatch.setattr(fresh, 'build', lambda: pytest.fail('spec was rebuilt'))
+        body, _, _ = fresh.get()
+        assert '/api/files/upload' in json.loads(body)['paths']
+
+    def test_new_code_version_gets_a_new_spec(self, spec_cache, monkeypatch):
+        monkeypatch.setenv('OPENAPI_SPEC_VERSION', 'build-1')
+        first = spec_cache.path
+        monkeypatch.setenv('OPENAPI_SPEC_VERSION', 'build-2')
+        assert spec_cache.path != first
+
+    def test_served_compressed_with_etag(self, spec_cache):
+        app = Flask(__name__)
+        app.add_url_rule('/spec.json', 'spec', spec_cache.response)
+        client = app.test_client()
+
+        compressed = client.get('/spec.json', headers={'Accept-Encoding': 'gzip'})
+        assert compressed.headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(compressed.data))['paths']
+
+        plain = client.get('/spec.json')
+        assert 'Content-Encoding' not in plain.headers
+        assert plain.headers['ETag'] == compressed.headers['ETag']
+
+        cached = client.get('/spec.json', headers={'If-None-Match': plain.headers['ETag']})
+        assert cached.status_code == 304
+        assert cached.data == b''
@@ -97,6 +97,30 @@ class TestPasswordResetRequest:
             assert data['status'] == 'error'
             assert 'Too many password reset requests' in data['message']
 
+    def test_ip_rate_limited_requests_do_not_charge_user(self, client, sample_user):
+        """Test requests rejected by the IP limit leave the user's allowance intact"""
+        with patch.object(email_service, 'send_password_reset_email') as mock_email:
+            mock_email.return_value.success = True
+            
+            with patch('app.services.password_reset_service.get_rate_limiter') as mock_limiter:
+                limiter = mock_limiter.return_value
+                limiter.hit.side_effect = lambda policy, key: Mock(allowed=policy != 'password_reset_ip')
+                
+                for i in range(10):
+                    response = client.post('/api/auth/password-reset/request',
+                                         json={'email': 'test@test.com'},
+                                         content_type='application/json')
+                    assert response.status_code == 429
+                
+                charged = [call.args[0] for call in limiter.hit.call_args_list]
+                assert 'password_reset_user' not in charged
+            
+            # The user's own allowance is untouched
+            response = client.post('/api/auth/password-reset/request',
+                                 json={'email': 'test@test.com'},
+                                 content_type='application/json')
+            assert response.status_code == 200
+
     def test_password_reset_request_email_failure(self, client, sample_user):
         """Test password reset request when email sending fails"""
         with patch.object(email_service, 'send_password_reset_email') as mock_email:
@@ -0,0 +1,115 @@
+"""
+Test suite for PDFExtractionEngine
+"""
+
+import io
+import os
+import signal
+import pytest
+from unittest.mock import Mock
+
+from app.services.pdf_extraction_engine import (
+    PDFExtractionEngine, PDFExtractionError, PDFExtractionTimeout, get_extraction_pool, shutdown_extraction_pool
+)
+
+SAMPLE_PDF = os.path.join(os.path.dirname(__file__), 'test_data', 'sample_resume.pdf')
+
+
+def _mock_reader(*page_texts):
+    pages = []
+    for text in page_texts:
+        page = Mock()
+        page.extract_text.return_value = text
+        pages.append(page)
+    reader = Mock()
+    reader.pages = pages
+    return Mock(return_value=reader)
+
+
+class TestPDFExtractionEngine:
+    """Test suite for PDFExtractionEngine class"""
+
+    def test_extracts_pages_with_injected_reader(self):
+        engine = PDFExtractionEngine({'backends': ['pypdf']}, reader_factory=_mock_reader('Page 1', '', 'Page 3'))
+        result = engine.extract(b'%PDF-1.4')
+
+        assert result.backend == 'pypdf'
+        assert result.page_count == 3
+        assert result.pages == ['Page 1', '', 'Page 3']
+        assert result.join() == 'Page 1\n\nPage 3'
+        assert result.parallel is False
+
+    def test_falls_back_to_next_backend(self):
+        engine = PDFExtractionEngine({'backends': ['pypdf']}, reader_factory=_mock_reader('Fallback text'))
+        result = engine.extract(b'%PDF-1.4', backends=['unknown', 'pypdf'])
+
+        assert result.backend == 'pypdf'
+        assert 'unknown' in result.errors
+
+    def test_all_backends_failing_raises(self):
+        engine = PDFExtractionEngine({'backends': ['pypdf']}, reader_factory=Mock(side_effect=Exception("bad xref")))
+
+        with pytest.raises(PDFExtractionError) as exc_info:
+            engine.extract(b'not a pdf')
+        assert 'bad xref' in str(exc_info.value)
+
+    def test_time_limit_is_enforced(self):
+        engine = PDFExtractionEngine(
+            {'backends': ['pypdf'], 'time_limit_seconds': 0.000001},
+            reader_factory=_mock_reader('a', 'b')
+        )
+
+        with pytest.raises(PDFExtractionTimeout):
+            engine.extract(b'%PDF-1.4')
+
+    @pytest.mark.skipif(not os.path.exists(SAMPLE_PDF), reason="sample PDF not available")
+    def test_parallel_extraction_matches_serial(self):
+        data = _repeated_sample(3)
+
+        serial = PDFExtractionEngine({'backends': ['pypdf'], 'max_workers': 1}).extract(data)
+        parallel = PDFExtractionEngine({
+            'backends': ['pypdf'], 'max_workers': 2, 'parallel_page_threshold': 1, 'pages_per_task': 1
+        }).extract(data)
+
+        assert (serial.parallel, parallel.parallel) == (False, True)
+        assert parallel.pages == serial.pages
+        assert serial.page_count == parallel.page_count == 3
+
+
+@pytest.mark.skipif(not os.path.exists(SAMPLE_PDF), reason="sample PDF not available")
+class TestExtractionPool:
+    """Every extraction runs in one long-lived pool per process"""
+
+    def test_pool_is_reused_and_survives_a_lost_worker(self):
+        data = _repeated_sample(1)
+        engine = PDFExtractionEngine({'backends': ['pypdf']})
+        first = engine.extract(data)
+        pool = get_extraction_pool()
+
+        # A worker killed by its limits breaks the pool; the next call recycles it
+        for process in list(pool._processes.values()):
+            os.kill(process.pid, signal.SIGKILL)
+            process.join()
+        again = engine.extract(data)
+
+        assert again.pages == first.pages
+        assert get_extraction_pool() is not pool
+        shutdown_extraction_pool()
+
+    def test_deadline_is_enforced_in_the_pool(self):
+        engine = PDFExtractionEngine({'backends': ['pypdf'], 'time_limit_seconds': 0.000001})
+
+        with pytest.raises(PDFExtractionTimeout):
+            engine.extract(_repeated_sample(1))
+
+
+def _repeated_sample(copies):
+    from pypdf import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    page = PdfReader(SAMPLE_PDF).pages[0]
+    for _ in range(copies):
+        writer.add_page(page)
+    output = io.BytesIO()
+    writer.write(output)
+    return output.getvalue()
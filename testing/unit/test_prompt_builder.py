@@ -0,0 +1,86 @@
+"""
+Test suite for the compact prompt builder
+"""
+
+import json
+import pytest
+
+from app.response_template.resume_schema import RESUME_TEMPLATE
+from app.services import prompt_builder
+from app.services.prompt_builder import (
+    PromptBuilder, PromptSection, count_tokens, get_prompt_stats, minify_schema,
+    normalize_whitespace, prune_empty, truncate_to_tokens
+)
+
+
+class TestPromptHelpers:
+    """Tests for minification and normalization helpers"""
+
+    def test_minified_schema_is_smaller_and_equivalent(self):
+        minified = minify_schema(RESUME_TEMPLATE)
+
+        assert json.loads(minified) == RESUME_TEMPLATE
+        assert len(minified) < len(json.dumps(RESUME_TEMPLATE, indent=2))
+        assert '\n' not in minified
+
+    def test_prune_empty_keeps_booleans(self):
+        pruned = prune_empty({'summary': '', 'skills': [], 'work': [{'title': 'SRE  lead', 'isPresent': False,
+                                                                      'city': ''}]})
+
+        assert pruned == {'work': [{'title': 'SRE lead', 'isPresent': False}]}
+
+    def test_normalize_whitespace(self):
+        assert normalize_whitespace('  a \t b  \r\n\n\n\nc  ') == 'a b\n\nc'
+
+    def test_truncate_respects_budget(self):
+        text = 'experience ' * 500
+        truncated = truncate_to_tokens(text, 50)
+
+        assert truncated.endswith(prompt_builder.TRUNCATION_MARKER)
+        assert count_tokens(truncated) <= 50
+
+    def test_encoding_failure_falls_back_once(self, monkeypatch):
+        from unittest.mock import MagicMock
+
+        # tiktoken is installed but can't download its BPE file (offline host)
+        offline = MagicMock()
+        offline.encoding_for_model.side_effect = ConnectionError('no network')
+        monkeypatch.setattr(prompt_builder, 'tiktoken', offline)
+        prompt_builder._encoding.cache_clear()
+        try:
+            assert count_tokens('a' * 40, 'gpt-test') == 40 // prompt_builder.CHARS_PER_TOKEN
+            assert truncate_to_tokens('a' * 400, 10, 'gpt-test').endswith(prompt_builder.TRUNCATION_MARKER)
+            assert offline.encoding_for_model.call_count == 1
+        finally:
+            prompt_builder._encoding.cache_clear()
+
+
+class TestPromptBuilder:
+    """Tests for budgeted prompt rendering"""
+
+    def test_trims_trimmable_sections_to_budget(self):
+        builder = PromptBuilder(max_tokens=300)
+
+        built = builder.build('test_trim', """
+            Analyze   this.
+        """, [
+            PromptSection('Schema', '{"a":""}'),
+            PromptSection('Job Description', 'kubernetes ' * 2000, trimmable=True, min_tokens=50)
+        ], 'Return JSON.')
+
+        assert built.tokens <= 300
+        assert 'Job Description' in built.trimmed
+        assert built.text.startswith('Analyze this.')
+        assert built.text.endswith('Return JSON.')
+
+    def test_untrimmed_prompt_and_stats(self):
+        builder = PromptBuilder(max_tokens=1000)
+
+        built = builder.build('test_stats', 'Hi', [PromptSection('Text', 'short')], '')
+        builder.build('test_stats', 'Hi', [PromptSection('Text', 'short')], '')
+
+        assert built.trimmed == {}
+        assert built.text == 'Hi\n\nText:\nshort'
+        stats = get_prompt_stats()['test_stats']
+        assert stats['calls'] == 2
+        assert stats['tokens'] == 2 * built.tokens
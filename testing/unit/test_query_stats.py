@@ -0,0 +1,102 @@
+"""
+Test suite for per-request SQL statistics and query-count budgets of
+endpoints that used to issue queries in loops
+"""
+
+from datetime import datetime
+
+from app.extensions import db
+from app.models.temp import GoogleAuth, Resume, User, UserSite
+from app.utils.query_stats import QueryStats, collect_queries, normalize_statement
+
+
+class TestQueryStats:
+    """Tests for statement aggregation"""
+
+    def test_parameter_lists_are_collapsed(self):
+        assert normalize_statement("SELECT *\n  FROM t WHERE id IN (?, ?, ?)") == 'SELECT * FROM t WHERE id IN (...)'
+        assert normalize_statement("SELECT * FROM t WHERE id IN (%(id_1)s, %(id_2)s)") == 'SELECT * FROM t WHERE id IN (...)'
+
+    def test_repeated_statements_are_reported(self):
+        stats = QueryStats()
+        for _ in range(3):
+            stats.record('SELECT * FROM users WHERE id = ?', 0.001)
+        stats.record('SELECT 1', 0.01)
+
+        assert stats.count == 4
+        assert stats.top(1)[0]['statement'] == 'SELECT 1'
+        assert stats.repeated() == [{'statement': 'SELECT * FROM users WHERE id = ?', 'count': 3, 'total_ms': 3.0}]
+
+    def test_collector_records_engine_statements(self, app, db_session):
+        with collect_queries() as stats:
+            db_session.execute(db.select(User)).all()
+        assert stats.count == 1
+
+
+class TestRequestInstrumentation:
+    """Tests for the per-request headers"""
+
+    def test_debug_headers(self, client, auth_headers, monkeypatch):
+        monkeypatch.setenv('SQL_DEBUG_HEADERS', 'true')
+        response = client.get('/api/get_resume_list', headers=auth_headers)
+
+        assert int(response.headers['X-DB-Query-Count']) >= 1
+        assert 'resumes' in response.headers['X-DB-Top-Statement-1']
+        assert response.headers['Server-Timing'].startswith('db;dur=')
+
+    def test_no_headers_by_default(self, client, auth_headers):
+        response = client.get('/api/get_resume_list', headers=auth_headers)
+        assert 'X-DB-Query-Count' not in response.headers
+
+
+class TestQueryBudgets:
+    """Query counts that must not grow with the number of rows"""
+
+    def test_resume_list(self, client, auth_headers, sample_user, db_session, assert_max_queries):
+        now = datetime.utcnow()
+        for serial in range(1, 11):
+            db_session.add(Resume(user_id=sample_user.id, serial_number=serial, title=f"Resume {serial}",
+                                  parsed_resume={}, created_at=now, updated_at=now))
+        db_session.commit()
+
+        with assert_max_queries(1):
+            response = client.get('/api/get_resume_list', headers=auth_headers)
+        assert len(response.get_json()['data']) == 10
+
+    def test_save_resume_allocates_serial_after_deletion(self, client, auth_headers, sample_user, db_session,
+                                                         assert_max_queries):
+        now = datetime.utcnow()
+        db_session.add(Resume(user_id=sample_user.id, serial_number=2, title='Kept', parsed_resume={},
+                              created_at=now, updated_at=now))
+        db_session.commit()
+
+        with assert_max_queries(4):
+            response = client.put('/api/save_resume', headers=auth_headers,
+                                  json={'resume_title': 'New', 'updated_resume': {}})
+        assert response.status_code == 200
+        assert Resume.query.filter_by(user_id=sample_user.id, title='New').one().serial_number == 3
+
+    def test_subdomain_candidates_checked_in_one_query(self, app, db_session, assert_max_queries):
+        from app.utils.subdomain_utils import generate_unique_subdomain
+        for serial, subdomain in enumerate(['jane', 'jane1', 'jane2'], start=1):
+            db_session.add(UserSite(user_id=1, resume_serial=serial, subdomain=subdomain, html_content=''))
+        db_session.commit()
+
+        with assert_max_queries(1):
+            assert generate_unique_subdomain(1, 'Jane') == 'jane3'
+
+    def test_authenticated_admin_found_in_one_query(self, app, db_session, assert_max_queries):
+        from app.services.google_drive_admin_service import GoogleDriveAdminService
+        now = datetime.utcnow()
+        admins = [User(username=f"admin{i}", email=f"admin{i}@test.com", password='x', is_admin=True,
+                       created_at=now, updated_at=now) for i in range(3)]
+        db_session.add_all(admins)
+        db_session.flush()
+        db_session.add(GoogleAuth(user_id=admins[2].id, access_token='a', refresh_token='r', token_expires_at=now,
+                                  scope='drive', is_active=True))
+        db_session.commit()
+
+        service = GoogleDriveAdminService()
+        with assert_max_queries(1):
+            status = service.check_admin_auth_status()
+        assert status['admin_user_id'] == admins[2].id
@@ -0,0 +1,126 @@
+"""
+Test suite for the GCRA rate limiter and its backends
+"""
+
+import json
+import sqlite3
+import threading
+import pytest
+
+from app.utils.rate_limiter import (
+    MemoryBackend, RateLimitPolicy, RateLimiter, SQLiteBackend, gcra, load_policies
+)
+
+
+def _limiter(backend, limit=3, period=60):
+    return RateLimiter(backend, policies={'test': RateLimitPolicy('test', limit, period)})
+
+
+class TestGCRA:
+    """Tests for the limiting algorithm"""
+
+    def test_burst_then_refill(self):
+        tat = None
+        for _ in range(3):
+            allowed, tat, _ = gcra(tat, 1000.0, limit=3, period=60)
+            assert allowed
+
+        allowed, _, retry_after = gcra(tat, 1000.0, limit=3, period=60)
+        assert not allowed and retry_after == pytest.approx(20.0)
+
+        # One request's worth of capacity returns every period / limit seconds
+        assert gcra(tat, 1020.0, limit=3, period=60)[0] is True
+
+    @pytest.mark.parametrize('make_backend', [
+        lambda tmp_path: MemoryBackend(),
+        lambda tmp_path: SQLiteBackend(str(tmp_path / 'limits.db'))
+    ])
+    def test_backends_enforce_limit_per_identity(self, tmp_path, make_backend):
+        limiter = _limiter(make_backend(tmp_path))
+
+        results = [limiter.hit('test', 'user:1', now=1000.0) for _ in range(4)]
+        assert [result.allowed for result in results] == [True, True, True, False]
+        assert [result.remaining for result in results[:3]] == [2, 1, 0]
+        assert results[3].retry_after == pytest.approx(20.0)
+
+        assert limiter.hit('test', 'user:2', now=1000.0).allowed is True
+
+    def test_sqlite_backend_is_shared_between_instances(self, tmp_path):
+        path = str(tmp_path / 'limits.db')
+        first, second = _limiter(SQLiteBackend(path), limit=2), _limiter(SQLiteBackend(path), limit=2)
+
+        assert first.hit('test', 'ip:1.2.3.4', now=1000.0).allowed
+        assert second.hit('test', 'ip:1.2.3.4', now=1000.0).allowed
+        assert first.hit('test', 'ip:1.2.3.4', now=1000.0).allowed is False
+
+    def test_sqlite_backend_keeps_one_connection_per_thread(self, tmp_path, monkeypatch):
+        limiter = _limiter(SQLiteBackend(str(tmp_path / 'limits.db')), limit=100)
+        opened = []
+        connect = sqlite3.connect
+        monkeypatch.setattr(sqlite3, 'connect', lambda *args, **kwargs: opened.append(1) or connect(*args, **kwargs))
+        barrier = threading.Barrier(4)
+
+        def hit_repeatedly(index):
+            for _ in range(5):
+                limiter.hit('test', f'user:{index}', now=1000.0)
+                barrier.wait()
+
+        threads = [threading.Thread(target=hit_repeatedly, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(opened) == 4
+
+    def test_memory_backend_evicts_expired_keys(self):
+        backend = MemoryBackend(sweep_every=10)
+        limiter = _limiter(backend)
+        for user_id in range(9):
+            limiter.hit('test', f'user:{user_id}', now=1000.0)
+        assert len(backend) == 9
+
+        limiter.hit('test', 'user:new', now=5000.0)
+        assert len(backend) == 1
+
+    def test_policies_overridden_from_environment(self, monkeypatch):
+        monkeypatch.setenv('RATE_LIMITS', json.dumps({'ai': {'limit': 100}, 'search': {'period': 10}}))
+        policies = load_policies()
+
+        assert (policies['ai'].limit, policies['ai'].period) == (100, 60)
+        assert (policies['search'].limit, policies['search'].period) == (60, 10)
+
+
+class TestRateLimitedEndpoints:
+    """Tests for the route decorator"""
+
+    def test_site_generation_returns_retry_after(self, client, auth_headers, monkeypatch):
+        from app.utils import rate_limiter
+
+        monkeypatch.setattr(rate_limiter, '_default_limiter', RateLimiter(
+            MemoryBackend(), policies={'site_generation': RateLimitPolicy('site_generation', 1, 60)}
+        ))
+
+        first = client.get('/web/generate_personal_site/1', headers=auth_headers)
+        second = client.get('/web/generate_personal_site/1', headers=auth_headers)
+
+        assert first.status_code != 429
+        assert first.headers['X-RateLimit-Limit'] == '1'
+        assert second.status_code == 429
+        assert int(second.headers['Retry-After']) == 60
+        assert second.get_json()['retry_after'] == 60
+
+    def test_anonymous_clients_behind_proxy_get_own_buckets(self, monkeypatch):
+        from app import create_app
+        from app.utils import rate_limiter
+
+        monkeypatch.setattr(rate_limiter, '_default_limiter', _limiter(MemoryBackend(), limit=1))
+        app = create_app(config={'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+                                 'PROXY_FIX_X_FOR': 1})
+        app.add_url_rule('/limited', 'limited', rate_limiter.rate_limited('test')(lambda: 'ok'))
+        client = app.test_client()
+
+        def get(address):
+            return client.get('/limited', headers={'X-Forwarded-For': address}).status_code
+
+        assert [get('203.0.113.1'), get('203.0.113.2'), get('203.0.113.1')] == [200, 200, 429]
@@ -0,0 +1,145 @@
+"""
+Test suite for read-replica routing: replica reads, read-your-writes and
+fallback to the primary
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from app import create_app
+from app.extensions import db
+from app.models.temp import Resume, User
+from app.utils.jwt_utils import generate_token
+from app.utils.metrics import DB_REPLICA_REQUESTS
+from app.utils.read_replica import MemoryWriteTracker, ReplicaRouter, SQLiteWriteTracker
+
+
+class TestReplicaRouter:
+    """Tests for the routing decision"""
+
+    def test_recent_write_keeps_user_on_primary(self):
+        router = ReplicaRouter(tracker=MemoryWriteTracker(), read_your_writes_seconds=5, retry_seconds=30)
+        router.record_write(7, now=100.0)
+
+        assert router.route(7, now=103.0) == 'primary_recent_write'
+        assert router.route(7, now=106.0) == 'replica'
+        assert router.route(8, now=103.0) == 'replica'
+
+    def test_replica_skipped_after_failure(self):
+        router = ReplicaRouter(tracker=MemoryWriteTracker(), read_your_writes_seconds=5, retry_seconds=30)
+        router.mark_down('connection refused')
+
+        assert router.route(1) == 'primary_unavailable'
+        assert router.status()['available'] is False
+
+    def test_sqlite_tracker_is_shared_between_processes(self, tmp_path):
+        path = str(tmp_path / 'writes.db')
+        SQLiteWriteTracker(path).record(3, 100.0, keep_seconds=5)
+
+        assert SQLiteWriteTracker(path).last_write(3) == 100.0
+
+    def test_sqlite_tracker_keeps_connections_until_fork(self, tmp_path, monkeypatch):
+        tracker = SQLiteWriteTracker(str(tmp_path / 'writes.db'))
+        opened = []
+        connect = sqlite3.connect
+        monkeypatch.setattr(sqlite3, 'connect', lambda *args, **kwargs: opened.append(1) or connect(*args, **kwargs))
+        barrier = threading.Barrier(3)
+
+        def write_repeatedly(user_id):
+            for step in range(5):
+                tracker.record(user_id, 100.0 + step, keep_seconds=5)
+                barrier.wait()
+
+        threads = [threading.Thread(target=write_repeatedly, args=(user_id,)) for user_id in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(opened) == 3
+
+        # A forked child opens its own connection
+        monkeypatch.setattr(os, 'getpid', lambda: -1)
+        assert tracker.last_write(2) == 104.0
+        assert len(opened) == 4
+
+
+@pytest.fixture
+def replica_app(tmp_path):
+    """App with a primary and a replica SQLite database, both seeded with one user"""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'primary.db'}",
+        'DATABASE_REPLICA_URL': f"sqlite:///{tmp_path / 'replica.db'}"
+    })
+    with app.app_context():
+        replica = app.extensions['read_replica'].engine
+        db.create_all()
+        db.metadata.create_all(replica)
+        for engine in (db.engine, replica):
+            with engine.begin() as conn:
+                conn.execute(User.__table__.insert().values(
+                    id=1, username='replica_user', email='replica@test.com', password='x',
+                    first_name='Replica', last_name='User', created_at=datetime.utcnow(), updated_at=datetime.utcnow()
+                ))
+        # The replica has not caught up with the primary's newest resume yet
+        _add_resume(db.engine, 1, 'Primary resume')
+        _add_resume(replica, 2, 'Replica resume')
+        yield app
+        db.session.remove()
+    replica.dispose()
+
+
+def _add_resume(engine, serial_number, title):
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(Resume.__table__.insert().values(
+            user_id=1, serial_number=serial_number, title=title, parsed_resume={},
+            created_at=now, updated_at=now
+        ))
+
+
+def _resume_titles(app):
+    with app.app_context():
+        headers = {'Authorization': f"Bearer {generate_token(1, 'replica@test.com')}"}
+    response = app.test_client().get('/api/get_resume_list', headers=headers)
+    assert response.status_code == 200
+    return [resume['resume_title'] for resume in response.get_json()['data']]
+
+
+class TestReadReplicaEndpoints:
+    """Tests for endpoints decorated with read_replica"""
+
+    def test_reads_go_to_replica(self, replica_app):
+        replicas = DB_REPLICA_REQUESTS.value(route='replica')
+
+        assert _resume_titles(replica_app) == ['Replica resume']
+        assert DB_REPLICA_REQUESTS.value(route='replica') == replicas + 1
+
+    def test_own_write_is_read_from_primary(self, replica_app):
+        with replica_app.test_request_context():
+            from flask import request
+            request.user = {'user_id': 1}
+            db.session.add(Resume(user_id=1, serial_number=3, title='Just saved', parsed_resume={},
+                                  created_at=datetime.utcnow(), updated_at=datetime.utcnow()))
+            db.session.commit()
+
+        assert _resume_titles(replica_app) == ['Primary resume', 'Just saved']
+
+    def test_falls_back_to_primary_when_replica_fails(self, replica_app):
+        with replica_app.extensions['read_replica'].engine.begin() as conn:
+            conn.execute(text('DROP TABLE resumes'))
+        fallbacks = DB_REPLICA_REQUESTS.value(route='fallback')
+
+        assert _resume_titles(replica_app) == ['Primary resume']
+        assert DB_REPLICA_REQUESTS.value(route='fallback') == fallbacks + 1
+        assert replica_app.extensions['read_replica'].available is False
+        # Skipped until the retry interval has passed
+        assert _resume_titles(replica_app) == ['Primary resume']
+
+    def test_no_replica_configured(self, app):
+        assert 'read_replica' not in app.extensions
@@ -0,0 +1,116 @@
+"""
+Test suite for the local ResumeScorer
+"""
+
+import copy
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.services.resume_scorer import ResumeScorer, score_resume_locally
+
+
+SAMPLE_RESUME = {
+    'userInfo': {
+        'firstName': 'Ada',
+        'lastName': 'Lovelace',
+        'email': 'ada@example.com',
+        'phoneNumber': '555-0100'
+    },
+    'summary': 'Backend engineer focused on Python services and data pipelines.',
+    'workExperience': [
+        {
+            'companyName': 'Analytical Engines',
+            'jobTitle': 'Senior Engineer',
+            'fromDate': '2021-03',
+            'toDate': '',
+            'isPresent': True,
+            'description': 'Built Flask APIs on PostgreSQL. Reduced latency by 40% with Redis caching.'
+        },
+        {
+            'companyName': 'Difference Co',
+            'jobTitle': 'Engineer',
+            'fromDate': '2018-01',
+            'toDate': '2021-02',
+            'description': 'Developed Docker based deployment tooling.'
+        }
+    ],
+    'education': [{'institutionName': 'University of London', 'degree': 'Bachelor',
+                   'fieldOfStudy': 'Computer Science', 'fromDate': '2014-09', 'toDate': '2018-06'}],
+    'skills': ['Python', 'Flask', 'PostgreSQL', 'Redis', 'Docker']
+}
+
+JOB_DESCRIPTION = 'Looking for a Python engineer with Flask, Kubernetes and PostgreSQL experience.'
+
+
+class TestResumeScorer:
+    """Tests for deterministic scoring"""
+
+    def test_keyword_matching_against_job_description(self):
+        score, details = ResumeScorer().keyword_matching(SAMPLE_RESUME, JOB_DESCRIPTION)
+
+        assert {'python', 'flask', 'postgresql'} <= set(details['matched_keywords'])
+        assert 'kubernetes' in details['missing_keywords']
+        assert 0 < score < 100
+
+    def test_keyword_matching_without_job_description(self):
+        score, details = ResumeScorer().keyword_matching(SAMPLE_RESUME)
+
+        assert 'python' in details['matched_keywords']
+        assert details['missing_keywords'] == []
+        assert score > 0
+
+    def test_ats_readability_rewards_complete_structure(self):
+        complete, _ = ResumeScorer().ats_readability(SAMPLE_RESUME)
+
+        broken = copy.deepcopy(SAMPLE_RESUME)
+        broken['userInfo']['email'] = 'not-an-email'
+        broken['workExperience'][0]['fromDate'] = 'March 2021'
+        del broken['skills']
+        degraded, details = ResumeScorer().ats_readability(broken)
+
+        assert complete > degraded
+        assert 'skills' in details['comment']
+
+    def test_score_is_deterministic_and_weighted(self):
+        first = score_resume_locally(SAMPLE_RESUME, JOB_DESCRIPTION)
+        second = score_resume_locally(SAMPLE_RESUME, JOB_DESCRIPTION)
+
+        assert first == second
+        scores = first['scores']
+        expected = sum(section['score'] * section['weight'] for section in scores.values())
+        assert first['overall_score'] == round(expected, 1)
+        assert scores['language_expression']['details']['action_verbs_usage'] == 100
+
+
+class TestScoreEndpoint:
+    """Tests for /api/resume/score modes"""
+
+    def test_fast_mode_makes_no_ai_call(self, client):
+        with patch('app.api.resume_ai_endpoints.ResumeAI') as resume_ai:
+            response = client.post('/api/resume/score', json={
+                'resume': SAMPLE_RESUME, 'job_description': JOB_DESCRIPTION, 'mode': 'fast'
+            })
+
+        assert response.status_code == 200
+        assert response.get_json()['data']['scoring_mode'] == 'fast'
+        resume_ai.assert_not_called()
+
+    def test_full_mode_only_asks_ai_for_language(self):
+        review = ('{"language_expression": {"grammar_quality": 90, "professional_tone": 80, '
+                  '"clarity": 70, "action_verbs_usage": 60, "comment": "ok"}, '
+                  '"recommendations": ["Quantify impact"], "strengths": [], "weaknesses": []}')
+        with patch('app.services.resume_ai.OpenAI') as openai_client:
+            completion = MagicMock()
+            completion.choices[0].message.content = review
+            openai_client.return_value.chat.completions.create.return_value = completion
+
+            from app.services.resume_ai import ResumeAI
+            processor = ResumeAI('')
+            processor.parsed_resume = SAMPLE_RESUME
+            result = processor.score_resume(JOB_DESCRIPTION)
+
+        local = score_resume_locally(SAMPLE_RESUME, JOB_DESCRIPTION)
+        assert result['scores']['language_expression']['score'] == 75
+        assert result['scores']['keyword_matching'] == local['scores']['keyword_matching']
+        assert result['recommendations'] == ['Quantify impact']
+        assert result['scoring_mode'] == 'full'
@@ -0,0 +1,175 @@
+"""
+Test suite for ResumeSearchService (local FTS5 backend)
+"""
+
+import pytest
+from datetime import datetime
+
+from app.extensions import db
+from app.models.temp import Resume, ResumeFile
+from app.services.resume_search_service import (
+    LocalSearchIndex, ResumeSearchService, flatten_json_text, get_search_service, query_terms
+)
+
+
+def _make_file(user_id, name, text, keywords=None):
+    resume_file = ResumeFile(
+        user_id=user_id,
+        original_filename=name,
+        stored_filename=f'stored_{name}',
+        file_size=1024,
+        mime_type='application/pdf',
+        storage_type='local',
+        file_path=f'/tmp/{name}',
+        file_hash=f'hash_{name}',
+        extracted_text=text,
+        keywords=keywords or [],
+        processing_status='completed',
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow()
+    )
+    db.session.add(resume_file)
+    db.session.commit()
+    return resume_file
+
+
+class TestSearchHelpers:
+    """Tests for query parsing and document flattening"""
+
+    def test_query_terms_keeps_skill_tokens(self):
+        assert query_terms('C++ and c# "node.js"') == ['C++', 'and', 'c#', 'node.js']
+
+    def test_flatten_json_text(self):
+        text = flatten_json_text({'skills': ['Python', 'Go'], 'workExperience': [{'jobTitle': 'SRE'}]})
+        assert 'Python' in text and 'Go' in text and 'SRE' in text
+
+
+class TestLocalSearchIndex:
+    """Tests for the SQLite FTS5 inverted index"""
+
+    def _doc(self, key, user_id, title, body, keywords=''):
+        doc_type, ref = key.split(':')
+        return {'doc_key': key, 'doc_type': doc_type, 'doc_ref': ref,
+                'user_id': user_id, 'title': title, 'body': body, 'keywords': keywords}
+
+    def test_ranks_and_highlights(self):
+        index = LocalSearchIndex()
+        index.upsert([
+            self._doc('file:1', 1, 'a.pdf', 'Kubernetes operator with Kubernetes clusters'),
+            self._doc('file:2', 1, 'b.pdf', 'Java developer, some Kubernetes'),
+            self._doc('file:3', 2, 'c.pdf', 'Kubernetes expert'),
+        ])
+
+        found = index.search(1, ['kubernetes'], 'all', 10, 0)
+
+        assert found['total'] == 2
+        assert [row['id'] for row in found['results']] == [1, 2]
+        assert '<mark>Kubernetes</mark>' in found['results'][0]['highlight']
+
+    def test_incremental_replace_and_delete(self):
+        index = LocalSearchIndex()
+        index.upsert([self._doc('file:1', 1, 'a.pdf', 'Python')])
+        index.upsert([self._doc('file:1', 1, 'a.pdf', 'Rust')])
+
+        assert index.search(1, ['python'], 'all', 10, 0)['total'] == 0
+        assert index.search(1, ['rust'], 'all', 10, 0)['total'] == 1
+
+        index.delete(['file:1'])
+        assert index.search(1, ['rust'], 'all', 10, 0)['total'] == 0
+
+    def test_prefix_and_operator_characters(self):
+        index = LocalSearchIndex()
+        index.upsert([self._doc('file:1', 1, 'a.pdf', 'PostgreSQL administration')])
+
+        assert index.search(1, ['postgre'], 'all', 10, 0)['total'] == 1
+        assert index.search(1, ['NOT', '"'], 'all', 10, 0)['total'] == 0
+
+
+class TestSearchIndexMaintenance:
+    """Index updates driven by session commits"""
+
+    def test_upload_process_and_delete_update_index(self, app, db_session, sample_user):
+        with app.app_context():
+            search_service = get_search_service()
+            assert isinstance(search_service, ResumeSearchService)
+
+            def matching(query, include_deleted=False):
+                files = ResumeFile.query.filter(search_service.file_id_filter(sample_user.id, query))
+                if not include_deleted:
+                    files = files.filter(ResumeFile.is_active == True)
+                return [resume_file.id for resume_file in files]
+
+            resume_file = _make_file(sample_user.id, 'devops.pdf', 'Terraform and Ansible automation', ['terraform'])
+            assert matching('terraform') == [resume_file.id]
+
+            resume_file.extracted_text = 'Golang microservices'
+            db.session.commit()
+            assert matching('ansible') == []
+            assert matching('golang') == [resume_file.id]
+
+            # Soft-deleted files stay indexed: the caller decides whether to show them
+            resume_file.soft_delete(sample_user.id)
+            db.session.commit()
+            assert matching('golang') == []
+            assert matching('golang', include_deleted=True) == [resume_file.id]
+            assert search_service.search(sample_user.id, 'golang', 'file')['total'] == 0
+
+    def test_parsed_resumes_are_searchable(self, app, db_session, sample_user):
+        with app.app_context():
+            db.session.add(Resume(
+                user_id=sample_user.id,
+                serial_number=7,
+                title='Platform Resume',
+                parsed_resume={'skills': ['Kafka', 'Spark']},
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow()
+            ))
+            db.session.commit()
+
+            found = get_search_service().search(sample_user.id, 'kafka', 'resume')
+            assert found['total'] == 1
+            assert found['results'][0]['id'] == 7
+
+    def test_search_endpoint(self, app, client, auth_headers, sample_user):
+        with app.app_context():
+            _make_file(sample_user.id, 'data.pdf', 'Airflow pipelines and dbt models')
+
+            response = client.get('/api/search?q=airflow', headers=auth_headers)
+            data = response.get_json()
+
+            assert response.status_code == 200
+            assert data['total'] == 1
+            assert data['results'][0]['type'] == 'file'
+
+            response = client.get('/api/search', headers=auth_headers)
+            assert response.status_code == 400
+
+    def test_file_listing_content_search_reaches_every_page(self, app, client, auth_headers, sample_user):
+        with app.app_context():
+            db.session.add_all([ResumeFile(
+                user_id=sample_user.id, original_filename=f'cv_{index}.pdf', stored_filename=f'stored_cv_{index}.pdf',
+                file_size=1024, mime_type='application/pdf', storage_type='local', file_path=f'/tmp/cv_{index}.pdf',
+                file_hash=f'hash_cv_{index}', extracted_text='Spark streaming' if index else 'Java only',
+                processing_status='completed'
+            ) for index in range(1006)])
+            db.session.commit()
+
+            response = client.get('/api/files?search=spark&search_mode=content&limit=100&page=11',
+                                  headers=auth_headers)
+            data = response.get_json()
+
+            assert response.status_code == 200
+            assert (data['total'], len(data['files']), data['has_next']) == (1005, 5, False)
+
+    def test_file_listing_content_search_includes_deleted_on_request(self, app, client, auth_headers, sample_user):
+        with app.app_context():
+            resume_file = _make_file(sample_user.id, 'old.pdf', 'Cobol mainframe batch jobs')
+            resume_file.soft_delete(sample_user.id)
+            db.session.commit()
+
+            response = client.get('/api/files?search=cobol&search_mode=content', headers=auth_headers)
+            assert response.get_json()['total'] == 0
+
+            response = client.get('/api/files?search=cobol&search_mode=content&include_deleted=true',
+                                  headers=auth_headers)
+            assert [f['id'] for f in response.get_json()['files']] == [resume_file.id]
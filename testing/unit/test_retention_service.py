@@ -0,0 +1,149 @@
+"""
+Test suite for the retention sweeper: expired soft-deleted files, orphaned
+stored files and orphaned thumbnails
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.temp import ResumeFile
+from app.services.retention_service import RetentionSweeper
+from app.utils.metrics import RETENTION_RECLAIMED_BYTES
+
+
+def _add_file(db_session, user_id, path, deleted_days_ago=None):
+    with open(path, 'wb') as f:
+        f.write(b'x' * 100)
+    resume_file = ResumeFile(
+        user_id=user_id,
+        original_filename=os.path.basename(path),
+        stored_filename=os.path.basename(path),
+        file_path=str(path),
+        file_size=100,
+        mime_type='application/pdf',
+        storage_type='local',
+        file_hash=os.path.basename(path),
+        is_active=deleted_days_ago is None,
+        deleted_at=None if deleted_days_ago is None else datetime.utcnow() - timedelta(days=deleted_days_ago)
+    )
+    db_session.add(resume_file)
+    db_session.commit()
+    return resume_file.id
+
+
+def _make_old(path, hours=48):
+    past = time.time() - hours * 3600
+    os.utime(path, (past, past))
+
+
+@pytest.fixture
+def storage(app, tmp_path, monkeypatch):
+    """Local storage root and upload folder inside tmp_path"""
+    root = tmp_path / 'files'
+    thumbnails = tmp_path / 'uploads' / 'thumbnails'
+    root.mkdir()
+    thumbnails.mkdir(parents=True)
+    monkeypatch.setenv('FILE_STORAGE_TYPE', 'local')
+    monkeypatch.setenv('LOCAL_STORAGE_PATH', str(root))
+    monkeypatch.setitem(app.config, 'UPLOAD_FOLDER', str(tmp_path / 'uploads'))
+    return root, thumbnails
+
+
+class TestPurgeExpired:
+    """Tests for removing files past their retention period"""
+
+    def test_expired_files_removed_in_batches(self, app, db_session, sample_user, storage):
+        root, thumbnails = storage
+        expired_ids = [_add_file(db_session, sample_user.id, root / f"old_{i}.pdf", deleted_days_ago=40)
+                       for i in range(5)]
+        recent_id = _add_file(db_session, sample_user.id, root / 'recent.pdf', deleted_days_ago=5)
+        live_id = _add_file(db_session, sample_user.id, root / 'live.pdf')
+        (thumbnails / f"{expired_ids[0]}.jpg").write_bytes(b'y' * 10)
+        reclaimed_before = RETENTION_RECLAIMED_BYTES.value(kind='expired_file')
+
+        sweeper = RetentionSweeper(retention_days=30, batch_size=2, batch_pause_seconds=0)
+        report = sweeper.purge_expired()
+
+        assert (report['files'], report['batches'], report['bytes']) == (5, 3, 510)
+        assert RETENTION_RECLAIMED_BYTES.value(kind='expired_file') - reclaimed_before == 500
+        assert {f.id for f in ResumeFile.query} == {recent_id, live_id}
+        assert sorted(p.name for p in root.iterdir()) == ['live.pdf', 'recent.pdf']
+        assert list(thumbnails.iterdir()) == []
+
+    def test_batches_per_sweep_are_capped(self, app, db_session, sample_user, storage):
+        root, _ = storage
+        for i in range(5):
+            _add_file(db_session, sample_user.id, root / f"old_{i}.pdf", deleted_days_ago=40)
+
+        report = RetentionSweeper(retention_days=30, batch_size=2, batch_pause_seconds=0, max_batches=1).purge_expired()
+
+        assert report['files'] == 2
+        assert ResumeFile.query.count() == 3
+
+    def test_dry_run_changes_nothing(self, app, db_session, sample_user, storage):
+        root, _ = storage
+        _add_file(db_session, sample_user.id, root / 'old.pdf', deleted_days_ago=40)
+
+        report = RetentionSweeper(retention_days=30).purge_expired(dry_run=True)
+
+        assert (report['files'], report['bytes']) == (1, 100)
+        assert ResumeFile.query.count() == 1
+        assert (root / 'old.pdf').exists()
+
+
+class TestOrphans:
+    """Tests for unreferenced local files and thumbnails"""
+
+    def test_only_old_unreferenced_files_removed(self, app, db_session, sample_user, storage):
+        root, thumbnails = storage
+        file_id = _add_file(db_session, sample_user.id, root / 'kept.pdf')
+        (root / 'users' / '1').mkdir(parents=True)
+        orphan = root / 'users' / '1' / 'orphan.pdf'
+        orphan.write_bytes(b'z' * 30)
+        fresh = root / 'fresh.pdf'
+        fresh.write_bytes(b'z')
+        (thumbnails / f"{file_id}.jpg").write_bytes(b't')
+        (thumbnails / '999999.jpg').write_bytes(b't' * 7)
+        (thumbnails / 'notes.txt').write_bytes(b'n')
+        for path in [root / 'kept.pdf', orphan, thumbnails / f"{file_id}.jpg", thumbnails / '999999.jpg',
+                     thumbnails / 'notes.txt']:
+            _make_old(path)
+
+        report = RetentionSweeper(batch_pause_seconds=0).sweep_orphans()
+
+        assert (report['found'], report['files'], report['bytes']) == (2, 2, 37)
+        assert not orphan.exists() and not (thumbnails / '999999.jpg').exists()
+        assert (root / 'kept.pdf').exists() and fresh.exists()
+        assert sorted(p.name for p in thumbnails.iterdir()) == [f"{file_id}.jpg", 'notes.txt']
+
+
+class TestSectionCacheEviction:
+    """Tests for evicting section cache entries by last use"""
+
+    def test_unused_entries_evicted_in_batches(self, app, db_session):
+        from app.models.temp import OptimizedSection
+
+        now = datetime.utcnow()
+        for i, days in enumerate([200, 120, 100, 10]):
+            db_session.add(OptimizedSection(fingerprint=f"{i:064d}", section='summary', optimized_value='x',
+                                            created_at=now - timedelta(days=300), last_used_at=now - timedelta(days=days)))
+        db_session.commit()
+
+        sweeper = RetentionSweeper(section_cache_max_age_days=90, batch_size=2, batch_pause_seconds=0,
+                                   scan_orphans=False)
+        assert sweeper.prune_section_cache(dry_run=True)['entries'] == 3
+        report = sweeper.run()
+
+        assert (report['section_cache']['entries'], report['section_cache']['batches']) == (3, 2)
+        assert [row.fingerprint for row in OptimizedSection.query] == [f"{3:064d}"]
+
+
+class TestRetentionEndpoint:
+    """Tests for POST /api/admin/files/retention/sweep"""
+
+    def test_requires_admin(self, client, auth_headers):
+        response = client.post('/api/admin/files/retention/sweep', headers=auth_headers, json={'dry_run': True})
+        assert response.status_code == 403
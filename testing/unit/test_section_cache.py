@@ -0,0 +1,52 @@
+"""
+Test suite for the section cache's transaction handling
+"""
+
+from unittest.mock import patch
+
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.temp import OptimizedSection
+from app.services.section_cache import SectionCache
+
+
+class TestSectionCache:
+    """The cache must never commit or roll back the caller's session"""
+
+    def test_hits_are_counted_without_touching_the_session(self, app, db_session, assert_max_queries):
+        cache = SectionCache()
+        cache.store_many({'a' * 64: {'section': 'summary', 'value': 'Tailored.'},
+                          'b' * 64: {'section': 'skills', 'value': ['Python']}})
+
+        with patch.object(db.session, 'commit') as commit, patch.object(db.session, 'rollback') as rollback, \
+                assert_max_queries(2):
+            hits = cache.lookup_many(['a' * 64, 'b' * 64, 'c' * 64])
+
+        assert hits == {'a' * 64: 'Tailored.', 'b' * 64: ['Python']}
+        commit.assert_not_called()
+        rollback.assert_not_called()
+        db.session.expire_all()
+        assert sorted(row.hit_count for row in OptimizedSection.query) == [1, 1]
+
+    def test_store_race_keeps_the_session_and_stores_the_rest(self, app, db_session):
+        cache = SectionCache()
+        execute = Connection.execute
+        raced = []
+
+        def racing_execute(connection, statement, *args, **kwargs):
+            # A concurrent worker inserts the first fingerprint just before us
+            if getattr(statement, 'is_insert', False) and not raced:
+                raced.append(1)
+                execute(connection, statement, args[0][:1])
+                raise IntegrityError('INSERT', {}, Exception('UNIQUE constraint failed'))
+            return execute(connection, statement, *args, **kwargs)
+
+        with patch.object(db.session, 'rollback') as rollback, patch.object(Connection, 'execute', racing_execute):
+            cache.store_many({'a' * 64: {'section': 'summary', 'value': 'A'},
+                              'b' * 64: {'section': 'summary', 'value': 'B'}})
+
+        assert raced == [1]
+        rollback.assert_not_called()
+        assert sorted(row.optimized_value for row in OptimizedSection.query) == ['A', 'B']
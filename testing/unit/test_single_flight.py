@@ -0,0 +1,201 @@
+"""
+Test suite for single-flight request coalescing
+"""
+
+import os
+import json
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.response_template.resume_schema import RESUME_TEMPLATE
+from app.services.single_flight import SingleFlight, content_key
+
+
+def _run_concurrently(count, target):
+    results, errors = [None] * count, [None] * count
+
+    def worker(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            errors[index] = e
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+class TestSingleFlight:
+    """Tests for in-process and cross-process coalescing"""
+
+    def test_content_key_is_order_independent(self):
+        assert content_key('op', {'a': 1, 'b': 2}) == content_key('op', {'b': 2, 'a': 1})
+        assert content_key('op', {'a': 1}) != content_key('other', {'a': 1})
+
+    def test_concurrent_callers_share_one_execution(self, tmp_path):
+        flight = SingleFlight(lock_dir=str(tmp_path))
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.2)
+            return {'value': 42}
+
+        results, errors = _run_concurrently(5, lambda: flight.do('key', slow))
+
+        assert len(calls) == 1
+        assert results == [{'value': 42}] * 5
+        assert errors == [None] * 5
+        assert flight.stats['coalesced'] == 4
+
+    def test_followers_receive_leader_exception(self, tmp_path):
+        flight = SingleFlight(lock_dir=str(tmp_path))
+
+        def failing():
+            time.sleep(0.2)
+            raise ValueError('upstream failed')
+
+        _, errors = _run_concurrently(3, lambda: flight.do('key', failing))
+
+        assert all(isinstance(error, ValueError) for error in errors)
+        assert flight.stats['executed'] == 1
+
+    def test_sequential_calls_are_not_cached(self, tmp_path):
+        flight = SingleFlight(lock_dir=str(tmp_path))
+
+        assert flight.do('key', lambda: 1) == 1
+        assert flight.do('key', lambda: 2) == 2
+
+    @pytest.mark.skipif(not SingleFlight().cross_process, reason='flock not available')
+    def test_cross_process_result_is_reused(self, tmp_path):
+        # Separate instances behave like separate workers sharing the lock directory
+        first, second = SingleFlight(lock_dir=str(tmp_path)), SingleFlight(lock_dir=str(tmp_path))
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.3)
+            return ['parsed']
+
+        leader = threading.Thread(target=lambda: first.do('key', slow))
+        leader.start()
+        time.sleep(0.1)
+        assert second.do('key', slow) == ['parsed']
+        leader.join()
+
+        assert len(calls) == 1
+        assert second.stats['cross_process_reused'] == 1
+
+
+    @pytest.mark.skipif(not SingleFlight().cross_process, reason='flock not available')
+    def test_shared_results_are_private_and_removed_after_reading(self, tmp_path):
+        lock_dir = tmp_path / 'flight'
+        first, second = SingleFlight(lock_dir=str(lock_dir)), SingleFlight(lock_dir=str(lock_dir))
+        written_modes = []
+        write_result = SingleFlight._write_result
+
+        def recording_write(path, result):
+            write_result(path, result)
+            written_modes.append(os.stat(path).st_mode & 0o777)
+
+        def slow():
+            time.sleep(0.3)
+            return {'firstName': 'Ada'}
+
+        with patch.object(SingleFlight, '_write_result', staticmethod(recording_write)):
+            leader = threading.Thread(target=lambda: first.do('key', slow))
+            leader.start()
+            time.sleep(0.1)
+            assert second.do('key', slow) == {'firstName': 'Ada'}
+            leader.join()
+            # Without waiters the leader removes its own result
+            assert first.do('other', lambda: {'firstName': 'Grace'}) == {'firstName': 'Grace'}
+
+        assert second.stats['cross_process_reused'] == 1
+        assert written_modes == [0o600, 0o600]
+        assert os.stat(lock_dir).st_mode & 0o777 == 0o700
+        assert not list(lock_dir.glob('*.result*'))
+        assert {os.stat(path).st_mode & 0o777 for path in lock_dir.iterdir()} == {0o600}
+
+    def test_follower_runs_the_call_when_the_leader_hangs(self, tmp_path):
+        flight = SingleFlight(lock_dir=str(tmp_path), wait_seconds=0.1)
+        release = threading.Event()
+
+        leader = threading.Thread(target=lambda: flight.do('key', lambda: release.wait(5) and 'leader'))
+        leader.start()
+        time.sleep(0.05)
+        assert flight.do('key', lambda: 'follower') == 'follower'
+        release.set()
+        leader.join()
+
+        assert flight.stats['wait_timeouts'] == 1
+
+    @pytest.mark.skipif(not SingleFlight().cross_process, reason='flock not available')
+    def test_cross_process_wait_is_bounded(self, tmp_path):
+        first = SingleFlight(lock_dir=str(tmp_path))
+        second = SingleFlight(lock_dir=str(tmp_path), wait_seconds=0.1)
+        release = threading.Event()
+
+        leader = threading.Thread(target=lambda: first.do('key', lambda: release.wait(5) and 'leader'))
+        leader.start()
+        time.sleep(0.05)
+        started = time.monotonic()
+        assert second.do('key', lambda: 'follower') == 'follower'
+        assert time.monotonic() - started < 1
+        release.set()
+        leader.join()
+
+        assert second.stats['wait_timeouts'] == 1
+
+    @pytest.mark.skipif(not SingleFlight().cross_process, reason='flock not available')
+    def test_loose_lock_directory_is_tightened(self, tmp_path):
+        lock_dir = tmp_path / 'flight'
+        lock_dir.mkdir(mode=0o777)
+        os.chmod(lock_dir, 0o777)
+
+        assert SingleFlight(lock_dir=str(lock_dir)).do('key', lambda: 1) == 1
+        assert os.stat(lock_dir).st_mode & 0o777 == 0o700
+
+
+class TestResumeAICoalescing:
+    """Duplicate ResumeAI calls share one API request"""
+
+    def test_concurrent_identical_parses(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('SINGLE_FLIGHT_DIR', str(tmp_path))
+        monkeypatch.setattr('app.services.single_flight._default_single_flight', None)
+
+        with patch('app.services.resume_ai.OpenAI') as openai_client:
+            create = openai_client.return_value.chat.completions.create
+
+            def slow_completion(**kwargs):
+                time.sleep(0.2)
+                completion = MagicMock()
+                completion.choices[0].message.content = json.dumps(dict(RESUME_TEMPLATE, userInfo={'firstName': 'Ada'}))
+                return completion
+            create.side_effect = slow_completion
+
+            from app.services.resume_ai import ResumeAI
+            results, errors = _run_concurrently(4, lambda: ResumeAI('Ada Lovelace resume').parse())
+
+        assert create.call_count == 1
+        assert errors == [None] * 4
+        assert all(result['userInfo']['firstName'] == 'Ada' for result in results)
+
+    def test_budget_is_checked_before_joining_a_call(self, monkeypatch):
+        from app.services.ai_usage import QuotaExceededError
+
+        ledger = MagicMock()
+        ledger.check_budget.side_effect = QuotaExceededError(7, 10, 5, 60)
+        monkeypatch.setattr('app.services.resume_ai.get_usage_ledger', lambda: ledger)
+
+        with patch('app.services.resume_ai.OpenAI'), patch('app.services.resume_ai.coalesce') as coalesce:
+            from app.services.resume_ai import ResumeAI
+            with pytest.raises(QuotaExceededError):
+                ResumeAI('Ada Lovelace resume').parse()
+
+        coalesce.assert_not_called()
@@ -0,0 +1,88 @@
+"""
+Test suite for application startup cost: deferred heavy imports and the
+cold-start import budget
+"""
+
+import os
+import sys
+import types
+from unittest.mock import patch
+
+import pytest
+
+from app.utils.lazy_import import LazyImport
+from app.utils.startup_profile import parse_importtime, profile_startup, summarize
+
+
+# Dependencies only needed by specific requests; importing any of them while
+# creating the app is a startup regression
+DEFERRED_MODULES = [
+    'openai', 'numpy', 'scipy', 'pypdf', 'docx', 'boto3', 'PIL.Image', 'pdf2image', 'bleach',
+    'googleapiclient.discovery', 'google_auth_oauthlib', 'google.oauth2.service_account'
+]
+
+
+class TestLazyImport:
+    """Tests for the deferred import stand-in"""
+
+    def test_imports_on_first_use(self, monkeypatch):
+        module = types.ModuleType('lazy_fixture_module')
+        module.answer = lambda: 42
+        monkeypatch.setitem(sys.modules, 'lazy_fixture_module', module)
+
+        answer = LazyImport('lazy_fixture_module', 'answer')
+        assert 'deferred' in repr(answer)
+        assert answer() == 42
+        assert 'loaded' in repr(answer)
+
+    def test_missing_module_is_falsy_and_raises_on_use(self):
+        missing = LazyImport('no_such_module_for_tests')
+        assert not missing
+        with pytest.raises(ImportError):
+            missing.anything
+
+    def test_fallback_module_used_when_first_is_missing(self):
+        path = LazyImport('no_such_module_for_tests', 'join', fallbacks=('os.path',))
+        assert path('a', 'b') == os.path.join('a', 'b')
+
+    def test_patching_through_the_stand_in(self):
+        lazy_os = LazyImport('os')
+        with patch.object(lazy_os, 'getcwd', return_value='/patched'):
+            assert os.getcwd() == '/patched'
+        assert os.getcwd() != '/patched'
+
+
+class TestImportTimeParsing:
+    """Tests for -X importtime parsing"""
+
+    def test_aggregates_per_package_and_app_module(self):
+        records = parse_importtime([
+            'import time: self [us] | cumulative | imported package',
+            'import time:       200 |        200 |     sqlalchemy.sql',
+            'import time:       300 |        500 |   sqlalchemy',
+            'import time:       100 |        600 | app.extensions',
+            'some other stderr line'
+        ])
+        summary = summarize(records)
+
+        assert [r.depth for r in records] == [2, 1, 0]
+        assert summary['total_ms'] == 0.6
+        assert summary['packages'][0] == {'name': 'sqlalchemy', 'ms': 0.5}
+        assert summary['app_modules'] == [{'name': 'app.extensions', 'ms': 0.6}]
+
+
+class TestColdStart:
+    """Cold create_app() in a fresh interpreter"""
+
+    @pytest.fixture(scope='class')
+    def cold_start(self):
+        return profile_startup("from app import create_app; create_app({'TESTING': True})")
+
+    def test_heavy_dependencies_are_not_imported(self, cold_start):
+        imported = [name for name in DEFERRED_MODULES if name in cold_start['modules']]
+        assert imported == []
+
+    def test_import_time_within_budget(self, cold_start):
+        # Generous by default so slow CI machines pass; tighten locally
+        budget_ms = float(os.getenv('STARTUP_IMPORT_BUDGET_MS', '5000'))
+        assert cold_start['total_ms'] < budget_ms
@@ -0,0 +1,91 @@
+"""
+Test suite for structured-output decoding and local JSON repair
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+from app.services.structured_output import (
+    StructuredOutputError, complete_json, decode_json, missing_fields, repair_json
+)
+
+
+def _completion(content):
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = content
+    return response
+
+
+def _client(*contents):
+    client = MagicMock()
+    client.chat.completions.create.side_effect = [_completion(content) for content in contents]
+    return client
+
+
+class TestDecodeJson:
+    """Tests for local repair of defective responses"""
+
+    def test_prose_and_code_fences_are_stripped(self):
+        content = 'Here is the result:\n```json\n{"name": "Ada", "skills": ["Python"]}\n```\nHope it helps!'
+        assert decode_json(content) == {'name': 'Ada', 'skills': ['Python']}
+
+    def test_trailing_commas_are_removed(self):
+        assert decode_json('{"a": [1, 2,], "b": "x, }",}') == {'a': [1, 2], 'b': 'x, }'}
+
+    def test_truncated_object_is_closed(self):
+        assert decode_json('{"summary": "Built APIs", "skills": ["Python", "Fla') == {
+            'summary': 'Built APIs', 'skills': ['Python', 'Fla']
+        }
+
+    def test_dangling_key_is_dropped(self):
+        assert decode_json('{"a": 1, "b": {"c": 2}, "d":') == {'a': 1, 'b': {'c': 2}}
+
+    def test_list_expectation(self):
+        assert decode_json('Skills: ["Python", "SQL",]', list) == ['Python', 'SQL']
+        with pytest.raises(StructuredOutputError):
+            decode_json('{"skills": []}', list)
+
+    def test_unrepairable_content_raises(self):
+        with pytest.raises(StructuredOutputError):
+            decode_json('no json here')
+        with pytest.raises(StructuredOutputError):
+            repair_json('{"a": tru e}')
+
+    def test_missing_fields_checks_top_level_only(self):
+        template = {'userInfo': {'firstName': ''}, 'skills': [], 'summary': ''}
+        assert missing_fields({'userInfo': {}, 'skills': []}, template) == ['summary']
+
+
+class TestCompleteJson:
+    """Tests for JSON-mode calls with local repair and filling"""
+
+    def test_repairable_response_needs_one_call(self):
+        client = _client('```json\n{"score": 80,}\n```')
+        assert complete_json(client, [{'role': 'user', 'content': 'Score it'}]) == {'score': 80}
+        assert client.chat.completions.create.call_count == 1
+        kwargs = client.chat.completions.create.call_args.kwargs
+        assert kwargs['response_format'] == {'type': 'json_object'}
+        # JSON mode needs the word "JSON" in the conversation
+        assert any('json' in message['content'].lower() for message in kwargs['messages'])
+
+    def test_invalid_response_is_reasked_once(self):
+        client = _client('I cannot format that.', '{"score": 70}')
+        assert complete_json(client, [{'role': 'user', 'content': 'Return JSON'}]) == {'score': 70}
+        assert client.chat.completions.create.call_count == 2
+
+    def test_missing_fields_are_filled_without_a_call(self):
+        template = {'summary': '', 'skills': [''], 'education': [{'degree': ''}],
+                    'userInfo': {'firstName': '', 'isPresent': False}, 'score': 0}
+        client = _client('{"summary": "Engineer", "userInfo": {"firstName": "Ada"}}')
+        result = complete_json(client, [{'role': 'user', 'content': 'Return JSON'}], template=template)
+
+        assert result == {'summary': 'Engineer', 'skills': [], 'education': [],
+                          'userInfo': {'firstName': 'Ada', 'isPresent': False}, 'score': 0}
+        assert client.chat.completions.create.call_count == 1
+
+    def test_explicit_response_format_is_kept(self):
+        client = _client('{"a": 1}')
+        schema_format = {'type': 'json_schema', 'json_schema': {'name': 'x', 'strict': True, 'schema': {}}}
+        complete_json(client, [{'role': 'user', 'content': 'Return JSON'}], response_format=schema_format)
+        assert client.chat.completions.create.call_args.kwargs['response_format'] == schema_format
@@ -0,0 +1,80 @@
+"""
+Test suite for multi-worker serving support
+"""
+
+import time
+
+from app.services.worker_lifecycle import BackgroundServices, KeywordIndexRebuilder, LeaderLock
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class TestLeaderElection:
+    """Tests for running background services in exactly one process"""
+
+    def test_only_one_holder_of_the_lock(self, tmp_path):
+        path = str(tmp_path / 'leader.lock')
+        first, second = LeaderLock(path), LeaderLock(path)
+
+        assert first.acquire() is True
+        assert second.acquire() is False
+
+        first.release()
+        assert second.acquire() is True
+        second.release()
+
+    def test_standby_takes_over_when_leader_stops(self, app, tmp_path):
+        path = str(tmp_path / 'leader.lock')
+        leader = BackgroundServices(app, services=(), lock=LeaderLock(path), retry_seconds=0.05)
+        standby = BackgroundServices(app, services=(), lock=LeaderLock(path), retry_seconds=0.05)
+
+        leader.start()
+        assert _wait_for(lambda: leader.is_leader)
+        standby.start()
+        time.sleep(0.15)
+        assert standby.is_leader is False
+
+        leader.stop()
+        assert _wait_for(lambda: standby.is_leader)
+        standby.stop()
+        assert standby.is_leader is False
+
+    def test_services_configured_from_environment(self, app, monkeypatch):
+        monkeypatch.setenv('BACKGROUND_SERVICES', 'token_refresh, bulk_poller')
+        assert BackgroundServices(app).services == ['token_refresh', 'bulk_poller']
+
+
+class TestKeywordIndexRebuilder:
+    """Tests for the leader's keyword corpus refit"""
+
+    def test_missing_index_is_built_on_start(self, app, db_session, tmp_path, monkeypatch):
+        path = tmp_path / 'keyword_index.json'
+        monkeypatch.setenv('KEYWORD_INDEX_PATH', str(path))
+        rebuilder = KeywordIndexRebuilder(app, interval_seconds=3600)
+
+        rebuilder.start()
+        assert _wait_for(path.exists)
+        rebuilder.stop()
+        assert not rebuilder.thread.is_alive()
+
+
+class TestResetAfterFork:
+    """Tests for fork-safe connection handling"""
+
+    def test_file_search_index_reopens_its_connection(self, tmp_path):
+        from app.services.resume_search_service import LocalSearchIndex
+
+        index = LocalSearchIndex(str(tmp_path / 'search.db'))
+        index.upsert([{'doc_key': 'file:1', 'doc_type': 'file', 'doc_ref': '1', 'user_id': 1,
+                       'title': 'a.pdf', 'body': 'Kubernetes operator', 'keywords': ''}])
+        inherited = index._conn
+
+        index.reopen()
+
+        assert index._conn is not inherited
+        assert index.search(1, ['kubernetes'], 'all', 10, 0)['total'] == 1